@@ -67,10 +67,12 @@ async def system_info():
         "endpoints": {
             "chat": "/api/v1/tool-calling/chat",
             "chat_stream": "/api/v1/tool-calling/chat/stream",
+            "chat_batch": "/api/v1/tool-calling/chat/batch",
             "conversation_history": "/api/v1/tool-calling/conversation/history/{session_id}",
             "session_stats": "/api/v1/tool-calling/session/stats/{session_id}",
             "session_delete": "/api/v1/tool-calling/session/{session_id}",
             "session_cleanup": "/api/v1/tool-calling/session/cleanup",
+            "prompt_cache": "/api/v1/tool-calling/prompt-cache",
             "health": "/api/v1/tool-calling/health"
         }
     }
@@ -146,6 +148,7 @@ async def system_health():
             "endpoints_available": [
                 "/api/v1/tool-calling/chat",
                 "/api/v1/tool-calling/chat/stream", 
+                "/api/v1/tool-calling/chat/batch",
                 "/api/v1/tool-calling/conversation/history/{session_id}",
                 "/api/v1/tool-calling/session/stats/{session_id}",
                 "/api/v1/system/info"
@@ -0,0 +1,244 @@
+"""
+Admission Control
+
+과부하 시 요청을 쌓아 두다 타임아웃시키는 대신 빠르게 429(Retry-After)로 거절합니다.
+
+- 전역 동시 처리 상한: AdmissionMiddleware가 채팅 경로 요청 수를 admission_max_in_flight로 제한
+- Agent별 동시 실행 수 + 대기열 길이: agent_schemas.json의 agents.<이름>.admission 설정
+  (max_concurrent, max_queue, max_wait_seconds)
+- 마감 시각 기반 조기 거절: 예상 대기 시간이 요청 마감(admission_request_timeout)이나
+  Agent 최대 대기 시간을 넘으면 대기열에 넣지 않고 즉시 거절
+- 대기열 길이, 대기 시간, 거절 수는 /metrics의 admission 항목과 admission.wait.<agent> 단계로 노출
+"""
+
+import asyncio
+import json
+import logging
+import math
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Any, Deque, Dict, Optional
+
+from .config import settings
+from .tracing import record, register_metrics_provider
+
+logger = logging.getLogger(__name__)
+
+# 스키마에 admission 설정이 없는 Agent의 기본값
+DEFAULT_AGENT_LIMITS = {"max_concurrent": 8, "max_queue": 32, "max_wait_seconds": 10.0}
+
+# 현재 요청의 마감 시각 (time.monotonic 기준, 미들웨어가 설정)
+_deadline: ContextVar[Optional[float]] = ContextVar("narutalk_admission_deadline", default=None)
+
+
+class Overloaded(Exception):
+    """처리 용량 초과로 요청을 거절 (HTTP 429 + Retry-After로 변환)"""
+
+    def __init__(self, reason: str, retry_after: int, agent: Optional[str] = None):
+        self.reason = reason
+        self.retry_after = retry_after
+        self.agent = agent
+        target = f"{agent} " if agent else ""
+        super().__init__(f"{target}요청이 많아 처리할 수 없습니다 ({reason}). {retry_after}초 후 다시 시도해주세요.")
+
+
+class AgentLimiter:
+    """Agent 하나의 동시 실행 슬롯 + 유한 대기열 (FIFO)"""
+
+    def __init__(self, name: str, max_concurrent: int, max_queue: int, max_wait_seconds: float):
+        self.name = name
+        self.max_concurrent = max(1, int(max_concurrent))
+        self.max_queue = max(0, int(max_queue))
+        self.max_wait_seconds = float(max_wait_seconds)
+        self.running = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        # 평균 처리 시간 (지수이동평균, 예상 대기 시간 계산용)
+        self.avg_service_seconds = 1.0
+        self.counts = {"admitted": 0, "queued": 0, "rejected_queue_full": 0, "rejected_deadline": 0}
+        self.wait_ms_total = 0.0
+
+    @property
+    def queue_depth(self) -> int:
+        return sum(1 for waiter in self._waiters if not waiter.done())
+
+    def expected_wait(self, position: int) -> float:
+        """대기열 position번째(1부터)가 슬롯을 얻기까지 예상 시간(초)"""
+        return math.ceil(position / self.max_concurrent) * self.avg_service_seconds
+
+    def _retry_after(self) -> int:
+        return max(1, math.ceil(self.expected_wait(self.queue_depth + 1)))
+
+    def _reject(self, reason: str):
+        self.counts[f"rejected_{reason}"] += 1
+        logger.warning(f"🚦 {self.name} 요청 거절 ({reason}): 실행 {self.running}, 대기 {self.queue_depth}")
+        raise Overloaded(reason, self._retry_after(), self.name)
+
+    async def acquire(self):
+        if self.running < self.max_concurrent and not self.queue_depth:
+            self.running += 1
+            self.counts["admitted"] += 1
+            return
+
+        depth = self.queue_depth
+        if depth >= self.max_queue:
+            self._reject("queue_full")
+
+        budget = self.max_wait_seconds
+        deadline = _deadline.get()
+        if deadline is not None:
+            budget = min(budget, deadline - time.monotonic())
+        if budget <= 0 or self.expected_wait(depth + 1) > budget:
+            self._reject("deadline")
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self.counts["queued"] += 1
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(waiter, timeout=budget)
+        except asyncio.TimeoutError:
+            # 시간 초과와 슬롯 양도가 겹친 경우는 획득으로 처리
+            if not (waiter.done() and not waiter.cancelled()):
+                self._reject("deadline")
+        except BaseException:
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            raise
+        finally:
+            waited_ms = (time.perf_counter() - started) * 1000
+            self.wait_ms_total += waited_ms
+            record(f"admission.wait.{self.name}", waited_ms)
+        self.counts["admitted"] += 1
+
+    def release(self, service_seconds: Optional[float] = None):
+        if service_seconds is not None:
+            self.avg_service_seconds = 0.8 * self.avg_service_seconds + 0.2 * service_seconds
+        # 대기 중인 요청에 슬롯을 바로 넘김 (취소/시간 초과된 대기자는 건너뜀)
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.running -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        queued = self.counts["queued"]
+        return {
+            **self.counts,
+            "running": self.running,
+            "queue_depth": self.queue_depth,
+            "max_concurrent": self.max_concurrent,
+            "max_queue": self.max_queue,
+            "max_wait_seconds": self.max_wait_seconds,
+            "avg_service_ms": round(self.avg_service_seconds * 1000, 2),
+            "wait_ms_avg": round(self.wait_ms_total / queued, 2) if queued else None,
+        }
+
+
+class AdmissionController:
+    """전역 동시 요청 상한 + Agent별 리미터"""
+
+    def __init__(self):
+        self.in_flight = 0
+        self.counts = {"admitted": 0, "rejected": 0}
+        self._limiters: Dict[str, AgentLimiter] = {}
+        self._configs: Dict[str, Dict[str, Any]] = {}
+
+    def configure(self, agent_configs: Dict[str, Optional[Dict[str, Any]]]):
+        """Agent별 설정 등록 (agent_schemas.json의 admission 항목, 설정이 바뀐 Agent만 리미터 재생성)"""
+        for name, config in agent_configs.items():
+            merged = {**DEFAULT_AGENT_LIMITS, **(config or {})}
+            if self._configs.get(name) != merged:
+                self._configs[name] = merged
+                self._limiters.pop(name, None)
+
+    def limiter(self, agent_name: str) -> AgentLimiter:
+        if agent_name not in self._limiters:
+            config = self._configs.get(agent_name, DEFAULT_AGENT_LIMITS)
+            self._limiters[agent_name] = AgentLimiter(agent_name, **config)
+        return self._limiters[agent_name]
+
+    @asynccontextmanager
+    async def slot(self, agent_name: str):
+        """Agent 실행 슬롯 (대기열이 가득 찼거나 마감 전에 차례가 오지 않으면 Overloaded)"""
+        if not settings.admission_enabled:
+            yield
+            return
+        limiter = self.limiter(agent_name)
+        await limiter.acquire()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            limiter.release(time.perf_counter() - started)
+
+    def try_enter(self) -> bool:
+        """전역 상한 내이면 요청 수 증가"""
+        if self.in_flight >= settings.admission_max_in_flight:
+            self.counts["rejected"] += 1
+            return False
+        self.in_flight += 1
+        self.counts["admitted"] += 1
+        return True
+
+    def leave(self):
+        self.in_flight -= 1
+
+    def global_retry_after(self) -> int:
+        """전역 상한 초과 시 Retry-After (Agent 평균 처리 시간 중 최댓값 기준)"""
+        slowest = max((limiter.avg_service_seconds for limiter in self._limiters.values()), default=1.0)
+        return max(1, math.ceil(slowest))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": settings.admission_enabled,
+            "in_flight": self.in_flight,
+            "max_in_flight": settings.admission_max_in_flight,
+            **self.counts,
+            "agents": {name: limiter.stats() for name, limiter in self._limiters.items()},
+        }
+
+
+admission_controller = AdmissionController()
+register_metrics_provider("admission", admission_controller.stats)
+
+
+class AdmissionMiddleware:
+    """채팅 경로 요청의 전역 동시 처리 상한 적용 및 요청 마감 시각 설정 (ASGI 미들웨어, 스트리밍 응답 포함)"""
+
+    def __init__(self, app, path_prefix: str = "/api/v1/tool-calling/chat"):
+        self.app = app
+        self.path_prefix = path_prefix
+
+    async def __call__(self, scope, receive, send):
+        if (scope["type"] != "http" or not settings.admission_enabled
+                or not scope.get("path", "").startswith(self.path_prefix)):
+            await self.app(scope, receive, send)
+            return
+
+        if not admission_controller.try_enter():
+            retry_after = admission_controller.global_retry_after()
+            logger.warning(f"🚦 전역 동시 처리 상한 초과: {admission_controller.in_flight}")
+            body = json.dumps({
+                "detail": f"요청이 많아 처리할 수 없습니다. {retry_after}초 후 다시 시도해주세요.",
+                "reason": "max_in_flight"
+            }, ensure_ascii=False).encode("utf-8")
+            await send({
+                "type": "http.response.start",
+                "status": 429,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"retry-after", str(retry_after).encode()),
+                ],
+            })
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        token = _deadline.set(time.monotonic() + settings.admission_request_timeout)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _deadline.reset(token)
+            admission_controller.leave()
@@ -0,0 +1,73 @@
+"""
+LangGraph Checkpointer
+
+워커 프로세스 간에 공유되는 SQLite 체크포인터를 생성합니다.
+langgraph-checkpoint-sqlite가 없으면 프로세스 메모리 기반 MemorySaver를 사용합니다.
+"""
+
+import asyncio
+import logging
+from pathlib import Path
+from typing import Any, Dict, Iterable
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+# 그래프별 SQLite 체크포인터 (프로세스 내 공유, 연결 하나씩 유지)
+_sqlite_savers: Dict[str, Any] = {}
+
+
+def create_checkpointer(name: str, allowed_types: Iterable[type] = ()) -> Any:
+    """
+    LangGraph 체크포인터 생성 (SQLite 공유 저장소 우선)
+
+    Args:
+        name: 그래프 이름 (그래프마다 별도 파일을 사용해 thread_id 충돌 방지)
+        allowed_types: 상태에 포함되어 역직렬화를 허용할 사용자 정의 타입
+    """
+    if settings.checkpoint_backend == "sqlite":
+        try:
+            import aiosqlite
+            from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+            from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+        except ImportError:
+            logger.warning("langgraph-checkpoint-sqlite가 설치되지 않아 MemorySaver를 사용합니다.")
+        else:
+            try:
+                # AsyncSqliteSaver는 생성 시점의 이벤트 루프에 연결됨
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                logger.warning("실행 중인 이벤트 루프가 없어 MemorySaver를 사용합니다.")
+            else:
+                saver = _sqlite_savers.get(name)
+                if saver is None or saver.loop is not loop:
+                    db_path = Path(settings.sqlite_db_path) / f"checkpoints_{name}.db"
+                    db_path.parent.mkdir(parents=True, exist_ok=True)
+                    try:
+                        serde = JsonPlusSerializer(
+                            allowed_msgpack_modules=[(t.__module__, t.__name__) for t in allowed_types]
+                        )
+                    except TypeError:
+                        # 허용 목록을 지원하지 않는 이전 버전
+                        serde = JsonPlusSerializer()
+                    saver = AsyncSqliteSaver(aiosqlite.connect(str(db_path), timeout=30), serde=serde)
+                    _sqlite_savers[name] = saver
+                    logger.info(f"SQLite 체크포인터 사용: {db_path}")
+                return saver
+
+    from langgraph.checkpoint.memory import MemorySaver
+
+    return MemorySaver()
+
+
+async def close_checkpointers():
+    """SQLite 체크포인터 연결 종료 (애플리케이션 종료 시 호출)"""
+    loop = asyncio.get_running_loop()
+    for name, saver in list(_sqlite_savers.items()):
+        if saver.loop is loop:
+            try:
+                await saver.conn.close()
+            except Exception as e:
+                logger.warning(f"체크포인터 연결 종료 실패 {name}: {str(e)}")
+        _sqlite_savers.pop(name, None)
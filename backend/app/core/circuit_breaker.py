@@ -0,0 +1,205 @@
+"""
+LLM Circuit Breaker
+
+OpenAI 장애/지연 시 모든 요청이 타임아웃까지 기다리지 않도록 LLM 호출 지점 전체가 공유하는 회로 차단기입니다.
+
+- closed: 최근 호출(최대 llm_breaker_window건, llm_breaker_window_seconds 이내)의 오류율 또는 지연 호출 비율이
+  임계값을 넘으면 open으로 전환
+- open: llm_breaker_open_seconds 동안 LLM을 호출하지 않고 즉시 CircuitOpen
+  (호출 측은 키워드 라우팅, 규칙 엔진, 기본 템플릿으로 응답)
+- half_open: 대기 시간이 지나면 llm_breaker_half_open_probes개의 탐색 호출만 허용해 모두 성공하면 closed,
+  하나라도 실패하면 다시 open
+- 실패로 집계하는 오류는 제공자 장애(시간 초과, 연결 오류, 429, 5xx)뿐이며, 잘못된 요청(4xx)이나
+  콘텐츠 필터 거절은 집계하지 않고 그대로 전달
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+
+from .config import settings
+from .tracing import register_metrics_provider
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+_provider_errors: Optional[Tuple[type, ...]] = None
+
+
+def is_provider_failure(error: BaseException) -> bool:
+    """차단기 실패로 집계할 오류인지 (제공자 장애: 시간 초과, 연결 오류, 429, 5xx)"""
+    global _provider_errors
+    if _provider_errors is None:
+        errors = [TimeoutError, ConnectionError]
+        try:
+            import openai
+            errors += [openai.APITimeoutError, openai.APIConnectionError, openai.RateLimitError,
+                       openai.InternalServerError]
+        except ImportError:
+            pass
+        _provider_errors = tuple(errors)
+    return isinstance(error, _provider_errors)
+
+
+class CircuitOpen(Exception):
+    """회로가 열려 있어 LLM 호출을 생략함"""
+
+    def __init__(self, name: str, retry_in: float):
+        self.name = name
+        self.retry_in = retry_in
+        super().__init__(f"{name} 회로 차단 중 ({retry_in:.0f}초 후 재시도)")
+
+
+class CircuitBreaker:
+    """오류율/지연 비율 기반 회로 차단기 (스레드 안전, LLM 호출은 스레드에서 실행됨)"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self._calls: Deque[Tuple[float, bool, bool]] = deque()  # (시각, 실패 여부, 지연 여부)
+        self.state = CLOSED
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+        self.counts = {"calls": 0, "failures": 0, "slow_calls": 0, "short_circuited": 0, "opened": 0}
+
+    def _trim(self, now: float):
+        while self._calls and (
+            len(self._calls) > settings.llm_breaker_window
+            or now - self._calls[0][0] > settings.llm_breaker_window_seconds
+        ):
+            self._calls.popleft()
+
+    def _rates(self) -> Tuple[float, float]:
+        total = len(self._calls)
+        if not total:
+            return 0.0, 0.0
+        failures = sum(1 for _, failed, _ in self._calls if failed)
+        slow = sum(1 for _, _, is_slow in self._calls if is_slow)
+        return failures / total, slow / total
+
+    def _open(self, now: float, reason: str):
+        self.state = OPEN
+        self._opened_at = now
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+        self.counts["opened"] += 1
+        logger.warning(f"⛔ {self.name} 회로 차단 ({reason}) - {settings.llm_breaker_open_seconds}초간 로컬 응답으로 전환")
+
+    def _retry_in(self, now: float) -> float:
+        return max(0.0, self._opened_at + settings.llm_breaker_open_seconds - now)
+
+    def available(self) -> bool:
+        """지금 호출하면 차단되지 않는지 (상태를 바꾸지 않는 조회 - 로컬 경로 선택용)"""
+        if not settings.llm_breaker_enabled:
+            return True
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN:
+                return self._retry_in(time.monotonic()) <= 0
+            return self._probes_in_flight < settings.llm_breaker_half_open_probes
+
+    def _acquire(self) -> bool:
+        """호출 허용 여부 (허용된 half_open 호출은 탐색 호출로 집계). 반환값: 탐색 호출 여부"""
+        now = time.monotonic()
+        with self._lock:
+            if self.state == OPEN:
+                if self._retry_in(now) > 0:
+                    self.counts["short_circuited"] += 1
+                    raise CircuitOpen(self.name, self._retry_in(now))
+                self.state = HALF_OPEN
+                logger.info(f"🔎 {self.name} 회로 반개방 - 탐색 호출 시작")
+            if self.state == HALF_OPEN:
+                if self._probes_in_flight >= settings.llm_breaker_half_open_probes:
+                    self.counts["short_circuited"] += 1
+                    raise CircuitOpen(self.name, 0.0)
+                self._probes_in_flight += 1
+                return True
+            return False
+
+    def _release_probe(self):
+        """집계하지 않는 오류로 끝난 탐색 호출의 슬롯 반납"""
+        with self._lock:
+            self._probes_in_flight = max(0, self._probes_in_flight - 1)
+
+    def _record(self, probe: bool, failed: bool, duration_ms: float):
+        now = time.monotonic()
+        slow = duration_ms >= settings.llm_breaker_slow_call_ms
+        with self._lock:
+            self.counts["calls"] += 1
+            self.counts["failures"] += failed
+            self.counts["slow_calls"] += slow
+
+            if probe:
+                self._probes_in_flight = max(0, self._probes_in_flight - 1)
+                if self.state != HALF_OPEN:
+                    return
+                if failed or slow:
+                    self._open(now, "탐색 호출 실패")
+                    return
+                self._probe_successes += 1
+                if self._probe_successes >= settings.llm_breaker_half_open_probes:
+                    self.state = CLOSED
+                    self._calls.clear()
+                    logger.info(f"✅ {self.name} 회로 복구")
+                return
+
+            self._calls.append((now, failed, slow))
+            self._trim(now)
+            if self.state != CLOSED or len(self._calls) < settings.llm_breaker_min_calls:
+                return
+            failure_rate, slow_rate = self._rates()
+            if failure_rate >= settings.llm_breaker_failure_rate:
+                self._open(now, f"오류율 {failure_rate:.0%}")
+            elif slow_rate >= settings.llm_breaker_slow_rate:
+                self._open(now, f"지연 호출 비율 {slow_rate:.0%}")
+
+    def call(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """차단기를 거쳐 호출 (차단 중이면 즉시 CircuitOpen, 제공자 장애가 아닌 오류는 집계 없이 전달)"""
+        if not settings.llm_breaker_enabled:
+            return fn(*args, **kwargs)
+        probe = self._acquire()
+        started = time.perf_counter()
+        try:
+            result = fn(*args, **kwargs)
+        except Exception as e:
+            if is_provider_failure(e):
+                self._record(probe, True, (time.perf_counter() - started) * 1000)
+            elif probe:
+                self._release_probe()
+            raise
+        self._record(probe, False, (time.perf_counter() - started) * 1000)
+        return result
+
+    def reset(self):
+        with self._lock:
+            self._calls.clear()
+            self.state = CLOSED
+            self._probes_in_flight = 0
+            self._probe_successes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        with self._lock:
+            self._trim(now)
+            failure_rate, slow_rate = self._rates()
+            return {
+                "state": self.state,
+                "window_calls": len(self._calls),
+                "failure_rate": round(failure_rate, 4),
+                "slow_rate": round(slow_rate, 4),
+                "retry_in_seconds": round(self._retry_in(now), 2) if self.state == OPEN else 0.0,
+                **self.counts,
+            }
+
+
+# 모든 OpenAI 호출 지점(라우팅, 문서 Agent, 대화 요약, 보고서)이 공유
+llm_breaker = CircuitBreaker("openai")
+register_metrics_provider("circuit_breaker", llm_breaker.stats)
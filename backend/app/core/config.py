@@ -1,32 +1,16 @@
 from pydantic_settings import BaseSettings
-from typing import Optional, ClassVar, List
+from typing import Optional, ClassVar, Dict, List
+from functools import lru_cache
+import logging
 import os
 from pathlib import Path
-from dotenv import load_dotenv
 
-# .env 파일 로드 (프로젝트 루트에서 찾기)
+logger = logging.getLogger(__name__)
+
+# .env 파일 경로 (프로젝트 루트) - 실제 로드는 최초 설정 접근 시점에 수행
 project_root = Path(__file__).parent.parent.parent.parent
 env_file = project_root / ".env"
 
-# 디버깅을 위한 로그
-print(f"🔍 .env 파일 경로: {env_file}")
-print(f"🔍 .env 파일 존재: {env_file.exists()}")
-
-if env_file.exists():
-    load_dotenv(env_file)
-    print(f"✅ .env 파일 로드 완료: {env_file}")
-else:
-    # .env 파일이 없으면 현재 디렉토리에서 찾기
-    load_dotenv()
-    print("⚠️  프로젝트 루트에 .env 파일이 없어 현재 디렉토리에서 로드 시도")
-
-# 환경변수 디버깅
-api_key = os.getenv("OPENAI_API_KEY")
-if api_key:
-    print(f"✅ OPENAI_API_KEY 로드됨: {api_key[:10]}...")
-else:
-    print("❌ OPENAI_API_KEY 로드 실패")
-
 class Settings(BaseSettings):
     """애플리케이션 설정"""
     
@@ -38,14 +22,27 @@ class Settings(BaseSettings):
     project_root: ClassVar[Path] = Path(__file__).parent.parent.parent.parent
     
     # OpenAI 설정
-    openai_api_key: Optional[str] = os.getenv("OPENAI_API_KEY")
+    openai_api_key: Optional[str] = None
     openai_model: str = "gpt-4o"
     openai_temperature: float = 0.7
     openai_max_tokens: int = 1000
     openai_timeout: int = 30
+    # OpenAI 호환 서버 주소 (미설정 시 공식 API, 벤치마크에서는 로컬 스텁 서버 지정)
+    openai_base_url: Optional[str] = None
+    
+    # OpenAI 회로 차단기 (최근 호출 창, 차단 임계값, 차단 유지 시간, 반개방 탐색 호출 수)
+    llm_breaker_enabled: bool = True
+    llm_breaker_window: int = 20
+    llm_breaker_window_seconds: float = 60.0
+    llm_breaker_min_calls: int = 5
+    llm_breaker_failure_rate: float = 0.5
+    llm_breaker_slow_call_ms: float = 15000.0
+    llm_breaker_slow_rate: float = 0.8
+    llm_breaker_open_seconds: float = 30.0
+    llm_breaker_half_open_probes: int = 2
     
     # HuggingFace 설정
-    huggingface_token: Optional[str] = os.getenv("HUGGINGFACE_TOKEN")
+    huggingface_token: Optional[str] = None
     
     # 허깅페이스 모델 ID (로컬 모델 대신 사용)
     embedding_model_id: str = "nlpai-lab/KURE-v1"  # 한국어 특화 임베딩 모델
@@ -58,12 +55,25 @@ class Settings(BaseSettings):
     embedding_model_path: str = str(project_root / "models" / "KURE-V1")
     reranker_model_path: str = str(project_root / "models" / "bge-reranker-v2-m3-ko")
     
+    # Agent 공유 임베딩 LRU 캐시 크기 (텍스트 수)
+    embedding_cache_size: int = 4096
+    
+    # LLM 응답 캐시 (SQLite, 최대 항목 수, temperature > 0 요청 제외 여부)
+    llm_cache_enabled: bool = True
+    llm_cache_max_entries: int = 5000
+    llm_cache_skip_sampled: bool = False  # 모든 호출이 temperature > 0이라 True면 캐시가 사실상 꺼짐 (llm_cache.py 참고)
+    
+    # 프롬프트 캐시 절감액 추정 (입력 100만 토큰당 단가(USD), 캐시 입력 토큰 할인율)
+    llm_input_price_per_million: float = 2.5
+    llm_cached_input_discount: float = 0.5
+    
     # 데이터베이스 설정 (절대 경로)
     chroma_db_path: str = str(project_root / "database" / "chroma_db")
     sqlite_db_path: str = str(project_root / "database" / "relationdb")
     
     # 랭그래프 설정
     langgraph_debug: bool = True
+    checkpoint_backend: str = "sqlite"  # sqlite: 워커 간 공유 파일, memory: 프로세스 메모리
     
     # 라우터 시스템 설정
     available_routers: List[str] = [
@@ -78,13 +88,80 @@ class Settings(BaseSettings):
     router_confidence_threshold: float = 0.5
     max_router_switches: int = 5
     
+    # 거래처 종합 분석 시 분석 유형별 타임아웃 (초)
+    client_analysis_branch_timeout: float = 10.0
+    
+    # 거래처 등급 분류 (등급별 종합 점수 하한 0~100, 점수 산출 기간)
+    client_grade_cutoffs: Dict[str, float] = {"S": 90.0, "A": 70.0, "B": 40.0, "C": 15.0, "D": 0.0}
+    client_grade_window_months: int = 12
+    
+    # 실적 급증/급감 야간 스캔 (실행 시각, 기준 구간, robust z-score 및 변화율 임계값)
+    anomaly_scan_enabled: bool = True
+    anomaly_scan_hour: int = 2
+    # 다중 워커 중 스캔을 맡은 워커의 임대 유지 시간 (초, 이 시간 안에 다른 워커는 스캔 생략)
+    anomaly_scan_lease_seconds: int = 3600
+    anomaly_window_months: int = 6
+    anomaly_z_threshold: float = 3.5
+    anomaly_min_change: float = 0.3
+    
+    # 라우팅 LLM 호출과 병렬로 db_agent 벡터 검색 후보 선조회
+    speculative_prefetch_enabled: bool = True
+    
+    # 대화 맥락 압축 (맥락 토큰 예산, 원문 유지 턴 수, 요약 갱신 주기(턴), 요약 최대 토큰, 최대 세션 수)
+    context_compaction_enabled: bool = True
+    context_budget_tokens: int = 1500
+    context_recent_turns: int = 3
+    context_summary_every: int = 4
+    context_summary_max_tokens: int = 300
+    context_max_sessions: int = 1000
+    
+    # 과부하 제어 (채팅 경로 전역 동시 처리 상한, 요청 마감 시간(초)) - Agent별 한도는 agent_schemas.json
+    admission_enabled: bool = True
+    admission_max_in_flight: int = 64
+    admission_request_timeout: float = 60.0
+    
+    # 동시에 들어온 같은 질문 합류 (세션 대화 맥락이 없는 요청만 라우팅 전체 공유)
+    single_flight_enabled: bool = True
+    
+    # 배치 채팅 (/chat/batch 동시 처리 수, 요청당 최대 메시지 수)
+    batch_chat_concurrency: int = 4
+    batch_chat_max_messages: int = 50
+    
     # API 설정
     api_v1_prefix: str = "/api/v1"
     
+    # 시작 시 워밍업 설정 (Agent/모델 사전 로드)
+    warmup_enabled: bool = True
+    warmup_max_workers: int = 6
+    
     class Config:
-        env_file = ".env"
+        env_file = str(env_file)
         env_file_encoding = "utf-8"
         extra = "ignore"  # 추가 필드 무시
 
-# 설정 인스턴스 생성
-settings = Settings() 
\ No newline at end of file
+@lru_cache()
+def get_settings() -> Settings:
+    """설정 인스턴스 생성 (최초 호출 시 .env 로드)"""
+    from dotenv import load_dotenv
+    
+    if env_file.exists():
+        load_dotenv(env_file)
+        logger.info(f".env 파일 로드 완료: {env_file}")
+    else:
+        # .env 파일이 없으면 현재 디렉토리에서 찾기
+        load_dotenv()
+        logger.warning("프로젝트 루트에 .env 파일이 없어 현재 디렉토리에서 로드 시도")
+    
+    if not os.getenv("OPENAI_API_KEY"):
+        logger.warning("OPENAI_API_KEY가 설정되지 않았습니다.")
+    
+    return Settings()
+
+class _LazySettings:
+    """import 시점이 아닌 최초 속성 접근 시점에 Settings를 생성하는 프록시"""
+    
+    def __getattr__(self, name: str):
+        return getattr(get_settings(), name)
+
+# 설정 인스턴스 (지연 생성)
+settings = _LazySettings() 
\ No newline at end of file
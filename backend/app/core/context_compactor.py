@@ -0,0 +1,314 @@
+"""
+Conversation Context Compactor
+
+세션별 대화 맥락을 고정된 토큰 예산 안에서 라우팅/응답 LLM 호출에 전달합니다.
+
+- 누적 요약(running summary): context_summary_every 턴마다 백그라운드에서 이전 요약 + 새 턴만으로 갱신
+  (요청 처리 경로에서는 LLM 요약 호출을 기다리지 않음)
+- 최근 context_recent_turns 턴은 원문 그대로 포함
+- 토큰 수는 로컬에서 계산 (tiktoken 설치 시 정확한 토큰, 미설치 시 문자 기반 추정)
+- 요약된 턴은 메모리에서 제거되므로 대화가 길어져도 턴당 프롬프트 크기가 일정하게 유지됨
+"""
+
+import asyncio
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .circuit_breaker import llm_breaker
+from .config import settings
+from .prompt_cache import layout_messages, record_usage
+from .tracing import register_metrics_provider, span
+
+logger = logging.getLogger(__name__)
+
+_encoding = None
+_encoding_loaded = False
+
+
+def _get_encoding():
+    """tiktoken 인코더 (미설치 시 None)"""
+    global _encoding, _encoding_loaded
+    if not _encoding_loaded:
+        _encoding_loaded = True
+        try:
+            import tiktoken
+            _encoding = tiktoken.get_encoding("o200k_base")
+        except Exception as e:
+            logger.info(f"tiktoken 미사용, 문자 기반 토큰 추정 사용: {str(e)}")
+            _encoding = None
+    return _encoding
+
+
+def _char_tokens(char: str) -> float:
+    """문자 하나의 추정 토큰 수 (영문/숫자 약 4자당 1토큰, 한글 등은 1자당 1토큰)"""
+    return 0.25 if ord(char) < 128 else 1.0
+
+
+def count_tokens(text: str) -> int:
+    """로컬 토큰 수 계산"""
+    if not text:
+        return 0
+    encoding = _get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text))
+    return int(sum(_char_tokens(char) for char in text) + 0.999)
+
+
+def truncate_tokens(text: str, max_tokens: int, keep: str = "end") -> str:
+    """토큰 예산에 맞게 자르기 (keep="end"면 뒤쪽, "start"면 앞쪽 유지)"""
+    if max_tokens <= 0:
+        return ""
+    if count_tokens(text) <= max_tokens:
+        return text
+
+    encoding = _get_encoding()
+    if encoding is not None:
+        tokens = encoding.encode(text)
+        kept = tokens[-max_tokens:] if keep == "end" else tokens[:max_tokens]
+        return "…" + encoding.decode(kept) if keep == "end" else encoding.decode(kept) + "…"
+
+    budget = max_tokens - 1  # 생략 표시분
+    chars = reversed(text) if keep == "end" else iter(text)
+    kept_chars, used = [], 0.0
+    for char in chars:
+        used += _char_tokens(char)
+        if used > budget:
+            break
+        kept_chars.append(char)
+    if keep == "end":
+        return "…" + "".join(reversed(kept_chars))
+    return "".join(kept_chars) + "…"
+
+
+class _SessionContext:
+    """세션 하나의 누적 요약 + 아직 요약되지 않은 턴"""
+
+    __slots__ = ("summary", "turns", "total_turns", "summarized_turns", "refreshing")
+
+    def __init__(self):
+        self.summary = ""
+        self.turns: List[Tuple[str, str]] = []  # (사용자 메시지, 응답)
+        self.total_turns = 0
+        self.summarized_turns = 0
+        self.refreshing = False
+
+
+SUMMARY_PROMPT = (
+    "당신은 제약회사 사내 업무 어시스턴트의 대화 요약기입니다. 기존 요약에 새 대화를 반영해 요약을 갱신하세요. "
+    "이후 질문의 대명사나 생략된 대상을 해석하는 데 필요한 사실(직원명, 거래처명, 기간, 문서명, 수치, 결론)을 "
+    "우선 남기고, 인사말이나 중복 내용은 버리세요. 요청에 지정된 분량 이내의 한국어 평서문으로 작성하세요."
+)
+
+
+class ContextCompactor:
+    """세션별 누적 요약 + 최근 턴 원문으로 토큰 예산 내 대화 맥락 구성"""
+
+    def __init__(self, summarizer: Optional[Callable[[str, List[Tuple[str, str]]], str]] = None,
+                 max_sessions: Optional[int] = None):
+        self._summarizer = summarizer
+        self._max_sessions = max_sessions
+        self._sessions: "OrderedDict[str, _SessionContext]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._tasks = set()
+        self._openai_client = None
+        self._counters = {"turns": 0, "refreshes": 0, "refresh_failures": 0, "fallback_summaries": 0}
+
+    @property
+    def max_sessions(self) -> int:
+        return self._max_sessions or settings.context_max_sessions
+
+    def _session(self, session_id: str) -> _SessionContext:
+        """세션 조회/생성 (오래 사용하지 않은 세션부터 축출)"""
+        context = self._sessions.get(session_id)
+        if context is None:
+            context = self._sessions[session_id] = _SessionContext()
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+        else:
+            self._sessions.move_to_end(session_id)
+        return context
+
+    def build_context(self, session_id: Optional[str],
+                      budget_tokens: Optional[int] = None) -> Tuple[List[Dict[str, str]], int]:
+        """
+        LLM 메시지 목록으로 변환한 대화 맥락
+
+        Returns:
+            ([{"role", "content"}, ...], 사용 토큰 수) - 시스템 프롬프트와 현재 메시지 사이에 삽입
+        """
+        if not session_id or not settings.context_compaction_enabled:
+            return [], 0
+        budget = budget_tokens if budget_tokens is not None else settings.context_budget_tokens
+
+        with self._lock:
+            context = self._sessions.get(session_id)
+            if context is None:
+                return [], 0
+            summary = context.summary
+            recent = context.turns[-settings.context_recent_turns:]
+
+        # 요약은 예산의 절반까지, 남은 예산은 최근 턴에 최신순으로 배정
+        messages: List[Dict[str, str]] = []
+        used = 0
+        if summary:
+            summary_text = "이전 대화 요약: " + truncate_tokens(summary, budget // 2)
+            used = count_tokens(summary_text)
+            messages.append({"role": "system", "content": summary_text})
+
+        turns: List[Dict[str, str]] = []
+        for user_message, answer in reversed(recent):
+            remaining = budget - used
+            user_tokens = count_tokens(user_message)
+            if user_tokens >= remaining:
+                break
+            answer = truncate_tokens(answer, remaining - user_tokens, keep="start")
+            turns[:0] = [{"role": "user", "content": user_message}, {"role": "assistant", "content": answer}]
+            used += user_tokens + count_tokens(answer)
+        return messages + turns, used
+
+    def add_turn(self, session_id: Optional[str], user_message: str, answer: str):
+        """턴 기록 후 요약 주기가 되면 백그라운드 요약 갱신 예약"""
+        if not session_id or not settings.context_compaction_enabled:
+            return
+        with self._lock:
+            context = self._session(session_id)
+            context.turns.append((user_message, answer or ""))
+            context.total_turns += 1
+            self._counters["turns"] += 1
+            due = (
+                not context.refreshing
+                and len(context.turns) - settings.context_recent_turns >= settings.context_summary_every
+            )
+            if due:
+                context.refreshing = True
+
+        if due:
+            try:
+                task = asyncio.get_running_loop().create_task(self.refresh(session_id))
+            except RuntimeError:
+                # 이벤트 루프 밖(동기 호출)에서는 즉시 갱신
+                asyncio.run(self.refresh(session_id))
+                return
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def refresh(self, session_id: str):
+        """최근 원문 구간을 제외한 턴을 누적 요약에 반영"""
+        with self._lock:
+            context = self._sessions.get(session_id)
+            if context is None:
+                return
+            context.refreshing = True
+            pending = context.turns[:max(0, len(context.turns) - settings.context_recent_turns)]
+            previous = context.summary
+
+        try:
+            if pending:
+                with span("context.summarize"):
+                    summary = await asyncio.to_thread(self._summarize, previous, pending)
+                with self._lock:
+                    context.summary = truncate_tokens(summary, settings.context_summary_max_tokens)
+                    # 요약하는 동안 추가된 턴은 유지
+                    del context.turns[:len(pending)]
+                    context.summarized_turns += len(pending)
+                    self._counters["refreshes"] += 1
+        except Exception as e:
+            logger.warning(f"대화 요약 갱신 실패 ({session_id}): {str(e)}")
+            with self._lock:
+                self._counters["refresh_failures"] += 1
+        finally:
+            with self._lock:
+                context.refreshing = False
+
+    def _summarize(self, previous: str, turns: List[Tuple[str, str]]) -> str:
+        """요약기 호출 (LLM 미사용 시 추출식 요약)"""
+        if self._summarizer is not None:
+            return self._summarizer(previous, turns)
+
+        client = self._get_openai_client()
+        if client is not None and llm_breaker.available():
+            try:
+                return self._llm_summarize(client, previous, turns)
+            except Exception as e:
+                logger.warning(f"LLM 대화 요약 실패, 추출식 요약 사용: {str(e)}")
+
+        with self._lock:
+            self._counters["fallback_summaries"] += 1
+        return self._extractive_summary(previous, turns)
+
+    def _get_openai_client(self):
+        if self._openai_client is None and settings.openai_api_key:
+            try:
+                from openai import OpenAI
+                self._openai_client = OpenAI(
+                    api_key=settings.openai_api_key, base_url=settings.openai_base_url, timeout=settings.openai_timeout
+                )
+            except Exception as e:
+                logger.error(f"대화 요약 OpenAI 클라이언트 초기화 실패: {str(e)}")
+        return self._openai_client
+
+    @staticmethod
+    def _llm_summarize(client: Any, previous: str, turns: List[Tuple[str, str]]) -> str:
+        max_tokens = settings.context_summary_max_tokens
+        transcript = "\n".join(
+            f"사용자: {user_message}\nAI: {truncate_tokens(answer, max_tokens, keep='start')}"
+            for user_message, answer in turns
+        )
+        response = llm_breaker.call(
+            client.chat.completions.create,
+            model=settings.openai_model,
+            messages=layout_messages(
+                "context_summary", SUMMARY_PROMPT,
+                f"[기존 요약]\n{previous or '없음'}\n\n[새 대화]\n{transcript}",
+                context=f"요약 분량: {max_tokens}토큰 이내"
+            ),
+            temperature=0.0,
+            max_tokens=max_tokens
+        )
+        record_usage("context_summary", response)
+        return response.choices[0].message.content or previous
+
+    @staticmethod
+    def _extractive_summary(previous: str, turns: List[Tuple[str, str]]) -> str:
+        """질문과 응답 첫 문장만 이어 붙이고 오래된 내용부터 잘라냄"""
+        lines = [previous] if previous else []
+        for user_message, answer in turns:
+            first_sentence = answer.strip().split("\n")[0]
+            lines.append(f"사용자: {truncate_tokens(user_message, 60, keep='start')} → "
+                         f"AI: {truncate_tokens(first_sentence, 60, keep='start')}")
+        return truncate_tokens("\n".join(lines), settings.context_summary_max_tokens)
+
+    def snapshot(self, session_id: str) -> Dict[str, Any]:
+        """세션 맥락 상태 (StateManager 메타데이터용)"""
+        with self._lock:
+            context = self._sessions.get(session_id)
+            if context is None:
+                return {"summary": "", "pending_turns": 0, "total_turns": 0, "summarized_turns": 0}
+            return {
+                "summary": context.summary,
+                "pending_turns": len(context.turns),
+                "total_turns": context.total_turns,
+                "summarized_turns": context.summarized_turns,
+            }
+
+    def reset(self, session_id: Optional[str] = None):
+        with self._lock:
+            if session_id is None:
+                self._sessions.clear()
+            else:
+                self._sessions.pop(session_id, None)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **self._counters,
+                "sessions": len(self._sessions),
+                "budget_tokens": settings.context_budget_tokens,
+                "tokenizer": "tiktoken" if _get_encoding() is not None else "estimate",
+            }
+
+
+context_compactor = ContextCompactor()
+register_metrics_provider("context_compactor", context_compactor.stats)
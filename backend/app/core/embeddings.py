@@ -0,0 +1,114 @@
+"""
+Shared Embeddings
+
+모든 Agent가 공유하는 임베딩 계산 진입점.
+
+- 모델은 model_registry에서 프로세스당 한 번만 로드
+- 텍스트 → 벡터는 프로세스 전역 LRU 캐시로 재사용 (같은 질의를 여러 Agent가 임베딩해도 1회 계산)
+- 캐시에 없는 텍스트만 모아 한 번의 배치로 인코딩
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .config import settings
+from .model_registry import model_registry
+from .tracing import register_metrics_provider
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingCache:
+    """텍스트 → 정규화 벡터 LRU 캐시 (스레드 안전)"""
+
+    def __init__(self, max_size: Optional[int] = None):
+        self._max_size = max_size
+        self._vectors: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def max_size(self) -> int:
+        # 설정은 최초 사용 시점에 읽음 (import 시 .env 로드 방지)
+        if self._max_size is None:
+            self._max_size = settings.embedding_cache_size
+        return self._max_size
+
+    def get_many(self, texts: Sequence[str]) -> List[Optional[np.ndarray]]:
+        with self._lock:
+            found = []
+            for text in texts:
+                vector = self._vectors.get(text)
+                if vector is None:
+                    self.misses += 1
+                else:
+                    self._vectors.move_to_end(text)
+                    self.hits += 1
+                found.append(vector)
+            return found
+
+    def put_many(self, texts: Sequence[str], vectors: np.ndarray):
+        with self._lock:
+            for text, vector in zip(texts, vectors):
+                self._vectors[text] = vector
+                self._vectors.move_to_end(text)
+            while len(self._vectors) > self.max_size:
+                self._vectors.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._vectors.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._vectors),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else None,
+        }
+
+
+embedding_cache = EmbeddingCache()
+register_metrics_provider("embedding_cache", embedding_cache.stats)
+
+
+def is_available() -> bool:
+    """임베딩 모델 사용 가능 여부"""
+    return model_registry.get_embedding_model() is not None
+
+
+def model_name() -> str:
+    """현재 설정의 임베딩 모델 식별자 (임베딩 캐시 파일 무효화 키)"""
+    return settings.embedding_model_id if settings.use_huggingface_models else settings.embedding_model_path
+
+
+def encode(texts: Sequence[str], use_cache: bool = True) -> Optional[np.ndarray]:
+    """
+    텍스트 목록 임베딩 (정규화된 float32 행렬, 모델이 없으면 None)
+
+    Args:
+        use_cache: 질의처럼 반복되는 짧은 텍스트는 True, 일회성 대량 색인은 False
+    """
+    model = model_registry.get_embedding_model()
+    if model is None:
+        return None
+    texts = list(texts)
+    if not texts:
+        return np.zeros((0, 0), dtype=np.float32)
+
+    cached = embedding_cache.get_many(texts) if use_cache else [None] * len(texts)
+    missing = list(dict.fromkeys(text for text, vector in zip(texts, cached) if vector is None))
+    if missing:
+        vectors = np.asarray(model.encode(missing, normalize_embeddings=True), dtype=np.float32)
+        computed = dict(zip(missing, vectors))
+        if use_cache:
+            embedding_cache.put_many(missing, vectors)
+        cached = [vector if vector is not None else computed[text] for text, vector in zip(texts, cached)]
+    return np.vstack(cached)
@@ -0,0 +1,201 @@
+"""
+LLM Response Cache
+
+같은 요청(모델, 프롬프트, temperature, 템플릿/카테고리)에 대한 LLM 응답을 SQLite에 저장해 재사용합니다.
+
+- 키: 요청 파라미터 전체를 정규화한 JSON의 SHA-256 (내용 주소 방식)
+- 저장소: sqlite_db_path/llm_cache.db, 최근 사용 시각 기준 LRU로 llm_cache_max_entries개 유지
+- temperature > 0 요청은 llm_cache_skip_sampled 설정으로 캐시 제외 가능
+  기본값은 캐시 사용(False): 현재 호출 지점이 모두 temperature > 0(규정 검토 0.2~0.3, 문서/양식 작성 0.5~0.7)이라
+  기본 제외로 두면 캐시가 사실상 꺼집니다. 대신 같은 입력의 문서/양식 작성 요청은 같은 초안을 다시 받으므로,
+  요청마다 새 초안이 필요하면 True로 설정합니다.
+- 작업 유형별 적중률과 절약한 토큰 수는 /metrics의 llm_cache 항목으로 노출
+"""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from .circuit_breaker import llm_breaker
+from .config import settings
+from .prompt_cache import record_usage
+from .tracing import register_metrics_provider, span
+
+logger = logging.getLogger(__name__)
+
+
+def cache_key(request: Dict[str, Any], scope: Optional[str] = None) -> str:
+    """요청 파라미터 + 범위(템플릿/카테고리) → 캐시 키"""
+    payload = json.dumps({"request": request, "scope": scope}, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    """SQLite 기반 LLM 응답 캐시 (LRU 축출, 작업 유형별 통계)"""
+
+    def __init__(self, db_path: Path, max_entries: int):
+        self.db_path = Path(db_path)
+        self.max_entries = max_entries
+        self._counters: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS llm_cache (
+                    key TEXT PRIMARY KEY,
+                    task_type TEXT,
+                    model TEXT,
+                    content TEXT,
+                    prompt_tokens INTEGER DEFAULT 0,
+                    completion_tokens INTEGER DEFAULT 0,
+                    created_at REAL,
+                    last_used_at REAL,
+                    hits INTEGER DEFAULT 0
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_last_used ON llm_cache(last_used_at)")
+
+    def _connect(self) -> sqlite3.Connection:
+        """여러 워커 프로세스가 같은 파일을 공유하므로 잠금 대기 허용"""
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def _count(self, task_type: str, name: str, amount: int = 1):
+        with self._lock:
+            counters = self._counters.setdefault(task_type, {
+                "hits": 0, "misses": 0, "bypassed": 0, "saved_prompt_tokens": 0, "saved_completion_tokens": 0
+            })
+            counters[name] += amount
+
+    def get(self, key: str, task_type: str) -> Optional[Dict[str, Any]]:
+        """캐시 조회 (적중 시 최근 사용 시각 갱신)"""
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT content, prompt_tokens, completion_tokens FROM llm_cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    conn.execute(
+                        "UPDATE llm_cache SET last_used_at = ?, hits = hits + 1 WHERE key = ?", (time.time(), key)
+                    )
+        except sqlite3.Error as e:
+            logger.warning(f"LLM 캐시 조회 실패: {str(e)}")
+            row = None
+
+        if row is None:
+            self._count(task_type, "misses")
+            return None
+        self._count(task_type, "hits")
+        self._count(task_type, "saved_prompt_tokens", row[1])
+        self._count(task_type, "saved_completion_tokens", row[2])
+        return {"content": row[0], "prompt_tokens": row[1], "completion_tokens": row[2]}
+
+    def put(self, key: str, task_type: str, model: str, content: str,
+            prompt_tokens: int = 0, completion_tokens: int = 0):
+        """응답 저장 후 용량 초과분을 오래 사용하지 않은 순으로 축출"""
+        now = time.time()
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO llm_cache "
+                    "(key, task_type, model, content, prompt_tokens, completion_tokens, created_at, last_used_at, hits) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, 0)",
+                    (key, task_type, model, content, prompt_tokens, completion_tokens, now, now)
+                )
+                overflow = conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0] - self.max_entries
+                if overflow > 0:
+                    conn.execute(
+                        "DELETE FROM llm_cache WHERE key IN "
+                        "(SELECT key FROM llm_cache ORDER BY last_used_at ASC LIMIT ?)", (overflow,)
+                    )
+        except sqlite3.Error as e:
+            logger.warning(f"LLM 캐시 저장 실패: {str(e)}")
+
+    def bypass(self, task_type: str):
+        """캐시 제외 요청 (temperature > 0 등) 집계"""
+        self._count(task_type, "bypassed")
+
+    def stats(self) -> Dict[str, Any]:
+        """작업 유형별 적중률·절약 토큰 + 저장 항목 수"""
+        try:
+            with self._connect() as conn:
+                entries = conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+        except sqlite3.Error:
+            entries = None
+
+        with self._lock:
+            tasks = {}
+            for task_type, counters in self._counters.items():
+                lookups = counters["hits"] + counters["misses"]
+                tasks[task_type] = {
+                    **counters,
+                    "hit_rate": round(counters["hits"] / lookups, 4) if lookups else None,
+                }
+        return {"entries": entries, "max_entries": self.max_entries, "tasks": tasks}
+
+
+_caches: Dict[str, LLMCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_llm_cache() -> LLMCache:
+    """설정 경로의 공유 LLM 응답 캐시"""
+    db_path = Path(settings.sqlite_db_path) / "llm_cache.db"
+    with _caches_lock:
+        if str(db_path) not in _caches:
+            _caches[str(db_path)] = LLMCache(db_path, settings.llm_cache_max_entries)
+        return _caches[str(db_path)]
+
+
+def llm_cache_stats() -> Dict[str, Any]:
+    """/metrics용 통계 (아직 사용되지 않은 캐시는 생성하지 않음)"""
+    cache = _caches.get(str(Path(settings.sqlite_db_path) / "llm_cache.db"))
+    if cache is None:
+        return {"entries": 0, "max_entries": settings.llm_cache_max_entries, "tasks": {}}
+    return cache.stats()
+
+
+register_metrics_provider("llm_cache", llm_cache_stats)
+
+
+def cached_completion(client: Any, task_type: str, scope: Optional[str] = None, **request) -> Tuple[str, bool]:
+    """
+    chat.completions.create 호출 (캐시 적중 시 LLM 호출 생략)
+
+    Args:
+        task_type: 통계 구분용 작업 유형 (compliance_check 등)
+        scope: 키에 포함할 템플릿/카테고리
+
+    Returns:
+        (응답 텍스트, 캐시 적중 여부)
+    """
+    cache = get_llm_cache() if settings.llm_cache_enabled else None
+    if cache is not None and settings.llm_cache_skip_sampled and request.get("temperature", 1.0) > 0:
+        cache.bypass(task_type)
+        cache = None
+
+    key = cache_key(request, scope)
+    if cache is not None:
+        with span("llm.cache"):
+            cached = cache.get(key, task_type)
+        if cached is not None:
+            logger.info(f"♻️ LLM 캐시 적중 ({task_type})")
+            return cached["content"], True
+
+    # 회로 차단 중이면 CircuitOpen (호출 측 폴백으로 즉시 전환)
+    response = llm_breaker.call(client.chat.completions.create, **request)
+    record_usage(task_type, response)
+    content = response.choices[0].message.content
+
+    if cache is not None and content:
+        usage = getattr(response, "usage", None)
+        cache.put(
+            key, task_type, request.get("model", ""), content,
+            getattr(usage, "prompt_tokens", 0) or 0, getattr(usage, "completion_tokens", 0) or 0
+        )
+    return content, False
@@ -0,0 +1,104 @@
+"""
+Model Registry
+
+임베딩/리랭커 모델을 프로세스 단위로 한 번만 로드하여 모든 Agent가 공유합니다.
+"""
+
+import logging
+import threading
+from typing import Any, Callable, Dict, Optional
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class ModelRegistry:
+    """임베딩/리랭커 모델 싱글톤 레지스트리 (스레드 안전)"""
+
+    def __init__(self):
+        self._models: Dict[str, Any] = {}
+        self._errors: Dict[str, str] = {}
+        self._locks = {
+            "embedding": threading.Lock(),
+            "reranker": threading.Lock()
+        }
+
+    def get_embedding_model(self) -> Optional[Any]:
+        """임베딩 모델 조회 (최초 호출 시 로드)"""
+        return self._get_or_load("embedding", self._load_embedding_model)
+
+    def get_reranker_model(self) -> Optional[Any]:
+        """리랭커 모델 조회 (최초 호출 시 로드)"""
+        return self._get_or_load("reranker", self._load_reranker_model)
+
+    def _get_or_load(self, kind: str, loader: Callable[[], Optional[Any]]) -> Optional[Any]:
+        """Double-checked locking으로 모델을 한 번만 로드"""
+        if kind in self._models:
+            return self._models[kind]
+
+        with self._locks[kind]:
+            if kind not in self._models:
+                try:
+                    self._models[kind] = loader()
+                except Exception as e:
+                    logger.error(f"{kind} 모델 로드 실패: {str(e)}")
+                    self._errors[kind] = str(e)
+                    self._models[kind] = None
+
+        return self._models[kind]
+
+    def _load_embedding_model(self) -> Optional[Any]:
+        """임베딩 모델 로드"""
+        try:
+            from sentence_transformers import SentenceTransformer
+        except ImportError:
+            logger.warning("sentence-transformers가 설치되지 않아 임베딩 모델을 로드하지 않습니다.")
+            self._errors["embedding"] = "sentence_transformers_not_installed"
+            return None
+
+        model_name = settings.embedding_model_id if settings.use_huggingface_models else settings.embedding_model_path
+        logger.info(f"임베딩 모델 로드 중: {model_name}")
+        # safetensors 가중치는 mmap으로 읽혀 여러 워커가 같은 파일 페이지 캐시를 공유
+        model = SentenceTransformer(
+            model_name,
+            device="cpu",
+            token=settings.huggingface_token,
+            model_kwargs={"use_safetensors": True}
+        )
+        logger.info(f"임베딩 모델 로드 완료: {model_name}")
+        return model
+
+    def _load_reranker_model(self) -> Optional[Any]:
+        """리랭커 모델 로드"""
+        try:
+            from sentence_transformers import CrossEncoder
+        except ImportError:
+            logger.warning("sentence-transformers가 설치되지 않아 리랭커 모델을 로드하지 않습니다.")
+            self._errors["reranker"] = "sentence_transformers_not_installed"
+            return None
+
+        model_name = settings.reranker_model_id if settings.use_huggingface_models else settings.reranker_model_path
+        logger.info(f"리랭커 모델 로드 중: {model_name}")
+        model = CrossEncoder(model_name, device="cpu", model_kwargs={"use_safetensors": True})
+        logger.info(f"리랭커 모델 로드 완료: {model_name}")
+        return model
+
+    def is_loaded(self, kind: str) -> bool:
+        """모델 로드 여부"""
+        return self._models.get(kind) is not None
+
+    def get_status(self) -> Dict[str, Any]:
+        """모델 상태 정보"""
+        return {
+            kind: {
+                "loaded": self.is_loaded(kind),
+                "attempted": kind in self._models,
+                "error": self._errors.get(kind)
+            }
+            for kind in self._locks
+        }
+
+
+# 프로세스 전역 모델 레지스트리
+model_registry = ModelRegistry()
@@ -0,0 +1,134 @@
+"""
+Prompt Prefix Layout & Cache Accounting
+
+OpenAI 프롬프트 캐싱은 요청 앞부분(tools + 메시지)이 이전 요청과 동일한 구간에만 적용됩니다.
+모든 LLM 요청을 "고정 접두부 → 가변 내용" 순서로 조립하고, API가 돌려주는 캐시 토큰 수를 호출 지점별로 집계합니다.
+
+- layout_messages(): 고정 시스템 프롬프트 → 이전 대화 → 가변 지시(카테고리, 템플릿 값 등) + 사용자 요청
+- record_usage(): usage.prompt_tokens_details.cached_tokens 기준 캐시/비캐시 입력 토큰 집계
+- prompt_cache_report(): 호출 지점별 캐시 비율, 접두부 변형 수, 예상 절감 비용 (/prompt-cache, /metrics)
+"""
+
+import hashlib
+import json
+import logging
+import threading
+from typing import Any, Dict, List, Optional
+
+from .config import settings
+from .tracing import register_metrics_provider
+
+logger = logging.getLogger(__name__)
+
+# 호출 지점별로 추적할 최대 접두부 해시 수
+MAX_PREFIX_VARIANTS = 32
+
+
+def layout_messages(call_site: str, system: str, user: str, context: Optional[str] = None,
+                    history: Optional[List[Dict[str, str]]] = None,
+                    tools: Optional[List[Dict[str, Any]]] = None) -> List[Dict[str, str]]:
+    """
+    접두부 캐싱에 유리한 순서로 메시지 조립
+
+    Args:
+        call_site: 통계 구분용 호출 지점 이름
+        system: 호출 지점마다 고정된 시스템 프롬프트 (요청별 값을 넣지 않음)
+        user: 사용자 요청 본문
+        context: 요청별 가변 지시 (카테고리, 양식 항목, 참고 데이터 등) - 사용자 메시지 앞에 배치
+        history: 이전 대화 메시지 (고정 접두부 뒤, 가변 지시 앞)
+        tools: 함께 전송하는 함수 정의 (접두부 해시에만 사용)
+    """
+    prefix = json.dumps({"system": system, "tools": tools or []}, ensure_ascii=False, sort_keys=True)
+    prompt_cache_stats.track_prefix(call_site, hashlib.sha256(prefix.encode("utf-8")).hexdigest()[:16])
+
+    content = f"{context}\n\n{user}" if context else user
+    return [{"role": "system", "content": system}, *(history or []), {"role": "user", "content": content}]
+
+
+class PromptCacheStats:
+    """호출 지점별 입력 토큰 캐시 적중 집계"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._sites: Dict[str, Dict[str, Any]] = {}
+
+    def _site(self, call_site: str) -> Dict[str, Any]:
+        return self._sites.setdefault(call_site, {
+            "calls": 0, "prompt_tokens": 0, "cached_tokens": 0, "completion_tokens": 0, "prefixes": set()
+        })
+
+    def track_prefix(self, call_site: str, prefix_hash: str):
+        with self._lock:
+            prefixes = self._site(call_site)["prefixes"]
+            if len(prefixes) < MAX_PREFIX_VARIANTS:
+                prefixes.add(prefix_hash)
+
+    def record(self, call_site: str, prompt_tokens: int, cached_tokens: int, completion_tokens: int):
+        with self._lock:
+            site = self._site(call_site)
+            site["calls"] += 1
+            site["prompt_tokens"] += prompt_tokens
+            site["cached_tokens"] += cached_tokens
+            site["completion_tokens"] += completion_tokens
+
+    def report(self) -> Dict[str, Any]:
+        """호출 지점별 캐시 비율과 예상 절감 비용 (입력 단가는 설정값 기준)"""
+        price = settings.llm_input_price_per_million / 1_000_000
+        discount = settings.llm_cached_input_discount
+
+        def summarize(calls, prompt_tokens, cached_tokens, completion_tokens):
+            return {
+                "calls": calls,
+                "prompt_tokens": prompt_tokens,
+                "cached_tokens": cached_tokens,
+                "uncached_tokens": prompt_tokens - cached_tokens,
+                "completion_tokens": completion_tokens,
+                "cache_ratio": round(cached_tokens / prompt_tokens, 4) if prompt_tokens else None,
+                "input_cost_usd": round((prompt_tokens - cached_tokens * discount) * price, 6),
+                "estimated_saved_usd": round(cached_tokens * discount * price, 6),
+            }
+
+        with self._lock:
+            sites = {
+                name: {
+                    **summarize(site["calls"], site["prompt_tokens"], site["cached_tokens"], site["completion_tokens"]),
+                    # 1보다 크면 시스템 프롬프트/도구 정의에 요청별 값이 섞여 접두부 캐시가 갈라지고 있음
+                    "prefix_variants": len(site["prefixes"]),
+                }
+                for name, site in self._sites.items()
+            }
+            totals = summarize(*(
+                sum(site[key] for site in self._sites.values())
+                for key in ("calls", "prompt_tokens", "cached_tokens", "completion_tokens")
+            ))
+        return {
+            "call_sites": sites,
+            "total": totals,
+            "pricing": {"input_per_million_usd": settings.llm_input_price_per_million, "cached_discount": discount},
+        }
+
+
+prompt_cache_stats = PromptCacheStats()
+register_metrics_provider("prompt_cache", prompt_cache_stats.report)
+
+
+def record_usage(call_site: str, response: Any):
+    """chat.completions 응답의 usage에서 캐시/비캐시 입력 토큰 기록"""
+    usage = getattr(response, "usage", None)
+    if usage is None:
+        return
+    details = getattr(usage, "prompt_tokens_details", None)
+    prompt_cache_stats.record(
+        call_site,
+        getattr(usage, "prompt_tokens", 0) or 0,
+        getattr(details, "cached_tokens", 0) or 0,
+        getattr(usage, "completion_tokens", 0) or 0,
+    )
+
+
+def prompt_cache_report() -> Dict[str, Any]:
+    return prompt_cache_stats.report()
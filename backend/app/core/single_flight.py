@@ -0,0 +1,151 @@
+"""
+Single-Flight Request Coalescing
+
+같은 질문이 동시에 여러 번 들어오면(출근 직후 공지/규정 문의 등) 한 번만 계산하고 결과를 공유합니다.
+
+- SingleFlight.do(): 동일 키의 진행 중인 계산이 있으면 새로 실행하지 않고 그 결과를 함께 기다림
+- SingleFlight.stream(): 스트리밍 응답은 하나의 이벤트 스트림을 모든 구독자에게 처음부터 전달 (fan-out)
+- 공유 계산은 요청과 분리된 태스크로 실행되므로 먼저 온 요청의 연결이 끊겨도 나머지 요청은 계속 진행됨
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import threading
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from .tracing import register_metrics_provider
+
+logger = logging.getLogger(__name__)
+
+
+def request_key(message: str, agent: Optional[str] = None, args: Optional[Dict[str, Any]] = None) -> str:
+    """정규화한 (메시지, Agent, 인수) → 합류 키 (공백 차이와 대소문자는 무시)"""
+    normalized = " ".join(str(message).split()).lower()
+    payload = json.dumps([normalized, agent, args or {}], ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class _Broadcast:
+    """원본 스트림 하나를 여러 구독자에게 전달 (늦게 합류한 구독자도 처음 이벤트부터 수신)"""
+
+    def __init__(self):
+        self.events: List[Any] = []
+        self.done = False
+        self.error: Optional[BaseException] = None
+        self._changed = asyncio.Event()
+
+    def _notify(self):
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def pump(self, source: AsyncIterator[Any]):
+        try:
+            async for event in source:
+                self.events.append(event)
+                self._notify()
+        except BaseException as e:
+            self.error = e
+            if not isinstance(e, Exception):
+                raise
+        finally:
+            self.done = True
+            self._notify()
+
+    async def subscribe(self) -> AsyncIterator[Any]:
+        index = 0
+        while True:
+            while index < len(self.events):
+                yield self.events[index]
+                index += 1
+            if self.done:
+                if self.error is not None:
+                    raise self.error
+                return
+            changed = self._changed
+            await changed.wait()
+
+
+class SingleFlight:
+    """키별 진행 중 계산 합류 (같은 이벤트 루프 안에서 동작)"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: Dict[str, asyncio.Task] = {}
+        self._streams: Dict[str, Tuple[_Broadcast, asyncio.Task]] = {}
+        self._lock = threading.Lock()
+        self._counts = {"leaders": 0, "followers": 0, "stream_leaders": 0, "stream_followers": 0}
+
+    def _count(self, name: str):
+        with self._lock:
+            self._counts[name] += 1
+
+    @staticmethod
+    def _running(task: Optional[asyncio.Task]) -> bool:
+        """현재 이벤트 루프에서 진행 중인 태스크인지 (테스트 등에서 루프가 바뀌는 경우 대비)"""
+        return task is not None and not task.done() and task.get_loop() is asyncio.get_running_loop()
+
+    def _start(self, registry: Dict[str, Any], key: str, task: asyncio.Task, entry: Any):
+        registry[key] = entry
+
+        def finished(done: asyncio.Task):
+            if registry.get(key) is entry:
+                del registry[key]
+            # 모든 대기자가 취소된 경우에도 예외가 회수되지 않았다는 경고가 남지 않도록 확인
+            if not done.cancelled():
+                done.exception()
+
+        task.add_done_callback(finished)
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """
+        진행 중인 동일 계산이 있으면 합류, 없으면 시작
+
+        Returns:
+            (결과, 다른 요청의 계산을 공유했는지 여부) - 결과 객체는 모든 호출자가 공유하므로 수정 전 복사 필요
+        """
+        task = self._calls.get(key)
+        shared = self._running(task)
+        if shared:
+            self._count("followers")
+        else:
+            task = asyncio.ensure_future(fn())
+            self._start(self._calls, key, task, task)
+            self._count("leaders")
+        return await asyncio.shield(task), shared
+
+    def stream(self, key: str, factory: Callable[[], AsyncIterator[Any]]) -> Tuple[AsyncIterator[Any], bool]:
+        """
+        진행 중인 동일 스트림이 있으면 구독, 없으면 시작
+
+        Returns:
+            (이벤트 이터레이터, 다른 요청의 스트림을 공유했는지 여부)
+        """
+        entry = self._streams.get(key)
+        shared = entry is not None and self._running(entry[1])
+        if shared:
+            self._count("stream_followers")
+        else:
+            broadcast = _Broadcast()
+            entry = (broadcast, asyncio.ensure_future(broadcast.pump(factory())))
+            self._start(self._streams, key, entry[1], entry)
+            self._count("stream_leaders")
+        return entry[0].subscribe(), shared
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counts = dict(self._counts)
+        computed = counts["leaders"] + counts["stream_leaders"]
+        coalesced = counts["followers"] + counts["stream_followers"]
+        return {
+            **counts,
+            "in_flight": len(self._calls) + len(self._streams),
+            "coalesced_rate": round(coalesced / (computed + coalesced), 4) if computed + coalesced else None,
+        }
+
+
+# 라우팅 전체(라우팅 + Agent 실행 + 합성)와 Agent 실행 단위 합류 그룹
+route_flight = SingleFlight("route")
+agent_flight = SingleFlight("agent")
+register_metrics_provider("single_flight", lambda: {"route": route_flight.stats(), "agent": agent_flight.stats()})
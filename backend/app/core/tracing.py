@@ -0,0 +1,189 @@
+"""
+Request Tracing
+
+요청 단위 구간(span) 타이밍 수집 및 단계별 지연시간 히스토그램을 제공합니다.
+
+- TimingMiddleware: HTTP 요청마다 RequestTrace를 컨텍스트 변수에 설정
+- span("stage"): 현재 요청의 구간 시간을 기록 (요청 밖에서도 히스토그램에는 반영)
+- metrics.snapshot(): 단계별 p50/p95/p99 (/metrics 엔드포인트에서 사용)
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# 타이밍 정보를 응답 metadata에 포함시키는 디버그 헤더
+DEBUG_TIMING_HEADER = "x-debug-timing"
+
+
+class RequestTrace:
+    """요청 하나의 구간 기록"""
+
+    def __init__(self, path: str = "", debug: bool = False):
+        self.path = path
+        self.debug = debug
+        self.started_at = time.perf_counter()
+        self.spans: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def add_span(self, name: str, duration_ms: float):
+        """구간 기록 추가 (Agent 생성 등 스레드에서도 호출됨)"""
+        with self._lock:
+            self.spans.append({"stage": name, "ms": round(duration_ms, 2)})
+
+    def breakdown(self) -> Dict[str, Any]:
+        """응답 metadata용 요약 (같은 단계는 합산)"""
+        with self._lock:
+            stages: Dict[str, float] = {}
+            for item in self.spans:
+                stages[item["stage"]] = round(stages.get(item["stage"], 0.0) + item["ms"], 2)
+        return {
+            "total_ms": round((time.perf_counter() - self.started_at) * 1000, 2),
+            "stages": stages
+        }
+
+
+class StageMetrics:
+    """단계별 지연시간 히스토그램 (최근 N개 샘플 기준 백분위수)"""
+
+    def __init__(self, max_samples: int = 2048):
+        self.max_samples = max_samples
+        self._samples: Dict[str, Deque[float]] = {}
+        self._counts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, stage: str, duration_ms: float):
+        """샘플 기록"""
+        with self._lock:
+            if stage not in self._samples:
+                self._samples[stage] = deque(maxlen=self.max_samples)
+                self._counts[stage] = 0
+            self._samples[stage].append(duration_ms)
+            self._counts[stage] += 1
+
+    @staticmethod
+    def _percentile(sorted_samples: List[float], q: float) -> float:
+        index = min(len(sorted_samples) - 1, max(0, int(round(q * (len(sorted_samples) - 1)))))
+        return round(sorted_samples[index], 2)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """단계별 통계 조회"""
+        with self._lock:
+            samples = {stage: sorted(values) for stage, values in self._samples.items()}
+            counts = dict(self._counts)
+
+        return {
+            stage: {
+                "count": counts[stage],
+                "p50_ms": self._percentile(values, 0.50),
+                "p95_ms": self._percentile(values, 0.95),
+                "p99_ms": self._percentile(values, 0.99),
+                "max_ms": round(values[-1], 2)
+            }
+            for stage, values in sorted(samples.items())
+            if values
+        }
+
+    def reset(self):
+        """통계 초기화"""
+        with self._lock:
+            self._samples.clear()
+            self._counts.clear()
+
+
+_current_trace: ContextVar[Optional[RequestTrace]] = ContextVar("narutalk_request_trace", default=None)
+
+# 프로세스 전역 단계별 지표
+metrics = StageMetrics()
+
+# /metrics에 추가로 노출할 지표 제공자 (캐시 적중률 등)
+_metrics_providers: Dict[str, Callable[[], Dict[str, Any]]] = {}
+
+
+def get_current_trace() -> Optional[RequestTrace]:
+    """현재 요청의 트레이스 조회"""
+    return _current_trace.get()
+
+
+def start_trace(path: str = "", debug: bool = False):
+    """새 트레이스 시작 (반환된 토큰으로 end_trace 호출)"""
+    return _current_trace.set(RequestTrace(path, debug))
+
+
+def end_trace(token):
+    """트레이스 종료"""
+    _current_trace.reset(token)
+
+
+def record(stage: str, duration_ms: float):
+    """측정된 구간 시간 기록"""
+    metrics.observe(stage, duration_ms)
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.add_span(stage, duration_ms)
+
+
+@contextmanager
+def span(stage: str):
+    """구간 시간 측정 (동기/비동기 코드 모두에서 with 문으로 사용)"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(stage, (time.perf_counter() - started) * 1000)
+
+
+def timing_metadata() -> Optional[Dict[str, Any]]:
+    """디버그 헤더가 설정된 요청이면 타이밍 요약 반환"""
+    trace = _current_trace.get()
+    if trace is not None and trace.debug:
+        return trace.breakdown()
+    return None
+
+
+def register_metrics_provider(name: str, provider: Callable[[], Dict[str, Any]]):
+    """/metrics에 포함할 추가 지표 제공자 등록"""
+    _metrics_providers[name] = provider
+
+
+def collect_metrics() -> Dict[str, Any]:
+    """전체 지표 수집"""
+    result: Dict[str, Any] = {"stages": metrics.snapshot()}
+    for name, provider in list(_metrics_providers.items()):
+        try:
+            result[name] = provider()
+        except Exception as e:
+            logger.warning(f"지표 수집 실패 {name}: {str(e)}")
+            result[name] = {"error": str(e)}
+    return result
+
+
+class TimingMiddleware:
+    """HTTP 요청별 트레이스 설정 및 전체 요청 시간 기록 (ASGI 미들웨어, 스트리밍 응답 포함)"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers") or [])
+        debug = headers.get(DEBUG_TIMING_HEADER.encode(), b"").lower() in (b"1", b"true", b"yes")
+        token = start_trace(scope.get("path", ""), debug)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            # 라우트 템플릿 기준으로 집계 (세션 ID 등 경로 파라미터로 지표가 늘어나지 않도록)
+            route = scope.get("route")
+            label = getattr(route, "path", None) or "unmatched"
+            metrics.observe(f"http {scope.get('method', '')} {label}", (time.perf_counter() - started) * 1000)
+            end_trace(token)
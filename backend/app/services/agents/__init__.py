@@ -8,11 +8,21 @@ Agents Package
 - client_agent: 거래처분석 Agent
 """
 
-# 새로운 폴더 구조의 Agent들 import
-from .db_agent import DBAgent
-from .docs_agent import DocsAgent
-from .employee_agent import EmployeeAgent
-from .client_agent import ClientAgent
+import importlib
+
+# Agent 클래스는 최초 접근 시점에 import (pandas/chromadb 등 무거운 의존성 지연 로드)
+_AGENT_MODULES = {
+    "DBAgent": ".db_agent",
+    "DocsAgent": ".docs_agent",
+    "EmployeeAgent": ".employee_agent",
+    "ClientAgent": ".client_agent"
+}
+
+def __getattr__(name):
+    if name in _AGENT_MODULES:
+        module = importlib.import_module(_AGENT_MODULES[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 __all__ = [
     "DBAgent",
@@ -0,0 +1,412 @@
+"""
+Client Analytics Engine
+
+거래처 월별 실적(거래처정보)과 담당자별 품목 실적(실적자료)을 열 단위 배열로 적재하고,
+거래처/월/품목 단위 집계(소형 OLAP 큐브)를 로드 시점에 미리 계산합니다.
+
+질의는 거래처별 연속 구간(offset)과 월 이진 탐색으로 처리하므로
+원본 행 수와 무관하게 거래처 하나의 데이터만 읽습니다.
+"""
+
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# 월 범위 (포함 구간, YYYYMM)
+MonthRange = Tuple[Optional[int], Optional[int]]
+
+# 실적자료에서 제외할 소계 행
+_SUBTOTAL_LABELS = {"합계", "총합계"}
+
+
+def _format_month(month: int) -> str:
+    return f"{str(month)[:4]}-{str(month)[4:]}"
+
+
+def read_client_monthly(file_path: Path) -> pd.DataFrame:
+    """거래처정보 Excel 로드 (거래처ID, 월, 월누적금액, 월방문횟수, 월사용금액, 총환자수)"""
+    df = pd.read_excel(file_path)
+    df["월"] = df["월"].astype(int)
+    return df
+
+
+def read_performance_workbook(file_path: Path) -> pd.DataFrame:
+    """
+    담당자별 실적자료 Excel을 품목-월 단위 긴 형식으로 변환
+
+    원본은 거래처ID가 첫 품목 행에만 있고 월이 열로 펼쳐진 형식입니다.
+    반환 컬럼: 담당자, 거래처ID, 품목, 월, 금액
+    """
+    wide = pd.read_excel(file_path)
+    wide["ID"] = wide["ID"].ffill()
+    wide = wide[~wide["ID"].isin(_SUBTOTAL_LABELS) & ~wide["품목"].isin(_SUBTOTAL_LABELS)]
+    month_columns = [column for column in wide.columns if str(column).isdigit()]
+
+    long = wide.melt(id_vars=["담당자", "ID", "품목"], value_vars=month_columns, var_name="월", value_name="금액")
+    long = long.dropna(subset=["금액"])
+    long = long.rename(columns={"ID": "거래처ID"})
+    long["월"] = long["월"].astype(int)
+    return long[["담당자", "거래처ID", "품목", "월", "금액"]]
+
+
+class ClientAnalyticsEngine:
+    """거래처 분석용 사전 집계 엔진 (읽기 전용, 스레드 안전)"""
+
+    ALL_CLIENTS = "__all__"
+
+    def __init__(self, monthly: Optional[pd.DataFrame] = None, transactions: Optional[pd.DataFrame] = None):
+        """
+        Args:
+            monthly: 거래처 월별 실적 (거래처ID, 월, 월누적금액, 월방문횟수, 월사용금액, 총환자수)
+            transactions: 품목 실적 (담당자, 거래처ID, 품목, 월, 금액)
+        """
+        started = time.perf_counter()
+        monthly = monthly if monthly is not None else pd.DataFrame(
+            columns=["거래처ID", "월", "월누적금액", "월방문횟수", "월사용금액", "총환자수"]
+        )
+        transactions = transactions if transactions is not None else pd.DataFrame(
+            columns=["담당자", "거래처ID", "품목", "월", "금액"]
+        )
+
+        self._build_product_cube(transactions)
+        self._build_client_month_cube(monthly, transactions)
+        self._build_profiles(transactions)
+        self._resolved: Dict[str, Optional[str]] = {}
+        self._forecasts: Dict[str, Any] = {}
+        self._forecast_lock = threading.Lock()
+
+        self.build_ms = round((time.perf_counter() - started) * 1000, 2)
+        logger.info(
+            f"거래처 분석 엔진 구축: 거래처 {len(self.clients)}곳, "
+            f"품목 실적 {len(transactions)}행 → 큐브 {len(self._pm_month)}셀 ({self.build_ms}ms)"
+        )
+
+    @classmethod
+    def from_files(cls, client_file: Path, performance_files: Iterable[Path]) -> "ClientAnalyticsEngine":
+        """Excel 원본에서 엔진 생성"""
+        monthly = read_client_monthly(client_file) if client_file.exists() else None
+        frames = [read_performance_workbook(path) for path in performance_files]
+        transactions = pd.concat(frames, ignore_index=True) if frames else None
+        return cls(monthly, transactions)
+
+    # ------------------------------------------------------------------
+    # 큐브 구축
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _offsets(keys: np.ndarray) -> Dict[str, Tuple[int, int]]:
+        """정렬된 키 배열에서 키별 연속 구간 [start, stop) 계산"""
+        if len(keys) == 0:
+            return {}
+        boundaries = np.flatnonzero(keys[1:] != keys[:-1]) + 1
+        starts = np.concatenate(([0], boundaries))
+        stops = np.concatenate((boundaries, [len(keys)]))
+        return {str(keys[start]): (int(start), int(stop)) for start, stop in zip(starts, stops)}
+
+    def _build_product_cube(self, transactions: pd.DataFrame):
+        """거래처 × 월 × 품목 집계 (거래처, 월 순으로 정렬된 열 배열)"""
+        cube = (
+            transactions.groupby(["거래처ID", "월", "품목"], sort=True, observed=True)["금액"]
+            .sum()
+            .reset_index()
+        )
+        self._pm_client = cube["거래처ID"].to_numpy(dtype=object)
+        self._pm_month = cube["월"].to_numpy(dtype=np.int64)
+        self._pm_product = cube["품목"].to_numpy(dtype=object)
+        self._pm_amount = cube["금액"].to_numpy(dtype=np.float64)
+        self._pm_offsets = self._offsets(self._pm_client)
+
+        # 거래처 × 월 품목 매출 합계
+        self._product_sales = transactions.groupby(["거래처ID", "월"], observed=True)["금액"].sum()
+
+    def _build_client_month_cube(self, monthly: pd.DataFrame, transactions: pd.DataFrame):
+        """거래처 × 월 집계 (매출액, 방문횟수, 사용금액, 환자수, 품목매출) 및 전체 합계"""
+        frame = (
+            monthly.groupby(["거래처ID", "월"], observed=True)
+            .agg(매출액=("월누적금액", "sum"), 방문횟수=("월방문횟수", "sum"),
+                 사용금액=("월사용금액", "sum"), 환자수=("총환자수", "max"))
+        )
+        # 거래처정보에 없는 거래처는 품목 실적 합계를 매출액으로 사용
+        frame = frame.join(self._product_sales.rename("품목매출"), how="outer")
+        frame["매출액"] = frame["매출액"].fillna(frame["품목매출"])
+        frame = frame.fillna(0).sort_index().reset_index()
+
+        self._cm_client = frame["거래처ID"].to_numpy(dtype=object)
+        self._cm_offsets = self._offsets(self._cm_client)
+        self._cm_columns = {
+            "월": frame["월"].to_numpy(dtype=np.int64),
+            "매출액": frame["매출액"].to_numpy(dtype=np.float64),
+            "방문횟수": frame["방문횟수"].to_numpy(dtype=np.int64),
+            "사용금액": frame["사용금액"].to_numpy(dtype=np.float64),
+            "환자수": frame["환자수"].to_numpy(dtype=np.int64),
+            "품목매출": frame["품목매출"].to_numpy(dtype=np.float64),
+        }
+
+        # 전체 거래처 월별 합계는 별도 구간으로 보관
+        totals = frame.groupby("월").agg(
+            매출액=("매출액", "sum"), 방문횟수=("방문횟수", "sum"), 사용금액=("사용금액", "sum"),
+            환자수=("환자수", "sum"), 품목매출=("품목매출", "sum")
+        )
+        self._total_columns = {"월": totals.index.to_numpy(dtype=np.int64)}
+        self._total_columns.update({name: totals[name].to_numpy() for name in totals.columns})
+
+        self.clients: List[str] = list(self._cm_offsets)
+        self.months: List[int] = sorted(int(month) for month in np.unique(self._cm_columns["월"]))
+        self.latest_month: Optional[int] = self.months[-1] if self.months else None
+
+    def _build_profiles(self, transactions: pd.DataFrame):
+        """거래처별 프로필 항목(담당자, 주력 품목 등) 사전 계산"""
+        self._managers = (
+            transactions.drop_duplicates("거래처ID").set_index("거래처ID")["담당자"].to_dict()
+            if not transactions.empty else {}
+        )
+        product_totals = (
+            transactions.groupby(["거래처ID", "품목"], observed=True)["금액"].sum()
+            .sort_values(ascending=False)
+        )
+        self._top_products: Dict[str, List[Tuple[str, float]]] = {}
+        self._product_share: Dict[str, float] = {}
+        for client, group in product_totals.groupby(level=0, sort=False):
+            values = group.to_numpy(dtype=np.float64)
+            total = values.sum()
+            products = group.index.get_level_values(1)
+            self._top_products[client] = [(str(p), float(v)) for p, v in zip(products[:5], values[:5])]
+            self._product_share[client] = float(values[0] / total) if total > 0 else 0.0
+
+        # 전체 거래처 요약 (거래처별 첫/마지막 구간 위치로 계산)
+        spans = np.array(list(self._cm_offsets.values()), dtype=np.int64).reshape(-1, 2)
+        month_values, amounts = self._cm_columns["월"], self._cm_columns["매출액"]
+        first_months, last_rows = month_values[spans[:, 0]], spans[:, 1] - 1
+        self._summary = {
+            "total_clients": len(self.clients),
+            "active_clients": int(self._is_active(month_values[last_rows], amounts[last_rows]).sum()),
+            "new_clients_this_month": int((first_months == self.latest_month).sum()),
+            "latest_month": self.latest_month,
+            "managers": sorted({str(m) for m in self._managers.values()}),
+        }
+
+    # ------------------------------------------------------------------
+    # 조회 헬퍼
+    # ------------------------------------------------------------------
+
+    def _is_active(self, last_months, last_amounts):
+        """활성 거래처 판정: 마지막 실적 월이 최신 월이고 그 달 매출이 있음 (배열 입력 시 원소별)"""
+        return (last_months == self.latest_month) & (last_amounts > 0)
+
+    def resolve_client(self, client_id: Optional[str]) -> Optional[str]:
+        """거래처 식별자 해석 (정확히 일치 → 부분 일치 순, 결과 캐시)"""
+        if not client_id:
+            return self.ALL_CLIENTS
+        if client_id in self._cm_offsets:
+            return client_id
+        if client_id not in self._resolved:
+            matches = [name for name in self.clients if client_id in name]
+            self._resolved[client_id] = matches[0] if matches else None
+        return self._resolved[client_id]
+
+    def _client_columns(self, client: str, months: MonthRange) -> Dict[str, np.ndarray]:
+        """거래처(또는 전체)의 월별 열 배열을 기간으로 잘라 반환"""
+        if client == self.ALL_CLIENTS:
+            columns = self._total_columns
+        else:
+            start, stop = self._cm_offsets[client]
+            columns = {name: values[start:stop] for name, values in self._cm_columns.items()}
+
+        lo, hi = self._month_bounds(columns["월"], months)
+        return {name: values[lo:hi] for name, values in columns.items()}
+
+    @staticmethod
+    def _month_bounds(month_values: np.ndarray, months: MonthRange) -> Tuple[int, int]:
+        first, last = months
+        lo = int(np.searchsorted(month_values, first, side="left")) if first else 0
+        hi = int(np.searchsorted(month_values, last, side="right")) if last else len(month_values)
+        return lo, hi
+
+    def _product_rows(self, client: str, months: MonthRange) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """거래처의 품목-월 셀 (월, 품목, 금액)"""
+        if client not in self._pm_offsets:
+            empty = np.array([], dtype=object)
+            return np.array([], dtype=np.int64), empty, np.array([], dtype=np.float64)
+        start, stop = self._pm_offsets[client]
+        month_values = self._pm_month[start:stop]
+        lo, hi = self._month_bounds(month_values, months)
+        return month_values[lo:hi], self._pm_product[start + lo:start + hi], self._pm_amount[start + lo:start + hi]
+
+    def monthly_matrix(self, column: str = "매출액") -> np.ndarray:
+        """거래처 × 월 밀집 행렬 (행: self.clients, 열: self.months, 데이터 없는 칸은 0)"""
+        matrix = np.zeros((len(self.clients), len(self.months)), dtype=np.float64)
+        if not self.clients:
+            return matrix
+        lengths = [stop - start for start, stop in self._cm_offsets.values()]
+        rows = np.repeat(np.arange(len(self.clients)), lengths)
+        cols = np.searchsorted(np.asarray(self.months), self._cm_columns["월"])
+        matrix[rows, cols] = self._cm_columns[column]
+        return matrix
+
+    def series_matrix(self, level: str) -> Tuple[List[Any], np.ndarray]:
+        """
+        단위별 계열 × 월 행렬 (열: self.months)
+
+        client: 거래처 매출, client_product: 거래처 × 품목, rep_product: 담당자 × 품목,
+        rep_client_product: 담당자 × 거래처 × 품목
+        """
+        if level == "client":
+            return list(self.clients), self.monthly_matrix("매출액")
+
+        cells = pd.DataFrame({"거래처ID": self._pm_client, "품목": self._pm_product,
+                              "월": self._pm_month, "금액": self._pm_amount})
+        if level == "client_product":
+            index = ["거래처ID", "품목"]
+        elif level in ("rep_product", "rep_client_product"):
+            cells["담당자"] = cells["거래처ID"].map(self._managers).fillna("")
+            index = ["담당자", "품목"] if level == "rep_product" else ["담당자", "거래처ID", "품목"]
+        else:
+            raise ValueError(f"지원하지 않는 계열 단위: {level}")
+
+        matrix = cells.pivot_table(index=index, columns="월", values="금액", aggfunc="sum", fill_value=0.0)
+        matrix = matrix.reindex(columns=self.months, fill_value=0.0)
+        return list(matrix.index), matrix.to_numpy(dtype=np.float64)
+
+    def forecasts(self, level: str = "client"):
+        """
+        단위별 전체 계열 일괄 예측 (최초 조회 시 적합 후 엔진 수명 동안 캐시)
+
+        Returns: ForecastResult (키: 거래처ID 또는 (거래처ID, 품목) / (담당자, 품목))
+        """
+        if level not in self._forecasts:
+            with self._forecast_lock:
+                if level not in self._forecasts:
+                    from ...analytics.forecasting import fit_forecasts
+
+                    keys, matrix = self.series_matrix(level)
+                    started = time.perf_counter()
+                    self._forecasts[level] = fit_forecasts(matrix, keys)
+                    logger.info(f"{level} 예측 적합: {len(keys)}개 계열 ({(time.perf_counter() - started) * 1000:.1f}ms)")
+        return self._forecasts[level]
+
+    def forecast(self, client_id: Optional[str], product: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """거래처(또는 거래처 × 품목)의 다음 월 매출 예측"""
+        client = self.resolve_client(client_id)
+        if client is None or client == self.ALL_CLIENTS:
+            return None
+        if product:
+            return self.forecasts("client_product").get((client, product))
+        return self.forecasts("client").get(client)
+
+    # ------------------------------------------------------------------
+    # 분석 질의
+    # ------------------------------------------------------------------
+
+    def profile(self, client_id: Optional[str]) -> Dict[str, Any]:
+        """거래처 프로필 (client_id가 없으면 전체 요약)"""
+        client = self.resolve_client(client_id)
+        if client is None:
+            return {}
+
+        if client == self.ALL_CLIENTS:
+            return dict(self._summary)
+
+        columns = self._client_columns(client, (None, None))
+        first_month, last_month = int(columns["월"][0]), int(columns["월"][-1])
+        return {
+            "client_id": client_id,
+            "name": client,
+            "manager": self._managers.get(client),
+            "registration_date": _format_month(first_month),
+            "last_transaction": _format_month(last_month),
+            "total_patients": int(columns["환자수"][-1]),
+            "total_sales": float(columns["매출액"].sum()),
+            "top_products": [{"product": p, "amount": v} for p, v in self._top_products.get(client, [])],
+            "status": "활성" if self._is_active(last_month, columns["매출액"][-1]) else "비활성",
+        }
+
+    def transactions(self, client_id: Optional[str], months: MonthRange = (None, None)) -> List[Dict[str, Any]]:
+        """품목-월 단위 거래 내역 (품목 실적이 없으면 월별 실적)"""
+        client = self.resolve_client(client_id)
+        if client is None:
+            return []
+
+        if client != self.ALL_CLIENTS:
+            month_values, products, amounts = self._product_rows(client, months)
+            if len(month_values):
+                return [
+                    {"date": f"{_format_month(int(m))}-01", "amount": float(a), "product": str(p), "client": client}
+                    for m, p, a in zip(month_values, products, amounts)
+                ]
+
+        columns = self._client_columns(client, months)
+        label = "전체" if client == self.ALL_CLIENTS else client
+        return [
+            {"date": f"{_format_month(int(m))}-01", "amount": float(a), "product": label, "quantity": int(v)}
+            for m, a, v in zip(columns["월"], columns["매출액"], columns["방문횟수"])
+        ]
+
+    def sales(self, client_id: Optional[str], months: MonthRange = (None, None)) -> Dict[str, Any]:
+        """월별 매출 및 합계"""
+        client = self.resolve_client(client_id)
+        if client is None:
+            return {}
+        columns = self._client_columns(client, months)
+        amounts = columns["매출액"]
+        return {
+            "client": None if client == self.ALL_CLIENTS else client,
+            "monthly_sales": {_format_month(int(m)): float(a) for m, a in zip(columns["월"], amounts)},
+            "total_sales": float(amounts.sum()),
+            "average_sales": float(amounts.mean()) if len(amounts) else 0.0,
+            "month_count": int(len(amounts)),
+        }
+
+    def trend(self, client_id: Optional[str], months: MonthRange = (None, None)) -> Dict[str, List]:
+        """지표별 월 시계열"""
+        client = self.resolve_client(client_id)
+        if client is None:
+            return {}
+        columns = self._client_columns(client, months)
+        return {
+            "매출액": [float(v) for v in columns["매출액"]],
+            "거래횟수": [int(v) for v in columns["방문횟수"]],
+            "사용금액": [float(v) for v in columns["사용금액"]],
+            "월별": [_format_month(int(m)) for m in columns["월"]],
+        }
+
+    def risk(self, client_id: Optional[str], months: MonthRange = (None, None)) -> Dict[str, Any]:
+        """위험도 지표 (최근 매출 변화, 변동성, 방문 추세, 품목 집중도)"""
+        client = self.resolve_client(client_id)
+        if client is None:
+            return {}
+        columns = self._client_columns(client, months)
+        amounts, visits = columns["매출액"], columns["방문횟수"]
+        if len(amounts) == 0:
+            return {}
+
+        mean = float(amounts.mean())
+        return {
+            "transaction_volume": {
+                "current_month": float(amounts[-1]),
+                "previous_month": float(amounts[-2]) if len(amounts) > 1 else float(amounts[-1]),
+            },
+            "visit_volume": {
+                "current_month": int(visits[-1]),
+                "previous_month": int(visits[-2]) if len(visits) > 1 else int(visits[-1]),
+            },
+            "sales_volatility": float(amounts.std() / mean) if mean > 0 else 0.0,
+            "product_concentration": self._product_share.get(client) if client != self.ALL_CLIENTS else None,
+            "months": [_format_month(int(columns["월"][0])), _format_month(int(columns["월"][-1]))],
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        """엔진 상태"""
+        return {
+            "clients": len(self.clients),
+            "months": len(self.months),
+            "client_month_cells": int(len(self._cm_client)),
+            "product_month_cells": int(len(self._pm_month)),
+            "build_ms": self.build_ms,
+        }
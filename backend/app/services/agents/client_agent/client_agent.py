@@ -4,14 +4,21 @@ Client Agent - 거래처 분석 Agent
 고객 데이터 분석, 거래 이력, 매출 분석, 비즈니스 인사이트를 제공합니다.
 """
 
+import asyncio
 import logging
-from typing import Dict, Any, List, Optional
+import time
+from typing import Dict, Any, List, Optional, Tuple
 import sqlite3
+import numpy as np
 import pandas as pd
 import json
 from pathlib import Path
 from datetime import datetime, timedelta
 from ....core.config import settings
+from ....core.tracing import record
+from ...analytics.anomaly_scan import extract_direction, format_anomalies
+from ...analytics.forecasting import ForecastResult, fit_forecasts
+from .analytics_engine import ClientAnalyticsEngine
 from .database_service import DatabaseService
 
 logger = logging.getLogger(__name__)
@@ -32,7 +39,9 @@ class ClientAgent:
             "sales": "매출 분석",
             "trend": "트렌드 분석",
             "risk": "위험도 분석",
-            "opportunity": "기회 분석"
+            "opportunity": "기회 분석",
+            "grade": "등급 분류",
+            "anomaly": "실적 급증/급감"
         }
         
         # 분석 지표 정의
@@ -66,6 +75,10 @@ class ClientAgent:
                 results = await self._analyze_risks(client_id, time_period)
             elif analysis_type == "opportunity":
                 results = await self._analyze_opportunities(client_id, time_period)
+            elif analysis_type == "grade":
+                results = await self._analyze_grades(client_id, args, original_message)
+            elif analysis_type == "anomaly":
+                results = await self._analyze_anomalies(client_id, args, original_message)
             else:
                 # 종합 분석
                 results = await self._comprehensive_analysis(client_id, time_period, metrics)
@@ -82,7 +95,8 @@ class ClientAgent:
                         "client_id": client_id,
                         "time_period": time_period,
                         "metrics": metrics,
-                        "data_points": len(results["data"])
+                        "data_points": len(results["data"]),
+                        **results.get("metadata", {})
                     }
                 }
             else:
@@ -104,15 +118,18 @@ class ClientAgent:
                 "metadata": {"error": str(e), "agent": "client_agent"}
             }
     
-    async def _analyze_client_profile(self, client_id: Optional[str], time_period: str) -> Dict[str, Any]:
+    async def _analyze_client_profile(self, client_id: Optional[str], time_period: str, engine: Optional[ClientAnalyticsEngine] = None) -> Dict[str, Any]:
         """고객 프로필 분석"""
         try:
+            if engine is None:
+                engine = await self._load_analytics_engine()
+            
             if client_id:
                 # 특정 고객 프로필
-                profile_data = await self._get_client_profile(client_id)
+                profile_data = await self._get_client_profile(client_id, engine)
             else:
                 # 전체 고객 프로필 요약
-                profile_data = await self._get_all_clients_summary()
+                profile_data = await self._get_all_clients_summary(engine)
             
             return {
                 "data": profile_data,
@@ -121,12 +138,17 @@ class ClientAgent:
             
         except Exception as e:
             logger.error(f"고객 프로필 분석 실패: {str(e)}")
-            return {"data": [], "sources": []}
+            return {"data": [], "sources": [], "error": str(e)}
     
-    async def _analyze_transactions(self, client_id: Optional[str], time_period: str, metrics: List[str]) -> Dict[str, Any]:
+    async def _analyze_transactions(self, client_id: Optional[str], time_period: str, metrics: List[str], engine: Optional[ClientAnalyticsEngine] = None) -> Dict[str, Any]:
         """거래 이력 분석"""
         try:
-            transaction_data = await self._get_transaction_data(client_id, time_period)
+            if engine is None:
+                engine = await self._load_analytics_engine()
+            
+            transaction_data = await self._get_transaction_data(client_id, time_period, engine)
+            if not transaction_data:
+                return {"data": [], "sources": []}
             
             # 지표별 분석
             analysis_results = {}
@@ -152,19 +174,33 @@ class ClientAgent:
             
         except Exception as e:
             logger.error(f"거래 이력 분석 실패: {str(e)}")
-            return {"data": [], "sources": []}
+            return {"data": [], "sources": [], "error": str(e)}
     
-    async def _analyze_sales(self, client_id: Optional[str], time_period: str, metrics: List[str]) -> Dict[str, Any]:
+    async def _analyze_sales(self, client_id: Optional[str], time_period: str, metrics: List[str], engine: Optional[ClientAnalyticsEngine] = None) -> Dict[str, Any]:
         """매출 분석"""
         try:
-            sales_data = await self._get_sales_data(client_id, time_period)
-            
-            # 매출 지표 계산
-            total_sales = sum(s.get("amount", 0) for s in sales_data)
-            avg_sales = total_sales / len(sales_data) if sales_data else 0
-            
-            # 월별 매출 분석
-            monthly_sales = self._group_sales_by_month(sales_data)
+            if engine is None:
+                engine = await self._load_analytics_engine()
+            
+            if engine is not None:
+                # 사전 집계된 거래처 × 월 매출 사용
+                sales = engine.sales(client_id, self._parse_time_period(time_period))
+                if not sales.get("month_count"):
+                    return {"data": [], "sources": []}
+                total_sales = sales["total_sales"]
+                avg_sales = sales["average_sales"]
+                monthly_sales = sales["monthly_sales"]
+                transaction_count = sales["month_count"]
+            else:
+                sales_data = await self._get_transaction_data(client_id, time_period)
+                
+                # 매출 지표 계산
+                total_sales = sum(s.get("amount", 0) for s in sales_data)
+                avg_sales = total_sales / len(sales_data) if sales_data else 0
+                
+                # 월별 매출 분석
+                monthly_sales = self._group_sales_by_month(sales_data)
+                transaction_count = len(sales_data)
             
             # 성장률 계산
             growth_rate = self._calculate_growth_rate(monthly_sales)
@@ -175,19 +211,24 @@ class ClientAgent:
                     "average_sales": avg_sales,
                     "monthly_sales": monthly_sales,
                     "growth_rate": growth_rate,
-                    "transaction_count": len(sales_data)
+                    "transaction_count": transaction_count
                 },
                 "sources": [{"type": "sales_database", "analysis": "sales", "client_id": client_id}]
             }
             
         except Exception as e:
             logger.error(f"매출 분석 실패: {str(e)}")
-            return {"data": [], "sources": []}
+            return {"data": [], "sources": [], "error": str(e)}
     
-    async def _analyze_trends(self, client_id: Optional[str], time_period: str, metrics: List[str]) -> Dict[str, Any]:
+    async def _analyze_trends(self, client_id: Optional[str], time_period: str, metrics: List[str], engine: Optional[ClientAnalyticsEngine] = None) -> Dict[str, Any]:
         """트렌드 분석"""
         try:
-            trend_data = await self._get_trend_data(client_id, time_period)
+            if engine is None:
+                engine = await self._load_analytics_engine()
+            
+            trend_data = await self._get_trend_data(client_id, time_period, engine)
+            if not trend_data.get("월별"):
+                return {"data": [], "sources": []}
             
             # 트렌드 패턴 분석
             trends = {
@@ -196,35 +237,54 @@ class ClientAgent:
                 "stable": []
             }
             
+            # 요청 지표 계열을 한 번에 적합하여 추세 방향 산출
+            fitted = self._fit_metric_series(trend_data, metrics)
             for metric in metrics:
-                trend_direction = self._analyze_metric_trend(trend_data, metric)
+                trend_direction = self._analyze_metric_trend(fitted, metric)
                 trends[trend_direction].append(metric)
             
+            # 거래처 매출 예측은 엔진에 캐시된 전체 거래처 일괄 적합 결과 사용
+            cached = engine.forecast(client_id) if engine is not None and client_id else None
+            
             return {
                 "data": {
                     "trends": trends,
                     "trend_data": trend_data,
-                    "forecast": self._generate_forecast(trend_data)
+                    "forecast": self._generate_forecast(fitted, cached)
                 },
                 "sources": [{"type": "trend_analysis", "analysis": "trends", "client_id": client_id}]
             }
             
         except Exception as e:
             logger.error(f"트렌드 분석 실패: {str(e)}")
-            return {"data": [], "sources": []}
+            return {"data": [], "sources": [], "error": str(e)}
     
-    async def _analyze_risks(self, client_id: Optional[str], time_period: str) -> Dict[str, Any]:
+    async def _analyze_risks(self, client_id: Optional[str], time_period: str, engine: Optional[ClientAnalyticsEngine] = None) -> Dict[str, Any]:
         """위험도 분석"""
         try:
-            risk_data = await self._assess_client_risks(client_id, time_period)
+            if engine is None:
+                engine = await self._load_analytics_engine()
+            
+            risk_data = await self._assess_client_risks(client_id, time_period, engine)
+            if not risk_data:
+                return {"data": [], "sources": []}
             
             # 위험 요소 평가
-            risk_factors = {
-                "payment_delay": self._check_payment_delays(risk_data),
-                "transaction_decline": self._check_transaction_decline(risk_data),
-                "credit_risk": self._assess_credit_risk(risk_data),
-                "concentration_risk": self._assess_concentration_risk(risk_data)
-            }
+            if "sales_volatility" in risk_data:
+                # 실적 데이터 기반 지표 (결제/신용 정보는 원본에 없음)
+                risk_factors = {
+                    "transaction_decline": self._check_transaction_decline(risk_data),
+                    "visit_decline": self._check_transaction_decline({"transaction_volume": risk_data["visit_volume"]}),
+                    "sales_volatility": self._assess_volatility_risk(risk_data),
+                    "concentration_risk": self._assess_concentration_risk(risk_data)
+                }
+            else:
+                risk_factors = {
+                    "payment_delay": self._check_payment_delays(risk_data),
+                    "transaction_decline": self._check_transaction_decline(risk_data),
+                    "credit_risk": self._assess_credit_risk(risk_data),
+                    "concentration_risk": self._assess_concentration_risk(risk_data)
+                }
             
             # 종합 위험도 산출
             overall_risk = self._calculate_overall_risk(risk_factors)
@@ -233,14 +293,15 @@ class ClientAgent:
                 "data": {
                     "risk_factors": risk_factors,
                     "overall_risk": overall_risk,
-                    "recommendations": self._generate_risk_recommendations(risk_factors)
+                    "recommendations": self._generate_risk_recommendations(risk_factors),
+                    "period": risk_data.get("months")
                 },
                 "sources": [{"type": "risk_assessment", "analysis": "risks", "client_id": client_id}]
             }
             
         except Exception as e:
             logger.error(f"위험도 분석 실패: {str(e)}")
-            return {"data": [], "sources": []}
+            return {"data": [], "sources": [], "error": str(e)}
     
     async def _analyze_opportunities(self, client_id: Optional[str], time_period: str) -> Dict[str, Any]:
         """기회 분석"""
@@ -269,45 +330,201 @@ class ClientAgent:
             
         except Exception as e:
             logger.error(f"기회 분석 실패: {str(e)}")
-            return {"data": [], "sources": []}
+            return {"data": [], "sources": [], "error": str(e)}
+    
+    async def _analyze_grades(self, client_id: Optional[str], args: Dict[str, Any], original_message: str) -> Dict[str, Any]:
+        """등급 분류 (사전 계산된 등급표 조회)"""
+        try:
+            grading = await asyncio.to_thread(self.database_service.get_grading_engine)
+            if grading is None:
+                return {"data": [], "sources": []}
+            
+            grade = args.get("grade") or self._extract_grade(original_message, grading.cutoffs)
+            change = args.get("grade_change") or self._extract_grade_change(original_message)
+            
+            if client_id:
+                engine = await self._load_analytics_engine()
+                resolved = engine.resolve_client(client_id) if engine else client_id
+                grade_record = grading.client_grade(resolved) if resolved else None
+                data = {"mode": "client", "client": grade_record} if grade_record else []
+            elif change:
+                data = {"mode": "change", "direction": change, "clients": grading.grade_changes(change)}
+            elif grade:
+                data = {"mode": "grade", "grade": grade.upper(), "clients": grading.clients_by_grade(grade)}
+            else:
+                data = {"mode": "distribution"}
+            
+            if data:
+                data["as_of_month"] = grading.latest_month
+                data["distribution"] = grading.distribution()
+            
+            return {
+                "data": data,
+                "sources": [{"type": "client_grades", "analysis": "grade", "client_id": client_id}]
+            }
+            
+        except Exception as e:
+            logger.error(f"등급 분류 실패: {str(e)}")
+            return {"data": [], "sources": [], "error": str(e)}
+    
+    @staticmethod
+    def _extract_grade(message: str, cutoffs: Dict[str, float]) -> Optional[str]:
+        """메시지에서 'S등급' 형태의 등급 추출"""
+        upper = (message or "").upper()
+        for grade in cutoffs:
+            if f"{grade}등급" in upper or f"{grade} 등급" in upper:
+                return grade
+        return None
+    
+    @staticmethod
+    def _extract_grade_change(message: str) -> Optional[str]:
+        """메시지에서 등급 하락/상승 질의 추출"""
+        if any(keyword in (message or "") for keyword in ["하락", "떨어진", "강등"]):
+            return "down"
+        if any(keyword in (message or "") for keyword in ["상승", "오른", "승급"]):
+            return "up"
+        return None
+    
+    async def _analyze_anomalies(self, client_id: Optional[str], args: Dict[str, Any], original_message: str) -> Dict[str, Any]:
+        """실적 급증/급감 분석 (야간 스캔으로 사전 계산된 이상치 테이블 조회)"""
+        try:
+            store = await asyncio.to_thread(self.database_service.get_anomaly_store)
+            direction = args.get("direction") or extract_direction(original_message)
+            
+            engine = await self._load_analytics_engine() if client_id else None
+            resolved = engine.resolve_client(client_id) if engine else client_id
+            if client_id and not resolved:
+                return {"data": [], "sources": []}
+            
+            anomalies = await asyncio.to_thread(
+                store.query, args.get("month"), direction, args.get("rep"), resolved, args.get("product")
+            )
+            summary = await asyncio.to_thread(store.summary, args.get("month"))
+            if summary["month"] is None:
+                return {"data": [], "sources": []}
+            
+            return {
+                "data": {"direction": direction, "anomalies": anomalies, "summary": summary},
+                "sources": [{"type": "sales_anomalies", "analysis": "anomaly", "client_id": client_id}]
+            }
+            
+        except Exception as e:
+            logger.error(f"실적 급증/급감 분석 실패: {str(e)}")
+            return {"data": [], "sources": [], "error": str(e)}
     
     async def _comprehensive_analysis(self, client_id: Optional[str], time_period: str, metrics: List[str]) -> Dict[str, Any]:
-        """종합 분석"""
+        """종합 분석 - 독립적인 분석들을 동시에 실행하고 완료된 결과만 종합"""
         try:
-            # 각 분석 타입의 결과를 종합
-            profile_result = await self._analyze_client_profile(client_id, time_period)
-            sales_result = await self._analyze_sales(client_id, time_period, metrics)
-            risk_result = await self._analyze_risks(client_id, time_period)
-            opportunity_result = await self._analyze_opportunities(client_id, time_period)
-            
-            # 종합 인사이트 생성
-            comprehensive_insights = self._generate_comprehensive_insights({
-                "profile": profile_result["data"],
-                "sales": sales_result["data"],
-                "risks": risk_result["data"],
-                "opportunities": opportunity_result["data"]
-            })
+            # 분석 엔진은 한 번만 로드하여 모든 분석에서 공유
+            try:
+                engine = await asyncio.to_thread(self.database_service.get_analytics_engine)
+                engine_error = None
+            except Exception as e:
+                logger.error(f"거래처 분석 엔진 로드 실패: {str(e)}")
+                engine, engine_error = None, str(e)
+            
+            if engine_error:
+                # 엔진 로드 실패 시 엔진 기반 분석은 샘플 데이터로 대체하지 않고 실패로 보고
+                profile, sales, risks = (self._failed_branch(engine_error) for _ in range(3))
+            else:
+                profile = self._analyze_client_profile(client_id, time_period, engine)
+                sales = self._analyze_sales(client_id, time_period, metrics, engine)
+                risks = self._analyze_risks(client_id, time_period, engine)
+            branches = {
+                "profile": profile,
+                "sales": sales,
+                "risks": risks,
+                "opportunities": self._analyze_opportunities(client_id, time_period)
+            }
+            timeout = settings.client_analysis_branch_timeout
+            outcomes = await asyncio.gather(*(
+                self._run_analysis_branch(name, branch, timeout) for name, branch in branches.items()
+            ))
+            
+            data = {}
+            sources = [{"type": "comprehensive_analysis", "analysis": "all", "client_id": client_id}]
+            branch_timings = {}
+            failed_branches = []
+            for name, (result, elapsed_ms, status) in zip(branches, outcomes):
+                branch_timings[name] = {"ms": elapsed_ms, "status": status}
+                if status == "ok":
+                    data[name] = result["data"]
+                    sources += result["sources"]
+                elif status in ("timeout", "error"):
+                    # empty는 정상 완료(해당 데이터 없음)이므로 미완료로 보지 않음
+                    failed_branches.append(name)
+            
+            if not data:
+                return {"data": [], "sources": [], "metadata": {"branch_timings": branch_timings, "failed_branches": failed_branches}}
+            
+            # 종합 인사이트 생성 (완료된 분석만 사용)
+            data["insights"] = self._generate_comprehensive_insights(data)
             
             return {
-                "data": {
-                    "profile": profile_result["data"],
-                    "sales": sales_result["data"],
-                    "risks": risk_result["data"],
-                    "opportunities": opportunity_result["data"],
-                    "insights": comprehensive_insights
-                },
-                "sources": [
-                    {"type": "comprehensive_analysis", "analysis": "all", "client_id": client_id}
-                ] + profile_result["sources"] + sales_result["sources"] + risk_result["sources"] + opportunity_result["sources"]
+                "data": data,
+                "sources": sources,
+                "metadata": {
+                    "branch_timings": branch_timings,
+                    "failed_branches": failed_branches,
+                    "partial": bool(failed_branches)
+                }
             }
             
         except Exception as e:
             logger.error(f"종합 분석 실패: {str(e)}")
             return {"data": [], "sources": []}
     
-    async def _get_client_profile(self, client_id: str) -> Dict[str, Any]:
+    async def _run_analysis_branch(self, name: str, branch, timeout: float) -> Tuple[Optional[Dict[str, Any]], float, str]:
+        """종합 분석의 개별 분석 실행 (타임아웃/실패 시에도 다른 분석은 계속 진행)"""
+        started = time.perf_counter()
+        result = None
+        try:
+            result = await asyncio.wait_for(branch, timeout=timeout)
+            if result.get("error"):
+                # 분석 함수가 예외를 처리하고 error로 보고한 경우 (데이터 없음과 구분)
+                logger.error(f"종합 분석 {name} 실패: {result['error']}")
+                status = "error"
+            else:
+                status = "ok" if result.get("data") else "empty"
+        except asyncio.TimeoutError:
+            logger.warning(f"종합 분석 {name} 시간 초과 ({timeout}초)")
+            status = "timeout"
+        except Exception as e:
+            logger.error(f"종합 분석 {name} 실패: {str(e)}")
+            status = "error"
+        
+        elapsed_ms = round((time.perf_counter() - started) * 1000, 2)
+        record(f"client_agent.{name}", elapsed_ms)
+        return result, elapsed_ms, status
+    
+    @staticmethod
+    async def _failed_branch(error: str) -> Dict[str, Any]:
+        """실행하지 못한 종합 분석 항목의 결과"""
+        return {"data": [], "sources": [], "error": error}
+    
+    async def _load_analytics_engine(self) -> Optional[ClientAnalyticsEngine]:
+        """거래처 분석 엔진 로드 (최초 구축 시 파일 I/O와 집계는 스레드에서 실행)"""
+        try:
+            return await asyncio.to_thread(self.database_service.get_analytics_engine)
+        except Exception as e:
+            logger.warning(f"거래처 분석 엔진 로드 실패: {str(e)}")
+            return None
+    
+    @staticmethod
+    def _parse_time_period(time_period: Optional[str]) -> Tuple[Optional[int], Optional[int]]:
+        """'2024-01~2024-12' 형식의 기간을 (202401, 202412)로 변환"""
+        try:
+            start, end = (part.strip().replace("-", "")[:6] for part in time_period.split("~"))
+            return int(start), int(end)
+        except (AttributeError, ValueError):
+            return None, None
+    
+    async def _get_client_profile(self, client_id: str, engine: Optional[ClientAnalyticsEngine] = None) -> Dict[str, Any]:
         """특정 고객 프로필 조회"""
-        # 샘플 데이터 (실제로는 데이터베이스에서 조회)
+        if engine is not None:
+            return engine.profile(client_id)
+        
+        # 샘플 데이터 (원본 데이터가 없는 경우)
         return {
             "client_id": client_id,
             "name": f"고객_{client_id}",
@@ -318,8 +535,11 @@ class ClientAgent:
             "status": "활성"
         }
     
-    async def _get_all_clients_summary(self) -> Dict[str, Any]:
+    async def _get_all_clients_summary(self, engine: Optional[ClientAnalyticsEngine] = None) -> Dict[str, Any]:
         """전체 고객 요약"""
+        if engine is not None and engine.clients:
+            return engine.profile(None)
+        
         return {
             "total_clients": 150,
             "active_clients": 120,
@@ -332,8 +552,11 @@ class ClientAgent:
             }
         }
     
-    async def _get_transaction_data(self, client_id: Optional[str], time_period: str) -> List[Dict[str, Any]]:
-        """거래 데이터 조회"""
+    async def _get_transaction_data(self, client_id: Optional[str], time_period: str, engine: Optional[ClientAnalyticsEngine] = None) -> List[Dict[str, Any]]:
+        """거래 데이터 조회 (품목-월 단위 실적)"""
+        if engine is not None:
+            return engine.transactions(client_id, self._parse_time_period(time_period))
+        
         # 샘플 데이터
         return [
             {"date": "2024-07-01", "amount": 1500000, "product": "제품A", "quantity": 10},
@@ -341,20 +564,22 @@ class ClientAgent:
             {"date": "2024-07-10", "amount": 1800000, "product": "제품A", "quantity": 12}
         ]
     
-    async def _get_sales_data(self, client_id: Optional[str], time_period: str) -> List[Dict[str, Any]]:
-        """매출 데이터 조회"""
-        return await self._get_transaction_data(client_id, time_period)
-    
-    async def _get_trend_data(self, client_id: Optional[str], time_period: str) -> Dict[str, List]:
+    async def _get_trend_data(self, client_id: Optional[str], time_period: str, engine: Optional[ClientAnalyticsEngine] = None) -> Dict[str, List]:
         """트렌드 데이터 조회"""
+        if engine is not None:
+            return engine.trend(client_id, self._parse_time_period(time_period))
+        
         return {
             "매출액": [1500000, 2300000, 1800000, 2100000, 2500000],
             "거래횟수": [3, 5, 4, 6, 7],
             "월별": ["2024-03", "2024-04", "2024-05", "2024-06", "2024-07"]
         }
     
-    async def _assess_client_risks(self, client_id: Optional[str], time_period: str) -> Dict[str, Any]:
+    async def _assess_client_risks(self, client_id: Optional[str], time_period: str, engine: Optional[ClientAnalyticsEngine] = None) -> Dict[str, Any]:
         """고객 위험도 평가 데이터"""
+        if engine is not None:
+            return engine.risk(client_id, self._parse_time_period(time_period))
+        
         return {
             "payment_history": {"delays": 2, "total_payments": 20},
             "transaction_volume": {"current_month": 5, "previous_month": 7},
@@ -407,32 +632,33 @@ class ClientAgent:
             return ((current - previous) / previous * 100) if previous > 0 else 0.0
         return 0.0
     
-    def _analyze_metric_trend(self, trend_data: Dict, metric: str) -> str:
-        """지표 트렌드 방향 분석"""
-        if metric not in trend_data:
-            return "stable"
-        
-        values = trend_data[metric]
-        if len(values) < 3:
-            return "stable"
-        
-        # 간단한 트렌드 분석
-        recent_avg = sum(values[-3:]) / 3
-        earlier_avg = sum(values[:3]) / 3
-        
-        if recent_avg > earlier_avg * 1.1:
-            return "increasing"
-        elif recent_avg < earlier_avg * 0.9:
-            return "decreasing"
-        else:
+    def _fit_metric_series(self, trend_data: Dict, metrics: List[str]) -> Optional[ForecastResult]:
+        """지표별 월 시계열을 (지표 × 월) 행렬로 묶어 일괄 적합"""
+        names = [
+            metric for metric in dict.fromkeys(list(metrics) + ["매출액"])
+            if isinstance(trend_data.get(metric), list) and trend_data[metric]
+        ]
+        if not names:
+            return None
+        return fit_forecasts(np.array([trend_data[name] for name in names], dtype=float), names)
+    
+    def _analyze_metric_trend(self, fitted: Optional[ForecastResult], metric: str) -> str:
+        """지표 트렌드 방향 분석 (적합된 선형 추세 기준)"""
+        if fitted is None or metric not in fitted:
             return "stable"
+        return fitted.get(metric)["trend"]
     
-    def _generate_forecast(self, trend_data: Dict) -> Dict[str, Any]:
-        """예측 생성"""
+    def _generate_forecast(self, fitted: Optional[ForecastResult], cached: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """다음 달 매출 예측 (95% 예측 구간)"""
+        forecast = cached or (fitted.get("매출액") if fitted is not None and "매출액" in fitted else None)
+        if not forecast:
+            return {}
         return {
-            "next_month_sales": 2800000,
-            "confidence": 75,
-            "factors": ["계절성", "과거 패턴", "시장 트렌드"]
+            "next_month_sales": forecast["forecast"],
+            "lower": forecast["lower"],
+            "upper": forecast["upper"],
+            "model": forecast["model"],
+            "interval": 0.95
         }
     
     # 위험도 분석 헬퍼 메서드들
@@ -465,8 +691,21 @@ class ClientAgent:
         
         return {"credit_score": credit_score, "risk_level": risk_level}
     
+    def _assess_volatility_risk(self, risk_data: Dict) -> Dict[str, Any]:
+        """월 매출 변동성 평가 (변동계수)"""
+        volatility = risk_data.get("sales_volatility", 0.0)
+        risk_level = "높음" if volatility > 0.5 else "중간" if volatility > 0.2 else "낮음"
+        
+        return {"coefficient_of_variation": volatility, "risk_level": risk_level}
+    
     def _assess_concentration_risk(self, risk_data: Dict) -> Dict[str, Any]:
         """집중도 위험 평가"""
+        share = risk_data.get("product_concentration")
+        if share is not None:
+            # 매출 1위 품목 비중
+            risk_level = "높음" if share > 0.7 else "중간" if share > 0.5 else "낮음"
+            return {"top_product_share": share, "risk_level": risk_level}
+        
         # 업계 위험도 등을 고려한 집중도 위험
         industry_risk = risk_data.get("industry_risk", "중간")
         return {"industry_risk": industry_risk, "risk_level": industry_risk}
@@ -510,6 +749,12 @@ class ClientAgent:
                     recommendations.append("고객 관계 강화 및 니즈 파악 필요")
                 elif factor == "credit_risk":
                     recommendations.append("신용 조사 업데이트 및 보증 요구 검토")
+                elif factor == "visit_decline":
+                    recommendations.append("방문 일정 재조정 및 담당자 접점 확대 필요")
+                elif factor == "sales_volatility":
+                    recommendations.append("월별 주문 편차 원인 파악 및 정기 주문 유도 필요")
+                elif factor == "concentration_risk":
+                    recommendations.append("특정 품목 의존도 완화를 위한 품목 다변화 제안 필요")
         
         if not recommendations:
             recommendations.append("현재 위험 수준이 낮아 정기 모니터링만 필요")
@@ -610,18 +855,43 @@ class ClientAgent:
             if analysis_type == "profile":
                 if client_id:
                     response += f"• 고객명: {data.get('name', 'N/A')}\n"
-                    response += f"• 업종: {data.get('industry', 'N/A')}\n"
+                    if data.get('manager'):
+                        response += f"• 담당자: {data['manager']}\n"
+                    else:
+                        response += f"• 업종: {data.get('industry', 'N/A')}\n"
                     response += f"• 등록일: {data.get('registration_date', 'N/A')}\n"
                     response += f"• 마지막 거래: {data.get('last_transaction', 'N/A')}\n"
                     response += f"• 상태: {data.get('status', 'N/A')}\n"
+                    top_products = data.get('top_products', [])
+                    if top_products:
+                        response += f"• 주력 품목: {', '.join(item['product'] for item in top_products[:3])}\n"
                 else:
                     response += f"• 전체 고객 수: {data.get('total_clients', 0)}명\n"
                     response += f"• 활성 고객: {data.get('active_clients', 0)}명\n"
                     response += f"• 이번 달 신규: {data.get('new_clients_this_month', 0)}명\n"
             
+            elif analysis_type == "transaction":
+                summary = data.get('summary', {})
+                response += f"• 거래 건수: {summary.get('total_transactions', 0)}건\n"
+                response += f"• 거래 금액: {summary.get('total_amount', 0):,.0f}원\n"
+                date_range = summary.get('date_range', {})
+                if date_range:
+                    response += f"• 기간: {date_range.get('start', '')} ~ {date_range.get('end', '')}\n"
+            
+            elif analysis_type == "trend":
+                trends = data.get('trends', {})
+                labels = {"increasing": "증가", "decreasing": "감소", "stable": "유지"}
+                for direction, label in labels.items():
+                    if trends.get(direction):
+                        response += f"• {label}: {', '.join(trends[direction])}\n"
+                forecast = data.get('forecast', {})
+                if forecast:
+                    response += f"• 다음 달 예상 매출: {forecast['next_month_sales']:,.0f}원 "
+                    response += f"(95% 구간 {forecast['lower']:,.0f} ~ {forecast['upper']:,.0f}원)\n"
+            
             elif analysis_type == "sales":
-                response += f"• 총 매출: {data.get('total_sales', 0):,}원\n"
-                response += f"• 평균 매출: {data.get('average_sales', 0):,}원\n"
+                response += f"• 총 매출: {data.get('total_sales', 0):,.0f}원\n"
+                response += f"• 평균 매출: {data.get('average_sales', 0):,.0f}원\n"
                 response += f"• 거래 건수: {data.get('transaction_count', 0)}건\n"
                 response += f"• 성장률: {data.get('growth_rate', 0):.1f}%\n"
             
@@ -634,6 +904,34 @@ class ClientAgent:
                     for i, rec in enumerate(recommendations, 1):
                         response += f"{i}. {rec}\n"
             
+            elif analysis_type == "grade":
+                as_of = data.get('as_of_month')
+                if as_of:
+                    response += f"기준월: {str(as_of)[:4]}-{str(as_of)[4:]}\n"
+                mode = data.get('mode')
+                if mode == "client":
+                    client = data['client']
+                    response += f"• {client['client_id']}: {client['grade']}등급 (점수 {client['score']:.1f})\n"
+                    response += f"• 최근 {client['frequency']}개월 거래, 매출 {client['monetary']:,.0f}원, 성장률 {client['growth_rate'] * 100:.1f}%\n"
+                elif mode in ("grade", "change"):
+                    clients = data.get('clients', [])
+                    if mode == "grade":
+                        response += f"🏅 {data['grade']}등급 거래처 {len(clients)}곳\n"
+                    else:
+                        label = "📉 전월 대비 등급 하락" if data['direction'] == "down" else "📈 전월 대비 등급 상승"
+                        response += f"{label} 거래처 {len(clients)}곳\n"
+                    for client in clients[:20]:
+                        previous = f"{client['grade_previous']} → " if 'grade_previous' in client else ""
+                        response += f"• {client['client_id']}: {previous}{client['grade']} (점수 {client['score']:.1f})\n"
+                    if len(clients) > 20:
+                        response += f"... 외 {len(clients) - 20}곳\n"
+                distribution = data.get('distribution', {})
+                if distribution:
+                    response += "\n📊 등급 분포: " + ", ".join(f"{g} {n}곳" for g, n in distribution.items()) + "\n"
+            
+            elif analysis_type == "anomaly":
+                response += format_anomalies(data['anomalies'], data['summary'], data.get('direction'))
+            
             elif analysis_type == "opportunity":
                 prioritized = data.get('prioritized', [])
                 if prioritized:
@@ -654,6 +952,10 @@ class ClientAgent:
                     response += "💡 주요 인사이트:\n"
                     for insight in data['insights']:
                         response += f"• {insight}\n"
+                
+                failed_branches = results.get("metadata", {}).get("failed_branches")
+                if failed_branches:
+                    response += f"\n※ 일부 분석({', '.join(failed_branches)})은 완료되지 않아 제외되었습니다.\n"
             
             return response
             
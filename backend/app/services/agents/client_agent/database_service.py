@@ -5,6 +5,7 @@ Client Agent Database Service
 """
 
 import logging
+import threading
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 from ....core.config import settings
@@ -21,10 +22,114 @@ logger = logging.getLogger(__name__)
 class DatabaseService:
     """거래처 데이터베이스 서비스"""
     
+    # 거래처 월별 실적 원본 (거래처ID, 월, 월누적금액, 월방문횟수, 월사용금액, 총환자수)
+    CLIENT_DATASET_FILE = "좋은제약_거래처정보.xlsx"
+    # 담당자별 거래처 품목 실적
+    PERFORMANCE_FILE_PATTERN = "좋은제약_실적자료_*.xlsx"
+    
     def __init__(self):
         self.excel_path = Path(settings.project_root) / "database" / "raw_data" / "내부자료"
+        self._dataset = None
+        self._dataset_mtime = None
+        self._dataset_lock = threading.Lock()
+        self._engine = None
+        self._engine_key = None
+        self._engine_lock = threading.Lock()
+        self._grading_engine = None
+        self._graded_engine = None
         logger.info("Client DatabaseService 초기화 완료")
     
+    def is_available(self) -> bool:
+        """거래처 데이터 사용 가능 여부"""
+        return HAS_PANDAS and (self.excel_path / self.CLIENT_DATASET_FILE).exists()
+    
+    def load_client_dataset(self) -> Optional["pd.DataFrame"]:
+        """
+        거래처 월별 데이터셋 로드 (파일 수정 시각 기준 캐시)
+        
+        분석 유형별로 각자 Excel을 읽지 않도록 한 번 읽은 DataFrame을 공유합니다.
+        반환된 DataFrame은 읽기 전용으로 사용해야 합니다.
+        """
+        if not HAS_PANDAS:
+            return None
+        
+        file_path = self.excel_path / self.CLIENT_DATASET_FILE
+        try:
+            mtime = file_path.stat().st_mtime
+        except FileNotFoundError:
+            logger.warning(f"거래처 데이터 파일이 없습니다: {file_path}")
+            return None
+        
+        with self._dataset_lock:
+            if self._dataset is None or self._dataset_mtime != mtime:
+                df = pd.read_excel(file_path)
+                df["월"] = df["월"].astype(int)
+                self._dataset = df
+                self._dataset_mtime = mtime
+                logger.info(f"거래처 데이터셋 로드: {len(df)}행, 거래처 {df['거래처ID'].nunique()}곳")
+            return self._dataset
+    
+    def get_analytics_engine(self):
+        """
+        거래처 분석 엔진 조회 (원본 파일 수정 시각 기준 캐시)
+        
+        거래처정보와 실적자료를 한 번 적재해 집계 큐브를 만들고, 파일이 바뀌면 다시 구축합니다.
+        """
+        if not HAS_PANDAS:
+            return None
+        
+        from .analytics_engine import ClientAnalyticsEngine, read_performance_workbook
+        
+        performance_files = sorted(self.excel_path.glob(self.PERFORMANCE_FILE_PATTERN))
+        source_files = [self.excel_path / self.CLIENT_DATASET_FILE] + performance_files
+        key = tuple((path.name, path.stat().st_mtime) for path in source_files if path.exists())
+        if not key:
+            logger.warning(f"거래처 분석 원본 파일이 없습니다: {self.excel_path}")
+            return None
+        
+        with self._engine_lock:
+            if self._engine is None or self._engine_key != key:
+                frames = []
+                for path in performance_files:
+                    try:
+                        frames.append(read_performance_workbook(path))
+                    except Exception as e:
+                        logger.warning(f"실적자료 {path.name} 읽기 실패: {str(e)}")
+                transactions = pd.concat(frames, ignore_index=True) if frames else None
+                self._engine = ClientAnalyticsEngine(self.load_client_dataset(), transactions)
+                self._engine_key = key
+            return self._engine
+    
+    def get_grading_engine(self):
+        """
+        거래처 등급 엔진 조회 (분석 엔진이 다시 구축되면 등급표 증분 갱신)
+        """
+        engine = self.get_analytics_engine()
+        if engine is None:
+            return None
+        
+        from .grading_engine import ClientGradingEngine
+        
+        with self._engine_lock:
+            if self._grading_engine is None:
+                self._grading_engine = ClientGradingEngine(
+                    Path(settings.sqlite_db_path) / "client_grades.db",
+                    cutoffs=settings.client_grade_cutoffs,
+                    window=settings.client_grade_window_months
+                )
+            if self._graded_engine is not engine:
+                self._grading_engine.refresh(engine)
+                self._graded_engine = engine
+            return self._grading_engine
+    
+    def get_anomaly_store(self):
+        """
+        실적 이상치 저장소 조회 (읽기 전용, 갱신은 예약 스캔 작업 run_anomaly_scan이 담당)
+        """
+        from ...analytics.anomaly_scan import get_anomaly_store
+        
+        return get_anomaly_store()
+    
     def get_client_data(self) -> List[Dict[str, Any]]:
         """거래처 데이터 조회"""
         try:
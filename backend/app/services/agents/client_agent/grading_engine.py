@@ -0,0 +1,253 @@
+"""
+Client Grading Engine
+
+전체 거래처의 RFM(최근성/빈도/규모) 및 성장·변동성 점수를 거래처 × 월 행렬 연산 한 번으로 계산하고,
+등급 기준에 따라 S~D 등급을 부여합니다.
+
+기준월별 등급표는 SQLite에 저장되며, 새 월 데이터가 들어오면 저장되지 않은 기준월과
+최신 기준월만 다시 계산합니다(증분 갱신).
+"""
+
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .analytics_engine import ClientAnalyticsEngine, _format_month
+
+logger = logging.getLogger(__name__)
+
+# 종합 점수 가중치 (각 점수는 전체 거래처 대비 백분위 0~100)
+SCORE_WEIGHTS = {"recency": 0.2, "frequency": 0.2, "monetary": 0.4, "growth": 0.2}
+
+# 성장률 비교 구간 (최근 N개월 vs 직전 N개월)
+GROWTH_MONTHS = 3
+
+GRADE_COLUMNS = [
+    "as_of_month", "client_id", "recency", "frequency", "monetary", "growth_rate", "volatility",
+    "recency_score", "frequency_score", "monetary_score", "growth_score", "score", "grade",
+]
+
+
+def assign_grades(scores: np.ndarray, cutoffs: Dict[str, float]) -> np.ndarray:
+    """종합 점수를 등급으로 변환 (cutoffs: 등급 → 점수 하한, 높은 하한부터 적용)"""
+    ordered = sorted(cutoffs.items(), key=lambda item: item[1], reverse=True)
+    grades = np.full(len(scores), ordered[-1][0], dtype=object)
+    for grade, lower in reversed(ordered):
+        grades[scores >= lower] = grade
+    return grades
+
+
+def compute_grade_table(sales: np.ndarray, clients: List[str], as_of_index: int,
+                        cutoffs: Dict[str, float], window: int = 12) -> pd.DataFrame:
+    """
+    기준월 하나에 대한 전체 거래처 등급 계산 (거래처 단위 반복 없이 행렬 연산)
+
+    Args:
+        sales: 거래처 × 월 매출 행렬
+        clients: 행 순서의 거래처 ID
+        as_of_index: 기준월 열 위치
+        cutoffs: 등급 → 종합 점수 하한
+        window: 점수 산출 기간 (개월)
+    """
+    start = max(0, as_of_index - window + 1)
+    block = sales[:, start:as_of_index + 1]
+    active = block > 0
+    width = block.shape[1]
+
+    # 최근성: 기준월부터 마지막 거래월까지 경과 개월 (거래 없으면 기간 길이)
+    last_active = np.where(active.any(axis=1), width - 1 - np.argmax(active[:, ::-1], axis=1), -1)
+    recency = np.where(last_active >= 0, width - 1 - last_active, width)
+    frequency = active.sum(axis=1)
+    monetary = block.sum(axis=1)
+
+    # 성장률: 최근 3개월 합계 / 직전 3개월 합계 - 1
+    recent = sales[:, max(0, as_of_index - GROWTH_MONTHS + 1):as_of_index + 1].sum(axis=1)
+    previous = sales[:, max(0, as_of_index - 2 * GROWTH_MONTHS + 1):max(0, as_of_index - GROWTH_MONTHS + 1)].sum(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        growth = np.where(previous > 0, recent / previous - 1.0, 0.0)
+        mean = block.mean(axis=1)
+        volatility = np.where(mean > 0, block.std(axis=1) / mean, 0.0)
+
+    table = pd.DataFrame({
+        "client_id": clients,
+        "recency": recency.astype(int),
+        "frequency": frequency.astype(int),
+        "monetary": monetary,
+        "growth_rate": growth,
+        "volatility": volatility,
+    })
+    table["recency_score"] = (-table["recency"]).rank(pct=True) * 100
+    table["frequency_score"] = table["frequency"].rank(pct=True) * 100
+    table["monetary_score"] = table["monetary"].rank(pct=True) * 100
+    table["growth_score"] = table["growth_rate"].rank(pct=True) * 100
+    table["score"] = sum(table[f"{name}_score"] * weight for name, weight in SCORE_WEIGHTS.items())
+
+    grades = assign_grades(table["score"].to_numpy(), cutoffs)
+    # 기간 내 거래가 없는 거래처는 최하 등급
+    grades[monetary <= 0] = min(cutoffs, key=cutoffs.get)
+    table["grade"] = grades
+    return table.round({"growth_rate": 4, "volatility": 4, "recency_score": 2, "frequency_score": 2,
+                        "monetary_score": 2, "growth_score": 2, "score": 2})
+
+
+class ClientGradingEngine:
+    """거래처 등급표 관리 (계산, SQLite 저장, 증분 갱신, 조회)"""
+
+    def __init__(self, db_path: Path, cutoffs: Dict[str, float], window: int = 12):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.cutoffs = dict(cutoffs)
+        self.window = window
+        self._lock = threading.Lock()
+        self._tables: Dict[int, pd.DataFrame] = {}
+        self.latest_month: Optional[int] = None
+        self.months: List[int] = []
+        self._initialize_database()
+
+    def _connect(self) -> sqlite3.Connection:
+        """SQLite 연결 생성 (여러 워커 프로세스가 같은 파일을 공유하므로 잠금 대기 허용)"""
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def _initialize_database(self):
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS client_grades (
+                    as_of_month INTEGER,
+                    client_id TEXT,
+                    recency INTEGER,
+                    frequency INTEGER,
+                    monetary REAL,
+                    growth_rate REAL,
+                    volatility REAL,
+                    recency_score REAL,
+                    frequency_score REAL,
+                    monetary_score REAL,
+                    growth_score REAL,
+                    score REAL,
+                    grade TEXT,
+                    PRIMARY KEY (as_of_month, client_id)
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_client_grades_grade ON client_grades(as_of_month, grade)")
+
+    def stored_months(self) -> List[int]:
+        """등급표가 저장된 기준월 목록"""
+        with self._connect() as conn:
+            rows = conn.execute("SELECT DISTINCT as_of_month FROM client_grades ORDER BY as_of_month").fetchall()
+        return [row[0] for row in rows]
+
+    def refresh(self, engine: ClientAnalyticsEngine, full: bool = False) -> List[int]:
+        """
+        분석 엔진 데이터로 등급표 갱신
+
+        저장되지 않은 기준월과 최신 기준월(월중 데이터가 바뀔 수 있음)만 계산합니다.
+        Returns: 다시 계산한 기준월 목록
+        """
+        with self._lock:
+            started = time.perf_counter()
+            stored = set() if full else set(self.stored_months())
+            targets = [
+                index for index, month in enumerate(engine.months)
+                if month not in stored or month == engine.latest_month
+            ]
+            if not targets:
+                return []
+
+            sales = engine.monthly_matrix("매출액")
+            tables = []
+            for index in targets:
+                table = compute_grade_table(sales, engine.clients, index, self.cutoffs, self.window)
+                table.insert(0, "as_of_month", engine.months[index])
+                tables.append(table)
+
+            refreshed = [engine.months[index] for index in targets]
+            with self._connect() as conn:
+                conn.executemany(
+                    "DELETE FROM client_grades WHERE as_of_month = ?", [(month,) for month in refreshed]
+                )
+                rows = pd.concat(tables, ignore_index=True)[GRADE_COLUMNS]
+                conn.executemany(
+                    f"INSERT INTO client_grades ({', '.join(GRADE_COLUMNS)}) VALUES ({', '.join('?' * len(GRADE_COLUMNS))})",
+                    rows.astype(object).itertuples(index=False, name=None)
+                )
+            for month, table in zip(refreshed, tables):
+                self._tables[month] = table
+            self.latest_month = engine.latest_month
+            self.months = list(engine.months)
+
+            logger.info(
+                f"거래처 등급표 갱신: 기준월 {len(refreshed)}개, 거래처 {len(engine.clients)}곳 "
+                f"({(time.perf_counter() - started) * 1000:.1f}ms)"
+            )
+            return refreshed
+
+    def _table(self, month: Optional[int] = None) -> pd.DataFrame:
+        """기준월 등급표 조회 (메모리 캐시 → SQLite)"""
+        if month is None:
+            month = self.latest_month
+        if month is None:
+            months = self.stored_months()
+            if not months:
+                return pd.DataFrame(columns=GRADE_COLUMNS)
+            month = months[-1]
+        if month not in self._tables:
+            with self._connect() as conn:
+                self._tables[month] = pd.read_sql_query(
+                    "SELECT * FROM client_grades WHERE as_of_month = ?", conn, params=(month,)
+                )
+        return self._tables[month]
+
+    @staticmethod
+    def _records(table: pd.DataFrame) -> List[Dict[str, Any]]:
+        return table.sort_values("score", ascending=False).to_dict("records")
+
+    def clients_by_grade(self, grade: str, month: Optional[int] = None) -> List[Dict[str, Any]]:
+        """특정 등급 거래처 목록 (점수 내림차순)"""
+        table = self._table(month)
+        return self._records(table[table["grade"] == grade.upper()])
+
+    def client_grade(self, client_id: str, month: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """거래처 하나의 등급"""
+        table = self._table(month)
+        rows = table[table["client_id"] == client_id]
+        return rows.iloc[0].to_dict() if not rows.empty else None
+
+    def grade_changes(self, direction: str = "down", month: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        직전 기준월 대비 등급이 하락(down) 또는 상승(up)한 거래처
+
+        기준월(기본: 분석 엔진의 최신 월)과 그 직전 월의 등급표를 비교하며,
+        둘 중 하나라도 아직 저장되지 않았으면 이전 월끼리 비교하지 않고 빈 목록을 반환합니다.
+        """
+        stored = self.stored_months()
+        current_month = month if month is not None else self.latest_month
+        if current_month is None:
+            # 이 프로세스에서 갱신 전이면 _table과 같이 저장된 최신 기준월 사용
+            current_month = stored[-1] if stored else None
+        axis = self.months or stored
+        earlier = [m for m in axis if current_month is not None and m < current_month]
+        previous_month = earlier[-1] if earlier else None
+        if current_month not in stored or previous_month not in stored:
+            return []
+
+        current, previous = self._table(current_month), self._table(previous_month)
+        rank = {grade: order for order, grade in enumerate(sorted(self.cutoffs, key=self.cutoffs.get))}
+        merged = current.merge(previous[["client_id", "grade", "score"]], on="client_id", suffixes=("", "_previous"))
+        delta = merged["grade"].map(rank) - merged["grade_previous"].map(rank)
+        changed = merged[delta < 0] if direction == "down" else merged[delta > 0]
+        return [
+            {**record, "previous_month": _format_month(previous_month), "current_month": _format_month(current_month)}
+            for record in self._records(changed)
+        ]
+
+    def distribution(self, month: Optional[int] = None) -> Dict[str, int]:
+        """등급별 거래처 수"""
+        counts = self._table(month)["grade"].value_counts().to_dict()
+        return {grade: int(counts.get(grade, 0)) for grade in sorted(self.cutoffs, key=self.cutoffs.get, reverse=True)}
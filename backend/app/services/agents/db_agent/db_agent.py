@@ -4,11 +4,12 @@ DB Agent - 내부 벡터 검색 Agent
 ChromaDB를 사용한 문서 검색, 정책 검색, 지식베이스 질문답변을 처리합니다.
 """
 
+import asyncio
 import logging
-from typing import Dict, Any, List, Optional
-import chromadb
+from typing import Dict, Any, List, Optional, Tuple
 from pathlib import Path
 from ....core.config import settings
+from ....core.tracing import span
 from .embedding_service import EmbeddingService
 
 logger = logging.getLogger(__name__)
@@ -30,6 +31,8 @@ class DBAgent:
     def _initialize_chroma_db(self):
         """ChromaDB 초기화"""
         try:
+            import chromadb
+            
             chroma_path = Path(settings.chroma_db_path)
             chroma_path.mkdir(parents=True, exist_ok=True)
             
@@ -48,8 +51,14 @@ class DBAgent:
             logger.error(f"ChromaDB 초기화 실패: {str(e)}")
             raise
     
-    async def process(self, args: Dict[str, Any], original_message: str) -> Dict[str, Any]:
-        """DB Agent 메인 처리 함수"""
+    async def process(self, args: Dict[str, Any], original_message: str,
+                      prefetched: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+        """
+        DB Agent 메인 처리 함수
+        
+        Args:
+            prefetched: 라우팅과 병렬로 미리 조회한 벡터 검색 후보 (있으면 임베딩/검색 생략)
+        """
         try:
             query = args.get("query", original_message)
             search_type = args.get("search_type", "semantic")
@@ -59,13 +68,13 @@ class DBAgent:
             
             # 검색 실행
             if search_type == "semantic":
-                results = await self._semantic_search(query, document_type)
+                results = await self._semantic_search(query, document_type, prefetched)
             elif search_type == "keyword":
                 results = await self._keyword_search(query, document_type)
             elif search_type == "hybrid":
-                results = await self._hybrid_search(query, document_type)
+                results = await self._hybrid_search(query, document_type, prefetched)
             else:
-                results = await self._semantic_search(query, document_type)
+                results = await self._semantic_search(query, document_type, prefetched)
             
             if results:
                 # 검색 결과를 기반으로 응답 생성
@@ -101,41 +110,73 @@ class DBAgent:
                 "metadata": {"error": str(e), "agent": "db_agent"}
             }
     
-    async def _semantic_search(self, query: str, document_type: str) -> List[Dict[str, Any]]:
-        """의미 기반 검색"""
-        try:
-            if not self.collection or not self.embedding_service.is_available():
-                return await self._fallback_search(query)
-            
-            # 쿼리 임베딩 생성
-            query_embedding = await self.embedding_service.embed_text(query)
-            if not query_embedding:
-                return await self._fallback_search(query)
-            
-            # ChromaDB에서 검색
-            results = self.collection.query(
+    async def prepare_batch(self, items: List[Tuple[Dict[str, Any], str]]):
+        """배치 요청 준비: 의미 검색 질의를 한 번에 임베딩 (이후 개별 검색은 공유 캐시 사용)"""
+        if not self.collection or not self.embedding_service.is_available():
+            return
+        queries = [
+            args.get("query", message) for args, message in items
+            if args.get("search_type", "semantic") != "keyword"
+        ]
+        if queries:
+            with span("retrieval.embed"):
+                await asyncio.to_thread(self.embedding_service.embed_queries, queries)
+    
+    async def prefetch_candidates(self, query: str, document_type: str = "general") -> Optional[List[Dict[str, Any]]]:
+        """
+        벡터 검색 후보 조회 (질의 임베딩 + top-k 검색, 리랭크 전)
+        
+        라우팅 LLM 호출과 병렬로 실행하는 투기적 조회에도 사용하며,
+        벡터 검색을 사용할 수 없으면 None을 반환합니다.
+        """
+        if not self.collection or not self.embedding_service.is_available():
+            return None
+        
+        # 쿼리 임베딩 생성 (CPU 연산이므로 스레드에서 실행)
+        with span("retrieval.embed"):
+            query_embedding = await asyncio.to_thread(self.embedding_service.embed_text, query)
+        if not query_embedding:
+            return None
+        
+        # ChromaDB에서 검색
+        with span("retrieval.semantic"):
+            results = await asyncio.to_thread(
+                self.collection.query,
                 query_embeddings=[query_embedding],
                 n_results=5,
                 where={"type": document_type} if document_type != "general" else None
             )
+        
+        # 결과 포맷팅
+        formatted_results = []
+        if results["documents"] and results["documents"][0]:
+            for i, (doc, metadata, distance) in enumerate(zip(
+                results["documents"][0],
+                results["metadatas"][0] if results["metadatas"] else [{}] * len(results["documents"][0]),
+                results["distances"][0] if results["distances"] else [0.0] * len(results["documents"][0])
+            )):
+                formatted_results.append({
+                    "content": doc,
+                    "metadata": metadata,
+                    "score": 1.0 - distance,  # 유사도 점수로 변환
+                    "rank": i + 1,
+                    "source": "chromadb_semantic_search"
+                })
+        return formatted_results
+    
+    async def _semantic_search(self, query: str, document_type: str,
+                               prefetched: Optional[List[Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
+        """의미 기반 검색"""
+        try:
+            candidates = prefetched
+            if candidates is None:
+                candidates = await self.prefetch_candidates(query, document_type)
+            if candidates is None:
+                return await self._fallback_search(query)
             
-            # 결과 포맷팅
-            formatted_results = []
-            if results["documents"] and results["documents"][0]:
-                for i, (doc, metadata, distance) in enumerate(zip(
-                    results["documents"][0],
-                    results["metadatas"][0] if results["metadatas"] else [{}] * len(results["documents"][0]),
-                    results["distances"][0] if results["distances"] else [0.0] * len(results["documents"][0])
-                )):
-                    formatted_results.append({
-                        "content": doc,
-                        "metadata": metadata,
-                        "score": 1.0 - distance,  # 유사도 점수로 변환
-                        "rank": i + 1,
-                        "source": "chromadb_semantic_search"
-                    })
-            
-            return formatted_results
+            # 리랭커로 재정렬 (선조회 후보도 최종 질의 기준으로 정렬)
+            with span("retrieval.rerank"):
+                return await asyncio.to_thread(self.embedding_service.rerank, query, [dict(c) for c in candidates])
             
         except Exception as e:
             logger.error(f"의미 검색 실패: {str(e)}")
@@ -148,11 +189,12 @@ class DBAgent:
                 return await self._fallback_search(query)
             
             # 키워드 검색 (where 조건 사용)
-            results = self.collection.query(
-                query_texts=[query],
-                n_results=5,
-                where={"type": document_type} if document_type != "general" else None
-            )
+            with span("retrieval.keyword"):
+                results = self.collection.query(
+                    query_texts=[query],
+                    n_results=5,
+                    where={"type": document_type} if document_type != "general" else None
+                )
             
             # 결과 포맷팅
             formatted_results = []
@@ -176,11 +218,12 @@ class DBAgent:
             logger.error(f"키워드 검색 실패: {str(e)}")
             return await self._fallback_search(query)
     
-    async def _hybrid_search(self, query: str, document_type: str) -> List[Dict[str, Any]]:
+    async def _hybrid_search(self, query: str, document_type: str,
+                             prefetched: Optional[List[Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
         """하이브리드 검색 (의미 + 키워드)"""
         try:
             # 의미 검색과 키워드 검색 결과를 결합
-            semantic_results = await self._semantic_search(query, document_type)
+            semantic_results = await self._semantic_search(query, document_type, prefetched)
             keyword_results = await self._keyword_search(query, document_type)
             
             # 중복 제거 및 점수 조합
@@ -266,6 +309,22 @@ class DBAgent:
             logger.error(f"응답 생성 실패: {str(e)}")
             return f"검색 결과를 처리하는 중 오류가 발생했습니다: {str(e)}"
     
+    def warm_up(self) -> Dict[str, Any]:
+        """워밍업: 더미 임베딩과 쿼리를 한 번 실행하여 초기화 비용을 선지불"""
+        warmed = {"embedding": False, "query": False}
+        try:
+            if self.embedding_service.is_available():
+                embedding = self.embedding_service.embed_text("워밍업")
+                warmed["embedding"] = True
+                
+                if self.collection:
+                    self.collection.query(query_embeddings=[embedding], n_results=1)
+                    warmed["query"] = True
+        except Exception as e:
+            logger.warning(f"DB Agent 워밍업 실패: {str(e)}")
+        
+        return warmed
+    
     def get_collection_info(self) -> Dict[str, Any]:
         """컬렉션 정보 반환"""
         try:
@@ -288,7 +347,7 @@ class DBAgent:
                 return False
             
             # 문서 임베딩 생성
-            embedding = await self.embedding_service.embed_text(content)
+            embedding = await asyncio.to_thread(self.embedding_service.embed_text, content)
             if not embedding:
                 return False
             
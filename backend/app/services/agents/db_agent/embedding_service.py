@@ -6,27 +6,62 @@ DB Agent Embedding Service
 
 import logging
 from typing import List, Dict, Any, Optional
+from ....core import embeddings
+from ....core.model_registry import model_registry
 
 logger = logging.getLogger(__name__)
 
 class EmbeddingService:
-    """임베딩 서비스 (기본 구현)"""
+    """임베딩 서비스 (공유 모델 레지스트리 기반)"""
     
     def __init__(self):
         logger.info("DB Agent EmbeddingService 초기화 완료")
     
+    def is_available(self) -> bool:
+        """임베딩 모델 사용 가능 여부"""
+        return embeddings.is_available()
+    
     def embed_text(self, text: str) -> List[float]:
-        """텍스트 임베딩 (임시 구현)"""
-        # 실제 환경에서는 HuggingFace나 OpenAI 임베딩을 사용
-        # 현재는 기본 구현으로 임시 처리
+        """텍스트 임베딩"""
         logger.info(f"텍스트 임베딩 요청: {text[:50]}...")
         
-        # 임시로 빈 벡터 반환 (실제로는 768차원 등의 임베딩 벡터)
-        return [0.0] * 768
+        vectors = embeddings.encode([text])
+        if vectors is None:
+            # 모델이 없으면 빈 벡터 반환 (호출 측에서 is_available()로 폴백 처리)
+            return [0.0] * 768
+        
+        return vectors[0].tolist()
+    
+    def embed_queries(self, queries: List[str]) -> List[List[float]]:
+        """질의 목록 일괄 임베딩 (공유 캐시에 적재되어 이후 embed_text 호출은 재계산 없음)"""
+        vectors = embeddings.encode(queries)
+        if vectors is None:
+            return [[0.0] * 768 for _ in queries]
+        
+        return vectors.tolist()
     
     def embed_documents(self, documents: List[str]) -> List[List[float]]:
         """문서 목록 임베딩"""
-        return [self.embed_text(doc) for doc in documents]
+        vectors = embeddings.encode(documents, use_cache=False)
+        if vectors is None:
+            return [[0.0] * 768 for _ in documents]
+        
+        return vectors.tolist()
+    
+    def rerank(self, query: str, results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """리랭커로 검색 결과 재정렬 (리랭커가 없으면 원래 순서 유지)"""
+        reranker = model_registry.get_reranker_model()
+        if reranker is None or len(results) < 2:
+            return results
+        
+        scores = reranker.predict([(query, result["content"]) for result in results])
+        reranked = sorted(zip(results, scores), key=lambda pair: pair[1], reverse=True)
+        
+        for i, (result, score) in enumerate(reranked):
+            result["rerank_score"] = float(score)
+            result["rank"] = i + 1
+        
+        return [result for result, _ in reranked]
     
     def calculate_similarity(self, vec1: List[float], vec2: List[float]) -> float:
         """벡터 유사도 계산"""
@@ -0,0 +1,312 @@
+"""
+Compliance Rule Engine
+
+외부자료(리베이트 관련 법령, 컴플라이언스 규정 총정리, 지출보고서 제도 법령, 의약품 광고심의 관련 법률)의
+조항을 규칙으로 컴파일해 LLM 호출 전에 검토 대상을 사전 선별합니다.
+
+- 규칙마다 근거 문서와 조항 앵커를 두고, 컴파일 시 해당 조항 원문을 인용문으로 읽어 오며
+  금액 한도(예: "1인당 10만원")도 조항 원문에서 파싱합니다. 문서가 바뀌면 다시 컴파일합니다.
+- 모든 규칙의 키워드는 하나의 정규식(다중 패턴 매처)으로 합쳐 입력을 한 번만 훑습니다.
+- 금액·인원·횟수는 줄 단위로 추출해 한도 판정(수치 조건)에 사용합니다.
+
+판정
+- violation: 한도 초과 또는 금지 행위가 명확함 → LLM 없이 조항 인용과 함께 응답
+- ambiguous: 키워드는 있으나 금액/인원이 없어 판단 불가, 또는 검토형 규칙 → LLM으로 에스컬레이션
+- clear: 해당 규칙이 없거나 모든 한도 이내
+"""
+
+import logging
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+COMPLIANCE_DOCS = "컴플라이언스 규정 총정리.docx"
+REBATE_DOCS = "리베이트 관련 법령.docx"
+EXPENSE_REPORT_DOCS = "지출보고서 제도 법령.docx"
+ADVERTISING_DOCS = "의약품 광고심의 관련 법률.docx"
+
+# 규칙 정의: 근거 조항(source + anchor)과 판정 방식
+# - limit: 조항 원문의 금액을 순서대로 limits에 대응시켜 한도로 사용
+# - prohibited: 키워드(또는 all_of 조합)가 있으면 위반
+# - review: 키워드가 있으면 판단 필요(LLM 검토)
+RULE_SPECS: List[Dict[str, Any]] = [
+    {
+        "id": "gift", "title": "거래처 금품·선물 한도", "category": "ethics", "kind": "limit",
+        "source": COMPLIANCE_DOCS, "anchor": "금품 및 선물:",
+        "terms": ["선물", "상품권", "금품", "기프트카드", "현금"], "limits": ["per_case"],
+    },
+    {
+        "id": "entertainment", "title": "접대(향응) 1인당 한도", "category": "ethics", "kind": "limit",
+        "source": COMPLIANCE_DOCS, "anchor": "향응 (접대):",
+        "terms": ["접대", "향응", "술자리", "유흥"], "limits": ["per_person"],
+    },
+    {
+        "id": "condolence", "title": "경조금품 한도", "category": "ethics", "kind": "limit",
+        "source": COMPLIANCE_DOCS, "anchor": "경조금품:",
+        "terms": ["경조", "조의금", "축의금", "부조", "화환"], "limits": ["per_case"],
+    },
+    {
+        "id": "briefing", "title": "제품설명회(복수 요양기관) 식음료·기념품 한도", "category": "ethics", "kind": "limit",
+        "source": COMPLIANCE_DOCS, "anchor": "복수 요양기관 대상:",
+        "terms": ["제품설명회", "설명회", "심포지엄"], "limits": ["per_person", "souvenir"],
+    },
+    {
+        "id": "visit", "title": "개별 요양기관 방문 식음료·판촉물 한도", "category": "ethics", "kind": "limit",
+        "source": COMPLIANCE_DOCS, "anchor": "개별 요양기관 방문:",
+        "terms": ["병원 방문", "의원 방문", "약국 방문", "디테일링", "방문 식사"], "limits": ["per_person", "souvenir"],
+        "monthly_count": True,
+    },
+    {
+        "id": "lecture_fee", "title": "강연료 한도", "category": "ethics", "kind": "limit",
+        "source": COMPLIANCE_DOCS, "anchor": "강연료:",
+        "terms": ["강연료", "강의료", "강연비", "연자료"], "limits": ["per_case", "per_day", "annual"],
+    },
+    {
+        "id": "advisory_fee", "title": "자문료 한도", "category": "ethics", "kind": "limit",
+        "source": COMPLIANCE_DOCS, "anchor": "자문료:",
+        "terms": ["자문료", "자문비", "컨설팅비"], "limits": ["per_case", "annual"],
+    },
+    {
+        "id": "public_official", "title": "공직자 금품 수수 금지 (청탁금지법 제8조)", "category": "ethics", "kind": "limit",
+        "source": REBATE_DOCS, "anchor": "제8조(금품등의 수수 금지)",
+        "terms": ["공직자", "공무원", "보건소"], "limits": ["per_case", "annual"],
+    },
+    {
+        "id": "rebate", "title": "처방 유도 목적의 경제적 이익 제공 (공정거래법 제45조)", "category": "ethics",
+        "kind": "prohibited", "source": REBATE_DOCS, "anchor": "4. 부당하게 경쟁자의 고객을",
+        "terms": ["리베이트", "랜딩비", "처방 대가", "처방 유도", "처방을 조건", "처방 조건", "채택 대가",
+                  "처방량에 따라", "처방 사례비"],
+    },
+    {
+        "id": "companion_travel", "title": "학술대회 동반자 여비 지원 금지", "category": "ethics", "kind": "prohibited",
+        "source": COMPLIANCE_DOCS, "anchor": "학술대회 지원:",
+        "all_of": [["동반자", "배우자", "가족"], ["여비", "항공", "숙박", "여행", "체재비"]],
+    },
+    {
+        "id": "golf", "title": "골프 접대 (사전·사후 보고 의무)", "category": "ethics", "kind": "review",
+        "source": COMPLIANCE_DOCS, "anchor": "골프 접대:", "terms": ["골프"],
+    },
+    {
+        "id": "exaggerated_ad", "title": "의약품 거짓·과장 광고 (약사법 제68조)", "category": "general",
+        "kind": "prohibited", "source": ADVERTISING_DOCS, "anchor": "제68조(과장광고 등의 금지)",
+        "terms": ["100% 효과", "완치", "부작용 없", "부작용이 없", "부작용 제로", "기적의", "특효", "만병통치",
+                  "최고의 효과", "유일한 치료", "즉각적인 효과", "무조건 효과"],
+    },
+    {
+        "id": "hcp_endorsement", "title": "의사 보증 오인 광고 (약사법 제68조 제2항)", "category": "general",
+        "kind": "prohibited", "source": ADVERTISING_DOCS, "anchor": "②의약품등은 그 효능이나 성능에 관하여",
+        "terms": ["의사가 추천", "의사 추천", "의사들이 인정", "전문의 추천", "의사가 보증", "약사 추천"],
+    },
+    {
+        "id": "rx_public_ad", "title": "전문의약품 대중광고 금지 (약사법 제68조 제6항)", "category": "general",
+        "kind": "prohibited", "source": ADVERTISING_DOCS, "anchor": "⑥ 다음 각 호의 어느 하나에 해당하는 의약품을",
+        "all_of": [["전문의약품"], ["광고", "SNS", "유튜브", "블로그", "인스타그램", "TV"]],
+    },
+    {
+        "id": "disparagement", "title": "타사 제품 비방·비교 표현", "category": "general", "kind": "review",
+        "source": COMPLIANCE_DOCS, "anchor": "다른 회사나 제품을 비방",
+        "terms": ["경쟁사 제품은", "타사 제품은", "타사 대비", "경쟁 제품보다", "타사보다"],
+    },
+    {
+        "id": "expense_evidence", "title": "지출보고서 근거 자료 보관 의무 (약사법 제47조의2)", "category": "finance",
+        "kind": "prohibited", "source": EXPENSE_REPORT_DOCS, "anchor": "제47조의2(경제적 이익등",
+        "terms": ["영수증 없", "영수증 미첨부", "증빙 없", "증빙 미첨부", "증빙자료 없", "지출보고서 미작성", "장부 누락"],
+    },
+]
+
+# 한도 종류별 금액 앞 문맥 표현 (per_case/per_person은 다른 한도에 해당하지 않는 금액)
+LIMIT_QUALIFIERS = {
+    "per_day": ("하루", "일일", "1일 합계", "1일 총"),
+    "annual": ("연간", "올해", "회계연도", "누적", "누계"),
+    "souvenir": ("기념품", "판촉물", "사은품"),
+}
+LIMIT_LABELS = {"per_case": "1회", "per_person": "1인당", "per_day": "1일", "annual": "연간", "souvenir": "기념품"}
+
+UNITS = {"억": 100_000_000, "천만": 10_000_000, "백만": 1_000_000, "십만": 100_000, "만": 10_000, "천": 1_000}
+
+_MONEY = re.compile(r"(\d+(?:[.,]\d+)*)\s*(억|천만|백만|십만|만|천)?\s*원")
+_HEADCOUNT = re.compile(r"(\d+)\s*(?:명|인)(?!당)")
+_MONTHLY_COUNT = re.compile(r"월\s*(\d+)\s*회")
+_PER_PERSON = ("1인당", "인당", "1인 ")
+
+SEVERITY = {"violation": "높음", "ambiguous": "중간", "clear": "낮음"}
+
+
+def parse_amounts(text: str) -> List[Tuple[int, int, int]]:
+    """금액 표현 → [(원 단위 금액, 시작, 끝)] ("10만원", "150,000원", "1.5만 원")"""
+    amounts = []
+    for match in _MONEY.finditer(text):
+        number = float(match.group(1).replace(",", ""))
+        amounts.append((int(round(number * UNITS.get(match.group(2) or "", 1))), match.start(), match.end()))
+    return amounts
+
+
+def _won(amount: float) -> str:
+    return f"{amount:,.0f}원"
+
+
+class ComplianceRuleEngine:
+    """규칙 컴파일 결과 (조항 인용, 한도, 다중 패턴 매처)"""
+
+    def __init__(self, specs: List[Dict[str, Any]], documents: Dict[str, List[str]]):
+        """
+        Args:
+            specs: 규칙 정의 (RULE_SPECS 형식)
+            documents: 문서 파일명 → 단락 목록 (없는 문서의 규칙은 제외)
+        """
+        started = time.perf_counter()
+        self.rules: Dict[str, Dict[str, Any]] = {}
+        term_owners: Dict[str, List[str]] = {}
+
+        for spec in specs:
+            clause = next((p for p in documents.get(spec["source"], []) if spec["anchor"] in p), None)
+            if clause is None:
+                logger.warning(f"규칙 근거 조항을 찾을 수 없음: {spec['id']} ({spec['source']})")
+                continue
+            rule = dict(spec, clause=clause)
+            if spec["kind"] == "limit":
+                amounts = [amount for amount, _, _ in parse_amounts(clause)]
+                if len(amounts) < len(spec["limits"]):
+                    logger.warning(f"규칙 한도 파싱 실패: {spec['id']} - {clause[:60]}")
+                    continue
+                rule["limit_values"] = dict(zip(spec["limits"], amounts))
+                count = _MONTHLY_COUNT.search(clause)
+                if spec.get("monthly_count") and count:
+                    rule["monthly_limit"] = int(count.group(1))
+            self.rules[spec["id"]] = rule
+            for term in spec.get("terms", []) + [t for group in spec.get("all_of", []) for t in group]:
+                term_owners.setdefault(term, []).append(spec["id"])
+
+        # 긴 키워드 우선 (예: "처방 유도"가 "처방"보다 먼저 일치)
+        self._term_owners = term_owners
+        terms = sorted(term_owners, key=len, reverse=True)
+        self._matcher = re.compile("|".join(re.escape(term) for term in terms)) if terms else None
+        self.build_ms = round((time.perf_counter() - started) * 1000, 2)
+        logger.info(f"⚖️ 컴플라이언스 규칙 {len(self.rules)}개 컴파일 (키워드 {len(terms)}개, {self.build_ms}ms)")
+
+    # ------------------------------------------------------------------
+    # 판정
+    # ------------------------------------------------------------------
+
+    def _check_limit(self, rule: Dict[str, Any], line: str) -> Tuple[str, str, Optional[int], Optional[int]]:
+        """한도 규칙 판정 → (판정, 설명, 금액, 한도)"""
+        count = _MONTHLY_COUNT.search(line)
+        if rule.get("monthly_limit") and count and int(count.group(1)) > rule["monthly_limit"]:
+            return "violation", f"월 {count.group(1)}회 > 한도 월 {rule['monthly_limit']}회", None, None
+        amounts = parse_amounts(line)
+        if not amounts:
+            return "ambiguous", "금액이 기재되지 않아 한도 판단 불가", None, None
+
+        limits = rule["limit_values"]
+        headcount = _HEADCOUNT.search(line)
+        per_person = any(marker in line for marker in _PER_PERSON)
+        worst: Tuple[float, str, str, Optional[int], Optional[int]] = (0.0, "clear", "한도 이내", None, None)
+        previous_end = 0
+        for amount, start, end in amounts:
+            context = line[previous_end:end]
+            previous_end = end
+            kind = next((k for k in limits if k in LIMIT_QUALIFIERS and any(q in context for q in LIMIT_QUALIFIERS[k])),
+                        next((k for k in limits if k not in LIMIT_QUALIFIERS), None))
+            if kind is None:
+                continue
+            value, note = amount, ""
+            if kind == "per_person" and not per_person:
+                if headcount and int(headcount.group(1)) > 0:
+                    value = amount / int(headcount.group(1))
+                    note = f" (총 {_won(amount)} / {headcount.group(1)}명)"
+                elif amount > limits[kind]:
+                    # 인원을 모르면 총액이 한도를 넘어도 1인당 초과 여부를 확정할 수 없음
+                    if worst[1] == "clear":
+                        worst = (0.0, "ambiguous", f"인원 미기재: 총 {_won(amount)} (1인당 한도 {_won(limits[kind])})",
+                                 amount, limits[kind])
+                    continue
+            ratio = value / limits[kind]
+            if ratio > 1 and ratio > worst[0]:
+                worst = (ratio, "violation", f"{LIMIT_LABELS[kind]} {_won(value)}{note} > 한도 {_won(limits[kind])}",
+                         int(value), limits[kind])
+        return worst[1], worst[2], worst[3], worst[4]
+
+    def scan(self, text: str, category: Optional[str] = None) -> Dict[str, Any]:
+        """
+        제출 내용 사전 선별
+
+        Args:
+            category: regulation_category (None 또는 "general"이면 전체 규칙)
+
+        Returns: {"status", "risk_level", "findings": [{"rule_id", "title", "status", "detail", "line",
+                  "amount", "limit", "citation": {"source", "clause"}}]}
+        """
+        findings: List[Dict[str, Any]] = []
+        if self._matcher is not None and text:
+            for line in filter(None, (line.strip() for line in text.splitlines())):
+                hits: Dict[str, set] = {}
+                for match in self._matcher.finditer(line):
+                    for rule_id in self._term_owners[match.group(0)]:
+                        hits.setdefault(rule_id, set()).add(match.group(0))
+                for rule_id, terms in hits.items():
+                    rule = self.rules[rule_id]
+                    if category not in (None, "general") and rule["category"] != category:
+                        continue
+                    if rule.get("all_of") and not all(terms & set(group) for group in rule["all_of"]):
+                        continue
+                    if rule["kind"] == "limit":
+                        status, detail, amount, limit = self._check_limit(rule, line)
+                    elif rule["kind"] == "prohibited":
+                        status, detail, amount, limit = "violation", f"금지 표현/행위: {', '.join(sorted(terms))}", None, None
+                    else:
+                        status, detail, amount, limit = "ambiguous", f"검토 필요: {', '.join(sorted(terms))}", None, None
+                    findings.append({
+                        "rule_id": rule_id,
+                        "title": rule["title"],
+                        "status": status,
+                        "detail": detail,
+                        "line": line,
+                        "amount": amount,
+                        "limit": limit,
+                        "citation": {"source": rule["source"], "clause": rule["clause"]},
+                    })
+
+        statuses = {finding["status"] for finding in findings}
+        status = "violation" if "violation" in statuses else "ambiguous" if "ambiguous" in statuses else "clear"
+        return {"status": status, "risk_level": SEVERITY[status], "findings": findings}
+
+    def scan_batch(self, texts: Iterable[str], category: Optional[str] = None) -> List[Dict[str, Any]]:
+        """여러 제출 건(지출 내역 등) 일괄 선별"""
+        return [self.scan(text, category) for text in texts]
+
+
+def read_docx_paragraphs(file_path: Path) -> List[str]:
+    """docx 단락 텍스트 (빈 단락 제외)"""
+    from docx import Document
+
+    return [paragraph.text.strip() for paragraph in Document(str(file_path)).paragraphs if paragraph.text.strip()]
+
+
+_engines: Dict[str, Tuple[List[Any], ComplianceRuleEngine]] = {}
+_engines_lock = threading.Lock()
+
+
+def get_rule_engine(docs_dir: Optional[Path] = None) -> ComplianceRuleEngine:
+    """외부자료 폴더 기준 공유 규칙 엔진 (근거 문서 수정 시각이 바뀌면 다시 컴파일)"""
+    if docs_dir is None:
+        from ....core.config import settings
+        docs_dir = Path(settings.project_root) / "database" / "relationdb" / "외부자료"
+
+    sources = sorted({spec["source"] for spec in RULE_SPECS})
+    key = [[name, (docs_dir / name).stat().st_mtime] for name in sources if (docs_dir / name).exists()]
+    with _engines_lock:
+        cached = _engines.get(str(docs_dir))
+        if cached is None or cached[0] != key:
+            documents = {}
+            for name, _ in key:
+                try:
+                    documents[name] = read_docx_paragraphs(docs_dir / name)
+                except Exception as e:
+                    logger.warning(f"규정 문서 읽기 실패 ({name}): {str(e)}")
+            cached = (key, ComplianceRuleEngine(RULE_SPECS, documents))
+            _engines[str(docs_dir)] = cached
+        return cached[1]
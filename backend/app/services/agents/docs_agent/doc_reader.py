@@ -0,0 +1,154 @@
+"""
+Word 문서 텍스트 추출
+
+- .doc (Word 97-2003 바이너리): OLE 복합 문서에서 WordDocument/Table 스트림을 읽고
+  조각 테이블(piece table)로 본문 텍스트를 복원합니다. 외부 변환기(LibreOffice 등) 없이 동작합니다.
+- .docx: python-docx로 단락과 표를 읽습니다.
+
+두 형식 모두 Word 바이너리 표기와 같은 제어 문자로 구조를 표시합니다.
+- "\\r": 단락 끝
+- "\\x07": 표 셀 끝
+"""
+
+import struct
+from pathlib import Path
+from typing import Callable, Dict, List
+
+PARAGRAPH_MARK = "\r"
+CELL_MARK = "\x07"
+
+# 섹터 체인 종료/미사용 표시 (0xFFFFFFFA 이상)
+_END_OF_CHAIN = 0xFFFFFFFA
+
+# FIB 오프셋 (MS-DOC 2.5.1)
+_FIB_FLAGS = 0x0A
+_FIB_WHICH_TABLE = 0x0200
+_FIB_CCP_TEXT = 0x4C
+_FIB_FC_CLX = 0x1A2
+
+
+def _read_ole_streams(data: bytes) -> Dict[str, bytes]:
+    """OLE 복합 문서의 스트림 이름 → 내용"""
+    if data[:8] != b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1":
+        raise ValueError("OLE 복합 문서 형식이 아닙니다.")
+
+    sector_size = 1 << struct.unpack_from("<H", data, 0x1E)[0]
+    mini_sector_size = 1 << struct.unpack_from("<H", data, 0x20)[0]
+    first_directory = struct.unpack_from("<I", data, 0x30)[0]
+    cutoff, first_minifat, _, first_difat, _ = struct.unpack_from("<IIIII", data, 0x38)
+    per_sector = sector_size // 4
+
+    def sector(index: int) -> bytes:
+        return data[512 + index * sector_size:512 + (index + 1) * sector_size]
+
+    def chain(start: int, table: List[int]) -> List[int]:
+        sectors = []
+        while start < _END_OF_CHAIN and len(sectors) <= len(table):
+            sectors.append(start)
+            start = table[start]
+        return sectors
+
+    # DIFAT(헤더 109개 + 확장 섹터) → FAT
+    difat = list(struct.unpack_from("<109I", data, 0x4C))
+    next_difat = first_difat
+    while next_difat < _END_OF_CHAIN:
+        values = struct.unpack(f"<{per_sector}I", sector(next_difat))
+        difat.extend(values[:-1])
+        next_difat = values[-1]
+    fat: List[int] = []
+    for index in difat:
+        if index < _END_OF_CHAIN:
+            fat.extend(struct.unpack(f"<{per_sector}I", sector(index)))
+
+    directory = b"".join(sector(index) for index in chain(first_directory, fat))
+    entries = []
+    for offset in range(0, len(directory), 128):
+        entry = directory[offset:offset + 128]
+        name_length = struct.unpack_from("<H", entry, 64)[0]
+        start, size = struct.unpack_from("<II", entry, 116)
+        entries.append((entry[:max(name_length - 2, 0)].decode("utf-16-le"), entry[66], start, size))
+
+    # 작은 스트림은 루트 항목의 미니 스트림에 저장
+    mini_stream = b"".join(sector(index) for index in chain(entries[0][2], fat))
+    minifat: List[int] = []
+    for index in chain(first_minifat, fat):
+        minifat.extend(struct.unpack(f"<{per_sector}I", sector(index)))
+
+    streams = {}
+    for name, entry_type, start, size in entries:
+        if entry_type != 2:  # 스트림 항목만
+            continue
+        if size < cutoff:
+            content = b"".join(
+                mini_stream[i * mini_sector_size:(i + 1) * mini_sector_size] for i in chain(start, minifat)
+            )
+        else:
+            content = b"".join(sector(i) for i in chain(start, fat))
+        streams[name] = content[:size]
+    return streams
+
+
+def read_doc_text(file_path: Path) -> str:
+    """Word 97-2003 .doc 본문 텍스트 (단락/셀 제어 문자 포함)"""
+    streams = _read_ole_streams(Path(file_path).read_bytes())
+    word = streams["WordDocument"]
+    flags = struct.unpack_from("<H", word, _FIB_FLAGS)[0]
+    table = streams["1Table" if flags & _FIB_WHICH_TABLE else "0Table"]
+    text_length = struct.unpack_from("<i", word, _FIB_CCP_TEXT)[0]
+    fc_clx, lcb_clx = struct.unpack_from("<II", word, _FIB_FC_CLX)
+    clx = table[fc_clx:fc_clx + lcb_clx]
+
+    # Clx = Prc* (0x01) + Pcdt (0x02)
+    position = 0
+    while clx[position] == 0x01:
+        position += 3 + struct.unpack_from("<H", clx, position + 1)[0]
+    if clx[position] != 0x02:
+        raise ValueError("조각 테이블을 찾을 수 없습니다.")
+    length = struct.unpack_from("<I", clx, position + 1)[0]
+    plc = clx[position + 5:position + 5 + length]
+
+    pieces = (length - 4) // 12
+    cps = struct.unpack_from(f"<{pieces + 1}I", plc, 0)
+    text = []
+    for index in range(pieces):
+        fc = struct.unpack_from("<I", plc, 4 * (pieces + 1) + 8 * index + 2)[0]
+        count = cps[index + 1] - cps[index]
+        if fc & 0x40000000:
+            # 압축 조각: 1바이트 문자 (cp1252)
+            start = (fc & ~0x40000000) // 2
+            text.append(word[start:start + count].decode("cp1252", errors="replace"))
+        else:
+            text.append(word[fc:fc + 2 * count].decode("utf-16-le", errors="replace"))
+    return "".join(text)[:text_length]
+
+
+def read_docx_text(file_path: Path) -> str:
+    """.docx 본문 텍스트 (문서 순서대로 단락과 표 셀, .doc와 같은 제어 문자 표기)"""
+    from docx import Document
+    from docx.table import Table
+    from docx.text.paragraph import Paragraph
+
+    document = Document(str(file_path))
+    parts = []
+    for element in document.element.body.iterchildren():
+        tag = element.tag.rsplit("}", 1)[-1]
+        if tag == "p":
+            parts.append(Paragraph(element, document).text + PARAGRAPH_MARK)
+        elif tag == "tbl":
+            for row in Table(element, document).rows:
+                parts.append("".join(cell.text + CELL_MARK for cell in row.cells) + CELL_MARK)
+    return "".join(parts)
+
+
+READERS: Dict[str, Callable[[Path], str]] = {
+    ".doc": read_doc_text,
+    ".docx": read_docx_text,
+}
+
+
+def read_word_text(file_path: Path) -> str:
+    """확장자에 맞는 방식으로 Word 문서 텍스트 추출"""
+    reader = READERS.get(Path(file_path).suffix.lower())
+    if reader is None:
+        raise ValueError(f"지원하지 않는 문서 형식: {file_path}")
+    return reader(Path(file_path))
@@ -4,27 +4,74 @@ Docs Agent - 문서 자동생성 및 규정 위반 검색 Agent
 문서 생성, 컴플라이언스 검토, 규정 위반 분석을 처리합니다.
 """
 
+import asyncio
+import json
 import logging
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
 from pathlib import Path
-from openai import OpenAI
+from ....core.circuit_breaker import CircuitOpen, llm_breaker
 from ....core.config import settings
+from ....core.llm_cache import cached_completion
+from ....core.prompt_cache import layout_messages
+from ....core.tracing import span
 from .embedding_service import EmbeddingService
+from .template_library import fill_template, free_text_blocks, get_template_library
+from .violation_index import get_violation_index
 
 logger = logging.getLogger(__name__)
 
+# 작업별 고정 시스템 프롬프트 (요청별 값은 사용자 메시지 앞의 가변 지시로 전달해 접두부 캐시 유지)
+DOCUMENT_SYSTEM_PROMPT = """당신은 전문적인 문서 작성 AI입니다.
+
+요청에 지정된 문서 타입, 문서 구조, 형식을 따라 한국어로 전문적이고 체계적인 문서를 작성해주세요.
+각 섹션을 명확히 구분하고, 내용은 구체적이고 실용적으로 작성해주세요."""
+
+FORM_SYSTEM_PROMPT = """당신은 제약회사 영업 문서 작성 AI입니다.
+요청에 지정된 양식의 서술형 항목만 작성합니다.
+
+각 항목은 2~4문장의 간결한 한국어로 작성하고, 항목 키를 그대로 사용한 JSON 객체로만 응답하세요."""
+
+COMPLIANCE_SYSTEM_PROMPT = """당신은 기업 컴플라이언스 전문가입니다.
+
+요청에 지정된 규정 카테고리 기준으로 다음 내용을 검토하여:
+1. 잠재적 위험 요소 식별
+2. 규정 준수 여부 판단
+3. 개선 권고사항 제시
+4. 위험도 평가 (높음/중간/낮음)
+
+한국의 기업 법규와 일반적인 컴플라이언스 기준을 바탕으로 분석해주세요.
+관련 조항이 함께 제공되면 근거로 인용해주세요."""
+
+VIOLATION_SYSTEM_PROMPT = """당신은 규정 위반 분석 전문가입니다.
+
+요청에 지정된 규정을 기준으로 다음을 수행해주세요:
+1. 구체적인 위반 내용 식별
+2. 관련 규정 조항 참조
+3. 위반 심각도 평가
+4. 시정 조치 방안 제시
+5. 재발 방지 대책 권고
+
+객관적이고 전문적인 분석을 제공해주세요."""
+
 class DocsAgent:
     """문서 자동생성 및 규정 위반 검색 Agent"""
     
     def __init__(self):
         self.embedding_service = EmbeddingService()
         self.openai_client = None
+        self._employee_db = None
         
         # OpenAI 클라이언트 초기화
         try:
             if settings.openai_api_key:
-                self.openai_client = OpenAI(api_key=settings.openai_api_key)
+                from openai import OpenAI
+                
+                self.openai_client = OpenAI(
+                    api_key=settings.openai_api_key,
+                    base_url=settings.openai_base_url,
+                    timeout=settings.openai_timeout
+                )
                 logger.info("Docs Agent OpenAI 클라이언트 초기화 성공")
         except Exception as e:
             logger.warning(f"Docs Agent OpenAI 클라이언트 초기화 실패: {str(e)}")
@@ -91,8 +138,25 @@ class DocsAgent:
                 "metadata": {"error": str(e), "agent": "docs_agent"}
             }
     
+    async def prepare_batch(self, items: List[Tuple[Dict[str, Any], str]]):
+        """배치 요청 준비: 규정 위반 검색 질의를 한 번에 임베딩"""
+        contents = [
+            args.get("content", message) for args, message in items
+            if args.get("task_type") == "regulation_violation"
+        ]
+        if contents:
+            await asyncio.to_thread(get_violation_index().warm, contents)
+    
     async def _generate_document(self, args: Dict[str, Any], content: str) -> Dict[str, Any]:
-        """문서 자동 생성"""
+        """문서 자동 생성 (사내 양식이 지정되거나 언급되면 양식 채우기)"""
+        try:
+            library = get_template_library()
+            form = library.get(args.get("template_name")) or library.match(content)
+            if form is not None:
+                return await self._fill_form(form, args, content)
+        except Exception as e:
+            logger.warning(f"문서 양식 작성 실패, 일반 문서 생성으로 전환: {str(e)}")
+        
         try:
             document_template = args.get("document_template", "report")
             template_info = self.document_templates.get(document_template, self.document_templates["report"])
@@ -101,31 +165,30 @@ class DocsAgent:
                 return await self._fallback_document_generation(content, template_info)
             
             # OpenAI를 사용한 문서 생성
-            system_prompt = f"""당신은 전문적인 문서 작성 AI입니다.
-            
-요청된 문서 타입: {template_info['name']}
-문서 구조: {' → '.join(template_info['structure'])}
-형식: {template_info['format']}
-
-한국어로 전문적이고 체계적인 문서를 작성해주세요.
-각 섹션을 명확히 구분하고, 내용은 구체적이고 실용적으로 작성해주세요."""
-
-            response = self.openai_client.chat.completions.create(
-                model="gpt-4o",
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": f"다음 내용을 바탕으로 {template_info['name']}를 작성해주세요:\n\n{content}"}
-                ],
-                temperature=0.7,
-                max_tokens=2000
+            template_spec = (
+                f"요청된 문서 타입: {template_info['name']}\n"
+                f"문서 구조: {' → '.join(template_info['structure'])}\n"
+                f"형식: {template_info['format']}"
             )
-            
-            generated_document = response.choices[0].message.content
+
+            with span("llm.synthesis"):
+                generated_document, cache_hit = await asyncio.to_thread(
+                    cached_completion, self.openai_client, "generate_document", document_template,
+                    model="gpt-4o",
+                    messages=layout_messages(
+                        "generate_document", DOCUMENT_SYSTEM_PROMPT,
+                        f"다음 내용을 바탕으로 {template_info['name']}를 작성해주세요:\n\n{content}",
+                        context=template_spec
+                    ),
+                    temperature=0.7,
+                    max_tokens=2000
+                )
             
             # 메타데이터 생성
             metadata = {
                 "agent": "docs_agent",
                 "task_type": "generate_document",
+                "llm_cache": "hit" if cache_hit else "miss",
                 "document_type": document_template,
                 "template_structure": template_info['structure'],
                 "generated_at": datetime.now().isoformat(),
@@ -142,39 +205,154 @@ class DocsAgent:
             logger.error(f"문서 생성 실패: {str(e)}")
             return await self._fallback_document_generation(content, template_info)
     
+    async def _fill_form(self, form: Dict[str, Any], args: Dict[str, Any], content: str) -> Dict[str, Any]:
+        """
+        사내 양식 작성
+        
+        성명·소속·기간·목표/실적 등 정형 필드는 직원 데이터로 결정적으로 채우고,
+        서술형 필드와 섹션만 LLM 한 번 호출로 작성합니다.
+        """
+        # 직원 Excel/조직 그래프 조회는 동기 I/O이므로 스레드에서 실행
+        values = await asyncio.to_thread(self._employee_values, args.get("employee"), content)
+        values.update({str(key).replace(" ", ""): value for key, value in (args.get("fields") or {}).items()})
+        
+        blocks = [block for block in free_text_blocks(form) if block["key"] not in values]
+        free_text = {}
+        if blocks and self.openai_client:
+            known = "\n".join(f"- {key}: {value}" for key, value in values.items() if value not in (None, ""))
+            wanted = "\n".join(f'- "{block["key"]}": {block["label"]}' for block in blocks)
+            form_spec = f"""양식: {form['title']}
+
+작성할 항목 (JSON 키: 항목명):
+{wanted}
+
+참고 데이터:
+{known or '- 없음'}"""
+            
+            try:
+                with span("llm.synthesis"):
+                    answer, _ = await asyncio.to_thread(
+                        cached_completion, self.openai_client, "generate_document", form["name"],
+                        model="gpt-4o",
+                        messages=layout_messages("generate_document", FORM_SYSTEM_PROMPT, content, context=form_spec),
+                        temperature=0.5,
+                        max_tokens=800,
+                        response_format={"type": "json_object"}
+                    )
+                free_text = {key: str(text) for key, text in json.loads(answer).items()}
+            except Exception as e:
+                logger.warning(f"양식 서술형 항목 작성 실패: {str(e)}")
+        
+        result = fill_template(form, values, free_text)
+        if blocks and not free_text:
+            result["document"] += "\n\n※ 서술형 항목 작성을 위해서는 OpenAI API 키를 설정해주세요."
+        logger.info(f"📄 양식 작성: {form['name']} (필드 {len(result['filled'])}개 채움, 미기재 {len(result['missing'])}개)")
+        
+        return {
+            "response": result["document"],
+            "sources": [{"type": "document_template", "template": form["name"], "source": form.get("source")}],
+            "metadata": {
+                "agent": "docs_agent",
+                "task_type": "generate_document",
+                "document_type": "form",
+                "template_name": form["name"],
+                "mode": "template",
+                "employee": values.get("name"),
+                "filled_fields": result["filled"],
+                "missing_fields": result["missing"],
+                "llm_sections": sum(1 for block in blocks if free_text.get(block["key"])),
+                "generated_at": datetime.now().isoformat()
+            }
+        }
+    
+    def _employee_values(self, employee: Optional[str], content: str) -> Dict[str, Any]:
+        """양식 필드용 직원 데이터 (성명, 소속, 직급, 최근 월 목표/실적)"""
+        if self._employee_db is None:
+            from ..employee_agent.database_service import DatabaseService as EmployeeDatabaseService
+            self._employee_db = EmployeeDatabaseService()
+        
+        # 직원을 지정하지 않으면 요청 문장에 정확히 나온 이름만 사용
+        matches = [
+            match for match in self._employee_db.search_employee("name", employee or content)
+            if employee or match.get("match_type") == "name_exact"
+        ]
+        if not matches:
+            return {}
+        
+        graph = self._employee_db.get_org_graph()
+        top = [match["data"] for match in matches if match.get("score") == matches[0].get("score")]
+        if graph is None:
+            profile, performance = top[0], {}
+        else:
+            # 동명이인은 실적 자료가 있는 직원 우선
+            ranked = sorted(
+                ((graph.employee_performance(int(data["사번"])), data) for data in top if "사번" in data),
+                key=lambda item: -item[0].get("actual", 0.0)
+            ) or [({}, top[0])]
+            performance, profile = ranked[0]
+        
+        values = {
+            "name": profile.get("성명"),
+            "department": profile.get("부서"),
+            "position": profile.get("직급"),
+        }
+        if performance and graph.months:
+            latest = graph.months[-1]
+            year = [month for month in graph.months if month // 100 == latest // 100]
+            employee_id = performance["employee_id"]
+            month = graph.employee_performance(employee_id, [latest])
+            annual = graph.employee_performance(employee_id, year)
+            basis = f"({latest // 100}-{latest % 100:02d} 기준)"
+            values.update({
+                "month": f"{latest % 100}월",
+                "target": f"{month['target']:,.0f} {basis}",
+                "actual": f"{month['actual']:,.0f} {basis}",
+                "achievement_rate": f"{month['achievement_rate'] * 100:.1f}%" if month["achievement_rate"] is not None else None,
+                "cumulative_actual": f"{annual['actual']:,.0f} ({latest // 100}년 누계)",
+                "annual_target": f"{annual['target']:,.0f}",
+            })
+        return values
+    
     async def _compliance_check(self, args: Dict[str, Any], content: str) -> Dict[str, Any]:
-        """컴플라이언스 검토"""
+        """
+        컴플라이언스 검토
+        
+        규칙 엔진으로 먼저 선별해 위반이 명확하거나 모든 한도 이내인 경우는 조항 인용과 함께 바로 응답하고,
+        판단이 필요한 경우(금액 미기재, 검토형 규칙)나 규칙에 해당하지 않는 질의만 LLM으로 검토합니다.
+        """
         try:
             regulation_category = args.get("regulation_category", "general")
             category_name = self.regulation_categories.get(regulation_category, "일반 규정")
             
+            screening = self._screen_compliance(content, regulation_category)
+            if screening is not None and screening["findings"] and (
+                screening["status"] != "ambiguous" or not self.openai_client or not llm_breaker.available()
+            ):
+                return self._rule_compliance_result(screening, regulation_category, category_name)
+            
             if not self.openai_client:
                 return await self._fallback_compliance_check(content, category_name)
             
-            # OpenAI를 사용한 컴플라이언스 검토
-            system_prompt = f"""당신은 기업 컴플라이언스 전문가입니다.
-            
-검토 대상 규정 카테고리: {category_name}
-
-다음 내용을 검토하여:
-1. 잠재적 위험 요소 식별
-2. 규정 준수 여부 판단
-3. 개선 권고사항 제시
-4. 위험도 평가 (높음/중간/낮음)
-
-한국의 기업 법규와 일반적인 컴플라이언스 기준을 바탕으로 분석해주세요."""
+            # OpenAI를 사용한 컴플라이언스 검토 (규칙 엔진이 찾은 조항을 근거로 제공)
+            clauses = ""
+            if screening is not None and screening["findings"]:
+                clauses = "\n\n관련 조항 (사내 규정 엔진 선별):\n" + "\n".join(
+                    f"- [{finding['title']}] {finding['detail']}: {finding['citation']['clause']}"
+                    for finding in screening["findings"]
+                )
 
-            response = self.openai_client.chat.completions.create(
-                model="gpt-4o",
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": f"다음 내용에 대한 컴플라이언스 검토를 해주세요:\n\n{content}"}
-                ],
-                temperature=0.3,  # 일관된 분석을 위해 낮은 temperature
-                max_tokens=1500
-            )
-            
-            compliance_analysis = response.choices[0].message.content
+            with span("llm.synthesis"):
+                compliance_analysis, cache_hit = await asyncio.to_thread(
+                    cached_completion, self.openai_client, "compliance_check", regulation_category,
+                    model="gpt-4o",
+                    messages=layout_messages(
+                        "compliance_check", COMPLIANCE_SYSTEM_PROMPT,
+                        f"다음 내용에 대한 컴플라이언스 검토를 해주세요:\n\n{content}",
+                        context=f"검토 대상 규정 카테고리: {category_name}{clauses}"
+                    ),
+                    temperature=0.3,  # 일관된 분석을 위해 낮은 temperature
+                    max_tokens=1500
+                )
             
             # 위험도 추출 (간단한 키워드 기반)
             risk_level = "중간"
@@ -186,21 +364,98 @@ class DocsAgent:
             metadata = {
                 "agent": "docs_agent",
                 "task_type": "compliance_check",
+                "llm_cache": "hit" if cache_hit else "miss",
                 "regulation_category": regulation_category,
                 "risk_level": risk_level,
+                "screening": screening["status"] if screening is not None else None,
                 "analyzed_at": datetime.now().isoformat()
             }
             
             return {
                 "response": f"🔍 {category_name} 컴플라이언스 검토 결과\n\n{compliance_analysis}",
-                "sources": [{"type": "compliance_analysis", "category": regulation_category, "risk_level": risk_level}],
+                "sources": self._rule_sources(screening) + [
+                    {"type": "compliance_analysis", "category": regulation_category, "risk_level": risk_level}
+                ],
                 "metadata": metadata
             }
             
+        except CircuitOpen:
+            # OpenAI 장애 중: 규칙 엔진 결과가 있으면 그대로, 없으면 기본 체크리스트로 즉시 응답
+            if screening is not None and screening["findings"]:
+                return self._rule_compliance_result(screening, regulation_category, category_name)
+            return await self._fallback_compliance_check(content, category_name)
         except Exception as e:
             logger.error(f"컴플라이언스 검토 실패: {str(e)}")
             return await self._fallback_compliance_check(content, category_name)
     
+    def _screen_compliance(self, content: str, regulation_category: str) -> Optional[Dict[str, Any]]:
+        """규칙 엔진 사전 선별 (규정 문서를 읽을 수 없으면 None)"""
+        try:
+            from .compliance_rules import get_rule_engine
+            
+            with span("compliance.screen"):
+                return get_rule_engine().scan(content, regulation_category)
+        except Exception as e:
+            logger.warning(f"컴플라이언스 규칙 선별 실패: {str(e)}")
+            return None
+    
+    @staticmethod
+    def _rule_sources(screening: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """선별 결과의 근거 조항 (규칙당 1건)"""
+        sources = {}
+        for finding in (screening or {}).get("findings", []):
+            sources.setdefault(finding["rule_id"], {
+                "type": "compliance_rule",
+                "rule_id": finding["rule_id"],
+                "source": finding["citation"]["source"],
+                "clause": finding["citation"]["clause"]
+            })
+        return list(sources.values())
+    
+    def _rule_compliance_result(self, screening: Dict[str, Any], regulation_category: str,
+                                category_name: str) -> Dict[str, Any]:
+        """규칙 엔진 판정 결과 응답 (LLM 미사용)"""
+        icons = {"violation": "❌", "ambiguous": "⚠️", "clear": "✅"}
+        labels = {"violation": "위반", "ambiguous": "검토 필요", "clear": "한도 이내"}
+        findings = screening["findings"]
+        counts = [
+            f"{icons[status]} {labels[status]} {sum(1 for f in findings if f['status'] == status)}건"
+            for status in ("violation", "ambiguous", "clear")
+            if any(f["status"] == status for f in findings)
+        ]
+        lines = [
+            f"🔍 {category_name} 컴플라이언스 검토 결과 (사내 규정 사전 검토)",
+            "",
+            f"위험도: {screening['risk_level']}",
+            " · ".join(counts),
+        ]
+        for number, finding in enumerate(findings, 1):
+            clause = finding["citation"]["clause"]
+            lines.extend([
+                "",
+                f"{number}. {icons[finding['status']]} {finding['title']}",
+                f"   - 내용: {finding['line'][:100]}",
+                f"   - 판정: {finding['detail']}",
+                f"   - 근거: {Path(finding['citation']['source']).stem} 「{clause[:120]}{'...' if len(clause) > 120 else ''}」",
+            ])
+        if screening["status"] == "ambiguous":
+            lines.extend(["", "※ 금액·인원 등 판단 정보를 보완하거나 자율준수관리자에게 확인하세요."])
+        
+        return {
+            "response": "\n".join(lines),
+            "sources": self._rule_sources(screening),
+            "metadata": {
+                "agent": "docs_agent",
+                "task_type": "compliance_check",
+                "regulation_category": regulation_category,
+                "risk_level": screening["risk_level"],
+                "screening": screening["status"],
+                "mode": "rule_engine",
+                "violations": sum(1 for f in findings if f["status"] == "violation"),
+                "analyzed_at": datetime.now().isoformat()
+            }
+        }
+    
     async def _regulation_violation_check(self, args: Dict[str, Any], content: str) -> Dict[str, Any]:
         """규정 위반 검색 및 분석"""
         try:
@@ -214,34 +469,24 @@ class DocsAgent:
                 return await self._fallback_violation_check(content, category_name, violation_results)
             
             # OpenAI를 사용한 위반 분석
-            system_prompt = f"""당신은 규정 위반 분석 전문가입니다.
-            
-분석 대상 규정: {category_name}
-
-다음을 수행해주세요:
-1. 구체적인 위반 내용 식별
-2. 관련 규정 조항 참조
-3. 위반 심각도 평가
-4. 시정 조치 방안 제시
-5. 재발 방지 대책 권고
-
-객관적이고 전문적인 분석을 제공해주세요."""
-
             context = f"검토 대상:\n{content}\n\n"
             if violation_results:
-                context += f"유사 사례:\n{chr(10).join([case['content'][:200] + '...' for case in violation_results[:3]])}"
+                context += "유사 조항/사례:\n" + "\n\n".join(
+                    f"[{case['source']} {case['metadata']['title']}]\n{case['content'][:300]}"
+                    for case in violation_results[:3]
+                )
 
-            response = self.openai_client.chat.completions.create(
-                model="gpt-4o",
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": context}
-                ],
-                temperature=0.2,
-                max_tokens=1500
-            )
-            
-            violation_analysis = response.choices[0].message.content
+            with span("llm.synthesis"):
+                violation_analysis, cache_hit = await asyncio.to_thread(
+                    cached_completion, self.openai_client, "regulation_violation", regulation_category,
+                    model="gpt-4o",
+                    messages=layout_messages(
+                        "regulation_violation", VIOLATION_SYSTEM_PROMPT, context,
+                        context=f"분석 대상 규정: {category_name}"
+                    ),
+                    temperature=0.2,
+                    max_tokens=1500
+                )
             
             # 위반 심각도 추출
             severity = "중간"
@@ -253,6 +498,7 @@ class DocsAgent:
             metadata = {
                 "agent": "docs_agent",
                 "task_type": "regulation_violation",
+                "llm_cache": "hit" if cache_hit else "miss",
                 "regulation_category": regulation_category,
                 "severity": severity,
                 "similar_cases_found": len(violation_results),
@@ -265,27 +511,17 @@ class DocsAgent:
                 "metadata": metadata
             }
             
+        except CircuitOpen:
+            return await self._fallback_violation_check(content, category_name, violation_results)
         except Exception as e:
             logger.error(f"규정 위반 검색 실패: {str(e)}")
             return await self._fallback_violation_check(content, category_name, [])
     
     async def _search_violation_cases(self, content: str, category: str) -> List[Dict[str, Any]]:
-        """유사한 위반 사례 검색"""
+        """유사한 위반 사례 검색 (규정 조항·과거 사례 벡터 색인, 질의 문장 일괄 임베딩)"""
         try:
-            if not self.embedding_service.is_available():
-                return []
-            
-            # 간단한 위반 사례 데이터베이스 (실제로는 ChromaDB나 별도 DB에서 조회)
-            sample_cases = [
-                {
-                    "content": f"{category} 관련 위반 사례: 규정을 준수하지 않은 경우입니다.",
-                    "metadata": {"category": category, "type": "violation_case"},
-                    "score": 0.7,
-                    "source": "violation_database"
-                }
-            ]
-            
-            return sample_cases
+            with span("violation.search"):
+                return await asyncio.to_thread(get_violation_index().search, content, 5, category)
             
         except Exception as e:
             logger.error(f"위반 사례 검색 실패: {str(e)}")
@@ -338,8 +574,13 @@ class DocsAgent:
 1. 규정 준수 여부 확인 필요
 2. 잠재적 위험 요소 검토 필요
 3. 전문가 상담 권장
-
-※ 정확한 위반 분석을 위해서는 OpenAI API 키를 설정해주세요."""
+"""
+        if violation_results:
+            fallback_analysis += "\n관련 조항/사례:\n" + "\n".join(
+                f"- [{case['source']}] {case['metadata']['title'] or case['content'][:40]}"
+                for case in violation_results[:3]
+            ) + "\n"
+        fallback_analysis += "\n※ 정확한 위반 분석을 위해서는 OpenAI API 키를 설정해주세요."
 
         return {
             "response": fallback_analysis,
@@ -351,6 +592,7 @@ class DocsAgent:
         """사용 가능한 문서 템플릿 목록"""
         return {
             "templates": self.document_templates,
+            "forms": get_template_library().summary(),
             "categories": self.regulation_categories
         }
     
@@ -362,5 +604,6 @@ class DocsAgent:
             "embedding_available": self.embedding_service.is_available(),
             "supported_tasks": ["generate_document", "compliance_check", "regulation_violation"],
             "document_templates": list(self.document_templates.keys()),
+            "document_forms": list(get_template_library().templates().keys()),
             "regulation_categories": list(self.regulation_categories.keys())
         } 
\ No newline at end of file
@@ -6,20 +6,38 @@ Docs Agent Embedding Service
 
 import logging
 from typing import List, Dict, Any, Optional
+from ....core import embeddings
 
 logger = logging.getLogger(__name__)
 
 class EmbeddingService:
-    """문서 임베딩 서비스 (기본 구현)"""
+    """문서 임베딩 서비스 (Agent 공유 임베딩 모델·캐시 사용)"""
     
     def __init__(self):
         logger.info("Docs Agent EmbeddingService 초기화 완료")
     
+    def is_available(self) -> bool:
+        """임베딩 모델 사용 가능 여부"""
+        return embeddings.is_available()
+    
     def embed_text(self, text: str) -> List[float]:
         """텍스트 임베딩"""
         logger.info(f"문서 텍스트 임베딩 요청: {text[:50]}...")
-        return [0.0] * 768
+        vectors = embeddings.encode([text])
+        if vectors is None:
+            return [0.0] * 768
+        return vectors[0].tolist()
+    
+    def embed_queries(self, queries: List[str]) -> List[List[float]]:
+        """질의 목록 일괄 임베딩 (공유 캐시에 적재)"""
+        vectors = embeddings.encode(queries)
+        if vectors is None:
+            return [[0.0] * 768 for _ in queries]
+        return vectors.tolist()
     
     def embed_documents(self, documents: List[str]) -> List[List[float]]:
         """문서 목록 임베딩"""
-        return [self.embed_text(doc) for doc in documents] 
\ No newline at end of file
+        vectors = embeddings.encode(documents, use_cache=False)
+        if vectors is None:
+            return [[0.0] * 768 for _ in documents]
+        return vectors.tolist()
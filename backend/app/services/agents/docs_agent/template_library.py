@@ -0,0 +1,368 @@
+"""
+Document Template Library
+
+database/raw_data/문서양식의 보고서 양식(.doc/.docx)을 한 번 파싱해 구조(블록 목록)로 캐시하고,
+구조화된 데이터로 필드를 결정적으로 채웁니다.
+
+블록 종류
+- field: 라벨 + 값 칸 (value_type: text / date / period)
+- section: "■ 제목" 또는 "1. 제목" 형태의 서술형 영역
+- table: 연속된 라벨 행(열 제목)과 행 라벨
+- text: 안내 문구, 맺음말
+- date: 작성일 자리 ("20  년  월  일")
+- signature: 서명란 ("보 고 자 :   (인)")
+
+서술형 필드와 섹션(free_text)만 LLM이 작성하고, 나머지는 데이터로 채웁니다.
+"""
+
+import json
+import logging
+import re
+import threading
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .doc_reader import CELL_MARK, PARAGRAPH_MARK, READERS, read_word_text
+
+logger = logging.getLogger(__name__)
+
+CACHE_VERSION = 1
+
+# 결재란 등 양식 내용과 무관한 칸
+SKIP_TOKENS = {"담당", "결", "재", "결재", "이사", "전무이사", "대표이사", "y"}
+
+# 라벨에 포함되면 서술형(LLM 작성) 필드
+FREE_TEXT_HINTS = ("내용", "사항", "계획", "결과", "의견", "개요", "기타", "분석", "평가", "원칙", "비고")
+
+# 필드 키(공백 제거 라벨) → 데이터 키
+FIELD_BINDINGS = {
+    "성명": "name", "보고자": "name", "작성자": "name", "방문자": "name", "담당자명": "name", "대리인": "name",
+    "소속": "department", "부서": "department", "부서명": "department", "현소속": "department",
+    "직급": "position", "현직급": "position",
+    "기간": "period", "작성일자": "date", "방문일": "date", "월분": "month",
+    "목표": "target", "올해목표량": "annual_target", "실적": "actual", "누적실적": "cumulative_actual",
+    "달성도": "achievement_rate",
+}
+
+# 양식 제목으로 보고 주기 판단 (기간 필드 계산)
+CADENCE_HINTS = (("일일", "daily"), ("주간", "weekly"), ("월간", "monthly"))
+
+_FIELD_CODE = re.compile(r"\x13[^\x13\x14\x15]*\x14")
+_HYPERLINK_TITLE = re.compile(r"\x13[^\x14]*\x14([^\x15]*)\x15")
+_CONTROL = re.compile(r"[\x01\x08\x0c\x13\x14\x15]")
+_DATE = re.compile(r"^(20\s*)?년\s*월\s*일$")
+_PERIOD = re.compile(r"년.*월.*일.*~.*년.*월.*일")
+_SIGNATURE = re.compile(r"^(.+?)\s*:\s*\((인|서명)\)$")
+_NUMBERED = re.compile(r"^(\d+|[A-Z])\.\s*\S")
+_SENTENCE = re.compile(r"(니다|한다|하다)\.?$")
+
+
+def _normalize(text: str) -> str:
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def field_key(label: str) -> str:
+    """라벨 → 필드 키 (괄호 설명과 공백 제거: "고객사 개요(신규...)" → "고객사개요")"""
+    return re.sub(r"\s+", "", re.sub(r"\(.*?\)", "", label)) or re.sub(r"\s+", "", label)
+
+
+def _title(raw: str, tokens: List[str], fallback: str) -> Tuple[str, List[str]]:
+    """양식 제목과 제목을 제외한 토큰 (하이퍼링크 제목 우선, 없으면 첫 문단)"""
+    match = _HYPERLINK_TITLE.search(raw)
+    if match:
+        return _normalize(match.group(1)) or fallback, tokens
+    for position, token in enumerate(tokens):
+        if token:
+            # "영 업 비 밀 보 호 서 약 서" 처럼 자간을 띄운 제목
+            pieces = token.split(" ")
+            title = "".join(pieces) if all(len(piece) == 1 for piece in pieces) else token
+            return title, tokens[position + 1:]
+    return fallback, tokens
+
+
+def _is_free_text(key: str) -> bool:
+    return any(hint in key for hint in FREE_TEXT_HINTS)
+
+
+def parse_template(raw: str, name: str) -> Dict[str, Any]:
+    """
+    Word 양식 텍스트(단락/셀 제어 문자 포함) → 양식 구조
+
+    Returns: {"name", "title", "blocks", "fields"}
+    """
+    body = _HYPERLINK_TITLE.sub(CELL_MARK, raw, count=1)
+    body = _CONTROL.sub("", _FIELD_CODE.sub("", body))
+    tokens = [_normalize(token) for token in re.split(f"[{PARAGRAPH_MARK}{CELL_MARK}]", body)]
+    title, tokens = _title(raw, tokens, name)
+    tokens = [re.sub(r"(?<=[가-힣])y(?=\s)", "", token) for token in tokens]  # 도형 고정 문자
+
+    blocks: List[Dict[str, Any]] = []
+    seen: Dict[str, int] = {}
+
+    def add_field(label: str, value_type: str = "text"):
+        key = field_key(label)
+        seen[key] = seen.get(key, 0) + 1
+        if seen[key] > 1:
+            key = f"{key}_{seen[key]}"
+        blocks.append({"kind": "field", "key": key, "label": label, "value_type": value_type,
+                       "free_text": value_type == "text" and _is_free_text(key)})
+
+    def is_label(token: str) -> bool:
+        key = field_key(token)
+        return bool(key) and len(key) <= 14 and key not in SKIP_TOKENS and not (
+            token.startswith(("■", "-", "<", "※")) or _NUMBERED.match(token) or _DATE.match(token)
+            or _PERIOD.search(token) or _SENTENCE.search(token) or "○" in token or ":" in token)
+
+    table: Optional[Dict[str, Any]] = None
+    position = 0
+    while position < len(tokens):
+        token = tokens[position]
+        position += 1
+        if not token or field_key(token) in SKIP_TOKENS or (token.startswith("(") and token.endswith(")")):
+            continue
+
+        if token.startswith("■") or _NUMBERED.match(token):
+            heading = token.lstrip("■ ").strip()
+            if ":" in heading:
+                label, value = (part.strip() for part in heading.split(":", 1))
+                add_field(label, "date" if _DATE.match(value) else "text")
+            else:
+                blocks.append({"kind": "section", "key": field_key(heading), "label": heading, "free_text": True})
+            table = None
+            continue
+
+        signature = _SIGNATURE.match(token)
+        if signature:
+            blocks.append({"kind": "signature", "key": field_key(signature.group(1)), "label": signature.group(1)})
+            continue
+        if token.endswith(":"):
+            add_field(token[:-1].strip())
+            continue
+        if _DATE.match(token) or _PERIOD.search(token):
+            # 바로 앞 라벨의 값 칸이면 그 필드의 값 형식, 아니면 작성일
+            previous = blocks[-1] if blocks else None
+            if previous and previous["kind"] == "field" and tokens[position - 2] == previous["label"]:
+                previous["value_type"] = "period" if _PERIOD.search(token) else "date"
+                previous["free_text"] = False
+            else:
+                blocks.append({"kind": "date", "key": "작성일"})
+            continue
+        if not is_label(token):
+            blocks.append({"kind": "text", "text": token})
+            continue
+
+        # 라벨이 연속되면 표의 열 제목, 값 칸(빈 칸)이 뒤따르면 필드
+        run = [token]
+        while position < len(tokens) and tokens[position] and is_label(tokens[position]):
+            run.append(tokens[position])
+            position += 1
+        if len(run) > 1:
+            if blocks and blocks[-1]["kind"] == "section":
+                blocks[-1]["free_text"] = False  # 표 제목 역할
+            table = {"kind": "table", "columns": run, "rows": []}
+            blocks.append(table)
+        elif table is not None and (len(field_key(token)) <= 2 or field_key(token).isdigit()):
+            table["rows"].append(token)
+        elif len(field_key(token)) > 1:
+            table = None
+            add_field(token)
+
+    return {
+        "name": name,
+        "title": title,
+        "blocks": blocks,
+        "fields": [block["key"] for block in blocks if block["kind"] == "field"],
+    }
+
+
+def free_text_blocks(template: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """LLM이 작성할 서술형 필드/섹션"""
+    return [block for block in template["blocks"] if block.get("free_text")]
+
+
+def cadence(template: Dict[str, Any]) -> Optional[str]:
+    for hint, value in CADENCE_HINTS:
+        if hint in template["title"] or hint in template["name"]:
+            return value
+    return None
+
+
+def period_for(template: Dict[str, Any], today: date) -> str:
+    """보고 주기에 맞는 기간 (주간: 이번 주 월~일, 월간: 이번 달, 그 외: 오늘)"""
+    kind = cadence(template)
+    if kind == "weekly":
+        start = today - timedelta(days=today.weekday())
+        return f"{start.isoformat()} ~ {(start + timedelta(days=6)).isoformat()}"
+    if kind == "monthly":
+        start = today.replace(day=1)
+        end = (start + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+        return f"{start.isoformat()} ~ {end.isoformat()}"
+    return today.isoformat()
+
+
+def _base_key(key: str) -> str:
+    return key.rsplit("_", 1)[0] if re.search(r"_\d+$", key) else key
+
+
+def fill_template(template: Dict[str, Any], values: Dict[str, Any],
+                  free_text: Optional[Dict[str, str]] = None, today: Optional[date] = None) -> Dict[str, Any]:
+    """
+    양식 채우기 (결정적)
+
+    Args:
+        values: 데이터 키(name, department, ...) 또는 필드 키(라벨)별 값. 필드 키가 우선
+        free_text: 서술형 필드/섹션 키별 본문
+
+    Returns: {"document", "filled", "missing"}
+    """
+    today = today or date.today()
+    free_text = free_text or {}
+    values = {"date": f"{today.year}년 {today.month}월 {today.day}일", "period": period_for(template, today), **values}
+
+    def value_of(key: str) -> Optional[str]:
+        for candidate in (key, _base_key(key)):
+            if values.get(candidate) not in (None, ""):
+                return str(values[candidate])
+        binding = FIELD_BINDINGS.get(_base_key(key))
+        if binding and values.get(binding) not in (None, ""):
+            return str(values[binding])
+        return None
+
+    lines = [f"📄 {template['title']}", ""]
+    filled, missing = [], []
+    for block in template["blocks"]:
+        kind = block["kind"]
+        if kind == "field":
+            value = free_text.get(block["key"]) if block["free_text"] else None
+            value = value or value_of(block["key"])
+            (filled if value else missing).append(block["key"])
+            lines.append(f"• {block['label']}: {value or ''}".rstrip())
+        elif kind == "section":
+            lines.extend(["", f"■ {block['label']}"])
+            if block["free_text"]:
+                text = free_text.get(block["key"]) or value_of(block["key"])
+                (filled if text else missing).append(block["key"])
+                lines.append(text or "-")
+        elif kind == "table":
+            columns = block["columns"]
+            lines.extend(["", "| " + " | ".join(columns) + " |", "|" + "---|" * len(columns)])
+            for row in block["rows"] or [""]:
+                lines.append("| " + " | ".join([row] + [""] * (len(columns) - 1)) + " |")
+            lines.append("")
+        elif kind == "text":
+            lines.extend(["", block["text"]])
+        elif kind == "date":
+            lines.extend(["", values["date"]])
+        elif kind == "signature":
+            lines.append(f"{block['label']}: {value_of(block['key']) or values.get('name', '')} (인)")
+
+    document = re.sub(r"\n{3,}", "\n\n", "\n".join(lines)).strip()
+    return {"document": document, "filled": filled, "missing": missing}
+
+
+class TemplateLibrary:
+    """문서양식 폴더의 파싱된 양식 모음 (원본 파일 수정 시각 기준 JSON 캐시)"""
+
+    def __init__(self, template_dir: Path, cache_path: Path):
+        self.template_dir = Path(template_dir)
+        self.cache_path = Path(cache_path)
+        self._templates: Dict[str, Dict[str, Any]] = {}
+        self._key: Optional[List[Any]] = None
+        self._lock = threading.Lock()
+
+    def _source_key(self) -> List[Any]:
+        if not self.template_dir.exists():
+            return []
+        return [
+            [path.name, path.stat().st_mtime]
+            for path in sorted(self.template_dir.iterdir())
+            if path.suffix.lower() in READERS and not path.name.startswith("~$")
+        ]
+
+    def _read_cache(self, key: List[Any]) -> Optional[Dict[str, Dict[str, Any]]]:
+        try:
+            data = json.loads(self.cache_path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, ValueError):
+            return None
+        if data.get("version") != CACHE_VERSION or data.get("source") != key:
+            return None
+        return data["templates"]
+
+    def _parse_all(self, key: List[Any]) -> Dict[str, Dict[str, Any]]:
+        started = time.perf_counter()
+        templates = {}
+        for file_name, _ in key:
+            path = self.template_dir / file_name
+            try:
+                template = parse_template(read_word_text(path), path.stem)
+            except Exception as e:
+                logger.warning(f"문서 양식 파싱 실패 ({file_name}): {str(e)}")
+                continue
+            template["source"] = file_name
+            templates[path.stem] = template
+        logger.info(f"📄 문서 양식 {len(templates)}개 파싱 ({(time.perf_counter() - started) * 1000:.1f}ms)")
+
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            payload = {"version": CACHE_VERSION, "source": key, "templates": templates}
+            self.cache_path.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+        except OSError as e:
+            logger.warning(f"문서 양식 캐시 저장 실패: {str(e)}")
+        return templates
+
+    def templates(self) -> Dict[str, Dict[str, Any]]:
+        """양식 이름(파일명) → 양식 구조 (원본이 바뀌었을 때만 다시 파싱)"""
+        key = self._source_key()
+        with self._lock:
+            if self._key != key:
+                cached = self._read_cache(key)
+                self._templates = cached if cached is not None else self._parse_all(key)
+                self._key = key
+            return self._templates
+
+    def get(self, name: Optional[str]) -> Optional[Dict[str, Any]]:
+        """양식 이름 또는 제목으로 조회 (공백 무시)"""
+        if not name:
+            return None
+        return self.match(name, exact=True)
+
+    def match(self, text: str, exact: bool = False) -> Optional[Dict[str, Any]]:
+        """문장에 양식 이름/제목이 포함되면 해당 양식 (가장 긴 이름 우선)"""
+        compact = re.sub(r"\s+", "", text or "")
+        candidates = []
+        for template in self.templates().values():
+            for label in (template["name"], template["title"], re.sub(r"\(.*?\)", "", template["name"])):
+                label = re.sub(r"\s+", "", label)
+                if label and (compact == label if exact else label in compact):
+                    candidates.append((len(label), template["name"], template))
+        return max(candidates, key=lambda item: item[:2])[2] if candidates else None
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """양식 목록 (이름, 제목, 필드, 서술형 항목)"""
+        return [
+            {
+                "name": template["name"],
+                "title": template["title"],
+                "fields": template["fields"],
+                "free_text": [block["key"] for block in free_text_blocks(template)],
+            }
+            for template in self.templates().values()
+        ]
+
+
+_libraries: Dict[str, TemplateLibrary] = {}
+_libraries_lock = threading.Lock()
+
+
+def get_template_library() -> TemplateLibrary:
+    """설정 경로의 공유 양식 라이브러리"""
+    from ....core.config import settings
+
+    template_dir = Path(settings.project_root) / "database" / "raw_data" / "문서양식"
+    cache_path = Path(settings.sqlite_db_path) / "document_templates.json"
+    with _libraries_lock:
+        if str(cache_path) not in _libraries:
+            _libraries[str(cache_path)] = TemplateLibrary(template_dir, cache_path)
+        return _libraries[str(cache_path)]
@@ -0,0 +1,305 @@
+"""
+Violation Case Index
+
+규정 위반 사례 검색용 벡터 색인.
+
+- 외부자료의 컴플라이언스 규정·법령 문서(docx)와 위반사례 폴더의 과거 사례 메모(txt/md/docx)를
+  조항/절 단위 청크로 나누고 규정 카테고리(ethics/finance/hr/safety/general) 메타데이터를 붙임
+- 청크 임베딩은 Agent 공유 임베딩(app.core.embeddings)으로 계산해 원본 수정 시각·모델 기준
+  npz 파일에 캐시 (임베딩 모델이 없으면 문자 bigram 해시 벡터로 대체)
+- 검색은 질의 문장들을 한 번에 배치 임베딩한 뒤 행렬곱 한 번으로 전체 청크와 비교
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ....core import embeddings
+from .compliance_rules import read_docx_paragraphs
+
+logger = logging.getLogger(__name__)
+
+INDEX_VERSION = 1
+CHUNK_MAX_CHARS = 400
+MIN_CHUNK_CHARS = 20
+MAX_QUERY_SENTENCES = 8
+LEXICAL_DIM = 4096
+LEXICAL_MODEL = "lexical-bigram"
+
+# 문서 단위 기본 카테고리 (파일명 stem 기준)
+DOCUMENT_CATEGORIES = {
+    "컴플라이언스 규정 총정리": "ethics",
+    "리베이트 관련 법령": "ethics",
+    "지출보고서 제도 법령": "finance",
+    "의약품 판촉영업자 신고제도 관련 법률": "finance",
+    "의약품 광고심의 관련 법률": "general",
+}
+
+# 청크 내용 기준 카테고리 (문서 기본값보다 우선, 먼저 일치한 항목 적용)
+CATEGORY_KEYWORDS = [
+    ("hr", ["성희롱", "괴롭힘", "폭언", "폭행", "파벌", "징계"]),
+    ("safety", ["산업안전", "안전사고", "안전보건", "재해", "위기대응"]),
+    ("finance", ["지출보고서", "회계", "증빙", "경비", "내부자 거래", "단기매매", "공시"]),
+]
+
+CHAPTER_HEADING = re.compile(r"^제\s*\d+\s*장")
+LAW_HEADING = re.compile(r"^\S+법\s*\d+조(의?\d+)?$")
+SECTION_HEADING = re.compile(r"^\d+\.\s*\S")
+CASE_EXTENSIONS = {".txt", ".md", ".docx"}
+
+
+def categorize(text: str, default: str = "general") -> str:
+    """청크 카테고리 (키워드 우선, 없으면 문서 기본값)"""
+    for category, keywords in CATEGORY_KEYWORDS:
+        if any(keyword in text for keyword in keywords):
+            return category
+    return default
+
+
+def _is_section(paragraph: str) -> bool:
+    return bool(SECTION_HEADING.match(paragraph)) and len(paragraph) <= 40 and not paragraph.endswith("다.")
+
+
+def chunk_paragraphs(paragraphs: List[str], source: str, default_category: str,
+                     kind: str = "regulation") -> List[Dict[str, Any]]:
+    """
+    단락 목록 → 청크 목록
+
+    장(제N장)·법령 조항(OO법 N조) 제목에서 새 청크를 시작하고, 장 아래의 번호 절(1. ...)도
+    제목으로 취급합니다. 청크가 CHUNK_MAX_CHARS를 넘으면 단락 경계에서 나눕니다.
+    """
+    chunks: List[Dict[str, Any]] = []
+    chapter: Optional[str] = None
+    section: Optional[str] = None
+    body: List[str] = []
+
+    def flush():
+        text = "\n".join(body).strip()
+        body.clear()
+        if len(text) < MIN_CHUNK_CHARS:
+            return
+        title = " > ".join(part for part in (chapter, section) if part)
+        chunks.append({
+            "title": title,
+            "content": text,
+            "source": source,
+            "category": categorize(f"{title}\n{text}", default_category),
+            "type": kind,
+        })
+
+    for paragraph in paragraphs:
+        paragraph = paragraph.replace("\xa0", " ").strip()
+        if not paragraph:
+            continue
+        if CHAPTER_HEADING.match(paragraph) or LAW_HEADING.match(paragraph):
+            flush()
+            chapter, section = paragraph, None
+            continue
+        if chapter and CHAPTER_HEADING.match(chapter) and _is_section(paragraph):
+            flush()
+            section = paragraph
+            continue
+        if body and sum(len(line) for line in body) + len(paragraph) > CHUNK_MAX_CHARS:
+            flush()
+        body.append(paragraph)
+    flush()
+    return chunks
+
+
+def read_case_notes(file_path: Path) -> List[str]:
+    """위반 사례 메모 파일 → 사례 목록 (txt/md는 빈 줄로 구분, docx는 단락 단위)"""
+    if file_path.suffix.lower() == ".docx":
+        return read_docx_paragraphs(file_path)
+    text = file_path.read_text(encoding="utf-8")
+    return [case.strip() for case in re.split(r"\n\s*\n", text) if case.strip()]
+
+
+def lexical_vectors(texts: List[str]) -> np.ndarray:
+    """문자 bigram 해시 벡터 (임베딩 모델이 없을 때의 대체 표현, L2 정규화)"""
+    matrix = np.zeros((len(texts), LEXICAL_DIM), dtype=np.float32)
+    for row, text in enumerate(texts):
+        compact = re.sub(r"\s+", " ", text.lower())
+        buckets = [zlib.crc32(compact[i:i + 2].encode("utf-8")) % LEXICAL_DIM for i in range(len(compact) - 1)]
+        if buckets:
+            np.add.at(matrix[row], buckets, 1.0)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.where(norms == 0, 1.0, norms)
+
+
+def query_sentences(content: str) -> List[str]:
+    """검토 대상 전체 + 문장 단위 질의 (긴 보고서에서 특정 문장만 규정과 닮은 경우 대비)"""
+    sentences = [s.strip() for s in re.split(r"(?<=[.!?])\s+|\n+", content) if len(s.strip()) >= 8]
+    queries = [content.strip()] + sentences[:MAX_QUERY_SENTENCES]
+    return list(dict.fromkeys(query for query in queries if query))
+
+
+class ViolationIndex:
+    """규정 조항 + 과거 위반 사례 벡터 색인 (원본 수정 시각·임베딩 모델 기준 npz 캐시)"""
+
+    def __init__(self, regulation_dir: Path, case_dir: Path, cache_path: Path):
+        self.regulation_dir = Path(regulation_dir)
+        self.case_dir = Path(case_dir)
+        self.cache_path = Path(cache_path)
+        self._chunks: List[Dict[str, Any]] = []
+        self._vectors: Optional[np.ndarray] = None
+        self._categories: Optional[np.ndarray] = None
+        self._key: Optional[List[Any]] = None
+        self._lock = threading.Lock()
+
+    def _sources(self) -> List[Tuple[str, Path]]:
+        sources = []
+        if self.regulation_dir.exists():
+            sources += [("regulation", path) for path in sorted(self.regulation_dir.glob("*.docx"))
+                        if not path.name.startswith("~$")]
+        if self.case_dir.exists():
+            sources += [("violation_case", path) for path in sorted(self.case_dir.iterdir())
+                        if path.suffix.lower() in CASE_EXTENSIONS and not path.name.startswith("~$")]
+        return sources
+
+    def _source_key(self, backend: str) -> List[Any]:
+        return [INDEX_VERSION, backend] + [[kind, path.name, path.stat().st_mtime] for kind, path in self._sources()]
+
+    def _build_chunks(self) -> List[Dict[str, Any]]:
+        chunks = []
+        for kind, path in self._sources():
+            try:
+                if kind == "regulation":
+                    default = DOCUMENT_CATEGORIES.get(path.stem, "general")
+                    chunks += chunk_paragraphs(read_docx_paragraphs(path), path.name, default)
+                else:
+                    for case in read_case_notes(path):
+                        chunks += chunk_paragraphs([case], path.name, "general", kind="violation_case")
+            except Exception as e:
+                logger.warning(f"위반 사례 색인 문서 읽기 실패 ({path.name}): {str(e)}")
+        return chunks
+
+    def _read_cache(self, key: List[Any]) -> Optional[Tuple[List[Dict[str, Any]], np.ndarray]]:
+        try:
+            with np.load(self.cache_path, allow_pickle=False) as data:
+                if json.loads(str(data["key"])) != key:
+                    return None
+                return json.loads(str(data["chunks"])), data["vectors"]
+        except (FileNotFoundError, KeyError, ValueError, OSError):
+            return None
+
+    def _write_cache(self, key: List[Any], chunks: List[Dict[str, Any]], vectors: np.ndarray):
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_path.with_name(self.cache_path.name + ".tmp")
+            with open(tmp_path, "wb") as f:
+                np.savez(f, key=json.dumps(key), chunks=json.dumps(chunks, ensure_ascii=False), vectors=vectors)
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            logger.warning(f"위반 사례 색인 캐시 저장 실패: {str(e)}")
+
+    def _encode(self, texts: List[str], backend: str, use_cache: bool) -> np.ndarray:
+        if backend == LEXICAL_MODEL:
+            return lexical_vectors(texts)
+        return embeddings.encode(texts, use_cache=use_cache)
+
+    def _ensure(self) -> str:
+        """색인 최신화 후 사용 중인 임베딩 방식 반환"""
+        backend = embeddings.model_name() if embeddings.is_available() else LEXICAL_MODEL
+        key = self._source_key(backend)
+        with self._lock:
+            if self._key == key:
+                return backend
+            cached = self._read_cache(key)
+            if cached is None:
+                started = time.perf_counter()
+                chunks = self._build_chunks()
+                texts = [f"{chunk['title']}\n{chunk['content']}" for chunk in chunks]
+                vectors = (self._encode(texts, backend, use_cache=False) if texts
+                           else np.zeros((0, 1), dtype=np.float32))
+                self._write_cache(key, chunks, vectors)
+                logger.info(f"⚖️ 위반 사례 색인 {len(chunks)}개 청크 생성 ({backend}, "
+                            f"{(time.perf_counter() - started) * 1000:.1f}ms)")
+            else:
+                chunks, vectors = cached
+            self._chunks = chunks
+            self._vectors = np.asarray(vectors, dtype=np.float32)
+            self._categories = np.array([chunk["category"] for chunk in chunks])
+            self._key = key
+            return backend
+
+    def search(self, content: str, k: int = 5, category: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        검토 대상과 유사한 조항/사례 상위 k개
+
+        Args:
+            category: 규정 카테고리 (None 또는 "general"이면 전체에서 검색)
+        """
+        backend = self._ensure()
+        if not self._chunks or not content.strip():
+            return []
+
+        queries = query_sentences(content)
+        query_vectors = self._encode(queries, backend, use_cache=True)
+        # 질의 문장 중 가장 가까운 문장의 유사도를 청크 점수로 사용
+        scores = (query_vectors @ self._vectors.T).max(axis=0)
+        if category and category != "general":
+            scores = np.where(self._categories == category, scores, -np.inf)
+
+        k = min(k, int(np.isfinite(scores).sum()))
+        if k <= 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+
+        return [
+            {
+                "content": self._chunks[i]["content"],
+                "metadata": {
+                    "title": self._chunks[i]["title"],
+                    "category": self._chunks[i]["category"],
+                    "type": self._chunks[i]["type"],
+                    "embedding": backend,
+                },
+                "score": round(float(scores[i]), 4),
+                "source": self._chunks[i]["source"],
+            }
+            for i in top
+        ]
+
+    def warm(self, contents: List[str]):
+        """배치 요청의 질의 문장을 한 번에 임베딩해 공유 캐시에 적재 (색인도 함께 최신화)"""
+        backend = self._ensure()
+        if backend == LEXICAL_MODEL:
+            return
+        queries = list(dict.fromkeys(query for content in contents for query in query_sentences(content)))
+        if queries:
+            embeddings.encode(queries)
+
+    def stats(self) -> Dict[str, Any]:
+        """색인 상태 (청크 수, 카테고리별 분포)"""
+        backend = self._ensure()
+        categories, counts = np.unique(self._categories, return_counts=True) if self._chunks else ([], [])
+        return {
+            "chunks": len(self._chunks),
+            "embedding": backend,
+            "categories": {str(category): int(count) for category, count in zip(categories, counts)},
+        }
+
+
+_indexes: Dict[str, ViolationIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_violation_index() -> ViolationIndex:
+    """설정 경로의 공유 위반 사례 색인"""
+    from ....core.config import settings
+
+    base_dir = Path(settings.project_root) / "database" / "relationdb"
+    cache_path = Path(settings.sqlite_db_path) / "violation_index.npz"
+    with _indexes_lock:
+        if str(cache_path) not in _indexes:
+            _indexes[str(cache_path)] = ViolationIndex(base_dir / "외부자료", base_dir / "위반사례", cache_path)
+        return _indexes[str(cache_path)]
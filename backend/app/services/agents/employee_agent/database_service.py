@@ -6,6 +6,7 @@ Employee Agent Database Service
 
 import logging
 import sqlite3
+import threading
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 from ....core.config import settings
@@ -22,33 +23,89 @@ logger = logging.getLogger(__name__)
 class DatabaseService:
     """직원 정보 데이터베이스 서비스"""
     
+    HR_FILE = "좋은제약_인사자료.xlsx"
+    ORG_CHART_FILE = "좋은제약_인사도.docx"
+    BRANCH_TARGET_FILE = "좋은제약_지점별_목표.xlsx"
+    NAME_COLUMN = "성명"
+    
+    # 검색 유형별 대상 컬럼 (그 외 유형은 전체 컬럼)
+    SEARCH_COLUMNS = {
+        "name": ["성명"],
+        "id": ["사번"],
+        "position": ["직급"],
+        "department": ["부서", "사업부", "지점"],
+        "skill": ["책임업무"],
+        "project": ["책임업무"]
+    }
+    
     def __init__(self):
         self.db_path = Path(settings.sqlite_db_path) / "employee_data.db"
         self.excel_path = Path(settings.project_root) / "database" / "raw_data" / "내부자료"
+        self._hr_data = None
+        self._name_index = None
+        self._hr_mtime = None
+        self._hr_lock = threading.Lock()
+        self._org_graph = None
+        self._org_key = None
         logger.info("Employee DatabaseService 초기화 완료")
     
+    def _load_hr_data(self):
+        """인사 자료와 이름 인덱스 로드 (파일 수정 시각 기준 캐시, 파일이 바뀌면 재구축)"""
+        file_path = self.excel_path / self.HR_FILE
+        try:
+            mtime = file_path.stat().st_mtime
+        except FileNotFoundError:
+            return None, None
+        
+        with self._hr_lock:
+            if self._hr_mtime != mtime:
+                from .name_index import NameIndex
+                
+                df = pd.read_excel(file_path)
+                names = df[self.NAME_COLUMN] if self.NAME_COLUMN in df.columns else pd.Series(dtype=str)
+                self._hr_data = df
+                self._name_index = NameIndex((position, name) for position, name in enumerate(names) if pd.notna(name))
+                self._hr_mtime = mtime
+            return self._hr_data, self._name_index
+    
+    def _search_by_name(self, search_value: str) -> List[Dict[str, Any]]:
+        """이름 인덱스 검색 (초성, 오타, 로마자 허용, 유사도 순)"""
+        df, index = self._load_hr_data()
+        if df is None:
+            return []
+        
+        results = []
+        for match in index.search(search_value):
+            for position in match["keys"]:
+                results.append({
+                    "source": self.HR_FILE,
+                    "data": df.iloc[position].to_dict(),
+                    "match_type": f"name_{match['match_type']}",
+                    "score": match["score"]
+                })
+        return results
+    
     def search_employee(self, search_type: str, search_value: str) -> List[Dict[str, Any]]:
         """직원 검색"""
         try:
-            # Excel 파일에서 직원 정보 검색
-            excel_files = [
-                "좋은제약_인사자료.xlsx",
-                "좋은제약_직원평가.xlsx"
-            ]
-            
             results = []
             
+            if HAS_PANDAS and search_type == "name" and search_value:
+                results = self._search_by_name(search_value)
+            
+            # 이름 인덱스에 없는 값은 검색 유형별 컬럼(없으면 전체 컬럼) 부분 일치 검색
+            excel_files = [] if results else [self.HR_FILE, "좋은제약_직원평가.xlsx"]
+            
             for excel_file in excel_files:
                 file_path = self.excel_path / excel_file
                 if file_path.exists():
                     if HAS_PANDAS:
                         try:
-                            df = pd.read_excel(file_path)
+                            df = self._load_hr_data()[0] if excel_file == self.HR_FILE else pd.read_excel(file_path)
                             
-                            # 검색 타입에 따른 필터링
-                            if search_type == "name" and search_value:
-                                # 이름으로 검색
-                                mask = df.astype(str).apply(lambda x: x.str.contains(search_value, case=False, na=False)).any(axis=1)
+                            if search_value:
+                                columns = [c for c in self.SEARCH_COLUMNS.get(search_type, []) if c in df.columns] or list(df.columns)
+                                mask = df[columns].astype(str).apply(lambda x: x.str.contains(search_value, case=False, na=False, regex=False)).any(axis=1)
                                 filtered_df = df[mask]
                                 
                                 if not filtered_df.empty:
@@ -56,7 +113,7 @@ class DatabaseService:
                                         results.append({
                                             "source": excel_file,
                                             "data": row.to_dict(),
-                                            "match_type": "name_search"
+                                            "match_type": f"{search_type}_search"
                                         })
                             
                         except Exception as e:
@@ -94,15 +151,81 @@ class DatabaseService:
                 "match_type": "error"
             }]
     
-    def get_department_info(self) -> List[Dict[str, Any]]:
-        """부서 정보 조회"""
+    def get_org_graph(self):
+        """
+        조직 그래프 조회 (원본 파일 수정 시각 기준 캐시)
+        
+        조직도 docx·인사 자료·지점별 목표를 파싱해 구축하고, 결과는 JSON 캐시로 저장해
+        다른 프로세스나 재시작 후에는 원본을 다시 파싱하지 않고 복원합니다.
+        """
+        if not HAS_PANDAS:
+            return None
+        
+        from .org_graph import OrgGraph, parse_org_chart, read_branch_performance
+        
+        sources = [self.ORG_CHART_FILE, self.HR_FILE, self.BRANCH_TARGET_FILE]
+        key = [[name, (self.excel_path / name).stat().st_mtime] for name in sources if (self.excel_path / name).exists()]
+        if not any(name == self.HR_FILE for name, _ in key):
+            logger.warning(f"인사 자료 파일이 없습니다: {self.excel_path / self.HR_FILE}")
+            return None
+        
+        with self._hr_lock:
+            if self._org_graph is not None and self._org_key == key:
+                return self._org_graph
+            
+            cache_path = Path(settings.sqlite_db_path) / "org_graph.json"
+            graph = OrgGraph.load(cache_path, key)
+            if graph is None:
+                employees = pd.read_excel(self.excel_path / self.HR_FILE)
+                try:
+                    departments = [(name, parent) for name, parent, _ in parse_org_chart(self.excel_path / self.ORG_CHART_FILE)]
+                except Exception as e:
+                    # 조직도를 읽을 수 없으면 인사 자료 부서만으로 1단계 트리 구성
+                    logger.warning(f"조직도 파싱 실패, 인사 자료 부서로 대체: {str(e)}")
+                    departments = []
+                performance = None
+                if (self.excel_path / self.BRANCH_TARGET_FILE).exists():
+                    try:
+                        performance = read_branch_performance(self.excel_path / self.BRANCH_TARGET_FILE)
+                    except Exception as e:
+                        logger.warning(f"지점별 목표 읽기 실패: {str(e)}")
+                graph = OrgGraph(departments, employees, performance)
+                try:
+                    graph.save(cache_path, key)
+                except OSError as e:
+                    logger.warning(f"조직 그래프 캐시 저장 실패: {str(e)}")
+            
+            self._org_graph, self._org_key = graph, key
+            return graph
+    
+    def get_department_info(self, query: Optional[str] = None) -> List[Dict[str, Any]]:
+        """부서 정보 조회 (query에 부서명이 있으면 해당 부서 인원·실적 롤업, 없으면 부서 트리)"""
         try:
-            # 조직도 파일에서 부서 정보 추출
-            org_file = self.excel_path / "좋은제약_인사도.docx"
+            graph = self.get_org_graph()
+            if graph is not None:
+                department = graph.find_department(query or "")
+                if department is None:
+                    return [{
+                        "source": self.ORG_CHART_FILE,
+                        "data": {"tree": graph.tree()},
+                        "match_type": "organization_chart"
+                    }]
+                return [{
+                    "source": self.ORG_CHART_FILE,
+                    "data": {
+                        "department": department,
+                        "path": graph.department_path(department),
+                        "headcount": graph.headcount(department),
+                        "members": graph.members(department),
+                        "rollup": graph.rollup(department)
+                    },
+                    "match_type": "department"
+                }]
             
+            org_file = self.excel_path / self.ORG_CHART_FILE
             if org_file.exists():
                 return [{
-                    "source": "좋은제약_인사도.docx",
+                    "source": self.ORG_CHART_FILE,
                     "data": {
                         "message": "조직도 정보가 있습니다.",
                         "file_path": str(org_file)
@@ -125,4 +248,35 @@ class DatabaseService:
                 "source": "error", 
                 "data": {"error": str(e)},
                 "match_type": "error"
-            }] 
\ No newline at end of file
+            }]
+    
+    def get_reporting_line(self, search_value: str) -> List[Dict[str, Any]]:
+        """직원의 상사(보고 라인)와 부하 직원 조회 (이름은 이름 인덱스로 해석)"""
+        try:
+            graph = self.get_org_graph()
+            if graph is None:
+                return []
+            
+            results = []
+            for match in self._search_by_name(search_value):
+                employee_id = int(match["data"]["사번"])
+                results.append({
+                    "source": self.ORG_CHART_FILE,
+                    "data": {
+                        "employee": graph.employee(employee_id),
+                        "manager": graph.manager(employee_id),
+                        "reporting_chain": graph.reporting_chain(employee_id),
+                        "subordinates": graph.subordinates(employee_id)
+                    },
+                    "match_type": "reporting_line",
+                    "score": match.get("score")
+                })
+            return results
+            
+        except Exception as e:
+            logger.error(f"보고 라인 조회 실패: {str(e)}")
+            return [{
+                "source": "error",
+                "data": {"error": str(e)},
+                "match_type": "error"
+            }]
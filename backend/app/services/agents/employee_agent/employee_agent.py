@@ -1,13 +1,11 @@
+import asyncio
+import logging
 import pandas as pd
 import os
 from typing import Dict, List, Any, Optional, TypedDict
 from datetime import datetime
-from docx import Document
-import openai
-from langgraph.graph import StateGraph, END
-from docx.enum.text import WD_ALIGN_PARAGRAPH
-from docx.shared import Inches
-from docx.shared import RGBColor
+
+logger = logging.getLogger(__name__)
 
 # 상태 정의
 class AgentState(TypedDict):
@@ -27,6 +25,7 @@ class EmployeePerformanceAgent:
     
     def _create_graph(self):
         """LangGraph StateGraph를 생성합니다."""
+        from langgraph.graph import StateGraph, END
         
         workflow = StateGraph(AgentState)
         
@@ -104,35 +103,30 @@ class EmployeePerformanceAgent:
                 state["error"] = "분석 기간에 해당하는 데이터가 없습니다."
                 return state
             
-            # 실적 데이터 분석
-            for idx, row in performance_df.iterrows():
+            # 실적 데이터 분석 (전체 행의 추세와 다음 달 예측을 행렬 단위로 한 번에 계산)
+            period_values = performance_df[analysis_months].apply(pd.to_numeric, errors="coerce")
+            trends = self._analyze_trends_batch(period_values)
+            forecasts = self._forecast_rows(performance_df, month_columns)
+            
+            for position, (idx, row) in enumerate(performance_df.iterrows()):
                 employee_name = row.get('담당자', 'Unknown')
                 hospital = row.get('ID', 'Unknown')
                 item = row.get('품목', 'Unknown')
                 
-                monthly_data = []
-                for month in analysis_months:
-                    if month in row:
-                        value = row[month]
-                        if pd.notna(value):
-                            try:
-                                performance_value = float(value)
-                                if performance_value > 0:
-                                    monthly_data.append({
-                                        "month": str(month),
-                                        "performance": performance_value
-                                    })
-                            except (ValueError, TypeError):
-                                continue
+                monthly_data = [
+                    {"month": str(month), "performance": float(value)}
+                    for month, value in zip(analysis_months, period_values.iloc[position])
+                    if pd.notna(value) and value > 0
+                ]
                 
                 if monthly_data:
-                    trend_analysis = self._analyze_trend(monthly_data)
                     employee_analysis = {
                         "employee": employee_name,
                         "hospital": hospital,
                         "item": item,
                         "monthly_data": monthly_data,
-                        "trend": trend_analysis
+                        "trend": trends[position],
+                        "forecast": forecasts.get(idx) if forecasts is not None else None
                     }
                     analysis_result["employee_analysis"].append(employee_analysis)
             
@@ -165,6 +159,53 @@ class EmployeePerformanceAgent:
         
         return state
     
+    @staticmethod
+    def _classify_trend(avg_change: float) -> str:
+        if avg_change >= 30:
+            return "급증"
+        elif avg_change >= 10:
+            return "증가"
+        elif avg_change <= -30:
+            return "급감"
+        elif avg_change <= -10:
+            return "감소"
+        return "안정"
+    
+    def _analyze_trends_batch(self, values: pd.DataFrame) -> List[Dict[str, Any]]:
+        """
+        전체 행의 월별 트렌드를 한 번에 분석 (_analyze_trend와 같은 기준)
+        
+        양수 실적만 대상으로, 직전 양수 실적 대비 변화율의 평균을 사용합니다.
+        """
+        positive = values.where(values > 0)
+        previous = positive.ffill(axis=1).shift(1, axis=1)
+        changes = (positive - previous) / previous * 100
+        avg_changes = changes.mean(axis=1)
+        
+        results = []
+        for avg_change, row_changes in zip(avg_changes.to_numpy(), changes.to_numpy()):
+            if pd.isna(avg_change):
+                results.append({"trend": "stable", "change_rate": 0, "is_significant": False})
+                continue
+            results.append({
+                "trend": self._classify_trend(avg_change),
+                "change_rate": round(float(avg_change), 2),
+                "changes": [float(change) for change in row_changes if pd.notna(change)],
+                "is_significant": bool(abs(avg_change) >= 30)
+            })
+        return results
+    
+    def _forecast_rows(self, performance_df: pd.DataFrame, month_columns: List[Any]):
+        """전체 월 실적으로 행별 다음 달 예측 (행 인덱스로 조회)"""
+        try:
+            from ...analytics.forecasting import fit_forecasts
+            
+            matrix = performance_df[month_columns].apply(pd.to_numeric, errors="coerce").to_numpy(dtype=float)
+            return fit_forecasts(matrix, keys=performance_df.index)
+        except Exception as e:
+            logger.warning(f"실적 예측 실패: {e}")
+            return None
+    
     def _analyze_trend(self, monthly_data: List[Dict]) -> Dict[str, Any]:
         """월별 실적 트렌드를 분석합니다."""
         if len(monthly_data) < 2:
@@ -183,17 +224,7 @@ class EmployeePerformanceAgent:
         
         avg_change = sum(changes) / len(changes)
         is_significant = abs(avg_change) >= 30
-        
-        if avg_change >= 30:
-            trend = "급증"
-        elif avg_change >= 10:
-            trend = "증가"
-        elif avg_change <= -30:
-            trend = "급감"
-        elif avg_change <= -10:
-            trend = "감소"
-        else:
-            trend = "안정"
+        trend = self._classify_trend(avg_change)
         
         return {
             "trend": trend,
@@ -347,16 +378,27 @@ class EmployeePerformanceAgent:
             if not api_key:
                 raise Exception("API 키 없음")
             
-            client = openai.OpenAI(api_key=api_key)
-            response = client.chat.completions.create(
+            import openai
+            from ....core.circuit_breaker import llm_breaker
+            from ....core.config import settings
+            from ....core.prompt_cache import layout_messages, record_usage
+            
+            if not llm_breaker.available():
+                raise Exception("OpenAI 회로 차단 중")
+            
+            client = openai.OpenAI(api_key=api_key, base_url=settings.openai_base_url, timeout=settings.openai_timeout)
+            response = llm_breaker.call(
+                client.chat.completions.create,
                 model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "당신은 전문적인 비즈니스 분석가입니다. 직원 실적 데이터를 분석하여 인사이트 있는 보고서를 작성합니다."},
-                    {"role": "user", "content": prompt}
-                ],
+                messages=layout_messages(
+                    "employee_report",
+                    "당신은 전문적인 비즈니스 분석가입니다. 직원 실적 데이터를 분석하여 인사이트 있는 보고서를 작성합니다.",
+                    prompt
+                ),
                 max_tokens=2000,
                 temperature=0.7
             )
+            record_usage("employee_report", response)
             
             return response.choices[0].message.content
             
@@ -405,6 +447,10 @@ class EmployeePerformanceAgent:
     def save_report_to_docx(self, report: str, filename: str = "실적분석보고서.docx") -> str:
         """분석 결과를 Word 문서로 저장합니다."""
         try:
+            from docx import Document
+            from docx.enum.text import WD_ALIGN_PARAGRAPH
+            from docx.shared import Inches, RGBColor
+            
             doc = Document()
             
             # 첫 페이지: 요약 정보 (텍스트 꾸미기 적용)
@@ -521,4 +567,161 @@ class EmployeePerformanceAgent:
         if total_target > 0:
             return (total_performance / total_target) * 100
         return 0 
-                  
\ No newline at end of file
+                  
+
+class EmployeeAgent:
+    """내부 직원정보 검색 Agent (Router Agent 연동용)"""
+    
+    # detail_level별 노출 필드
+    BASIC_FIELDS = ["사번", "성명", "부서", "직급", "지점", "연락처"]
+    
+    def __init__(self):
+        from .database_service import DatabaseService
+        
+        self.database_service = DatabaseService()
+        logger.info("Employee Agent 초기화 완료")
+    
+    async def process(self, args: Dict[str, Any], original_message: str) -> Dict[str, Any]:
+        """Employee Agent 메인 처리 함수"""
+        try:
+            search_type = args.get("search_type", "name")
+            search_value = args.get("search_value", original_message)
+            detail_level = args.get("detail_level", "basic")
+            
+            logger.info(f"Employee Agent 처리: {search_type} 검색 - {search_value[:50]}...")
+            
+            from ....core.tracing import span
+            
+            if search_type == "anomaly":
+                return await self._process_anomalies(args, search_value, original_message)
+            
+            with span("retrieval.employee"):
+                if search_type == "department":
+                    results = await asyncio.to_thread(self.database_service.get_department_info, search_value)
+                elif search_type == "manager":
+                    results = await asyncio.to_thread(self.database_service.get_reporting_line, search_value)
+                else:
+                    # 이름은 이름 인덱스(초성/오타/로마자), 직급·ID 등은 해당 컬럼 검색
+                    results = await asyncio.to_thread(self.database_service.search_employee, search_type, search_value)
+            
+            matches = [r for r in results if r.get("match_type") not in ("no_match", "error", "file_not_found")]
+            
+            return {
+                "response": self._format_response(search_value, matches, results, detail_level),
+                "sources": results,
+                "metadata": {
+                    "agent": "employee_agent",
+                    "search_type": search_type,
+                    "detail_level": detail_level,
+                    "results_count": len(matches)
+                }
+            }
+            
+        except Exception as e:
+            logger.error(f"Employee Agent 처리 실패: {str(e)}")
+            return {
+                "response": f"직원 정보 검색 중 오류가 발생했습니다: {str(e)}",
+                "sources": [],
+                "metadata": {"error": str(e), "agent": "employee_agent"}
+            }
+    
+    async def _process_anomalies(self, args: Dict[str, Any], search_value: str, original_message: str) -> Dict[str, Any]:
+        """담당자 실적 급증/급감 조회 (야간 스캔으로 사전 계산된 이상치 테이블)"""
+        from ...analytics.anomaly_scan import extract_direction, format_anomalies, get_anomaly_store
+        from ....core.tracing import span
+        
+        with span("retrieval.employee_anomaly"):
+            store = await asyncio.to_thread(get_anomaly_store)
+            reps = await asyncio.to_thread(store.reps)
+            rep = next((name for name in reps if name in f"{search_value} {original_message}"), None)
+            direction = args.get("direction") or extract_direction(original_message)
+            anomalies = await asyncio.to_thread(store.query, None, direction, rep)
+            summary = await asyncio.to_thread(store.summary)
+        
+        if summary["month"] is None:
+            response = "실적 급증/급감 스캔 결과가 아직 없습니다. 야간 스캔 후 다시 조회해 주세요."
+        else:
+            response = f"👤 {rep or '전체 담당자'} 실적 급증/급감\n" + format_anomalies(anomalies, summary, direction)
+        
+        return {
+            "response": response,
+            "sources": [{"type": "sales_anomalies", "rep": rep}],
+            "metadata": {
+                "agent": "employee_agent",
+                "search_type": "anomaly",
+                "rep": rep,
+                "results_count": len(anomalies)
+            }
+        }
+    
+    def _format_response(self, search_value: str, matches: List[Dict[str, Any]], results: List[Dict[str, Any]], detail_level: str) -> str:
+        """검색 결과 응답 포맷팅"""
+        if not matches:
+            message = results[0]["data"].get("message") if results else None
+            return message or f"'{search_value}'에 대한 직원 정보를 찾을 수 없습니다."
+        
+        match_type = matches[0].get("match_type")
+        if match_type in ("department", "organization_chart"):
+            return self._format_department(matches[0]["data"])
+        if match_type == "reporting_line":
+            return self._format_reporting_lines(matches)
+        
+        lines = [f"👤 '{search_value}' 검색 결과 ({len(matches)}건)\n"]
+        for match in matches[:10]:
+            data = match.get("data", {})
+            if detail_level == "basic":
+                fields = {key: data[key] for key in self.BASIC_FIELDS if key in data}
+            else:
+                fields = data
+            
+            lines.append("• " + ", ".join(f"{key}: {value}" for key, value in fields.items() if pd.notna(value)))
+        
+        return "\n".join(lines)
+    
+    @staticmethod
+    def _person(profile: Optional[Dict[str, Any]]) -> str:
+        if not profile:
+            return "없음"
+        return f"{profile.get('성명')} {profile.get('직급', '')} ({profile.get('부서', '')}, 사번 {profile.get('사번')})"
+    
+    def _format_department(self, data: Dict[str, Any]) -> str:
+        """부서 인원·실적 롤업 또는 부서 트리 포맷팅"""
+        if "tree" in data:
+            lines = ["🏢 조직도\n"]
+            for node in data["tree"]:
+                head = f" - 부서장 {node['head']}" if node.get("head") else ""
+                lines.append(f"{'    ' * node['depth']}• {node['department']} ({node['headcount']}명){head}")
+            return "\n".join(lines)
+        
+        lines = [f"🏢 {' > '.join(data['path'])} 전체 인원 {data['headcount']}명\n"]
+        for member in data["members"][:30]:
+            lines.append(f"• {member.get('성명')} {member.get('직급', '')} ({member.get('부서', '')})")
+        if data["headcount"] > 30:
+            lines.append(f"... 외 {data['headcount'] - 30}명")
+        
+        rollup = data.get("rollup") or {}
+        if rollup.get("target"):
+            lines.append(
+                f"\n📊 실적 롤업: 목표 {rollup['target']:,.0f}원 / 실적 {rollup['actual']:,.0f}원 "
+                f"(달성률 {rollup['achievement_rate'] * 100:.1f}%)"
+            )
+        return "\n".join(lines)
+    
+    def _format_reporting_lines(self, matches: List[Dict[str, Any]]) -> str:
+        """보고 라인 포맷팅 (동명이인은 각각 표시)"""
+        lines = []
+        for match in matches[:5]:
+            data = match["data"]
+            lines.append(f"👤 {self._person(data['employee'])}")
+            lines.append(f"• 직속 상사: {self._person(data['manager'])}")
+            if len(data["reporting_chain"]) > 1:
+                lines.append("• 보고 라인: " + " → ".join(p.get("성명", "") for p in data["reporting_chain"]))
+            if data["subordinates"]:
+                lines.append(f"• 부하 직원: {len(data['subordinates'])}명")
+            lines.append("")
+        return "\n".join(lines).strip()
+    
+    def warm_up(self) -> Dict[str, Any]:
+        """워밍업: 인사 자료를 한 번 조회하여 Excel 파서와 이름 인덱스 초기화"""
+        results = self.database_service.search_employee("name", "워밍업")
+        return {"search": bool(results)}
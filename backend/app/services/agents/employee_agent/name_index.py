@@ -0,0 +1,276 @@
+"""
+Employee Name Index
+
+직원 이름 전용 검색 인덱스. 한글 이름을 자모 단위로 분해해 다음 검색을 지원합니다.
+- 초성 접두어 검색 (예: "ㅊㅅㅇ" → 최수아): 초성 트라이
+- 오타 허용 검색 (예: "최수사" → 최수아): 자모 시퀀스 바이그램 색인 + 편집 거리
+- 로마자 이름 검색 (예: "Choi Sua"): 로마자 표기 바이그램 색인 + 편집 거리
+
+인사 자료에서 한 번 구축하며, 편집 거리는 바이그램을 충분히 공유하는 후보에만 계산하므로
+조회는 1ms 미만입니다.
+"""
+
+import logging
+import time
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+HANGUL_BASE = 0xAC00
+HANGUL_LAST = 0xD7A3
+
+CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+JUNGSEONG = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+JONGSEONG = ["", "ㄱ", "ㄲ", "ㄳ", "ㄴ", "ㄵ", "ㄶ", "ㄷ", "ㄹ", "ㄺ", "ㄻ", "ㄼ", "ㄽ", "ㄾ", "ㄿ", "ㅀ",
+             "ㅁ", "ㅂ", "ㅄ", "ㅅ", "ㅆ", "ㅇ", "ㅈ", "ㅊ", "ㅋ", "ㅌ", "ㅍ", "ㅎ"]
+
+# 국어의 로마자 표기법 (자모 단위 단순화)
+CHOSEONG_ROMAN = ["g", "kk", "n", "d", "tt", "r", "m", "b", "pp", "s", "ss", "", "j", "jj", "ch", "k", "t", "p", "h"]
+JUNGSEONG_ROMAN = ["a", "ae", "ya", "yae", "eo", "e", "yeo", "ye", "o", "wa", "wae", "oe", "yo", "u", "wo", "we",
+                   "wi", "yu", "eu", "ui", "i"]
+JONGSEONG_ROMAN = ["", "k", "k", "k", "n", "n", "n", "t", "l", "l", "l", "l", "l", "l", "l", "l", "m", "p", "p",
+                   "t", "t", "ng", "t", "t", "k", "t", "p", "t"]
+
+# 성씨는 표기법보다 관용 표기를 주로 쓰므로 별도 매핑
+SURNAME_ROMAN = {
+    "김": "kim", "이": "lee", "박": "park", "최": "choi", "정": "jung", "강": "kang", "조": "cho",
+    "윤": "yoon", "장": "jang", "임": "lim", "한": "han", "오": "oh", "서": "seo", "신": "shin",
+    "권": "kwon", "황": "hwang", "안": "ahn", "송": "song", "류": "ryu", "유": "yoo", "홍": "hong",
+}
+
+
+def _syllable_parts(char: str) -> Optional[Tuple[int, int, int]]:
+    """완성형 한글 음절 → (초성, 중성, 종성) 위치"""
+    code = ord(char)
+    if not HANGUL_BASE <= code <= HANGUL_LAST:
+        return None
+    offset = code - HANGUL_BASE
+    return offset // 588, (offset % 588) // 28, offset % 28
+
+
+def decompose(text: str) -> str:
+    """한글 음절을 호환 자모로 분해 (그 외 문자는 그대로)"""
+    jamo = []
+    for char in text:
+        parts = _syllable_parts(char)
+        if parts is None:
+            jamo.append(char)
+        else:
+            cho, jung, jong = parts
+            jamo.append(CHOSEONG[cho] + JUNGSEONG[jung] + JONGSEONG[jong])
+    return "".join(jamo)
+
+
+def initials(text: str) -> str:
+    """초성 문자열 (한글 음절이 아닌 문자는 그대로)"""
+    return "".join(CHOSEONG[parts[0]] if (parts := _syllable_parts(char)) else char for char in text)
+
+
+def is_initials(text: str) -> bool:
+    """초성(자음)만으로 이루어진 입력인지"""
+    return bool(text) and all(char in CHOSEONG for char in text)
+
+
+def romanize(name: str) -> str:
+    """한글 이름 → 로마자 (공백 없는 소문자, 첫 음절은 관용 성씨 표기)"""
+    roman = []
+    for position, char in enumerate(name):
+        if position == 0 and char in SURNAME_ROMAN:
+            roman.append(SURNAME_ROMAN[char])
+            continue
+        parts = _syllable_parts(char)
+        if parts is None:
+            roman.append(char.lower() if char.isascii() and char.isalpha() else "")
+        else:
+            cho, jung, jong = parts
+            roman.append(CHOSEONG_ROMAN[cho] + JUNGSEONG_ROMAN[jung] + JONGSEONG_ROMAN[jong])
+    return "".join(roman)
+
+
+def edit_distance(a: str, b: str, limit: Optional[int] = None) -> int:
+    """Levenshtein 편집 거리 (limit 초과가 확정되면 limit + 1 반환)"""
+    if len(a) < len(b):
+        a, b = b, a
+    if limit is not None and len(a) - len(b) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b)))
+        if limit is not None and min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+class InitialsTrie:
+    """초성 접두어 트라이 (노드마다 하위 키 집합을 보관해 접두어 조회가 입력 길이에 비례)"""
+
+    def __init__(self):
+        self._root: Dict[str, Any] = {"keys": set(), "children": {}}
+
+    def insert(self, word: str, key: Hashable):
+        node = self._root
+        node["keys"].add(key)
+        for char in word:
+            node = node["children"].setdefault(char, {"keys": set(), "children": {}})
+            node["keys"].add(key)
+
+    def prefix(self, word: str) -> set:
+        node = self._root
+        for char in word:
+            node = node["children"].get(char)
+            if node is None:
+                return set()
+        return node["keys"]
+
+
+class NGramIndex:
+    """
+    바이그램 역색인 기반 근사 검색 (허용 편집 거리 이내 단어)
+
+    편집 거리 k 이내인 두 단어는 경계 표시를 붙인 바이그램을 최소 max(|a|, |b|) + 1 - 2k개 공유하므로,
+    공유 바이그램 수로 후보를 거른 뒤 후보만 편집 거리를 계산합니다.
+    """
+
+    def __init__(self):
+        self._postings: Dict[str, List[str]] = {}
+        self._words: List[str] = []
+
+    @staticmethod
+    def _grams(word: str) -> List[str]:
+        padded = f"^{word}$"
+        return [padded[i:i + 2] for i in range(len(padded) - 1)]
+
+    def __len__(self) -> int:
+        return len(self._words)
+
+    def add(self, word: str):
+        self._words.append(word)
+        for gram in set(self._grams(word)):
+            self._postings.setdefault(gram, []).append(word)
+
+    def search(self, word: str, tolerance: int) -> List[Tuple[str, int]]:
+        """허용 거리 이내 (단어, 거리) 목록"""
+        shared: Dict[str, int] = {}
+        for gram in set(self._grams(word)):
+            for candidate in self._postings.get(gram, ()):
+                shared[candidate] = shared.get(candidate, 0) + 1
+
+        # 공유 바이그램 하한이 0 이하인 짧은 입력은 전체 단어가 후보
+        candidates = self._words if len(word) + 1 - 2 * tolerance <= 0 else [
+            candidate for candidate, count in shared.items()
+            if count >= max(len(word), len(candidate)) + 1 - 2 * tolerance
+        ]
+        found = []
+        for candidate in candidates:
+            distance = edit_distance(word, candidate, limit=tolerance)
+            if distance <= tolerance:
+                found.append((candidate, distance))
+        return found
+
+
+class NameIndex:
+    """직원 이름 검색 인덱스 (동명이인은 같은 이름에 여러 키로 보관)"""
+
+    # 검색 결과 최소 유사도
+    MIN_SCORE = 0.6
+
+    def __init__(self, entries: Iterable[Tuple[Hashable, str]]):
+        """
+        Args:
+            entries: (레코드 키, 이름) 목록
+        """
+        started = time.perf_counter()
+        self._keys_by_name: Dict[str, List[Hashable]] = {}
+        self._names_by_jamo: Dict[str, str] = {}
+        self._names_by_roman: Dict[str, str] = {}
+        self._initials = InitialsTrie()
+        self._jamo_grams = NGramIndex()
+        self._roman_grams = NGramIndex()
+
+        for key, name in entries:
+            name = str(name).strip()
+            if not name:
+                continue
+            self._keys_by_name.setdefault(name, []).append(key)
+            if len(self._keys_by_name[name]) > 1:
+                continue
+            jamo, roman = decompose(name), romanize(name)
+            self._names_by_jamo[jamo] = name
+            self._jamo_grams.add(jamo)
+            self._initials.insert(initials(name), name)
+            if roman:
+                self._names_by_roman.setdefault(roman, name)
+                self._roman_grams.add(roman)
+
+        self.build_ms = round((time.perf_counter() - started) * 1000, 2)
+        logger.info(f"직원 이름 인덱스 구축: 이름 {len(self._keys_by_name)}개 ({self.build_ms}ms)")
+
+    def __len__(self) -> int:
+        return len(self._keys_by_name)
+
+    @staticmethod
+    def _tolerance(length: int) -> int:
+        """입력 길이별 허용 편집 거리 (자모/로마자 약 3자당 1)"""
+        return max(1, length // 3)
+
+    def _match_token(self, token: str) -> Dict[str, Tuple[float, str]]:
+        """단일 토큰 → {이름: (유사도, 일치 유형)}"""
+        matches: Dict[str, Tuple[float, str]] = {}
+
+        def add(name: str, score: float, match_type: str):
+            if score >= self.MIN_SCORE and score > matches.get(name, (0.0, ""))[0]:
+                matches[name] = (round(score, 4), match_type)
+
+        if is_initials(token):
+            for name in self._initials.prefix(token):
+                add(name, 0.6 + 0.4 * len(token) / len(name), "initials")
+            return matches
+
+        if token.isascii():
+            roman = "".join(char for char in token.lower() if char.isalpha())
+            if len(roman) >= 3:
+                for candidate, distance in self._roman_grams.search(roman, self._tolerance(len(roman))):
+                    add(self._names_by_roman[candidate], 1.0 - distance / max(len(roman), len(candidate)), "romanized")
+            return matches
+
+        jamo = decompose(token)
+        if len(token) >= 2:
+            for candidate, distance in self._jamo_grams.search(jamo, self._tolerance(len(jamo))):
+                add(self._names_by_jamo[candidate], 1.0 - distance / max(len(jamo), len(candidate)), "fuzzy")
+        return matches
+
+    def search(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        이름 검색 (유사도 내림차순)
+
+        문장 형태의 질의("최수아 연락처")는 공백 단위 토큰별로 검색해 이름과 가장 잘 맞는 결과를 사용하며,
+        로마자 질의는 "Sua Choi"처럼 이름-성 순서도 허용합니다.
+
+        Returns: [{"name", "keys", "score", "match_type"}]
+        """
+        tokens = [token for token in (query or "").replace(",", " ").split() if token]
+        if not tokens:
+            return []
+
+        # 정확히 일치한 이름이 있으면 다른 토큰("연락처" 등)의 유사 검색은 생략
+        best: Dict[str, Tuple[float, str]] = {
+            token: (1.0, "exact") for token in tokens if token in self._keys_by_name
+        }
+        if not best:
+            latin = [token for token in tokens if token.isascii() and token.isalpha()]
+            if len(latin) >= 2:
+                tokens = [token for token in tokens if token not in latin]
+                tokens += ["".join(latin), "".join(reversed(latin))]
+            for token in tokens:
+                for name, (score, match_type) in self._match_token(token).items():
+                    if score > best.get(name, (0.0, ""))[0]:
+                        best[name] = (score, match_type)
+
+        ranked = sorted(best.items(), key=lambda item: (-item[1][0], item[0]))[:limit]
+        return [
+            {"name": name, "keys": list(self._keys_by_name[name]), "score": score, "match_type": match_type}
+            for name, (score, match_type) in ranked
+        ]
@@ -0,0 +1,373 @@
+"""
+Organization Graph
+
+조직도(좋은제약_인사도.docx)의 부서 계층과 인사 자료의 직원·직급을 하나의 조직 그래프로 구축합니다.
+
+- 부서 트리를 오일러 투어 순서로 번호 매겨 부서마다 [진입, 종료) 구간을 계산하고,
+  직원 배열을 소속 부서 진입 순서로 정렬해 "부서 하위 전체 인원"이 배열의 연속 구간이 되도록 합니다.
+- 보고 라인(상사)은 부서장(직급 서열 최상위) 기준으로 미리 계산합니다.
+- 실적 롤업은 직원 순서로 정렬한 누적합 행렬의 두 행 차이로 계산합니다.
+
+따라서 인원/상사/롤업 질의는 트리 순회 없이 사전 조회와 구간 연산으로 처리됩니다.
+파싱 결과는 원본 파일 수정 시각과 함께 JSON 캐시로 저장해 재시작 시 docx를 다시 읽지 않습니다.
+"""
+
+import json
+import logging
+import re
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# 직급 서열 (뒤로 갈수록 상위, 부서장 선정에 사용)
+POSITION_RANK = ["사원", "주임", "대리", "과장", "차장", "부장", "팀장"]
+
+# 캐시 형식 버전 (구조가 바뀌면 올려서 기존 캐시 무효화)
+CACHE_VERSION = 1
+
+_TREE_LINE = re.compile(r"^(?P<indent>\s*)(?:(?P<branch>[├└]─)|(?P<bullet>•))?\s*(?P<name>\S.*?)\s*$")
+
+
+def parse_org_chart(file_path: Path) -> List[Tuple[str, Optional[str], List[str]]]:
+    """
+    조직도 docx 파싱
+
+    들여쓰기된 "├─ 부서" / "• 직원" 줄을 읽어 부서 계층과 부서별 직원 명단을 추출합니다.
+    Returns: [(부서명, 상위 부서명, [직원 이름])] (조직도 순서)
+    """
+    from docx import Document
+
+    departments: List[Tuple[str, Optional[str], List[str]]] = []
+    stack: List[Tuple[int, int]] = []  # (들여쓰기, departments 위치)
+    for paragraph in Document(str(file_path)).paragraphs:
+        text = paragraph.text.rstrip()
+        match = _TREE_LINE.match(text) if text.strip() and not paragraph.style.name.startswith("Heading") else None
+        if not match:
+            continue
+        indent = len(match.group("indent"))
+        name = match.group("name")
+
+        if match.group("bullet"):
+            if stack:
+                departments[stack[-1][1]][2].append(name)
+            continue
+
+        while stack and stack[-1][0] >= indent:
+            stack.pop()
+        parent = departments[stack[-1][1]][0] if stack else None
+        departments.append((name, parent, []))
+        stack.append((indent, len(departments) - 1))
+    return departments
+
+
+def read_branch_performance(file_path: Path) -> pd.DataFrame:
+    """
+    지점별 목표/실적 (2단 헤더: 월 / 목표·실적·달성률) → 롱 포맷
+
+    Returns: 지점, 담당자, 월, 목표, 실적
+    """
+    raw = pd.read_excel(file_path, header=None)
+    months = raw.iloc[1].ffill()
+    metrics = raw.iloc[2]
+    body = raw.iloc[3:].reset_index(drop=True)
+
+    frames = []
+    for month in months.dropna().unique():
+        columns = {metrics[c]: c for c in raw.columns if months[c] == month and metrics[c] in ("목표", "실적")}
+        if len(columns) < 2:
+            continue
+        frames.append(pd.DataFrame({
+            "지점": body[0].ffill().str.strip(),
+            "담당자": body[1].str.strip(),
+            "월": int(month),
+            "목표": pd.to_numeric(body[columns["목표"]], errors="coerce"),
+            "실적": pd.to_numeric(body[columns["실적"]], errors="coerce"),
+        }))
+    if not frames:
+        return pd.DataFrame(columns=["지점", "담당자", "월", "목표", "실적"])
+    return pd.concat(frames, ignore_index=True).dropna(subset=["담당자"])
+
+
+class OrgGraph:
+    """조직 그래프 (부서 트리, 보고 라인, 부서 롤업; 읽기 전용)"""
+
+    ROOT = "대표이사"
+
+    def __init__(self, departments: List[Tuple[str, Optional[str]]], employees: pd.DataFrame,
+                 performance: Optional[pd.DataFrame] = None):
+        """
+        Args:
+            departments: (부서명, 상위 부서명) 목록. 최상위는 상위 부서가 None
+            employees: 사번, 성명, 부서, 직급 (그 외 컬럼은 프로필로 보관)
+            performance: 지점, 담당자, 월, 목표, 실적 (선택)
+        """
+        started = time.perf_counter()
+        self._build_tree(departments, employees)
+        self._build_employees(employees)
+        self._build_reporting_lines()
+        self._build_rollups(performance)
+        self.build_ms = round((time.perf_counter() - started) * 1000, 2)
+        logger.info(
+            f"조직 그래프 구축: 부서 {len(self.departments)}개, 직원 {len(self._ids)}명 ({self.build_ms}ms)"
+        )
+
+    # ------------------------------------------------------------------
+    # 구축
+    # ------------------------------------------------------------------
+
+    def _build_tree(self, departments: List[Tuple[str, Optional[str]]], employees: pd.DataFrame):
+        """부서 트리 및 오일러 투어 구간 [tin, tout)"""
+        self.parent: Dict[str, Optional[str]] = {}
+        for name, parent in departments:
+            self.parent.setdefault(name, parent)
+        # 조직도에 없는 인사 자료 부서는 최상위 바로 아래에 배치
+        self.root = next((name for name, parent in self.parent.items() if parent is None), self.ROOT)
+        self.parent.setdefault(self.root, None)
+        for name in employees["부서"].dropna().unique():
+            self.parent.setdefault(str(name), self.root)
+
+        self.children: Dict[str, List[str]] = {name: [] for name in self.parent}
+        for name, parent in self.parent.items():
+            if parent is not None:
+                self.children.setdefault(parent, []).append(name)
+
+        self.tin: Dict[str, int] = {}
+        self.tout: Dict[str, int] = {}
+        self.depth: Dict[str, int] = {}
+        self.departments: List[str] = []
+        roots = [name for name, parent in self.parent.items() if parent is None]
+        stack: List[Tuple[str, bool]] = [(name, False) for name in reversed(roots)]
+        while stack:
+            name, closing = stack.pop()
+            if closing:
+                self.tout[name] = len(self.departments)
+                continue
+            self.tin[name] = len(self.departments)
+            self.depth[name] = self.depth[self.parent[name]] + 1 if self.parent[name] else 0
+            self.departments.append(name)
+            stack.append((name, True))
+            stack.extend((child, False) for child in reversed(self.children.get(name, [])))
+
+    def _build_employees(self, employees: pd.DataFrame):
+        """직원을 소속 부서 진입 순서로 정렬하고 부서별 하위 인원 구간 계산"""
+        frame = employees.dropna(subset=["성명"]).copy()
+        frame["부서"] = frame["부서"].fillna(self.root).astype(str)
+        frame["_tin"] = frame["부서"].map(self.tin)
+        frame["_rank"] = frame["직급"].map({p: r for r, p in enumerate(POSITION_RANK)}).fillna(-1)
+        frame = frame.sort_values(["_tin", "_rank", "사번"], ascending=[True, False, True], kind="stable")
+
+        self._ids: List[int] = [int(value) for value in frame["사번"]]
+        self._position = {employee_id: position for position, employee_id in enumerate(self._ids)}
+        self._profiles: List[Dict[str, Any]] = [
+            {key: (value.item() if hasattr(value, "item") else value) for key, value in row.items() if pd.notna(value)}
+            for row in frame.drop(columns=["_tin", "_rank"]).to_dict("records")
+        ]
+        self._by_name: Dict[str, List[int]] = {}
+        for employee_id, name in zip(self._ids, frame["성명"]):
+            self._by_name.setdefault(str(name), []).append(employee_id)
+
+        # 부서 진입 순서 k 이전에 배치된 직원 수 → 부서 구간 [tin, tout)의 직원 구간
+        tins = np.sort(frame["_tin"].to_numpy(dtype=np.int64))
+        self._span = {
+            name: (int(np.searchsorted(tins, self.tin[name])), int(np.searchsorted(tins, self.tout[name])))
+            for name in self.departments
+        }
+        self._own = {
+            name: (int(np.searchsorted(tins, self.tin[name])), int(np.searchsorted(tins, self.tin[name], side="right")))
+            for name in self.departments
+        }
+
+    def _build_reporting_lines(self):
+        """부서장(직급 최상위) 선정 및 직원별 상사 사전 계산"""
+        self.head: Dict[str, Optional[int]] = {}
+        for name in self.departments:
+            start, stop = self._own[name]
+            self.head[name] = self._ids[start] if stop > start else None
+
+        self._manager: Dict[int, Optional[int]] = {}
+        for employee_id, profile in zip(self._ids, self._profiles):
+            department = profile["부서"]
+            if self.head.get(department) != employee_id:
+                self._manager[employee_id] = self.head.get(department)
+                continue
+            # 부서장의 상사: 부서장이 있는 가장 가까운 상위 부서의 부서장
+            ancestor = self.parent.get(department)
+            while ancestor is not None and self.head.get(ancestor) is None:
+                ancestor = self.parent.get(ancestor)
+            self._manager[employee_id] = self.head.get(ancestor) if ancestor else None
+
+    def _build_rollups(self, performance: Optional[pd.DataFrame]):
+        """직원 순서 × 월 목표/실적 누적합 (부서 롤업 = 구간 양 끝 누적합 차이)"""
+        self.months: List[int] = []
+        self._cumulative: Dict[str, np.ndarray] = {}
+        if performance is None or performance.empty:
+            return
+
+        keys = {(str(self._profiles[p]["부서"]), str(self._profiles[p]["성명"])): p for p in range(len(self._ids))}
+        rows = [keys.get((str(team), str(name))) for team, name in zip(performance["지점"], performance["담당자"])]
+        matched = performance.assign(_row=rows).dropna(subset=["_row"])
+        if len(matched) < len(performance):
+            logger.warning(f"조직 그래프: 인사 자료와 매칭되지 않은 실적 {len(performance) - len(matched)}행")
+
+        self.months = sorted(int(m) for m in matched["월"].unique())
+        rows = matched["_row"].to_numpy(dtype=np.int64)
+        cols = np.searchsorted(self.months, matched["월"].to_numpy(dtype=np.int64))
+        for metric in ("목표", "실적"):
+            matrix = np.zeros((len(self._ids), len(self.months)), dtype=np.float64)
+            np.add.at(matrix, (rows, cols), matched[metric].fillna(0).to_numpy(dtype=np.float64))
+            self._cumulative[metric] = np.vstack([np.zeros((1, len(self.months))), matrix.cumsum(axis=0)])
+
+    # ------------------------------------------------------------------
+    # 캐시 (JSON)
+    # ------------------------------------------------------------------
+
+    def to_dict(self) -> Dict[str, Any]:
+        """원본 재구성에 필요한 최소 데이터 (부서 목록, 직원 프로필, 실적)"""
+        performance = []
+        if self._cumulative:
+            actual = np.diff(self._cumulative["실적"], axis=0)
+            target = np.diff(self._cumulative["목표"], axis=0)
+            for row, col in zip(*np.nonzero((actual != 0) | (target != 0))):
+                profile = self._profiles[row]
+                performance.append([profile["부서"], profile["성명"], self.months[col],
+                                    float(target[row, col]), float(actual[row, col])])
+        return {
+            "version": CACHE_VERSION,
+            "departments": [[name, self.parent[name]] for name in self.departments],
+            "employees": self._profiles,
+            "performance": performance,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "OrgGraph":
+        performance = pd.DataFrame(data.get("performance", []), columns=["지점", "담당자", "월", "목표", "실적"])
+        return cls([tuple(item) for item in data["departments"]], pd.DataFrame(data["employees"]), performance)
+
+    def save(self, cache_path: Path, source_key: List[Any]):
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {"source": source_key, **self.to_dict()}
+        cache_path.write_text(json.dumps(payload, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+
+    @classmethod
+    def load(cls, cache_path: Path, source_key: List[Any]) -> Optional["OrgGraph"]:
+        """캐시가 같은 원본(파일명, 수정 시각)에서 만들어졌으면 복원"""
+        try:
+            data = json.loads(cache_path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, ValueError):
+            return None
+        if data.get("version") != CACHE_VERSION or data.get("source") != source_key:
+            return None
+        return cls.from_dict(data)
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+
+    def find_department(self, text: str) -> Optional[str]:
+        """문장에 포함된 부서명 (가장 긴 이름 우선)"""
+        for name in sorted(self.departments, key=len, reverse=True):
+            if name in (text or ""):
+                return name
+        return None
+
+    def find_employees(self, name: str) -> List[Dict[str, Any]]:
+        """이름이 같은 직원 전체"""
+        return [self.employee(employee_id) for employee_id in self._by_name.get(name, [])]
+
+    def employee(self, employee_id: int) -> Optional[Dict[str, Any]]:
+        position = self._position.get(int(employee_id))
+        return dict(self._profiles[position]) if position is not None else None
+
+    def members(self, department: str, recursive: bool = True) -> List[Dict[str, Any]]:
+        """부서 인원 (recursive: 하위 부서 포함, 직원 배열의 연속 구간)"""
+        if department not in self.tin:
+            return []
+        start, stop = self._span[department] if recursive else self._own[department]
+        return [dict(profile) for profile in self._profiles[start:stop]]
+
+    def headcount(self, department: str, recursive: bool = True) -> int:
+        if department not in self.tin:
+            return 0
+        start, stop = self._span[department] if recursive else self._own[department]
+        return stop - start
+
+    def is_ancestor(self, ancestor: str, department: str) -> bool:
+        """ancestor가 department의 상위(또는 동일) 부서인지 (구간 포함 관계로 O(1))"""
+        return self.tin[ancestor] <= self.tin[department] < self.tout[ancestor]
+
+    def department_path(self, department: str) -> List[str]:
+        """최상위부터 부서까지 경로"""
+        path = []
+        while department is not None:
+            path.append(department)
+            department = self.parent.get(department)
+        return list(reversed(path))
+
+    def manager(self, employee_id: int) -> Optional[Dict[str, Any]]:
+        """직속 상사"""
+        manager_id = self._manager.get(int(employee_id))
+        return self.employee(manager_id) if manager_id is not None else None
+
+    def reporting_chain(self, employee_id: int) -> List[Dict[str, Any]]:
+        """직속 상사부터 최상위까지 보고 라인"""
+        chain, current = [], self._manager.get(int(employee_id))
+        while current is not None and len(chain) < len(self._ids):
+            chain.append(self.employee(current))
+            current = self._manager.get(current)
+        return chain
+
+    def subordinates(self, employee_id: int) -> List[Dict[str, Any]]:
+        """부서장이면 소속 부서(하위 포함) 인원, 아니면 빈 목록"""
+        profile = self.employee(employee_id)
+        if profile is None or self.head.get(profile["부서"]) != int(employee_id):
+            return []
+        return [member for member in self.members(profile["부서"]) if member["사번"] != int(employee_id)]
+
+    def _totals(self, start: int, stop: int, months: Optional[Iterable[int]]) -> Dict[str, Any]:
+        """직원 구간 [start, stop)의 목표/실적 합계 및 월별 내역"""
+        selected = None if months is None else set(months)
+        columns = [i for i, m in enumerate(self.months) if selected is None or m in selected]
+        target = (self._cumulative["목표"][stop] - self._cumulative["목표"][start])[columns]
+        actual = (self._cumulative["실적"][stop] - self._cumulative["실적"][start])[columns]
+        total_target, total_actual = float(target.sum()), float(actual.sum())
+        return {
+            "target": total_target,
+            "actual": total_actual,
+            "achievement_rate": round(total_actual / total_target, 4) if total_target > 0 else None,
+            "monthly": {
+                self.months[i]: {"target": float(t), "actual": float(a)}
+                for i, t, a in zip(columns, target, actual)
+            },
+        }
+
+    def rollup(self, department: str, months: Optional[Iterable[int]] = None) -> Dict[str, Any]:
+        """부서(하위 포함) 목표/실적 합계 및 월별 내역"""
+        if department not in self.tin or not self._cumulative:
+            return {}
+        start, stop = self._span[department]
+        return {"department": department, "headcount": stop - start, **self._totals(start, stop, months)}
+
+    def employee_performance(self, employee_id: int, months: Optional[Iterable[int]] = None) -> Dict[str, Any]:
+        """직원 개인 목표/실적 합계 및 월별 내역 (실적 자료가 없으면 빈 dict)"""
+        position = self._position.get(int(employee_id))
+        if position is None or not self._cumulative:
+            return {}
+        return {"employee_id": int(employee_id), **self._totals(position, position + 1, months)}
+
+    def tree(self) -> List[Dict[str, Any]]:
+        """부서 트리 (오일러 투어 순서, 깊이와 인원 포함)"""
+        return [
+            {
+                "department": name,
+                "parent": self.parent[name],
+                "depth": self.depth[name],
+                "headcount": self.headcount(name),
+                "head": (self.employee(self.head[name]) or {}).get("성명") if self.head.get(name) else None,
+            }
+            for name in self.departments
+        ]
@@ -0,0 +1,19 @@
+"""
+Analytics 패키지
+
+여러 Agent가 공유하는 수치 분석 모듈:
+- forecasting: 다수 시계열 일괄 예측 (선형 추세, 계절 단순, 지수 평활)
+- anomaly_scan: 실적 급증/급감 일괄 탐지 및 이상치 테이블
+"""
+
+from .anomaly_scan import AnomalyStore, detect_anomalies, get_anomaly_store, run_anomaly_scan
+from .forecasting import ForecastResult, fit_forecasts
+
+__all__ = [
+    "AnomalyStore",
+    "ForecastResult",
+    "detect_anomalies",
+    "fit_forecasts",
+    "get_anomaly_store",
+    "run_anomaly_scan"
+]
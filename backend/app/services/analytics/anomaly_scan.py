@@ -0,0 +1,371 @@
+"""
+Anomaly Scan
+
+(계열 수 × 기간) 실적 행렬 전체에서 월별 급증/급감을 한 번에 탐지합니다.
+각 월 값을 직전 window개월의 중앙값/MAD(중앙 절대 편차)와 비교한 robust z-score로 판정하며,
+계열 단위 반복 없이 sliding window 뷰 위에서 벡터 연산으로 계산합니다.
+
+탐지 결과는 SQLite 이상치 테이블(월, 방향, 담당자 인덱스)에 저장되어
+Agent와 API가 "이번 달 급감 품목" 같은 질의를 재계산 없이 조회합니다.
+새 월 데이터가 추가되면 스캔하지 않은 월과 최신 월만 다시 계산합니다(증분 스캔).
+스캔은 예약 작업에서만 실행하며, 여러 워커 프로세스 중 임대(lease)를 얻은 하나만 실행합니다.
+"""
+
+import logging
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# 정규분포 가정에서 MAD → 표준편차 환산 계수
+MAD_SCALE = 1.4826
+
+# 분모가 0일 때(기준 구간 값이 모두 같음)의 z-score 상한
+Z_CAP = 99.0
+
+DIRECTIONS = {"up": "급증", "down": "급감"}
+
+ANOMALY_COLUMNS = [
+    "month", "rep", "client_id", "product", "value", "baseline", "change_rate", "z_score", "direction",
+]
+
+
+def detect_anomalies(values: np.ndarray, targets: Sequence[int], window: int = 6,
+                     z_threshold: float = 3.5, min_change: float = 0.3) -> Dict[str, np.ndarray]:
+    """
+    대상 월 열의 급증/급감 셀 탐지
+
+    Args:
+        values: (계열 수, 기간) 행렬. 결측(NaN)은 0으로 간주
+        targets: 판정할 열 위치 (직전 window개월이 없는 열은 제외)
+        window: 기준 구간 길이 (개월)
+        z_threshold: |robust z-score| 하한
+        min_change: 기준 중앙값 대비 |변화율| 하한 (소액 계열의 잡음 제외)
+
+    Returns: 탐지된 셀의 row, column, value, baseline, change_rate, z_score 배열
+    """
+    values = np.nan_to_num(np.asarray(values, dtype=np.float64))
+    empty = {name: np.empty(0) for name in ("row", "column", "value", "baseline", "change_rate", "z_score")}
+    if values.ndim != 2 or len(values) == 0:
+        return empty
+    columns = np.array(sorted({int(t) for t in targets if window <= t < values.shape[1]}), dtype=np.int64)
+    if len(columns) == 0:
+        return empty
+
+    # windows[:, j] = values[:, j:j + window] → 열 t의 기준 구간은 windows[:, t - window]
+    windows = np.lib.stride_tricks.sliding_window_view(values, window, axis=1)[:, columns - window]
+    baseline = np.median(windows, axis=2)
+    mad = np.median(np.abs(windows - baseline[..., None]), axis=2)
+    current = values[:, columns]
+    deviation = current - baseline
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        z_score = np.where(mad > 0, deviation / (MAD_SCALE * mad), np.sign(deviation) * Z_CAP)
+        change_rate = np.where(baseline > 0, deviation / baseline, 0.0)
+    z_score = np.clip(z_score, -Z_CAP, Z_CAP)
+
+    # 기준 구간에 실적이 있던 계열만 판정 (신규 품목 진입은 급증으로 보지 않음)
+    flagged = (baseline > 0) & (np.abs(z_score) >= z_threshold) & (np.abs(change_rate) >= min_change)
+    rows, positions = np.nonzero(flagged)
+    return {
+        "row": rows,
+        "column": columns[positions],
+        "value": current[rows, positions],
+        "baseline": baseline[rows, positions],
+        "change_rate": change_rate[rows, positions],
+        "z_score": z_score[rows, positions],
+    }
+
+
+def extract_direction(message: str) -> Optional[str]:
+    """메시지에서 급증(up)/급감(down) 질의 추출"""
+    if any(keyword in (message or "") for keyword in ["급감", "감소", "줄어", "빠진"]):
+        return "down"
+    if any(keyword in (message or "") for keyword in ["급증", "증가", "늘어", "뛴"]):
+        return "up"
+    return None
+
+
+def format_anomalies(anomalies: List[Dict[str, Any]], summary: Dict[str, Any], direction: Optional[str] = None) -> str:
+    """이상치 목록 응답 텍스트"""
+    month = summary.get("month")
+    text = f"기준월: {str(month)[:4]}-{str(month)[4:]}\n" if month else ""
+    text += f"📈 급증 {summary.get('급증', 0)}건 / 📉 급감 {summary.get('급감', 0)}건\n\n"
+    if not anomalies:
+        label = DIRECTIONS.get(direction, "급증/급감")
+        return text + f"조건에 맞는 {label} 품목이 없습니다.\n"
+    for item in anomalies:
+        icon = "📈" if item["direction"] == DIRECTIONS["up"] else "📉"
+        text += (
+            f"{icon} {item['product']} ({item['client_id']}, 담당 {item['rep']}): "
+            f"{item['baseline']:,.0f} → {item['value']:,.0f}원 ({item['change_rate'] * 100:+.0f}%)\n"
+        )
+    return text
+
+
+def seconds_until(hour: int, now: Optional[datetime] = None) -> float:
+    """다음 실행 시각(매일 hour시 정각)까지 남은 초"""
+    now = now or datetime.now()
+    target = now.replace(hour=hour, minute=0, second=0, microsecond=0)
+    if target <= now:
+        target += timedelta(days=1)
+    return (target - now).total_seconds()
+
+
+class AnomalyStore:
+    """급증/급감 이상치 테이블 (증분 스캔, SQLite 저장, 조회)"""
+
+    def __init__(self, db_path: Path, window: int = 6, z_threshold: float = 3.5, min_change: float = 0.3):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.window = window
+        self.z_threshold = z_threshold
+        self.min_change = min_change
+        self._lock = threading.Lock()
+        self._initialize_database()
+
+    def _connect(self) -> sqlite3.Connection:
+        """SQLite 연결 생성 (스캔 작업과 API 워커가 같은 파일을 공유하므로 잠금 대기 허용)"""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _initialize_database(self):
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS sales_anomalies (
+                    month INTEGER,
+                    rep TEXT,
+                    client_id TEXT,
+                    product TEXT,
+                    value REAL,
+                    baseline REAL,
+                    change_rate REAL,
+                    z_score REAL,
+                    direction TEXT,
+                    PRIMARY KEY (month, rep, client_id, product)
+                )
+            """)
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_sales_anomalies_direction ON sales_anomalies(month, direction, change_rate)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_sales_anomalies_rep ON sales_anomalies(rep, month)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_sales_anomalies_client ON sales_anomalies(client_id, month)")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS anomaly_scans (
+                    month INTEGER PRIMARY KEY,
+                    series INTEGER,
+                    flagged INTEGER,
+                    scanned_at TEXT
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS scan_leases (
+                    name TEXT PRIMARY KEY,
+                    owner TEXT,
+                    expires_at REAL
+                )
+            """)
+
+    def try_lease(self, name: str, owner: str, ttl_seconds: float) -> bool:
+        """
+        작업 임대 획득 (다른 소유자의 임대가 만료되지 않았으면 False)
+
+        uvicorn 다중 워커가 같은 DB 파일을 공유하므로 예약 스캔을 한 워커만 실행하도록 SQLite 행으로 조정합니다.
+        """
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO scan_leases (name, owner, expires_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET owner = excluded.owner, expires_at = excluded.expires_at "
+                "WHERE scan_leases.expires_at < ? OR scan_leases.owner = excluded.owner",
+                (name, owner, now + ttl_seconds, now)
+            )
+            row = conn.execute("SELECT owner FROM scan_leases WHERE name = ?", (name,)).fetchone()
+        return row is not None and row[0] == owner
+
+    def release_lease(self, name: str, owner: str):
+        """보유 중인 임대 반납 (실패한 작업을 다른 워커가 다음 주기에 이어받도록)"""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM scan_leases WHERE name = ? AND owner = ?", (name, owner))
+
+    def scanned_months(self) -> List[int]:
+        """스캔이 끝난 월 목록"""
+        with self._connect() as conn:
+            rows = conn.execute("SELECT month FROM anomaly_scans ORDER BY month").fetchall()
+        return [row[0] for row in rows]
+
+    def latest_month(self) -> Optional[int]:
+        months = self.scanned_months()
+        return months[-1] if months else None
+
+    def refresh(self, keys: Sequence[Tuple[Hashable, Hashable, Hashable]], months: Sequence[int],
+                values: np.ndarray, full: bool = False) -> List[int]:
+        """
+        (담당자, 거래처, 품목) 계열 행렬로 이상치 테이블 갱신
+
+        스캔하지 않은 월과 최신 월(월중 데이터가 바뀔 수 있음)만 계산합니다.
+        Returns: 다시 스캔한 월 목록
+        """
+        with self._lock:
+            started = time.perf_counter()
+            scanned = set() if full else set(self.scanned_months())
+            latest = months[-1] if len(months) else None
+            targets = [
+                index for index, month in enumerate(months)
+                if index >= self.window and (month not in scanned or month == latest)
+            ]
+            if not targets:
+                return []
+
+            found = detect_anomalies(values, targets, self.window, self.z_threshold, self.min_change)
+            keys = list(keys)
+            rows = [
+                (
+                    int(months[column]), str(keys[row][0]), str(keys[row][1]), str(keys[row][2]),
+                    round(float(value), 2), round(float(baseline), 2), round(float(change), 4), round(float(z), 2),
+                    DIRECTIONS["up"] if change > 0 else DIRECTIONS["down"],
+                )
+                for row, column, value, baseline, change, z in zip(
+                    found["row"], found["column"], found["value"], found["baseline"],
+                    found["change_rate"], found["z_score"]
+                )
+            ]
+
+            refreshed = [int(months[index]) for index in targets]
+            flagged = [int((found["column"] == index).sum()) for index in targets]
+            scanned_at = datetime.now().isoformat(timespec="seconds")
+            with self._connect() as conn:
+                conn.executemany("DELETE FROM sales_anomalies WHERE month = ?", [(month,) for month in refreshed])
+                conn.executemany(
+                    f"INSERT INTO sales_anomalies ({', '.join(ANOMALY_COLUMNS)}) "
+                    f"VALUES ({', '.join('?' * len(ANOMALY_COLUMNS))})",
+                    rows
+                )
+                conn.executemany(
+                    "INSERT OR REPLACE INTO anomaly_scans (month, series, flagged, scanned_at) VALUES (?, ?, ?, ?)",
+                    [(month, len(keys), int(count), scanned_at) for month, count in zip(refreshed, flagged)]
+                )
+
+            logger.info(
+                f"실적 이상치 스캔: {len(keys)}개 계열 × {len(refreshed)}개월, 탐지 {len(rows)}건 "
+                f"({(time.perf_counter() - started) * 1000:.1f}ms)"
+            )
+            return refreshed
+
+    def query(self, month: Optional[int] = None, direction: Optional[str] = None, rep: Optional[str] = None,
+              client_id: Optional[str] = None, product: Optional[str] = None, limit: int = 20) -> List[Dict[str, Any]]:
+        """
+        이상치 조회 (month 생략 시 최신 스캔 월, 변화율 절댓값 내림차순)
+
+        direction: "급증"/"급감" 또는 "up"/"down"
+        client_id, product: 부분 문자열 일치
+        """
+        month = month or self.latest_month()
+        if month is None:
+            return []
+
+        clauses, params = ["month = ?"], [month]
+        if direction:
+            clauses.append("direction = ?")
+            params.append(DIRECTIONS.get(direction, direction))
+        if rep:
+            clauses.append("rep = ?")
+            params.append(rep)
+        if client_id:
+            clauses.append("client_id LIKE ?")
+            params.append(f"%{client_id}%")
+        if product:
+            clauses.append("product LIKE ?")
+            params.append(f"%{product}%")
+
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT * FROM sales_anomalies WHERE {' AND '.join(clauses)} "
+                f"ORDER BY ABS(change_rate) DESC, ABS(z_score) DESC LIMIT ?",
+                params + [limit]
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def reps(self) -> List[str]:
+        """이상치가 기록된 담당자 목록"""
+        with self._connect() as conn:
+            rows = conn.execute("SELECT DISTINCT rep FROM sales_anomalies ORDER BY rep").fetchall()
+        return [row[0] for row in rows]
+
+    def summary(self, month: Optional[int] = None) -> Dict[str, Any]:
+        """월별 급증/급감 건수"""
+        month = month or self.latest_month()
+        if month is None:
+            return {"month": None, "급증": 0, "급감": 0}
+        with self._connect() as conn:
+            counts = dict(conn.execute(
+                "SELECT direction, COUNT(*) FROM sales_anomalies WHERE month = ? GROUP BY direction", (month,)
+            ).fetchall())
+        return {"month": month, **{label: int(counts.get(label, 0)) for label in DIRECTIONS.values()}}
+
+
+_stores: Dict[str, AnomalyStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_anomaly_store() -> AnomalyStore:
+    """설정 경로의 공유 이상치 저장소"""
+    from ...core.config import settings
+
+    db_path = Path(settings.sqlite_db_path) / "anomalies.db"
+    with _stores_lock:
+        if str(db_path) not in _stores:
+            _stores[str(db_path)] = AnomalyStore(
+                db_path,
+                window=settings.anomaly_window_months,
+                z_threshold=settings.anomaly_z_threshold,
+                min_change=settings.anomaly_min_change
+            )
+        return _stores[str(db_path)]
+
+
+def run_anomaly_scan(full: bool = False, service: Any = None) -> Dict[str, Any]:
+    """
+    전체 실적(담당자 × 거래처 × 품목) 이상치 스캔 작업
+
+    거래처 분석 엔진의 사전 집계 큐브에서 계열 행렬을 만들고 증분 스캔합니다.
+
+    Args:
+        service: 분석 엔진을 제공하는 거래처 DatabaseService (서버에서는 거래처 Agent의 공유 인스턴스,
+            생략 시 단독 실행용으로 새로 생성)
+    """
+    if service is None:
+        from ..agents.client_agent.database_service import DatabaseService
+        service = DatabaseService()
+
+    started = time.perf_counter()
+    engine = service.get_analytics_engine()
+    if engine is None:
+        logger.warning("실적 이상치 스캔 건너뜀: 거래처 분석 데이터 없음")
+        return {"scanned_months": [], "series": 0}
+
+    keys, matrix = engine.series_matrix("rep_client_product")
+    store = get_anomaly_store()
+    refreshed = store.refresh(keys, engine.months, matrix, full=full)
+    return {
+        "scanned_months": refreshed,
+        "series": len(keys),
+        "summary": store.summary(),
+        "elapsed_seconds": round(time.perf_counter() - started, 3),
+    }
+
+
+if __name__ == "__main__":
+    # cron 등 외부 스케줄러에서 단독 실행: python -m app.services.analytics.anomaly_scan [--full]
+    import sys
+
+    logging.basicConfig(level=logging.INFO)
+    print(run_anomaly_scan(full="--full" in sys.argv))
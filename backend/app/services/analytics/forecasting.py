@@ -0,0 +1,183 @@
+"""
+Batch Forecasting
+
+(계열 수 × 기간) 2차원 행렬의 모든 시계열에 단순 모형을 한 번에 적합합니다.
+계열 단위 반복 없이 NumPy 브로드캐스팅으로 계산하며, 지수 평활만 기간 축으로 순회합니다.
+
+모형:
+- linear: 최소제곱 선형 추세
+- seasonal_naive: 한 주기 전 값 (주기보다 짧으면 직전 값)
+- exponential: 단순 지수 평활
+
+계열별로 1-step 예측 오차(각 시점 값을 그 이전 값만으로 예측한 오차)의 MAE가 가장 작은 모형을 선택하고,
+오차 표준편차로 예측 구간을 계산합니다. 모든 모형을 같은 평가 시점 구간에서 비교합니다.
+결과는 키 → 행 위치 사전으로 O(1) 조회합니다.
+"""
+
+import logging
+import time
+from typing import Any, Dict, Hashable, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+MODELS = ("linear", "seasonal_naive", "exponential")
+
+# 95% 예측 구간
+Z_95 = 1.96
+
+
+def _linear(values: np.ndarray):
+    """
+    선형 추세 적합 → (다음 기간 예측, 기울기, 1-step 잔차)
+
+    예측/기울기는 전체 기간 적합, 잔차는 t번째 값을 직전 t개 값만으로 적합한 추세로 예측한 오차입니다
+    (t >= 2, 누적합으로 모든 시점을 한 번에 계산, 계산할 수 없는 시점은 NaN).
+    """
+    periods = values.shape[1]
+    t = np.arange(periods, dtype=np.float64)
+    t_centered = t - t.mean()
+    mean = values.mean(axis=1, keepdims=True)
+    slope = (values - mean) @ t_centered / max((t_centered ** 2).sum(), 1e-12)
+    intercept = mean[:, 0] - slope * t.mean()
+    forecast = intercept + slope * periods
+
+    residuals = np.full(values.shape, np.nan)
+    if periods > 2:
+        n = t[2:]  # 시점 k의 예측에 쓰는 직전 값 개수 = k
+        sum_t = n * (n - 1) / 2
+        sum_tt = (n - 1) * n * (2 * n - 1) / 6
+        sum_y = np.cumsum(values, axis=1)[:, 1:-1]
+        sum_ty = np.cumsum(values * t, axis=1)[:, 1:-1]
+        prefix_slope = (n * sum_ty - sum_t * sum_y) / (n * sum_tt - sum_t ** 2)
+        prefix_intercept = (sum_y - prefix_slope * sum_t) / n
+        residuals[:, 2:] = values[:, 2:] - (prefix_intercept + prefix_slope * n)
+    return forecast, slope, residuals
+
+
+def _seasonal_naive(values: np.ndarray, season_length: int):
+    """계절 단순 예측 → (다음 기간 예측, 1-step 잔차, 시차) - 잔차는 시차 이전 시점 NaN"""
+    periods = values.shape[1]
+    lag = season_length if periods > season_length else 1
+    forecast = values[:, periods - lag]
+    residuals = np.full(values.shape, np.nan)
+    if periods > lag:
+        residuals[:, lag:] = values[:, lag:] - values[:, :-lag]
+    return forecast, residuals, lag
+
+
+def _exponential(values: np.ndarray, alpha: float):
+    """단순 지수 평활 → (다음 기간 예측 = 최종 수준, 1-step 잔차) - 첫 시점 잔차는 NaN"""
+    level = values[:, 0].copy()
+    residuals = np.full(values.shape, np.nan)
+    for step in range(1, values.shape[1]):
+        residuals[:, step] = values[:, step] - level
+        level += alpha * residuals[:, step]
+    return level, residuals
+
+
+class ForecastResult:
+    """일괄 적합 결과 (계열 키로 O(1) 조회)"""
+
+    def __init__(self, keys: Sequence[Hashable], periods: int, forecast: np.ndarray, lower: np.ndarray,
+                 upper: np.ndarray, model: np.ndarray, slope: np.ndarray, mean: np.ndarray, mae: np.ndarray):
+        self.keys = list(keys)
+        self.periods = periods
+        self.forecast = forecast
+        self.lower = lower
+        self.upper = upper
+        self.model = model
+        self.slope = slope
+        self.mean = mean
+        self.mae = mae
+        self._index = {key: position for position, key in enumerate(self.keys)}
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._index
+
+    def trend_direction(self, position: int, threshold: float = 0.1) -> str:
+        """적합 기간 동안의 추세 변화율로 방향 분류 (increasing/decreasing/stable)"""
+        mean = self.mean[position]
+        if mean <= 0:
+            return "stable"
+        change = self.slope[position] * max(self.periods - 1, 1) / mean
+        if change > threshold:
+            return "increasing"
+        if change < -threshold:
+            return "decreasing"
+        return "stable"
+
+    def get(self, key: Hashable) -> Optional[Dict[str, Any]]:
+        """계열 하나의 다음 기간 예측"""
+        position = self._index.get(key)
+        if position is None:
+            return None
+        return {
+            "forecast": round(float(self.forecast[position]), 2),
+            "lower": round(float(self.lower[position]), 2),
+            "upper": round(float(self.upper[position]), 2),
+            "model": MODELS[int(self.model[position])],
+            "trend": self.trend_direction(position),
+            "slope": round(float(self.slope[position]), 4),
+            "mae": round(float(self.mae[position]), 2),
+        }
+
+
+def fit_forecasts(values: np.ndarray, keys: Optional[Sequence[Hashable]] = None,
+                  season_length: int = 12, alpha: float = 0.3) -> ForecastResult:
+    """
+    모든 계열에 모형을 적합하고 계열별 최적 모형의 다음 기간 예측을 반환
+
+    Args:
+        values: (계열 수, 기간) 행렬. 결측(NaN)은 0으로 간주
+        keys: 행 순서의 계열 키 (생략 시 행 번호)
+        season_length: 계절 주기 (월 데이터 기본 12)
+        alpha: 지수 평활 계수
+    """
+    started = time.perf_counter()
+    values = np.nan_to_num(np.asarray(values, dtype=np.float64))
+    if values.ndim != 2 or values.shape[1] == 0:
+        raise ValueError("values는 (계열 수, 기간) 2차원 행렬이어야 합니다.")
+    keys = list(range(len(values))) if keys is None else list(keys)
+
+    linear_forecast, slope, linear_residuals = _linear(values)
+    seasonal_forecast, seasonal_residuals, lag = _seasonal_naive(values, season_length)
+    exp_forecast, exp_residuals = _exponential(values, alpha)
+
+    forecasts = np.stack([linear_forecast, seasonal_forecast, exp_forecast])
+    # 모든 모형의 1-step 오차가 있는 시점부터 같은 구간으로 비교 (구간이 없으면 오차 0 → 선형 선택)
+    start = max(2, lag)
+    residuals = np.stack([linear_residuals, seasonal_residuals, exp_residuals])[:, :, start:]
+    if residuals.shape[2] == 0:
+        residuals = np.zeros(residuals.shape[:2] + (1,))
+    mae = np.abs(residuals).mean(axis=2)
+    sigma = residuals.std(axis=2)
+
+    model = mae.argmin(axis=0)
+    rows = np.arange(len(values))
+    forecast = np.maximum(forecasts[model, rows], 0.0)
+    spread = Z_95 * sigma[model, rows]
+
+    result = ForecastResult(
+        keys=keys,
+        periods=values.shape[1],
+        forecast=forecast,
+        lower=np.maximum(forecast - spread, 0.0),
+        upper=forecast + spread,
+        model=model,
+        slope=slope,
+        mean=values.mean(axis=1),
+        mae=mae[model, rows],
+    )
+    logger.debug(f"시계열 일괄 예측: {len(values)}개 × {values.shape[1]}기간 ({(time.perf_counter() - started) * 1000:.1f}ms)")
+    return result
+
+
+def summarize_models(result: ForecastResult) -> Dict[str, int]:
+    """모형별 선택 계열 수"""
+    counts = np.bincount(result.model, minlength=len(MODELS))
+    return {name: int(count) for name, count in zip(MODELS, counts)}
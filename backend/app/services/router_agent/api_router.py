@@ -14,15 +14,24 @@ import logging
 import uuid
 from datetime import datetime
 import asyncio
+import time
 
+from ...core.admission import Overloaded
+from ...core.config import settings
+from ...core.tracing import record, timing_metadata
 from .router_agent import RouterAgent
 
 logger = logging.getLogger(__name__)
 
-# Router Agent 인스턴스 (StateGraph 사용)
-router_agent_state = RouterAgent(use_state_graph=True)
-# Router Agent 인스턴스 (기존 방식)
-router_agent_normal = RouterAgent(use_state_graph=False)
+# Router Agent 인스턴스 (최초 요청 시 생성)
+_router_agents: Dict[bool, RouterAgent] = {}
+
+def get_router_agent(use_state_graph: bool = False) -> RouterAgent:
+    """Router Agent 인스턴스 조회 (StateGraph 사용 여부별로 한 번만 생성)"""
+    use_state_graph = bool(use_state_graph)
+    if use_state_graph not in _router_agents:
+        _router_agents[use_state_graph] = RouterAgent(use_state_graph=use_state_graph)
+    return _router_agents[use_state_graph]
 
 # FastAPI 라우터
 router = APIRouter()
@@ -34,6 +43,12 @@ class ChatRequest(BaseModel):
     user_id: Optional[str] = None
     use_state_graph: Optional[bool] = False  # StateGraph 사용 여부
 
+class BatchChatRequest(BaseModel):
+    messages: List[str]
+    user_id: Optional[str] = None
+    use_state_graph: Optional[bool] = False
+    concurrency: Optional[int] = None  # 미지정 시 batch_chat_concurrency
+
 class ChatResponse(BaseModel):
     response: str
     agent: str
@@ -59,13 +74,17 @@ class RouterStats(BaseModel):
     initialized: bool
     use_state_graph: bool
 
+def _too_many_requests(e: Overloaded) -> HTTPException:
+    """과부하 거절 → 429 + Retry-After"""
+    return HTTPException(status_code=429, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+
 # 메인 채팅 엔드포인트
 @router.post("/chat", response_model=ChatResponse)
 async def chat(request: ChatRequest):
     """메인 채팅 엔드포인트 - Router Agent를 통한 자동 라우팅"""
     try:
         # StateGraph 사용 여부에 따라 Router Agent 선택
-        router_agent = router_agent_state if request.use_state_graph else router_agent_normal
+        router_agent = get_router_agent(request.use_state_graph)
         
         # 세션 ID 생성 (없는 경우)
         session_id = request.session_id or str(uuid.uuid4())
@@ -83,12 +102,18 @@ async def chat(request: ChatRequest):
         if "error" in result:
             raise HTTPException(status_code=500, detail=result["error"])
         
+        # 디버그 헤더(X-Debug-Timing)가 있으면 단계별 타이밍 첨부
+        metadata = result.get("metadata", {})
+        timings = timing_metadata()
+        if timings:
+            metadata = {**metadata, "timings": timings}
+        
         # 응답 생성
         response = ChatResponse(
             response=result.get("response", ""),
             agent=result.get("agent", "unknown"),
             sources=result.get("sources", []),
-            metadata=result.get("metadata", {}),
+            metadata=metadata,
             session_id=session_id,
             user_id=request.user_id,
             routing_confidence=result.get("routing_confidence", 0.0),
@@ -100,6 +125,8 @@ async def chat(request: ChatRequest):
         logger.info(f"채팅 응답 완료: agent={response.agent}, confidence={response.routing_confidence}, state_graph={request.use_state_graph}")
         return response
         
+    except Overloaded as e:
+        raise _too_many_requests(e)
     except Exception as e:
         logger.error(f"채팅 처리 실패: {str(e)}")
         raise HTTPException(status_code=500, detail=f"채팅 처리 중 오류가 발생했습니다: {str(e)}")
@@ -110,51 +137,75 @@ async def chat_stream(request: ChatRequest):
     """스트리밍 채팅 엔드포인트"""
     try:
         # StateGraph 사용 여부에 따라 Router Agent 선택
-        router_agent = router_agent_state if request.use_state_graph else router_agent_normal
+        router_agent = get_router_agent(request.use_state_graph)
         
         session_id = request.session_id or str(uuid.uuid4())
         
         logger.info(f"스트리밍 채팅 요청: session_id={session_id}, use_state_graph={request.use_state_graph}")
         
-        # Router Agent로 요청 라우팅
-        result = await router_agent.route_request(
+        # Router Agent로 요청 라우팅 (복합 질문은 Agent별 부분 결과가 먼저 도착)
+        events = router_agent.stream_request(
             message=request.message,
             user_id=request.user_id,
             session_id=session_id
         )
+        first_event = await events.__anext__()
         
-        if "error" in result:
-            raise HTTPException(status_code=500, detail=result["error"])
+        if first_event["type"] == "final" and "error" in first_event["result"]:
+            raise HTTPException(status_code=500, detail=first_event["result"]["error"])
         
         # 스트리밍 응답 생성 (프론트엔드 형식에 맞춤)
         async def generate_stream():
+            stream_started = time.perf_counter()
+            agent_name = first_event["result"].get('agent', 'unknown') if first_event["type"] == "final" else "multi_agent"
+            
             # 1. 시작 신호
-            yield f"data: {json.dumps({'type': 'start', 'session_id': session_id, 'agent': result.get('agent', 'unknown'), 'use_state_graph': request.use_state_graph})}\n\n"
+            yield f"data: {json.dumps({'type': 'start', 'session_id': session_id, 'agent': agent_name, 'use_state_graph': request.use_state_graph})}\n\n"
             
             # 2. Agent 선택 정보
             yield f"data: {json.dumps({'type': 'agent_selection', 'message': '적절한 전문 Agent를 선택하고 있습니다...'})}\n\n"
             await asyncio.sleep(0.1)
             
             # 3. Agent 정보
-            agent_name = result.get('agent', 'unknown')
             yield f"data: {json.dumps({'type': 'agent_info', 'agent': agent_name, 'message': f'{agent_name} Agent가 처리합니다...'})}\n\n"
+            
+            # 3-1. 복합 질문: Agent가 끝나는 순서대로 부분 결과 전달
+            event = first_event
+            while event["type"] == "agent_result":
+                partial = {
+                    'type': 'agent_partial', 'index': event['index'], 'agent': event['agent'],
+                    'content': event['response'], 'sources': event['sources'], 'elapsed_ms': event['elapsed_ms']
+                }
+                yield f"data: {json.dumps(partial)}\n\n"
+                event = await events.__anext__()
+            result = event["result"]
+            if event is not first_event:
+                yield f"data: {json.dumps({'type': 'agent_info', 'agent': result.get('agent', 'unknown'), 'message': '부분 결과를 하나의 답변으로 정리했습니다.'})}\n\n"
             await asyncio.sleep(0.1)
             
             # 4. 응답 텍스트를 토큰 단위로 스트리밍 (한국어 친화적)
             response_text = result.get("response", "")
             words = response_text.split()
+            # LLM 캐시 적중 응답은 타이핑 효과 없이 즉시 재생
+            typing_delay = 0 if result.get("metadata", {}).get("llm_cache") == "hit" else 0.05
             
             for i, word in enumerate(words):
                 yield f"data: {json.dumps({'type': 'token', 'word': word, 'index': i})}\n\n"
-                await asyncio.sleep(0.05)  # 자연스러운 타이핑 효과
+                if typing_delay:
+                    await asyncio.sleep(typing_delay)  # 자연스러운 타이핑 효과
             
             # 5. 완료 정보
+            metadata = result.get('metadata', {})
+            timings = timing_metadata()
+            if timings:
+                metadata = {**metadata, 'timings': timings}
+            
             complete_data = {
                 'type': 'complete',
                 'content': response_text,
                 'agent': result.get('agent', 'unknown'),
                 'sources': result.get('sources', []),
-                'metadata': result.get('metadata', {}),
+                'metadata': metadata,
                 'routing_confidence': result.get('routing_confidence', 0.0),
                 'session_id': session_id,
                 'use_state_graph': request.use_state_graph
@@ -163,6 +214,7 @@ async def chat_stream(request: ChatRequest):
             
             # 6. 종료 신호 (프론트엔드가 기대하는 형식)
             yield f"data: [DONE]\n\n"
+            record("sse.emit", (time.perf_counter() - stream_started) * 1000)
         
         return StreamingResponse(
             generate_stream(),
@@ -170,16 +222,70 @@ async def chat_stream(request: ChatRequest):
             headers={"Cache-Control": "no-cache", "Connection": "keep-alive"}
         )
         
+    except Overloaded as e:
+        raise _too_many_requests(e)
     except Exception as e:
         logger.error(f"스트리밍 채팅 처리 실패: {str(e)}")
         raise HTTPException(status_code=500, detail=f"스트리밍 처리 중 오류가 발생했습니다: {str(e)}")
 
+# 배치 채팅 엔드포인트
+@router.post("/chat/batch")
+async def chat_batch(request: BatchChatRequest):
+    """
+    배치 채팅 엔드포인트 - 여러 메시지를 동시에 처리하고 완료되는 순서대로 NDJSON으로 스트리밍
+    
+    각 줄: {"index", "message", "agent", "response", "sources", "metadata", "routing_confidence"}
+    마지막 줄: {"done": true, "total", "errors", "elapsed_ms"}
+    """
+    if not request.messages:
+        raise HTTPException(status_code=400, detail="messages가 비어 있습니다.")
+    if len(request.messages) > settings.batch_chat_max_messages:
+        raise HTTPException(
+            status_code=400,
+            detail=f"한 번에 최대 {settings.batch_chat_max_messages}개 메시지까지 처리할 수 있습니다."
+        )
+    
+    router_agent = get_router_agent(request.use_state_graph)
+    concurrency = max(1, min(request.concurrency or settings.batch_chat_concurrency, settings.batch_chat_concurrency))
+    logger.info(f"배치 채팅 요청: {len(request.messages)}건, 동시 처리 {concurrency}")
+    
+    async def generate_lines():
+        started = time.perf_counter()
+        errors = 0
+        async for index, result in router_agent.iter_batch_requests(request.messages, request.user_id, concurrency):
+            if "error" in result:
+                errors += 1
+            item = {
+                "index": index,
+                "message": request.messages[index],
+                "agent": result.get("agent", "unknown"),
+                "response": result.get("response", ""),
+                "sources": result.get("sources", []),
+                "metadata": result.get("metadata", {}),
+                "routing_confidence": result.get("routing_confidence", 0.0),
+            }
+            if "error" in result:
+                item["error"] = result["error"]
+            if "retry_after" in result:
+                item["retry_after"] = result["retry_after"]
+            yield json.dumps(item, ensure_ascii=False, default=str) + "\n"
+        
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        record("batch.total", elapsed_ms)
+        yield json.dumps({"done": True, "total": len(request.messages), "errors": errors, "elapsed_ms": round(elapsed_ms, 2)}) + "\n"
+    
+    return StreamingResponse(
+        generate_lines(),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-cache"}
+    )
+
 # 사용 가능한 Agent 목록
 @router.get("/agents", response_model=List[AgentInfo])
 async def get_agents(use_state_graph: bool = Query(False, description="StateGraph 사용 여부")):
     """사용 가능한 Agent 목록 조회"""
     try:
-        router_agent = router_agent_state if use_state_graph else router_agent_normal
+        router_agent = get_router_agent(use_state_graph)
         agents = router_agent.get_available_agents()
         return [AgentInfo(**agent) for agent in agents]
     except Exception as e:
@@ -191,21 +297,53 @@ async def get_agents(use_state_graph: bool = Query(False, description="StateGrap
 async def get_router_stats(use_state_graph: bool = Query(False, description="StateGraph 사용 여부")):
     """Router Agent 통계 정보"""
     try:
-        router_agent = router_agent_state if use_state_graph else router_agent_normal
+        router_agent = get_router_agent(use_state_graph)
         stats = router_agent.get_router_stats()
         return RouterStats(**stats)
     except Exception as e:
         logger.error(f"Router 통계 조회 실패: {str(e)}")
         raise HTTPException(status_code=500, detail=f"통계 조회 중 오류가 발생했습니다: {str(e)}")
 
+# 실적 급증/급감 조회 (야간 스캔 결과)
+@router.get("/anomalies")
+async def get_anomalies(
+    month: Optional[int] = Query(None, description="기준월 (YYYYMM, 생략 시 최신 스캔 월)"),
+    direction: Optional[str] = Query(None, description="급증/급감 (up/down)"),
+    rep: Optional[str] = Query(None, description="담당자"),
+    client_id: Optional[str] = Query(None, description="거래처 (부분 일치)"),
+    product: Optional[str] = Query(None, description="품목 (부분 일치)"),
+    limit: int = Query(20, ge=1, le=500, description="최대 건수")
+):
+    """사전 계산된 실적 이상치 테이블 조회"""
+    try:
+        from ..analytics.anomaly_scan import get_anomaly_store
+        
+        def query():
+            store = get_anomaly_store()
+            anomalies = store.query(month, direction, rep, client_id, product, limit)
+            return {"summary": store.summary(month), "anomalies": anomalies, "count": len(anomalies)}
+        
+        return await asyncio.to_thread(query)
+    except Exception as e:
+        logger.error(f"실적 이상치 조회 실패: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"이상치 조회 중 오류가 발생했습니다: {str(e)}")
+
+# 프롬프트 캐시 효과 리포트
+@router.get("/prompt-cache")
+async def get_prompt_cache_report():
+    """호출 지점별 캐시/비캐시 입력 토큰, 접두부 변형 수, 예상 절감 비용"""
+    from ...core.prompt_cache import prompt_cache_report
+    
+    return prompt_cache_report()
+
 # 헬스 체크
 @router.get("/health")
 async def health_check():
     """Router Agent 헬스 체크"""
     try:
         # 두 가지 방식 모두 체크
-        stats_normal = router_agent_normal.get_router_stats()
-        stats_state = router_agent_state.get_router_stats()
+        stats_normal = get_router_agent(False).get_router_stats()
+        stats_state = get_router_agent(True).get_router_stats()
         
         return {
             "status": "healthy",
@@ -235,7 +373,7 @@ async def health_check():
 async def get_conversation_history(session_id: str):
     """대화 기록 조회 (StateGraph 전용)"""
     try:
-        history = router_agent_state.get_conversation_history(session_id)
+        history = get_router_agent(True).get_conversation_history(session_id)
         return {
             "session_id": session_id,
             "history": history,
@@ -256,7 +394,7 @@ async def get_conversation_history(session_id: str):
 async def get_session_stats(session_id: str):
     """세션 통계 조회 (StateGraph 전용)"""
     try:
-        stats = router_agent_state.get_session_stats(session_id)
+        stats = get_router_agent(True).get_session_stats(session_id)
         return {
             "session_id": session_id,
             "stats": stats,
@@ -6,8 +6,9 @@ OpenAI GPT-4o Tool Calling을 사용하여 4개의 전문 Agent로 라우팅하
 StateGraph 옵션 지원
 """
 
+import asyncio
 import logging
-from typing import Dict, List, Any, Optional
+from typing import AsyncIterator, Dict, List, Any, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -40,6 +41,18 @@ class RouterAgent:
         """
         return await self.graph.route_request(message, user_id, session_id)
     
+    async def stream_request(self, message: str, user_id: str = None,
+                             session_id: str = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        라우팅 이벤트 스트림 (복합 질문의 Agent별 부분 결과 → 최종 결과)
+        """
+        if hasattr(self.graph, 'stream_request'):
+            async for event in self.graph.stream_request(message, user_id, session_id):
+                yield event
+        else:
+            # StateGraph Router의 경우 최종 결과만 전달
+            yield {"type": "final", "result": await self.route_request(message, user_id, session_id)}
+    
     def get_available_agents(self) -> List[Dict[str, Any]]:
         """사용 가능한 Agent 목록 반환"""
         if hasattr(self.graph, 'get_available_agents'):
@@ -97,16 +110,30 @@ class RouterAgent:
     
     # 추가 기능들 (Graph를 통한 접근)
     async def route_batch_requests(self, messages: List[str], user_id: str = None) -> List[Dict[str, Any]]:
-        """배치 요청 라우팅"""
-        if hasattr(self.graph, 'route_batch_requests'):
-            return await self.graph.route_batch_requests(messages, user_id)
-        else:
-            # StateGraph Router의 경우 개별 처리
-            results = []
-            for message in messages:
-                result = await self.route_request(message, user_id)
-                results.append(result)
-            return results
+        """배치 요청 라우팅 (동시 처리, 입력 순서로 반환)"""
+        results: List[Optional[Dict[str, Any]]] = [None] * len(messages)
+        async for index, result in self.iter_batch_requests(messages, user_id):
+            results[index] = result
+        return results
+    
+    async def iter_batch_requests(self, messages: List[str], user_id: str = None,
+                                  concurrency: Optional[int] = None) -> AsyncIterator[Tuple[int, Dict[str, Any]]]:
+        """배치 요청 동시 처리 - 완료되는 순서대로 (인덱스, 결과) 반환"""
+        if hasattr(self.graph, 'iter_batch_requests'):
+            async for item in self.graph.iter_batch_requests(messages, user_id, concurrency):
+                yield item
+            return
+        
+        # StateGraph Router의 경우 요청별 라우팅을 세마포어 범위 내에서 동시 실행
+        from ...core.config import settings
+        semaphore = asyncio.Semaphore(concurrency or settings.batch_chat_concurrency)
+        
+        async def route(index: int) -> Tuple[int, Dict[str, Any]]:
+            async with semaphore:
+                return index, await self.route_request(messages[index], user_id)
+        
+        for completed in asyncio.as_completed([route(index) for index in range(len(messages))]):
+            yield await completed
     
     async def route_with_fallback(self, message: str, primary_agent: str = None, user_id: str = None) -> Dict[str, Any]:
         """폴백이 있는 라우팅"""
@@ -4,13 +4,62 @@ Router Agent Graph Module
 라우팅 로직 및 그래프 관리 기능
 """
 
+import asyncio
 import logging
-from typing import Dict, List, Any, Optional
+import threading
+import time
+from typing import AsyncIterator, Dict, List, Any, Optional, Tuple
+from ...core.admission import Overloaded
+from ...core.config import settings
+from ...core.context_compactor import context_compactor
+from ...core.single_flight import request_key, route_flight
+from ...core.tracing import register_metrics_provider, span
 from .router_agent_tool import RouterAgentTool
 from .router_agent_nodes import RouterAgentNodes
 
 logger = logging.getLogger(__name__)
 
+
+class PrefetchStats:
+    """투기적 검색 선조회 통계 (재사용률, 라우팅과 겹쳐 절약한 지연시간)"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+    
+    def reset(self):
+        with self._lock:
+            self.counts = {"started": 0, "reused": 0, "cancelled": 0, "unavailable": 0, "failed": 0}
+            self.saved_ms = 0.0
+    
+    def count(self, name: str, saved_ms: float = 0.0):
+        with self._lock:
+            self.counts[name] += 1
+            self.saved_ms += saved_ms
+    
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            started, reused = self.counts["started"], self.counts["reused"]
+            return {
+                **self.counts,
+                "hit_rate": round(reused / started, 4) if started else None,
+                "saved_ms_total": round(self.saved_ms, 2),
+                "saved_ms_avg": round(self.saved_ms / reused, 2) if reused else None,
+            }
+
+
+# 복합 응답에서 Agent별 구간 제목
+AGENT_LABELS = {
+    "db_agent": "문서 검색",
+    "docs_agent": "문서·컴플라이언스",
+    "employee_agent": "직원 정보",
+    "client_agent": "거래처 분석"
+}
+
+prefetch_stats = PrefetchStats()
+register_metrics_provider("speculative_prefetch", prefetch_stats.snapshot)
+
+
 class RouterAgentGraph:
     """라우팅 그래프 관리 및 메인 로직"""
     
@@ -24,79 +73,361 @@ class RouterAgentGraph:
         """
         메인 라우팅 로직 - 사용자 요청을 분석하고 적절한 Agent로 라우팅
         """
+        result = None
+        async for event in self.stream_request(message, user_id, session_id):
+            if event["type"] == "final":
+                result = event["result"]
+        return result
+    
+    async def stream_request(self, message: str, user_id: str = None,
+                             session_id: str = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        라우팅 + Agent 실행 이벤트 스트림
+        
+        - {"type": "agent_result", ...}: 복합 질문에서 Agent 하나가 끝날 때마다의 부분 결과
+        - {"type": "final", "result": ...}: 최종 응답 (항상 마지막에 한 번)
+        
+        세션 대화 맥락이 없는 요청은 동시에 진행 중인 같은 질문의 이벤트 스트림을 공유합니다.
+        """
+        # 이전 대화 맥락 (누적 요약 + 최근 턴, 토큰 예산 내)
+        context, context_tokens = context_compactor.build_context(session_id)
+        if context or not settings.single_flight_enabled:
+            async for event in self._stream_request(message, user_id, session_id, context, context_tokens):
+                yield event
+            return
+        
+        events, shared = route_flight.stream(
+            request_key(message), lambda: self._stream_request(message, user_id, session_id, [], 0)
+        )
+        if shared:
+            logger.info(f"🔗 진행 중인 동일 질문에 합류: {message[:50]}...")
+        async for event in events:
+            if shared and event["type"] == "final":
+                # 먼저 시작한 요청의 결과를 이 요청의 세션 기준으로 복사
+                result = {
+                    **event["result"],
+                    "user_id": user_id,
+                    "session_id": session_id,
+                    "metadata": {**event["result"].get("metadata", {}), "coalesced": True}
+                }
+                if "error" not in result:
+                    context_compactor.add_turn(session_id, message, result.get("response", ""))
+                event = {**event, "result": result}
+            yield event
+    
+    async def _stream_request(self, message: str, user_id: str = None, session_id: str = None,
+                              context: Optional[List[Dict[str, str]]] = None,
+                              context_tokens: int = 0) -> AsyncIterator[Dict[str, Any]]:
+        """라우팅 + Agent 실행 (합류 없이 직접 계산)"""
         try:
             logger.info(f"Router Agent Graph 요청 처리: {message[:50]}...")
             
-            # 1. Tool Calling으로 적절한 Agent 선택
-            tool_result = await self.tool_caller.call_tool(message)
-            
-            if "error" in tool_result:
-                return {
-                    "error": tool_result["error"],
-                    "response": "시스템 오류가 발생했습니다. OpenAI API 키를 확인해주세요.",
-                    "agent": "error",
-                    "routing_confidence": 0.0
-                }
+            # 라우팅 LLM 호출이 진행되는 동안 db_agent 검색 후보를 투기적으로 선조회
+            prefetch = None
+            if settings.speculative_prefetch_enabled:
+                prefetch = self.agent_nodes.start_prefetch(message)
+                prefetch_stats.count("started")
             
-            # 2. Tool Call 결과 처리
-            if tool_result["tool_call"]:
-                # 특정 Agent로 라우팅
-                function_name = tool_result["tool_call"]["function_name"]
-                function_args = tool_result["tool_call"]["function_args"]
-                confidence = tool_result["tool_call"]["confidence"]
-                
-                logger.info(f"Router Graph 선택: {function_name}")
-                
-                # 3. 선택된 Agent 실행
-                agent_result = await self.agent_nodes.execute_agent(
-                    function_name, function_args, message
-                )
-                
-                return {
-                    "agent": function_name,
-                    "arguments": function_args,
-                    "response": agent_result.get("response", ""),
-                    "sources": agent_result.get("sources", []),
-                    "metadata": agent_result.get("metadata", {}),
-                    "user_id": user_id,
-                    "session_id": session_id,
-                    "routing_confidence": confidence
-                }
+            # 1. Tool Calling으로 적절한 Agent 선택
+            try:
+                with span("graph.route_to_agent"):
+                    if context:
+                        tool_result = await self.tool_caller.call_tool(message, context=context)
+                    else:
+                        tool_result = await self.tool_caller.call_tool(message)
+            except BaseException:
+                if prefetch is not None:
+                    prefetch.cancel()
+                    prefetch_stats.count("cancelled")
+                raise
             
+            prefetched = await self._resolve_prefetch(prefetch, tool_result)
+            tool_calls = self._tool_calls(tool_result)
+            if "error" not in tool_result and len(tool_calls) > 1:
+                events = self._iter_multi_tool(message, tool_calls, user_id, session_id, prefetched)
             else:
-                # 일반 대화 응답
-                general_response = tool_result["general_response"]
-                confidence = tool_result.get("confidence", 0.5)
-                
-                logger.info("Router Graph: 일반 응답 생성")
-                
-                return {
-                    "agent": "general_chat",
-                    "response": general_response,
-                    "sources": [],
-                    "metadata": {"type": "general_response"},
-                    "user_id": user_id,
-                    "session_id": session_id,
-                    "routing_confidence": confidence
-                }
+                events = self._single_event(message, tool_result, user_id, session_id, prefetched)
+            
+            async for event in events:
+                if event["type"] == "final" and "error" not in event["result"]:
+                    # 다음 턴 맥락용 기록 (요약 갱신은 백그라운드)
+                    result = event["result"]
+                    context_compactor.add_turn(session_id, message, result.get("response", ""))
+                    if context:
+                        result["metadata"] = {**result.get("metadata", {}), "context_tokens": context_tokens}
+                yield event
                 
+        except Overloaded:
+            raise
         except Exception as e:
             logger.error(f"Router Agent Graph 처리 실패: {str(e)}")
+            yield {"type": "final", "result": self._error_result(e)}
+    
+    async def _single_event(self, message: str, tool_result: Dict[str, Any], user_id: str = None,
+                            session_id: str = None,
+                            prefetched: Optional[List[Dict[str, Any]]] = None) -> AsyncIterator[Dict[str, Any]]:
+        """단일 Agent(또는 일반 응답) 결과를 최종 이벤트 하나로 전달"""
+        yield {
+            "type": "final",
+            "result": await self._execute_tool_result(message, tool_result, user_id, session_id, prefetched)
+        }
+    
+    @staticmethod
+    def _tool_calls(tool_result: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """라우팅 결과의 전체 Tool Call 목록 (키워드 폴백처럼 tool_call만 있는 결과 포함)"""
+        if tool_result.get("tool_calls"):
+            return tool_result["tool_calls"]
+        return [tool_result["tool_call"]] if tool_result.get("tool_call") else []
+    
+    @staticmethod
+    def _can_reuse_prefetch(tool_call: Optional[Dict[str, Any]]) -> bool:
+        """선조회(원문 기준 전체 문서 벡터 검색)를 그대로 쓸 수 있는 라우팅인지"""
+        if not tool_call or tool_call["function_name"] != "db_agent":
+            return False
+        args = tool_call["function_args"]
+        return args.get("search_type", "semantic") in ("semantic", "hybrid") and args.get("document_type", "general") == "general"
+    
+    async def _resolve_prefetch(self, prefetch: Optional["asyncio.Task"],
+                                tool_result: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
+        """라우팅 결과가 db_agent면 선조회 후보를 넘겨받고, 아니면 취소"""
+        if prefetch is None:
+            return None
+        if not any(self._can_reuse_prefetch(tool_call) for tool_call in self._tool_calls(tool_result)):
+            prefetch.cancel()
+            prefetch_stats.count("cancelled")
+            return None
+        
+        wait_started = time.perf_counter()
+        try:
+            candidates, duration_ms = await prefetch
+        except Exception as e:
+            logger.warning(f"검색 선조회 실패: {str(e)}")
+            prefetch_stats.count("failed")
+            return None
+        if candidates is None:
+            prefetch_stats.count("unavailable")
+            return None
+        
+        # 라우팅 이후 추가로 기다린 시간을 뺀 만큼이 병렬 실행으로 절약한 시간
+        waited_ms = (time.perf_counter() - wait_started) * 1000
+        prefetch_stats.count("reused", max(0.0, duration_ms - waited_ms))
+        return candidates
+    
+    async def _execute_tool_result(self, message: str, tool_result: Dict[str, Any],
+                                   user_id: str = None, session_id: str = None,
+                                   prefetched: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+        """Tool Calling 결과에 따라 Agent 실행 또는 일반 응답 구성"""
+        if "error" in tool_result:
             return {
-                "error": str(e),
-                "response": f"라우팅 처리 중 오류가 발생했습니다: {str(e)}",
+                "error": tool_result["error"],
+                "response": "시스템 오류가 발생했습니다. OpenAI API 키를 확인해주세요.",
                 "agent": "error",
                 "routing_confidence": 0.0
             }
+        
+        # 2. Tool Call 결과 처리
+        if tool_result["tool_call"]:
+            # 특정 Agent로 라우팅
+            function_name = tool_result["tool_call"]["function_name"]
+            function_args = tool_result["tool_call"]["function_args"]
+            confidence = tool_result["tool_call"]["confidence"]
+            
+            logger.info(f"Router Graph 선택: {function_name}")
+            
+            # 3. 선택된 Agent 실행
+            with span("graph.execute_agent"):
+                if prefetched is not None:
+                    agent_result = await self.agent_nodes.execute_agent(
+                        function_name, function_args, message, prefetched=prefetched
+                    )
+                else:
+                    agent_result = await self.agent_nodes.execute_agent(
+                        function_name, function_args, message
+                    )
+            
+            metadata = agent_result.get("metadata", {})
+            if "fallback_reason" in tool_result:
+                # LLM 라우팅 불가(회로 차단, API 오류 등)로 키워드 라우팅 사용
+                metadata = {**metadata, "routing": "keyword_fallback"}
+            
+            return {
+                "agent": function_name,
+                "arguments": function_args,
+                "response": agent_result.get("response", ""),
+                "sources": agent_result.get("sources", []),
+                "metadata": metadata,
+                "user_id": user_id,
+                "session_id": session_id,
+                "routing_confidence": confidence
+            }
+        
+        else:
+            # 일반 대화 응답
+            general_response = tool_result["general_response"]
+            confidence = tool_result.get("confidence", 0.5)
+            
+            logger.info("Router Graph: 일반 응답 생성")
+            
+            return {
+                "agent": "general_chat",
+                "response": general_response,
+                "sources": [],
+                "metadata": {"type": "general_response"},
+                "user_id": user_id,
+                "session_id": session_id,
+                "routing_confidence": confidence
+            }
     
-    async def route_batch_requests(self, messages: List[str], user_id: str = None) -> List[Dict[str, Any]]:
-        """배치 요청 라우팅"""
-        results = []
+    async def _iter_multi_tool(self, message: str, tool_calls: List[Dict[str, Any]], user_id: str = None,
+                               session_id: str = None,
+                               prefetched: Optional[List[Dict[str, Any]]] = None) -> AsyncIterator[Dict[str, Any]]:
+        """복합 질문: 선택된 Agent들을 동시에 실행하고 끝나는 대로 부분 결과를 내보낸 뒤 하나의 응답으로 합성"""
+        logger.info(f"Router Graph 복합 선택: {', '.join(call['function_name'] for call in tool_calls)}")
+        reuse_index = None
+        if prefetched is not None:
+            reuse_index = next((i for i, call in enumerate(tool_calls) if self._can_reuse_prefetch(call)), None)
         
-        for message in messages:
-            result = await self.route_request(message, user_id)
-            results.append(result)
+        async def run(index: int) -> Tuple[int, Dict[str, Any], float]:
+            call = tool_calls[index]
+            started = time.perf_counter()
+            try:
+                with span("graph.execute_agent"):
+                    if index == reuse_index:
+                        result = await self.agent_nodes.execute_agent(
+                            call["function_name"], call["function_args"], message, prefetched=prefetched
+                        )
+                    else:
+                        result = await self.agent_nodes.execute_agent(call["function_name"], call["function_args"], message)
+            except Overloaded as e:
+                # 과부하로 거절된 Agent만 빼고 나머지 결과로 응답
+                result = {
+                    "response": str(e),
+                    "sources": [],
+                    "metadata": {"error": "overloaded", "agent": call["function_name"], "retry_after": e.retry_after}
+                }
+            return index, result, (time.perf_counter() - started) * 1000
+        
+        started = time.perf_counter()
+        results: List[Optional[Dict[str, Any]]] = [None] * len(tool_calls)
+        latencies = [0.0] * len(tool_calls)
+        for completed in asyncio.as_completed([run(index) for index in range(len(tool_calls))]):
+            index, result, elapsed_ms = await completed
+            results[index], latencies[index] = result, elapsed_ms
+            yield {
+                "type": "agent_result",
+                "index": index,
+                "agent": tool_calls[index]["function_name"],
+                "response": result.get("response", ""),
+                "sources": result.get("sources", []),
+                "metadata": result.get("metadata", {}),
+                "elapsed_ms": round(elapsed_ms, 2)
+            }
+        parallel_ms = (time.perf_counter() - started) * 1000
         
+        yield {
+            "type": "final",
+            "result": self._compose_multi_tool(tool_calls, results, latencies, parallel_ms, user_id, session_id)
+        }
+    
+    @staticmethod
+    def _compose_multi_tool(tool_calls: List[Dict[str, Any]], results: List[Dict[str, Any]], latencies: List[float],
+                            parallel_ms: float, user_id: str = None, session_id: str = None) -> Dict[str, Any]:
+        """Agent별 결과를 라우팅 순서대로 합쳐 하나의 응답 구성"""
+        agents = [call["function_name"] for call in tool_calls]
+        sections = [
+            f"[{AGENT_LABELS.get(agent, agent)}]\n{result.get('response', '')}"
+            for agent, result in zip(agents, results)
+        ]
+        sources = [
+            {**source, "agent": agent} if isinstance(source, dict) else source
+            for agent, result in zip(agents, results)
+            for source in result.get("sources", [])
+        ]
+        return {
+            "agent": "multi_agent",
+            "arguments": [call["function_args"] for call in tool_calls],
+            "response": "\n\n".join(sections),
+            "sources": sources,
+            "metadata": {
+                "type": "multi_tool",
+                "agents": agents,
+                "agent_metadata": [result.get("metadata", {}) for result in results],
+                # 병렬 실행 벽시계 시간과 순차 실행 시 예상 시간(Agent별 소요 합계) 비교
+                "latency": {
+                    "parallel_ms": round(parallel_ms, 2),
+                    "sequential_estimate_ms": round(sum(latencies), 2),
+                    "per_agent_ms": [round(latency, 2) for latency in latencies]
+                }
+            },
+            "user_id": user_id,
+            "session_id": session_id,
+            "routing_confidence": min(call.get("confidence", 0.0) for call in tool_calls)
+        }
+    
+    @staticmethod
+    def _error_result(e: Exception) -> Dict[str, Any]:
+        result = {
+            "error": str(e),
+            "response": f"라우팅 처리 중 오류가 발생했습니다: {str(e)}",
+            "agent": "error",
+            "routing_confidence": 0.0
+        }
+        if isinstance(e, Overloaded):
+            result.update({"response": str(e), "status": 429, "retry_after": e.retry_after})
+        return result
+    
+    async def iter_batch_requests(self, messages: List[str], user_id: str = None,
+                                  concurrency: Optional[int] = None) -> AsyncIterator[Tuple[int, Dict[str, Any]]]:
+        """
+        배치 요청 동시 처리 (완료되는 순서대로 (인덱스, 결과) 반환)
+        
+        1. 전체 메시지의 Tool Calling을 동시에 실행
+        2. 같은 Agent로 라우팅된 요청끼리 묶어 검색/임베딩을 한 번에 준비 (prepare_batch)
+        3. Agent 실행을 동시에 진행하며 끝나는 대로 반환
+        """
+        semaphore = asyncio.Semaphore(concurrency or settings.batch_chat_concurrency)
+        
+        async def route(message: str) -> Dict[str, Any]:
+            async with semaphore:
+                try:
+                    with span("graph.route_to_agent"):
+                        return await self.tool_caller.call_tool(message)
+                except Exception as e:
+                    logger.error(f"배치 라우팅 실패: {str(e)}")
+                    return {"error": str(e)}
+        
+        tool_results = await asyncio.gather(*(route(message) for message in messages))
+        
+        groups: Dict[str, List[Tuple[Dict[str, Any], str]]] = {}
+        for message, tool_result in zip(messages, tool_results):
+            for tool_call in self._tool_calls(tool_result):
+                groups.setdefault(tool_call["function_name"], []).append((tool_call["function_args"], message))
+        with span("graph.prepare_batch"):
+            await asyncio.gather(*(
+                self.agent_nodes.prepare_batch(agent_name, items) for agent_name, items in groups.items()
+            ))
+        
+        async def execute(index: int) -> Tuple[int, Dict[str, Any]]:
+            async with semaphore:
+                try:
+                    tool_result = tool_results[index]
+                    tool_calls = self._tool_calls(tool_result)
+                    if "error" not in tool_result and len(tool_calls) > 1:
+                        events = [event async for event in self._iter_multi_tool(messages[index], tool_calls, user_id)]
+                        return index, events[-1]["result"]
+                    return index, await self._execute_tool_result(messages[index], tool_result, user_id)
+                except Exception as e:
+                    logger.error(f"배치 요청 {index} 처리 실패: {str(e)}")
+                    return index, self._error_result(e)
+        
+        for completed in asyncio.as_completed([execute(index) for index in range(len(messages))]):
+            yield await completed
+    
+    async def route_batch_requests(self, messages: List[str], user_id: str = None) -> List[Dict[str, Any]]:
+        """배치 요청 라우팅 (동시 처리, 입력 순서로 반환)"""
+        results: List[Optional[Dict[str, Any]]] = [None] * len(messages)
+        async for index, result in self.iter_batch_requests(messages, user_id):
+            results[index] = result
         return results
     
     async def route_with_fallback(self, message: str, primary_agent: str = None, user_id: str = None) -> Dict[str, Any]:
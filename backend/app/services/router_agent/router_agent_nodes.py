@@ -4,17 +4,38 @@ Router Agent Nodes Module
 Agent 노드 정의 및 실행 관리 (JSON 스키마 기반)
 """
 
+import asyncio
 import logging
-from typing import Dict, List, Any, Optional
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Optional, Tuple
+from ...core.admission import Overloaded, admission_controller
+from ...core.config import settings
+from ...core.single_flight import agent_flight, request_key
+from ...core.tracing import span
 from .schema_loader import AgentSchemaLoader
 
 logger = logging.getLogger(__name__)
 
+# 프로세스 전역 Agent 인스턴스 (RouterAgent 인스턴스 간 공유)
+_shared_agent_instances: Dict[str, Any] = {}
+_agent_locks: Dict[str, threading.Lock] = {}
+_agent_locks_guard = threading.Lock()
+
+
+def _get_agent_lock(agent_name: str) -> threading.Lock:
+    """Agent별 생성 락 조회"""
+    with _agent_locks_guard:
+        if agent_name not in _agent_locks:
+            _agent_locks[agent_name] = threading.Lock()
+        return _agent_locks[agent_name]
+
 class RouterAgentNodes:
     """Agent 노드 관리 및 실행 (JSON 스키마 기반)"""
     
     def __init__(self):
-        self.agent_instances = {}
+        self.agent_instances = _shared_agent_instances
         self.agent_status = {}
         self.schema_loader = None
         
@@ -27,14 +48,23 @@ class RouterAgentNodes:
         """JSON 스키마 로더 초기화"""
         try:
             self.schema_loader = AgentSchemaLoader()
+            # Agent별 동시 실행/대기열 한도 (agent_schemas.json의 admission)
+            admission_controller.configure({
+                agent_name: self.schema_loader.get_agent_admission(agent_name)
+                for agent_name in self.schema_loader.get_all_agents()
+            })
             logger.info("JSON 스키마 로더 초기화 완료")
         except Exception as e:
             logger.error(f"JSON 스키마 로더 초기화 실패: {str(e)}")
             self.schema_loader = None
     
-    async def execute_agent(self, agent_name: str, function_args: Dict[str, Any], original_message: str) -> Dict[str, Any]:
+    async def execute_agent(self, agent_name: str, function_args: Dict[str, Any], original_message: str,
+                            prefetched: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
         """
         선택된 Agent 실행
+        
+        Args:
+            prefetched: 라우팅과 병렬로 미리 조회한 검색 후보 (db_agent만 사용)
         """
         try:
             logger.info(f"Agent 노드 실행: {agent_name}")
@@ -49,8 +79,23 @@ class RouterAgentNodes:
                     "metadata": {"error": "agent_initialization_failed", "agent": agent_name}
                 }
             
-            # Agent 실행
-            result = await agent_instance.process(function_args, original_message)
+            # Agent 실행 (Agent별 동시 실행 슬롯 안에서)
+            async def process() -> Dict[str, Any]:
+                async with admission_controller.slot(agent_name):
+                    with span(f"agent.{agent_name}.process"):
+                        if prefetched is not None:
+                            return await agent_instance.process(function_args, original_message, prefetched=prefetched)
+                        return await agent_instance.process(function_args, original_message)
+            
+            # Agent는 (인수, 메시지)만으로 응답하므로 동시에 들어온 같은 요청은 한 번만 실행
+            if settings.single_flight_enabled:
+                key = request_key(original_message, agent_name, function_args)
+                shared_result, shared = await agent_flight.do(key, process)
+                result = {**shared_result, "metadata": dict(shared_result.get("metadata", {}))}
+                if shared:
+                    result["metadata"]["coalesced"] = True
+            else:
+                result = await process()
             
             # 실행 상태 업데이트
             self.agent_status[agent_name] = {
@@ -60,6 +105,9 @@ class RouterAgentNodes:
             
             return result
             
+        except Overloaded:
+            # 과부하 거절은 실행 실패가 아니므로 상위(API)에서 429로 응답하도록 전달
+            raise
         except Exception as e:
             logger.error(f"Agent {agent_name} 실행 실패: {str(e)}")
             
@@ -76,6 +124,43 @@ class RouterAgentNodes:
                 "metadata": {"error": str(e), "agent": agent_name}
             }
     
+    def start_prefetch(self, message: str) -> "asyncio.Task":
+        """
+        db_agent 벡터 검색 후보를 백그라운드로 선조회 (라우팅 LLM 호출과 병렬)
+        
+        Returns:
+            (후보 목록 또는 None, 소요 시간 ms)를 반환하는 Task
+        """
+        async def run():
+            started = time.perf_counter()
+            with span("retrieval.prefetch"):
+                agent_instance = await self._get_agent_instance("db_agent")
+                candidates = None
+                if agent_instance is not None and hasattr(agent_instance, "prefetch_candidates"):
+                    candidates = await agent_instance.prefetch_candidates(message)
+            return candidates, (time.perf_counter() - started) * 1000
+        
+        task = asyncio.create_task(run())
+        # 취소/실패한 선조회의 예외가 로그에 "never retrieved"로 남지 않도록 회수
+        task.add_done_callback(lambda done: done.cancelled() or done.exception())
+        return task
+    
+    async def prepare_batch(self, agent_name: str, items: List[Tuple[Dict[str, Any], str]]):
+        """
+        같은 Agent로 라우팅된 배치 요청의 공통 준비 작업 (질의 임베딩 일괄 계산 등)
+        
+        Agent가 prepare_batch(items)를 제공하는 경우에만 호출하며, 실패해도 개별 실행은 계속됩니다.
+        """
+        if len(items) < 2:
+            return
+        try:
+            agent_instance = await self._get_agent_instance(agent_name)
+            if agent_instance is not None and hasattr(agent_instance, "prepare_batch"):
+                with span(f"agent.{agent_name}.prepare_batch"):
+                    await agent_instance.prepare_batch(items)
+        except Exception as e:
+            logger.warning(f"Agent {agent_name} 배치 준비 실패: {str(e)}")
+    
     async def execute_agent_direct(self, agent_name: str, args: Dict[str, Any], message: str) -> Dict[str, Any]:
         """직접 Agent 실행 (폴백용) - JSON 스키마 기반"""
         try:
@@ -114,46 +199,60 @@ class RouterAgentNodes:
                 "metadata": {"error": str(e), "agent": agent_name}
             }
     
+    async def get_agent(self, agent_name: str):
+        """공유 Agent 인스턴스 조회 (최초 호출 시 생성, 동시에 호출해도 한 번만 생성)"""
+        return await self._get_agent_instance(agent_name)
+    
     async def _get_agent_instance(self, agent_name: str):
         """Agent 인스턴스 가져오기 또는 생성"""
+        # 이미 생성된 인스턴스가 있으면 반환
+        if agent_name in self.agent_instances:
+            return self.agent_instances[agent_name]
+        
+        # 생성자가 모델/데이터를 로드하므로 이벤트 루프를 막지 않도록 스레드에서 생성
+        return await asyncio.to_thread(self._create_agent_instance, agent_name)
+    
+    def _create_agent_instance(self, agent_name: str):
+        """Agent 인스턴스 생성 (Agent별 락으로 한 번만 생성)"""
         try:
-            # 이미 생성된 인스턴스가 있으면 반환
-            if agent_name in self.agent_instances:
-                return self.agent_instances[agent_name]
-            
-            # JSON 스키마에서 Agent 정의 확인
-            if not self.schema_loader:
-                logger.error("JSON 스키마 로더가 초기화되지 않았습니다.")
-                return None
-            
-            agent_config = self.schema_loader.get_agent_config(agent_name)
-            if not agent_config:
-                logger.error(f"알 수 없는 Agent: {agent_name}")
-                return None
-            
-            # 동적 import 및 인스턴스 생성
-            if agent_name == "db_agent":
-                from ..agents.db_agent.db_agent import DBAgent
-                agent_instance = DBAgent()
+            with _get_agent_lock(agent_name):
+                if agent_name in self.agent_instances:
+                    return self.agent_instances[agent_name]
                 
-            elif agent_name == "docs_agent":
-                from ..agents.docs_agent.docs_agent import DocsAgent
-                agent_instance = DocsAgent()
+                # JSON 스키마에서 Agent 정의 확인
+                if not self.schema_loader:
+                    logger.error("JSON 스키마 로더가 초기화되지 않았습니다.")
+                    return None
                 
-            elif agent_name == "employee_agent":
-                from ..agents.employee_agent.employee_agent import EmployeeAgent
-                agent_instance = EmployeeAgent()
+                agent_config = self.schema_loader.get_agent_config(agent_name)
+                if not agent_config:
+                    logger.error(f"알 수 없는 Agent: {agent_name}")
+                    return None
                 
-            elif agent_name == "client_agent":
-                from ..agents.client_agent.client_agent import ClientAgent
-                agent_instance = ClientAgent()
-            
-            else:
-                logger.error(f"지원하지 않는 Agent: {agent_name}")
-                return None
-            
-            # 인스턴스 캐시에 저장
-            self.agent_instances[agent_name] = agent_instance
+                # 동적 import 및 인스턴스 생성
+                with span(f"agent.{agent_name}.construct"):
+                    if agent_name == "db_agent":
+                        from ..agents.db_agent.db_agent import DBAgent
+                        agent_instance = DBAgent()
+                        
+                    elif agent_name == "docs_agent":
+                        from ..agents.docs_agent.docs_agent import DocsAgent
+                        agent_instance = DocsAgent()
+                        
+                    elif agent_name == "employee_agent":
+                        from ..agents.employee_agent.employee_agent import EmployeeAgent
+                        agent_instance = EmployeeAgent()
+                        
+                    elif agent_name == "client_agent":
+                        from ..agents.client_agent.client_agent import ClientAgent
+                        agent_instance = ClientAgent()
+                    
+                    else:
+                        logger.error(f"지원하지 않는 Agent: {agent_name}")
+                        return None
+                
+                # 인스턴스 캐시에 저장
+                self.agent_instances[agent_name] = agent_instance
             
             # 상태 초기화
             self.agent_status[agent_name] = {
@@ -172,6 +271,61 @@ class RouterAgentNodes:
             logger.error(f"Agent 인스턴스 생성 실패: {str(e)}")
             return None
     
+    async def warm_up(self, max_workers: int = 6) -> Dict[str, Any]:
+        """
+        모든 Agent와 공유 모델을 병렬로 초기화한 뒤 Agent별 워밍업 실행
+        """
+        agent_names = self.schema_loader.get_all_agents() if self.schema_loader else []
+        
+        def load_models() -> Dict[str, bool]:
+            from ...core.model_registry import model_registry
+            
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                embedding = executor.submit(model_registry.get_embedding_model)
+                reranker = executor.submit(model_registry.get_reranker_model)
+                return {
+                    "embedding": embedding.result() is not None,
+                    "reranker": reranker.result() is not None
+                }
+        
+        def warm_up_agent(agent_name: str) -> Dict[str, Any]:
+            agent_instance = self._create_agent_instance(agent_name)
+            if not agent_instance:
+                return {"initialized": False}
+            
+            result = {"initialized": True}
+            if hasattr(agent_instance, "warm_up"):
+                try:
+                    result["warm_up"] = agent_instance.warm_up()
+                except Exception as e:
+                    logger.warning(f"Agent {agent_name} 워밍업 실패: {str(e)}")
+                    result["warm_up_error"] = str(e)
+            return result
+        
+        logger.info(f"🔥 워밍업 시작: {len(agent_names)}개 Agent + 모델")
+        
+        loop = asyncio.get_running_loop()
+        executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="warmup")
+        try:
+            # 모델 로드와 Agent 생성을 동시에 시작 (Agent 생성 중 모델 요청은 레지스트리 락에서 대기)
+            models_future = loop.run_in_executor(executor, load_models)
+            agent_futures = [loop.run_in_executor(executor, warm_up_agent, name) for name in agent_names]
+            results = await asyncio.gather(models_future, *agent_futures, return_exceptions=True)
+        finally:
+            # 종료 시 워밍업 태스크가 취소되어도 이벤트 루프가 진행 중인 로드를 기다리며 멈추지 않도록 대기 없이 정리
+            executor.shutdown(wait=False, cancel_futures=True)
+        
+        summary = {
+            "models": results[0] if not isinstance(results[0], Exception) else {"error": str(results[0])},
+            "agents": {
+                name: result if not isinstance(result, Exception) else {"initialized": False, "error": str(result)}
+                for name, result in zip(agent_names, results[1:])
+            }
+        }
+        
+        logger.info(f"✅ 워밍업 완료: {summary}")
+        return summary
+    
     def get_agent_info(self, agent_name: str) -> Dict[str, Any]:
         """특정 Agent 정보 조회 (JSON 스키마 기반)"""
         if not self.schema_loader:
@@ -5,11 +5,14 @@ OpenAI GPT-4o Tool Calling을 사용한 Agent 라우팅 기능
 JSON 스키마 기반 에이전트 정의
 """
 
+import asyncio
 import json
 import logging
 from typing import Dict, List, Any, Optional
-from openai import OpenAI
+from ...core.circuit_breaker import llm_breaker
 from ...core.config import settings
+from ...core.prompt_cache import layout_messages, record_usage
+from ...core.tracing import span
 from .schema_loader import AgentSchemaLoader
 
 logger = logging.getLogger(__name__)
@@ -30,14 +33,14 @@ class RouterAgentTool:
     def _initialize_openai_client(self):
         """OpenAI 클라이언트 초기화"""
         api_key = settings.openai_api_key
-        logger.info(f"🔍 Router Agent Tool 초기화 - API 키: {api_key[:10] if api_key else 'None'}...")
-        
         if not api_key:
             logger.error("OpenAI API 키가 설정되지 않았습니다. .env 파일에 OPENAI_API_KEY를 설정해주세요.")
             return
             
         try:
-            self.openai_client = OpenAI(api_key=api_key)
+            from openai import OpenAI
+            
+            self.openai_client = OpenAI(api_key=api_key, base_url=settings.openai_base_url, timeout=settings.openai_timeout)
             logger.info("Router Agent Tool OpenAI 클라이언트 초기화 성공")
         except Exception as e:
             logger.error(f"Router Agent Tool OpenAI 클라이언트 초기화 실패: {str(e)}")
@@ -51,10 +54,18 @@ class RouterAgentTool:
             logger.error(f"JSON 스키마 로더 초기화 실패: {str(e)}")
             self.schema_loader = None
     
-    async def call_tool(self, message: str) -> Dict[str, Any]:
-        """OpenAI Tool Calling 실행"""
+    async def call_tool(self, message: str, context: Optional[List[Dict[str, str]]] = None) -> Dict[str, Any]:
+        """
+        OpenAI Tool Calling 실행
+        
+        Args:
+            context: 이전 대화 맥락 메시지 (누적 요약 + 최근 턴, 시스템 프롬프트와 현재 메시지 사이에 삽입)
+        """
         if not self.openai_client:
             return self._get_fallback_response(message, "OpenAI 클라이언트가 초기화되지 않았습니다.")
+        if not llm_breaker.available():
+            # OpenAI 장애 중에는 타임아웃을 기다리지 않고 키워드 라우팅
+            return self._get_fallback_response(message, "OpenAI 회로 차단 중")
         
         try:
             logger.info(f"Tool Calling 실행: {message[:50]}...")
@@ -72,40 +83,41 @@ class RouterAgentTool:
             
             logger.info(f"Tool Calling 설정: 함수 {len(function_definitions)}개, 모델 {settings_data.get('model', 'gpt-4o')}")
             
-            # OpenAI Tool Calling 요청
-            response = self.openai_client.chat.completions.create(
-                model=settings_data.get("model", "gpt-4o"),
-                messages=[
-                    {
-                        "role": "system",
-                        "content": system_prompt
-                    },
-                    {
-                        "role": "user", 
-                        "content": message
-                    }
-                ],
-                tools=function_definitions,
-                tool_choice=settings_data.get("tool_choice", "auto"),
-                temperature=settings_data.get("temperature", 0.1)
-            )
+            # OpenAI Tool Calling 요청 (동기 클라이언트이므로 스레드에서 실행해 동시 요청을 막지 않음)
+            # 도구 정의 + 시스템 프롬프트는 매 요청 동일한 접두부, 대화 맥락과 현재 메시지는 그 뒤에 배치
+            with span("routing.llm"):
+                response = await asyncio.to_thread(
+                    llm_breaker.call,
+                    self.openai_client.chat.completions.create,
+                    model=settings_data.get("model", "gpt-4o"),
+                    messages=layout_messages("router", system_prompt, message, history=context,
+                                             tools=function_definitions),
+                    tools=function_definitions,
+                    tool_choice=settings_data.get("tool_choice", "auto"),
+                    temperature=settings_data.get("temperature", 0.1)
+                )
+            record_usage("router", response)
             
             logger.info(f"OpenAI 응답 받음: {len(response.choices)} choices")
             
             # Tool Call 결과 확인
             if response.choices[0].message.tool_calls:
-                tool_call = response.choices[0].message.tool_calls[0]
-                function_name = tool_call.function.name
-                function_args = json.loads(tool_call.function.arguments)
+                with span("routing.slot_extraction"):
+                    tool_calls = [
+                        {
+                            "function_name": tool_call.function.name,
+                            "function_args": json.loads(tool_call.function.arguments),
+                            "confidence": 1.0
+                        }
+                        for tool_call in response.choices[0].message.tool_calls
+                    ]
                 
-                logger.info(f"Tool Call 선택: {function_name}")
+                logger.info(f"Tool Call 선택: {', '.join(call['function_name'] for call in tool_calls)}")
                 
+                # tool_call: 첫 번째 호출 (단일 Agent 경로 호환), tool_calls: 복합 질문의 전체 호출
                 return {
-                    "tool_call": {
-                        "function_name": function_name,
-                        "function_args": function_args,
-                        "confidence": 1.0
-                    },
+                    "tool_call": tool_calls[0],
+                    "tool_calls": tool_calls,
                     "general_response": None
                 }
             
@@ -127,15 +139,48 @@ class RouterAgentTool:
     def _get_fallback_response(self, message: str, error_msg: str) -> Dict[str, Any]:
         """Fallback 응답 생성 - 키워드 기반 라우팅"""
         logger.warning(f"Fallback 라우팅 사용: {error_msg}")
-        
-        # 간단한 키워드 기반 라우팅
+        result = self._keyword_route(message)
+        result["fallback_reason"] = error_msg
+        return result
+    
+    def _keyword_route(self, message: str) -> Dict[str, Any]:
+        """간단한 키워드 기반 라우팅"""
         message_lower = message.lower()
         
-        if any(keyword in message_lower for keyword in ["직원", "인사", "연락처", "조직", "부서"]):
+        if any(keyword in message_lower for keyword in ["급증", "급감"]):
+            # 실적 급증/급감: 담당자 기준이면 employee_agent, 그 외 client_agent
+            if any(keyword in message_lower for keyword in ["담당자", "직원", "영업사원"]):
+                function_name, function_args = "employee_agent", {"search_type": "anomaly", "search_value": message}
+            else:
+                function_name, function_args = "client_agent", {"analysis_type": "anomaly"}
+            return {
+                "tool_call": {
+                    "function_name": function_name,
+                    "function_args": function_args,
+                    "confidence": 0.7
+                },
+                "general_response": None
+            }
+        elif any(keyword in message_lower for keyword in ["보고서", "양식"]) and any(keyword in message_lower for keyword in ["작성", "써", "만들"]):
+            return {
+                "tool_call": {
+                    "function_name": "docs_agent",
+                    "function_args": {"task_type": "generate_document", "content": message},
+                    "confidence": 0.7
+                },
+                "general_response": None
+            }
+        elif any(keyword in message_lower for keyword in ["직원", "인사", "연락처", "조직", "부서", "상사", "인원"]):
+            if "상사" in message_lower:
+                search_type = "manager"
+            elif any(keyword in message_lower for keyword in ["조직", "부서", "인원"]):
+                search_type = "department"
+            else:
+                search_type = "name"
             return {
                 "tool_call": {
                     "function_name": "employee_agent",
-                    "function_args": {"search_type": "name", "search_value": message},
+                    "function_args": {"search_type": search_type, "search_value": message},
                     "confidence": 0.7
                 },
                 "general_response": None
@@ -153,7 +198,7 @@ class RouterAgentTool:
             return {
                 "tool_call": {
                     "function_name": "client_agent",
-                    "function_args": {"analysis_type": "profile"},
+                    "function_args": {"analysis_type": "grade" if "등급" in message_lower else "profile"},
                     "confidence": 0.7
                 },
                 "general_response": None
@@ -87,6 +87,13 @@ class AgentSchemaLoader:
             return agent_config["default_args"]
         return {}
     
+    def get_agent_admission(self, agent_name: str) -> Dict[str, Any]:
+        """특정 에이전트의 동시 실행/대기열 한도 조회"""
+        agent_config = self.get_agent_config(agent_name)
+        if agent_config and "admission" in agent_config:
+            return agent_config["admission"]
+        return {}
+    
     def get_system_prompt(self) -> str:
         """시스템 프롬프트 조회"""
         return self.schema_data.get("system_prompt", "")
@@ -11,8 +11,10 @@ import uuid
 
 # LangGraph imports
 from langgraph.graph import StateGraph, END
-from langgraph.checkpoint.memory import MemorySaver
 
+from ...core.checkpointer import create_checkpointer
+from ...core.context_compactor import context_compactor
+from ...core.tracing import span
 from .router_agent_tool import RouterAgentTool
 from .router_agent_nodes import RouterAgentNodes
 
@@ -57,8 +59,8 @@ class StateGraphRouter:
         # StateGraph 생성
         self.workflow = self._create_workflow()
         
-        # Checkpoint saver 설정
-        self.checkpointer = MemorySaver()
+        # Checkpoint saver 설정 (워커 간 공유 SQLite, 미설치 시 메모리)
+        self.checkpointer = create_checkpointer("state_graph_router")
         
         # 컴파일된 앱
         self.app = self.workflow.compile(checkpointer=self.checkpointer)
@@ -71,13 +73,13 @@ class StateGraphRouter:
         # StateGraph 생성
         workflow = StateGraph(RouterState)
         
-        # 노드 추가
-        workflow.add_node("initialize_state", self._initialize_state)
-        workflow.add_node("process_user_input", self._process_user_input)
-        workflow.add_node("route_to_agent", self._route_to_agent)
-        workflow.add_node("execute_agent", self._execute_agent)
-        workflow.add_node("generate_response", self._generate_response)
-        workflow.add_node("save_conversation", self._save_conversation)
+        # 노드 추가 (노드별 실행 시간 기록)
+        workflow.add_node("initialize_state", self._timed_node("initialize_state", self._initialize_state))
+        workflow.add_node("process_user_input", self._timed_node("process_user_input", self._process_user_input))
+        workflow.add_node("route_to_agent", self._timed_node("route_to_agent", self._route_to_agent))
+        workflow.add_node("execute_agent", self._timed_node("execute_agent", self._execute_agent))
+        workflow.add_node("generate_response", self._timed_node("generate_response", self._generate_response))
+        workflow.add_node("save_conversation", self._timed_node("save_conversation", self._save_conversation))
         
         # 엣지 추가 (노드 간 흐름 정의)
         workflow.set_entry_point("initialize_state")
@@ -91,6 +93,14 @@ class StateGraphRouter:
         
         return workflow
     
+    @staticmethod
+    def _timed_node(name: str, node):
+        """노드 실행 시간을 graph.{name} 단계로 기록하는 래퍼"""
+        async def timed(state: RouterState) -> RouterState:
+            with span(f"graph.{name}"):
+                return await node(state)
+        return timed
+    
     async def _initialize_state(self, state: RouterState) -> RouterState:
         """상태 초기화"""
         try:
@@ -155,8 +165,13 @@ class StateGraphRouter:
             
             logger.info(f"에이전트 라우팅: {state['session_id']}")
             
-            # Tool Calling으로 적절한 Agent 선택
-            tool_result = await self.tool_caller.call_tool(current_message)
+            # Tool Calling으로 적절한 Agent 선택 (이전 대화 요약 + 최근 턴을 토큰 예산 내에서 전달)
+            context, context_tokens = context_compactor.build_context(state["session_id"])
+            if context:
+                state["metadata"]["context_tokens"] = context_tokens
+                tool_result = await self.tool_caller.call_tool(current_message, context=context)
+            else:
+                tool_result = await self.tool_caller.call_tool(current_message)
             
             if "error" in tool_result:
                 state["error_message"] = tool_result["error"]
@@ -216,7 +231,7 @@ class StateGraphRouter:
             state.update({
                 "agent_response": agent_result.get("response", ""),
                 "sources": agent_result.get("sources", []),
-                "metadata": agent_result.get("metadata", {})
+                "metadata": {**state["metadata"], **agent_result.get("metadata", {})}
             })
             
             state["execution_steps"].append("agent_executed")
@@ -263,7 +278,11 @@ class StateGraphRouter:
             session_id = state["session_id"]
             
             # 여기서 실제 DB 저장 로직을 구현할 수 있음
-            # 현재는 메모리에만 저장됨 (LangGraph MemorySaver)
+            # 상태는 LangGraph 체크포인터(세션별 thread_id)에 저장됨
+            
+            # 다음 턴 맥락용 기록 (요약 갱신은 백그라운드)
+            if not state.get("error_message"):
+                context_compactor.add_turn(session_id, state["current_message"], state["agent_response"])
             
             logger.info(f"대화 저장 완료: {session_id}")
             state["execution_steps"].append("conversation_saved")
@@ -296,8 +315,9 @@ class StateGraphRouter:
                 execution_steps=[]
             )
             
-            # StateGraph 실행
-            result = await self.app.ainvoke(initial_state)
+            # StateGraph 실행 (세션별 체크포인트 스레드)
+            thread_config = {"configurable": {"thread_id": initial_state["session_id"]}}
+            result = await self.app.ainvoke(initial_state, config=thread_config)
             
             # 결과 반환
             return {
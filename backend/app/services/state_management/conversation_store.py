@@ -11,6 +11,7 @@ from pathlib import Path
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 from ...core.config import settings
+from ...core.tracing import span
 from .state_schema import MessageState, SessionInfo, MessageRole, AgentType
 
 logger = logging.getLogger(__name__)
@@ -23,12 +24,19 @@ class ConversationStore:
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
         self._initialize_database()
     
+    def _connect(self) -> sqlite3.Connection:
+        """SQLite 연결 생성 (여러 워커 프로세스가 같은 파일을 공유하므로 잠금 대기 허용)"""
+        return sqlite3.connect(self.db_path, timeout=30)
+    
     def _initialize_database(self):
         """데이터베이스 초기화"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 
+                # WAL 모드: 다중 워커의 동시 읽기/쓰기 허용
+                cursor.execute("PRAGMA journal_mode=WAL")
+                
                 # 세션 테이블
                 cursor.execute("""
                     CREATE TABLE IF NOT EXISTS sessions (
@@ -79,7 +87,7 @@ class ConversationStore:
                 metadata=metadata or {}
             )
             
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 cursor.execute("""
                     INSERT OR REPLACE INTO sessions 
@@ -105,7 +113,7 @@ class ConversationStore:
     def get_session(self, session_id: str) -> Optional[SessionInfo]:
         """세션 정보 조회"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 cursor.execute("""
                     SELECT session_id, user_id, created_at, last_activity, message_count, metadata
@@ -131,7 +139,7 @@ class ConversationStore:
     def update_session_activity(self, session_id: str):
         """세션 활동 시간 업데이트"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 cursor.execute("""
                     UPDATE sessions 
@@ -145,8 +153,13 @@ class ConversationStore:
     
     def save_message(self, session_id: str, message: MessageState):
         """메시지 저장"""
+        with span("db.persist"):
+            self._save_message(session_id, message)
+    
+    def _save_message(self, session_id: str, message: MessageState):
+        """메시지 저장 (내부 구현)"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 cursor.execute("""
                     INSERT INTO messages 
@@ -172,7 +185,7 @@ class ConversationStore:
     def get_conversation_history(self, session_id: str, limit: int = 50) -> List[MessageState]:
         """대화 기록 조회"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 cursor.execute("""
                     SELECT role, content, timestamp, agent_type, metadata
@@ -210,7 +223,7 @@ class ConversationStore:
     def delete_session(self, session_id: str):
         """세션 및 관련 메시지 삭제"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 # 메시지 먼저 삭제
                 cursor.execute("DELETE FROM messages WHERE session_id = ?", (session_id,))
@@ -226,7 +239,7 @@ class ConversationStore:
     def get_user_sessions(self, user_id: str, limit: int = 20) -> List[SessionInfo]:
         """사용자별 세션 목록 조회"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 cursor.execute("""
                     SELECT session_id, user_id, created_at, last_activity, message_count, metadata
@@ -259,7 +272,7 @@ class ConversationStore:
             cutoff_date = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
             cutoff_date = cutoff_date.replace(day=cutoff_date.day - days_old)
             
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 # 오래된 메시지 삭제
                 cursor.execute("DELETE FROM messages WHERE session_id IN (SELECT session_id FROM sessions WHERE last_activity < ?)", (cutoff_date,))
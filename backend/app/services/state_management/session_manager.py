@@ -20,6 +20,8 @@ class SessionManager:
         self.conversation_store = ConversationStore()
         # 메모리 캐시 (활성 세션)
         self._active_sessions: Dict[str, ConversationState] = {}
+        # 세션별 DB와 동기화된 메시지 수 (다른 워커의 변경 감지용)
+        self._synced_message_counts: Dict[str, int] = {}
         # 세션 타임아웃 (30분)
         self.session_timeout = timedelta(minutes=30)
         logger.info("SessionManager 초기화 완료")
@@ -39,6 +41,7 @@ class SessionManager:
             # 메모리에 초기 상태 생성
             initial_state = create_initial_state(session_id, user_id)
             self._active_sessions[session_id] = initial_state
+            self._synced_message_counts[session_id] = 0
             
             logger.info(f"새 세션 생성: {session_id}")
             return session_id
@@ -50,8 +53,8 @@ class SessionManager:
     def get_or_create_session(self, session_id: Optional[str] = None, user_id: Optional[str] = None) -> str:
         """세션 조회 또는 생성"""
         if session_id:
-            # 기존 세션 확인
-            if self.session_exists(session_id):
+            # 기존 세션 확인 (다른 워커가 갱신한 경우 DB에서 다시 로드)
+            if self.session_exists(session_id) and not self._is_stale(session_id):
                 return session_id
             else:
                 # 데이터베이스에서 세션 복원 시도
@@ -65,6 +68,13 @@ class SessionManager:
         """세션 존재 여부 확인"""
         return session_id in self._active_sessions
     
+    def _is_stale(self, session_id: str) -> bool:
+        """메모리 캐시가 공유 DB보다 오래되었는지 확인"""
+        session_info = self.conversation_store.get_session(session_id)
+        if not session_info:
+            return False
+        return session_info.message_count != self._synced_message_counts.get(session_id)
+    
     def _restore_session(self, session_id: str) -> bool:
         """데이터베이스에서 세션 복원"""
         try:
@@ -88,6 +98,7 @@ class SessionManager:
                     state["last_agent_response"] = last_message.content
             
             self._active_sessions[session_id] = state
+            self._synced_message_counts[session_id] = session_info.message_count
             logger.info(f"세션 복원: {session_id}")
             return True
             
@@ -125,12 +136,20 @@ class SessionManager:
             
             # 데이터베이스에 저장
             self.conversation_store.save_message(session_id, message)
+            if session_id in self._synced_message_counts:
+                self._synced_message_counts[session_id] += 1
             
             logger.debug(f"메시지 추가: {session_id} - {role.value}")
             
         except Exception as e:
             logger.error(f"메시지 추가 실패: {str(e)}")
     
+    def save_message(self, session_id: str, message: MessageState):
+        """이미 상태에 추가된 메시지를 데이터베이스에 저장"""
+        self.conversation_store.save_message(session_id, message)
+        if session_id in self._synced_message_counts:
+            self._synced_message_counts[session_id] += 1
+    
     def get_conversation_context(self, session_id: str, max_messages: int = 10) -> List[MessageState]:
         """대화 컨텍스트 조회"""
         try:
@@ -177,6 +196,7 @@ class SessionManager:
         """세션 정리 (메모리에서만)"""
         if session_id in self._active_sessions:
             del self._active_sessions[session_id]
+            self._synced_message_counts.pop(session_id, None)
             logger.info(f"세션 메모리 정리: {session_id}")
     
     def delete_session(self, session_id: str):
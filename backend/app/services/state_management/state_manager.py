@@ -10,8 +10,9 @@ from datetime import datetime
 
 # LangGraph imports
 from langgraph.graph import StateGraph, END
-from langgraph.checkpoint.memory import MemorySaver
 
+from ...core.checkpointer import create_checkpointer
+from ...core.context_compactor import context_compactor
 from .state_schema import ConversationState, MessageState, MessageRole, AgentType
 from .session_manager import SessionManager
 from ..router_agent.router_agent import RouterAgent
@@ -28,9 +29,8 @@ class StateManager:
         # LangGraph StateGraph 생성
         self.workflow = self._create_workflow()
         
-        # Checkpoint saver 설정 (메모리 기반 상태 지속성)
-        # 참고: LangGraph 0.5.2에서는 SqliteSaver 대신 MemorySaver 사용
-        self.checkpointer = MemorySaver()
+        # Checkpoint saver 설정 (워커 간 공유 SQLite, 미설치 시 메모리)
+        self.checkpointer = create_checkpointer("state_manager", allowed_types=(MessageState, MessageRole, AgentType))
         
         # 컴파일된 앱
         self.app = self.workflow.compile(checkpointer=self.checkpointer)
@@ -51,16 +51,28 @@ class StateManager:
         workflow.add_node("save_state", self._save_state)
         
         # 엣지 추가 (노드 간 흐름 정의)
+        # 라우팅 → 실행 → 응답은 한 번의 순회로 처리되며, 오류 시 응답 생성으로 바로 이동
         workflow.set_entry_point("process_user_input")
         
-        workflow.add_edge("process_user_input", "route_to_agent")
-        workflow.add_edge("route_to_agent", "execute_agent")
+        workflow.add_conditional_edges(
+            "process_user_input", self._should_continue,
+            {"continue": "route_to_agent", "error": "generate_response"}
+        )
+        workflow.add_conditional_edges(
+            "route_to_agent", self._should_continue,
+            {"continue": "execute_agent", "error": "generate_response"}
+        )
         workflow.add_edge("execute_agent", "generate_response")
         workflow.add_edge("generate_response", "save_state")
         workflow.add_edge("save_state", END)
         
         return workflow
     
+    @staticmethod
+    def _should_continue(state: ConversationState) -> str:
+        """조건부 엣지: 오류 발생 시 남은 단계를 건너뜀"""
+        return "continue" if state.get("should_continue", True) else "error"
+    
     async def _process_user_input(self, state: ConversationState) -> ConversationState:
         """사용자 입력 처리"""
         try:
@@ -84,8 +96,12 @@ class StateManager:
                 # 메모리 상태가 DB보다 적으면 최근 메시지로 업데이트
                 state["messages"] = context_messages[-20:]  # 최근 20개 메시지 유지
             
+            # 이전 턴의 결과 초기화
             state["should_continue"] = True
             state["error_message"] = None
+            state["last_agent_response"] = ""
+            state["agent_arguments"] = {}
+            state["sources"] = []
             
             return state
             
@@ -103,7 +119,7 @@ class StateManager:
             
             logger.info(f"에이전트 라우팅: {session_id}")
             
-            # RouterAgent를 통해 에이전트 선택
+            # RouterAgent를 통해 에이전트 선택 및 실행 (Tool Calling + Agent 실행을 한 번에 수행)
             routing_result = await self.agent_router.route_request(
                 message=current_message,
                 session_id=session_id,
@@ -120,6 +136,10 @@ class StateManager:
             
             # AgentType enum으로 변환
             agent_type_map = {
+                "db_agent": AgentType.CHROMA_DB,
+                "docs_agent": AgentType.RULE_COMPLIANCE,
+                "employee_agent": AgentType.EMPLOYEE_DB,
+                "client_agent": AgentType.CLIENT_ANALYSIS,
                 "chroma_db_agent": AgentType.CHROMA_DB,
                 "employee_db_agent": AgentType.EMPLOYEE_DB,
                 "client_analysis_agent": AgentType.CLIENT_ANALYSIS,
@@ -130,16 +150,17 @@ class StateManager:
             state["current_agent"] = agent_type_map.get(agent_name, AgentType.CHROMA_DB)  # 기본값 설정
             state["agent_arguments"] = routing_result.get("arguments", {})
             state["sources"] = routing_result.get("sources", [])
+            state["last_agent_response"] = routing_result.get("response", "")
             
             # 라우팅 기록 추가
             route_info = {
                 "timestamp": datetime.now().isoformat(),
                 "agent": agent_name,
                 "arguments": state["agent_arguments"],
-                "confidence": 1.0  # MainAgentRouter에서는 신뢰도 점수가 없음
+                "confidence": routing_result.get("routing_confidence", 1.0)
             }
             state["route_history"].append(route_info)
-            state["route_confidence"] = 1.0
+            state["route_confidence"] = route_info["confidence"]
             
             logger.info(f"라우팅 완료: {agent_name}")
             return state
@@ -166,11 +187,14 @@ class StateManager:
             # 에이전트 실행 (MainAgentRouter에서 이미 처리됨)
             # 여기서는 추가적인 처리나 상태 업데이트만 수행
             
-            # 컨텍스트 정보 추가
-            recent_messages = state["messages"][-5:]  # 최근 5개 메시지
-            context_summary = self._create_context_summary(recent_messages)
+            # 컨텍스트 정보 추가 (라우팅 LLM에 전달되는 세션 누적 요약, 요약 전이면 최근 메시지 미리보기)
+            context = context_compactor.snapshot(session_id)
+            context_summary = context["summary"] or self._create_context_summary(state["messages"][-5:])
             
             state["conversation_metadata"]["context_summary"] = context_summary
+            state["conversation_metadata"]["context_turns"] = {
+                "summarized": context["summarized_turns"], "verbatim": context["pending_turns"]
+            }
             state["conversation_metadata"]["agent_execution_time"] = datetime.now().isoformat()
             
             return state
@@ -189,21 +213,12 @@ class StateManager:
             
             logger.info(f"응답 생성: {session_id}")
             
-            # MainAgentRouter에서 이미 응답이 생성됨
-            # 여기서는 이미 생성된 응답을 사용하거나 추가 처리 수행
-            
-            # 만약 아직 응답이 없다면 기본 응답 생성
+            # 응답은 라우팅 단계에서 이미 생성됨 (다시 라우팅하지 않음)
             if not state["last_agent_response"]:
-                # RouterAgent를 통해 다시 처리
-                routing_result = await self.agent_router.route_request(
-                    message=current_message,
-                    session_id=session_id,
-                    user_id=state["user_id"] or "unknown"
-                )
-                
-                response_text = routing_result.get("response", "죄송합니다. 응답을 생성할 수 없습니다.")
-                state["last_agent_response"] = response_text
-                state["sources"] = routing_result.get("sources", [])
+                if state["error_message"]:
+                    state["last_agent_response"] = f"죄송합니다. 요청 처리 중 오류가 발생했습니다: {state['error_message']}"
+                else:
+                    state["last_agent_response"] = "죄송합니다. 응답을 생성할 수 없습니다."
             
             # 어시스턴트 메시지 생성
             assistant_message = MessageState(
@@ -249,7 +264,7 @@ class StateManager:
                     # 최근 10초 이내의 메시지만 저장 (중복 방지)
                     time_diff = (current_time - message.timestamp).total_seconds()
                     if time_diff < 10:
-                        self.session_manager.conversation_store.save_message(session_id, message)
+                        self.session_manager.save_message(session_id, message)
             
             state["conversation_metadata"]["state_saved_at"] = datetime.now().isoformat()
             state["should_continue"] = False  # 처리 완료
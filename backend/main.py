@@ -1,18 +1,93 @@
 from fastapi import FastAPI, HTTPException
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse, FileResponse
+from fastapi.responses import HTMLResponse, FileResponse, JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
+from contextlib import asynccontextmanager
+import asyncio
+import logging
+import time
+import socket
 import uvicorn
 from pathlib import Path
 import os
 
 from app.api.fastapi_router_main import api_router
 from app.core.config import settings
+from app.core.admission import AdmissionMiddleware
+from app.core.tracing import TimingMiddleware, collect_metrics
+
+logger = logging.getLogger(__name__)
+
+async def run_warm_up(app: FastAPI):
+    """Agent 및 모델 워밍업 (백그라운드 실행)"""
+    from app.services.router_agent.router_agent_nodes import RouterAgentNodes
+    
+    started_at = time.perf_counter()
+    try:
+        app.state.warm_up = await RouterAgentNodes().warm_up(max_workers=settings.warmup_max_workers)
+    except Exception as e:
+        logger.error(f"워밍업 실패: {str(e)}")
+        app.state.warm_up = {"error": str(e)}
+    finally:
+        app.state.warm_up_seconds = round(time.perf_counter() - started_at, 3)
+        app.state.ready = True
+
+async def run_anomaly_scan_worker(app: FastAPI):
+    """
+    실적 급증/급감 스캔 워커: 시작 시 증분 스캔 후 매일 설정 시각에 재실행
+    
+    --prod 다중 워커에서도 한 번만 실행되도록 이상치 DB의 임대를 얻은 워커만 스캔하며,
+    거래처 Agent가 쓰는 분석 엔진을 그대로 사용합니다.
+    """
+    from app.services.analytics.anomaly_scan import get_anomaly_store, run_anomaly_scan, seconds_until
+    from app.services.router_agent.router_agent_nodes import RouterAgentNodes
+    
+    owner = f"{socket.gethostname()}:{os.getpid()}"
+    while True:
+        store = None
+        try:
+            store = await asyncio.to_thread(get_anomaly_store)
+            if await asyncio.to_thread(store.try_lease, "anomaly_scan", owner, settings.anomaly_scan_lease_seconds):
+                client_agent = await RouterAgentNodes().get_agent("client_agent")
+                service = getattr(client_agent, "database_service", None)
+                app.state.anomaly_scan = await asyncio.to_thread(run_anomaly_scan, False, service)
+            else:
+                logger.info("실적 이상치 스캔 생략: 다른 워커가 실행 중이거나 최근에 완료")
+                app.state.anomaly_scan = {"skipped": "lease_held"}
+        except Exception as e:
+            logger.error(f"실적 이상치 스캔 실패: {str(e)}")
+            app.state.anomaly_scan = {"error": str(e)}
+            if store is not None:
+                await asyncio.to_thread(store.release_lease, "anomaly_scan", owner)
+        await asyncio.sleep(seconds_until(settings.anomaly_scan_hour))
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """애플리케이션 수명주기: 시작 시 워밍업을 병렬 실행하고 완료 시 ready 전환"""
+    app.state.ready = not settings.warmup_enabled
+    app.state.warm_up = None
+    app.state.warm_up_seconds = None
+    
+    app.state.anomaly_scan = None
+    
+    warm_up_task = asyncio.create_task(run_warm_up(app)) if settings.warmup_enabled else None
+    anomaly_task = asyncio.create_task(run_anomaly_scan_worker(app)) if settings.anomaly_scan_enabled else None
+    try:
+        yield
+    finally:
+        for task in (warm_up_task, anomaly_task):
+            if task and not task.done():
+                task.cancel()
+        
+        # 공유 SQLite 체크포인터 연결 종료
+        from app.core.checkpointer import close_checkpointers
+        await close_checkpointers()
 
 app = FastAPI(
     title="NaruTalk AI 챗봇",
     description="랭그래프를 활용한 AI 챗봇 시스템",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # CORS 설정
@@ -24,6 +99,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 채팅 경로 전역 동시 처리 상한 (초과 시 429 + Retry-After)
+app.add_middleware(AdmissionMiddleware)
+
+# 요청별 단계 타이밍 수집 (X-Debug-Timing 헤더 시 응답 metadata에 포함)
+app.add_middleware(TimingMiddleware)
+
 # API 라우터 등록
 app.include_router(api_router, prefix="/api/v1")
 
@@ -95,5 +176,24 @@ async def health_check():
     """헬스 체크"""
     return {"status": "ok", "message": "NaruTalk AI 챗봇이 정상 작동 중입니다."}
 
+@app.get("/metrics")
+async def get_metrics():
+    """단계별 지연시간 히스토그램 (p50/p95/p99) 및 추가 지표"""
+    return collect_metrics()
+
+@app.get("/ready")
+async def readiness_check():
+    """레디니스 체크 - 워밍업 완료 전에는 503 반환"""
+    if not getattr(app.state, "ready", False):
+        return JSONResponse(
+            status_code=503,
+            content={"status": "warming_up", "message": "Agent 및 모델을 준비 중입니다."}
+        )
+    return {
+        "status": "ready",
+        "warm_up": getattr(app.state, "warm_up", None),
+        "warm_up_seconds": getattr(app.state, "warm_up_seconds", None)
+    }
+
 if __name__ == "__main__":
     uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True) 
\ No newline at end of file
@@ -6,6 +6,7 @@ NaruTalk AI 챗봇 서버 실행 스크립트
 import os
 import sys
 import asyncio
+import argparse
 import uvicorn
 from pathlib import Path
 
@@ -121,8 +122,20 @@ def setup_environment():
     
     print("✅ 환경 설정 완료")
 
+def parse_args():
+    """실행 옵션 파싱"""
+    parser = argparse.ArgumentParser(description="NaruTalk AI 챗봇 서버 실행")
+    parser.add_argument("--prod", action="store_true", help="운영 모드 (reload 없이 다중 워커 실행)")
+    parser.add_argument("--workers", type=int, default=None, help="운영 모드 워커 수 (기본값: CPU 코어 수)")
+    parser.add_argument("--host", default="0.0.0.0", help="바인딩 주소")
+    parser.add_argument("--port", type=int, default=8000, help="포트")
+    return parser.parse_args()
+
 def main():
     """메인 함수"""
+    args = parse_args()
+    workers = max(1, args.workers or os.cpu_count() or 1) if args.prod else 1
+    
     print("🚀 NaruTalk AI 챗봇 시스템 시작")
     print("=" * 50)
     
@@ -152,23 +165,34 @@ def main():
     print("\n5. 서버 시작 중...")
     print("=" * 50)
     print("📌 서버 정보:")
-    print("   - 주소: http://localhost:8000")
-    print("   - API 문서: http://localhost:8000/docs")
-    print("   - 테스트 페이지: http://localhost:8000/tests/test_frontend.html")
+    print(f"   - 주소: http://localhost:{args.port}")
+    print(f"   - API 문서: http://localhost:{args.port}/docs")
+    print(f"   - 테스트 페이지: http://localhost:{args.port}/tests/test_frontend.html")
+    print(f"   - 모드: {'운영 (워커 ' + str(workers) + '개)' if args.prod else '개발 (reload)'}")
     print("   - 중지: Ctrl+C")
     print("=" * 50)
     
     try:
         # FastAPI 서버 시작
         os.chdir(backend_path)
-        uvicorn.run(
-            "main:app",
-            host="0.0.0.0",
-            port=8000,
-            reload=True,
-            reload_dirs=[str(backend_path)],
-            log_level="info"
-        )
+        if args.prod:
+            # 운영 모드: 세션/체크포인트는 공유 SQLite에 저장되므로 어느 워커든 요청 처리 가능
+            uvicorn.run(
+                "main:app",
+                host=args.host,
+                port=args.port,
+                workers=workers,
+                log_level="info"
+            )
+        else:
+            uvicorn.run(
+                "main:app",
+                host=args.host,
+                port=args.port,
+                reload=True,
+                reload_dirs=[str(backend_path)],
+                log_level="info"
+            )
     except KeyboardInterrupt:
         print("\n\n🛑 서버가 중지되었습니다.")
     except Exception as e:
@@ -0,0 +1,108 @@
+"""
+거래처 분석 엔진 벤치마크
+
+합성 품목 실적 데이터(기본 100만 행)로 ClientAnalyticsEngine을 구축하고,
+사전 집계 큐브 조회와 원본 DataFrame 재스캔(기존 방식) 간 질의 지연시간을 비교합니다.
+
+실행:
+    python tests/benchmarks/bench_client_analytics.py --rows 1000000 --clients 5000 --queries 200
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "backend"))
+
+from app.services.agents.client_agent.analytics_engine import ClientAnalyticsEngine
+
+MONTHS = [202301 + i for i in range(12)] + [202401 + i for i in range(12)]
+
+
+def make_dataset(rows: int, clients: int, products: int, seed: int = 42):
+    """합성 거래처 월별 실적 + 품목 실적 생성"""
+    rng = np.random.default_rng(seed)
+    client_names = np.array([f"거래처{i:05d}(서울시 {i % 25}구)" for i in range(clients)], dtype=object)
+    product_names = np.array([f"품목{i:03d}정" for i in range(products)], dtype=object)
+
+    managers = np.array([f"담당자{i:02d}" for i in range(40)], dtype=object)
+
+    client_index = rng.integers(0, clients, rows)
+    transactions = pd.DataFrame({
+        "담당자": managers[client_index % len(managers)],
+        "거래처ID": client_names[client_index],
+        "품목": product_names[rng.integers(0, products, rows)],
+        "월": np.array(MONTHS)[rng.integers(0, len(MONTHS), rows)],
+        "금액": rng.gamma(2.0, 50000.0, rows).round(),
+    })
+
+    grid = pd.MultiIndex.from_product([client_names, MONTHS], names=["거래처ID", "월"]).to_frame(index=False)
+    monthly = grid.assign(
+        월누적금액=rng.integers(100_000, 20_000_000, len(grid)),
+        월방문횟수=rng.integers(0, 8, len(grid)),
+        월사용금액=rng.integers(10_000, 3_000_000, len(grid)),
+        총환자수=rng.integers(100, 3000, len(grid)),
+    )
+    return monthly, transactions, client_names
+
+
+def rescan_sales(monthly: pd.DataFrame, client: str, start: int, end: int) -> dict:
+    """기존 방식: 질의마다 원본 전체를 부분 문자열/기간 조건으로 필터링"""
+    rows = monthly[monthly["거래처ID"].str.contains(client, regex=False) & monthly["월"].between(start, end)]
+    return rows.groupby("월")["월누적금액"].sum().to_dict()
+
+
+def rescan_transactions(transactions: pd.DataFrame, client: str, start: int, end: int) -> int:
+    rows = transactions[(transactions["거래처ID"] == client) & transactions["월"].between(start, end)]
+    return len(rows.groupby(["월", "품목"])["금액"].sum())
+
+
+def timed(fn, queries):
+    latencies = []
+    for query in queries:
+        started = time.perf_counter()
+        fn(*query)
+        latencies.append((time.perf_counter() - started) * 1000)
+    latencies.sort()
+    return latencies[len(latencies) // 2], latencies[int(len(latencies) * 0.95)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="거래처 분석 엔진 벤치마크")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--clients", type=int, default=5000)
+    parser.add_argument("--products", type=int, default=200)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    monthly, transactions, client_names = make_dataset(args.rows, args.clients, args.products)
+    print(f"합성 데이터: 품목 실적 {len(transactions):,}행, 월별 실적 {len(monthly):,}행")
+
+    started = time.perf_counter()
+    engine = ClientAnalyticsEngine(monthly, transactions)
+    print(f"엔진 구축: {(time.perf_counter() - started):.2f}s  {engine.get_stats()}")
+
+    rng = np.random.default_rng(7)
+    queries = [
+        (str(client_names[i]), 202303, 202408)
+        for i in rng.integers(0, len(client_names), args.queries)
+    ]
+
+    results = {
+        "sales (cube)": timed(lambda c, s, e: engine.sales(c, (s, e)), queries),
+        "sales (rescan)": timed(lambda c, s, e: rescan_sales(monthly, c, s, e), queries),
+        "transactions (cube)": timed(lambda c, s, e: engine.transactions(c, (s, e)), queries),
+        "transactions (rescan)": timed(lambda c, s, e: rescan_transactions(transactions, c, s, e), queries),
+        "profile (cube)": timed(lambda c, s, e: engine.profile(c), queries),
+        "risk (cube)": timed(lambda c, s, e: engine.risk(c, (s, e)), queries),
+    }
+    for name, (p50, p95) in results.items():
+        print(f"{name:<24} p50={p50:9.3f}ms  p95={p95:9.3f}ms")
+
+
+if __name__ == "__main__":
+    main()
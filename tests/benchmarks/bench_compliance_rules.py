@@ -0,0 +1,72 @@
+"""
+컴플라이언스 규칙 엔진 처리량 벤치마크
+
+합성 지출 내역(기본 10만 건)을 규칙 엔진으로 일괄 선별해 초당 처리 건수와 건당 지연시간,
+판정 분포(위반/검토 필요/이상 없음)를 출력합니다.
+
+실행:
+    python tests/benchmarks/bench_compliance_rules.py --reports 100000
+"""
+
+import argparse
+import random
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "backend"))
+
+from app.services.agents.docs_agent.compliance_rules import get_rule_engine
+
+DOCS_DIR = Path(__file__).parent.parent.parent / "database" / "relationdb" / "외부자료"
+
+TEMPLATES = [
+    "{client} 원장님 접대비 {amount}만원 ({people}명)",
+    "{client} 제품설명회 식음료 1인당 {amount}만원, 기념품 {small}만원",
+    "{client} 의원 방문 식사 {amount}만원 월 {count}회",
+    "{client} 교수 강연료 {amount}0만원 지급",
+    "{client} 자문료 {amount}0만원, 연간 누적 {large}0만원",
+    "{client} 원장 모친상 조의금 {small}만원",
+    "{client} 거래처 선물 {amount}만원 (영수증 미첨부)",
+    "{client} 약국 방문, 신제품 디테일링",
+    "{client} 골프 라운딩 참석",
+    "{client} 월간 매출 보고 및 재고 확인",
+]
+
+
+def make_reports(count: int, seed: int = 42):
+    rng = random.Random(seed)
+    return [
+        rng.choice(TEMPLATES).format(
+            client=f"거래처{rng.randint(1, 500)}", amount=rng.randint(1, 30), people=rng.randint(1, 6),
+            small=rng.randint(1, 9), count=rng.randint(1, 8), large=rng.randint(10, 40),
+        )
+        for _ in range(count)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="컴플라이언스 규칙 엔진 처리량 벤치마크")
+    parser.add_argument("--reports", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    engine = get_rule_engine(DOCS_DIR)
+    print(f"규칙 컴파일: {len(engine.rules)}개 ({(time.perf_counter() - started) * 1000:.1f}ms, 문서 읽기 포함)")
+
+    reports = make_reports(args.reports)
+    timings = []
+    for _ in range(args.repeat):
+        started = time.perf_counter()
+        results = engine.scan_batch(reports)
+        timings.append(time.perf_counter() - started)
+    best = min(timings)
+    print(f"일괄 선별: {args.reports:,}건  {best * 1000:.1f}ms  ({args.reports / best:,.0f} reports/s, "
+          f"{best / args.reports * 1e6:.2f}us/건)")
+    print(f"판정 분포: {dict(Counter(result['status'] for result in results))}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+시계열 일괄 예측 처리량 벤치마크
+
+합성 월별 계열(기본 10만 개 × 24개월)에 fit_forecasts를 적용해 초당 적합 계열 수와
+적합 후 계열별 조회 지연시간을 측정합니다. 비교용으로 계열 단위 반복 적합 시간도 출력합니다.
+
+실행:
+    python tests/benchmarks/bench_forecasting.py --series 100000 --periods 24
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "backend"))
+
+from app.services.analytics.forecasting import fit_forecasts, summarize_models
+
+
+def make_series(series: int, periods: int, seed: int = 42) -> np.ndarray:
+    """추세 + 12개월 계절성 + 잡음 합성 계열"""
+    rng = np.random.default_rng(seed)
+    t = np.arange(periods)
+    level = rng.gamma(2.0, 500_000.0, (series, 1))
+    trend = rng.normal(0.0, 0.02, (series, 1)) * level * t
+    season = rng.uniform(0.0, 0.3, (series, 1)) * level * np.sin(2 * np.pi * t / 12)
+    noise = rng.normal(0.0, 0.1, (series, periods)) * level
+    return np.maximum(level + trend + season + noise, 0.0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="시계열 일괄 예측 처리량 벤치마크")
+    parser.add_argument("--series", type=int, default=100_000)
+    parser.add_argument("--periods", type=int, default=24)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--loop-sample", type=int, default=2000, help="계열 단위 반복 적합 비교 표본 수")
+    args = parser.parse_args()
+
+    values = make_series(args.series, args.periods)
+    keys = [f"series-{i}" for i in range(args.series)]
+
+    timings = []
+    for _ in range(args.repeat):
+        started = time.perf_counter()
+        result = fit_forecasts(values, keys)
+        timings.append(time.perf_counter() - started)
+    best = min(timings)
+    print(f"일괄 적합: {args.series:,}개 × {args.periods}기간  {best * 1000:.1f}ms  "
+          f"({args.series / best:,.0f} series/s)  모형 선택 {summarize_models(result)}")
+
+    sample = min(args.loop_sample, args.series)
+    started = time.perf_counter()
+    for row in range(sample):
+        fit_forecasts(values[row:row + 1])
+    per_series = (time.perf_counter() - started) / sample
+    print(f"계열 단위 반복: {1 / per_series:,.0f} series/s (표본 {sample:,}개, 일괄 대비 {per_series * args.series / best:.0f}배 느림)")
+
+    lookups = [keys[i] for i in np.random.default_rng(7).integers(0, args.series, 10_000)]
+    started = time.perf_counter()
+    for key in lookups:
+        result.get(key)
+    print(f"조회: {(time.perf_counter() - started) / len(lookups) * 1e6:.2f}us/건")
+
+
+if __name__ == "__main__":
+    main()
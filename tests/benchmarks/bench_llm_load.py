@@ -0,0 +1,166 @@
+"""
+OpenAI 스텁 서버 기반 채팅 엔드포인트 부하 테스트
+
+API 키와 네트워크 없이 로컬 OpenAI 호환 스텁(openai_stub.py)을 띄우고 /chat, /chat/stream에 동시 요청을 보내
+응답 지연시간 분위수, 스트리밍 첫 이벤트까지의 시간, 처리량, 429 비율을 측정합니다.
+LLM 지연은 분포와 초당 토큰 속도로 모사하고, --mode record로 실제 응답을 카세트에 한 번 녹화한 뒤
+--mode replay로 같은 응답을 오프라인에서 반복 재생할 수 있습니다.
+
+실행:
+    python tests/benchmarks/bench_llm_load.py --requests 200 --concurrency 20 --latency lognormal --mean-ms 800 --spread-ms 400
+    OPENAI_API_KEY=sk-... python tests/benchmarks/bench_llm_load.py --mode record --cassette cassettes/chat.json --requests 8
+    python tests/benchmarks/bench_llm_load.py --mode replay --cassette cassettes/chat.json --endpoint stream
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "backend"))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from openai_stub import LatencyModel, StubConfig, StubServer, create_stub_app
+
+from app.core.config import settings
+
+CHAT_PATH = "/api/v1/tool-calling/chat"
+STREAM_PATH = "/api/v1/tool-calling/chat/stream"
+
+MESSAGES = [
+    "영업부 직원 연락처 알려줘",
+    "인사팀 조직 인원 알려줘",
+    "거래처 매출 등급 분석해줘",
+    "출장비 정산 규정 찾아줘",
+    "이번 달 영업 보고서 작성해줘",
+    "김철수 담당 거래처 매출과 담당자 연락처 알려줘",
+    "오늘 날씨 어때?",
+]
+
+
+def _percentile(values, q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+async def _chat(client: httpx.AsyncClient, message: str, use_state_graph: bool):
+    started = time.perf_counter()
+    response = await client.post(CHAT_PATH, json={"message": message, "use_state_graph": use_state_graph})
+    elapsed = (time.perf_counter() - started) * 1000
+    agent = response.json().get("agent") if response.status_code == 200 else None
+    return response.status_code, elapsed, elapsed, agent
+
+
+async def _stream(client: httpx.AsyncClient, message: str, use_state_graph: bool):
+    """(상태 코드, 전체 시간, 첫 응답 내용 이벤트까지의 시간, Agent)"""
+    started = time.perf_counter()
+    first_content, agent = None, None
+    async with client.stream("POST", STREAM_PATH, json={"message": message, "use_state_graph": use_state_graph}) as response:
+        if response.status_code != 200:
+            await response.aread()
+            return response.status_code, (time.perf_counter() - started) * 1000, None, None
+        async for line in response.aiter_lines():
+            if not line.startswith("data: ") or line == "data: [DONE]":
+                continue
+            event = json.loads(line[6:])
+            if first_content is None and event.get("type") in ("agent_partial", "token"):
+                first_content = (time.perf_counter() - started) * 1000
+            if event.get("type") == "complete":
+                agent = event.get("agent")
+    return 200, (time.perf_counter() - started) * 1000, first_content, agent
+
+
+async def run_load(base_url: str, endpoint: str, total: int, concurrency: int, use_state_graph: bool):
+    call = _stream if endpoint == "stream" else _chat
+    semaphore = asyncio.Semaphore(concurrency)
+    limits = httpx.Limits(max_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=300) as client:
+        async def one(index: int):
+            async with semaphore:
+                return await call(client, MESSAGES[index % len(MESSAGES)], use_state_graph)
+
+        started = time.perf_counter()
+        results = await asyncio.gather(*(one(index) for index in range(total)))
+        wall = time.perf_counter() - started
+        metrics = (await client.get("/metrics")).json()
+    return results, wall, metrics
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--endpoint", choices=["chat", "stream"], default="chat")
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--state-graph", action="store_true", help="StateGraph 라우터 사용")
+    parser.add_argument("--mode", choices=["stub", "record", "replay"], default="stub")
+    parser.add_argument("--cassette", help="녹화/재생 카세트 파일 경로 (record/replay 모드)")
+    parser.add_argument("--latency", choices=["fixed", "uniform", "lognormal"], default="lognormal")
+    parser.add_argument("--mean-ms", type=float, default=600.0, help="LLM 첫 토큰까지 평균 지연")
+    parser.add_argument("--spread-ms", type=float, default=300.0, help="uniform: ±폭, lognormal: 표준편차")
+    parser.add_argument("--tokens-per-second", type=float, default=60.0, help="LLM 생성 속도 (0이면 즉시)")
+    parser.add_argument("--completion-tokens", type=int, default=120)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    stub_app = create_stub_app(StubConfig(
+        mode=args.mode,
+        latency=LatencyModel(args.latency, args.mean_ms, args.spread_ms, args.seed),
+        tokens_per_second=args.tokens_per_second,
+        completion_tokens=args.completion_tokens,
+        cassette_path=args.cassette,
+        upstream_api_key=os.getenv("OPENAI_API_KEY"),
+        replay_fallback=False,
+    ))
+
+    with tempfile.TemporaryDirectory() as db_dir, StubServer(stub_app) as server:
+        # 모든 OpenAI 호출 지점을 스텁으로 연결 (RouterAgent 생성 전에 설정)
+        os.environ.setdefault("OPENAI_API_KEY", "stub-key")
+        os.environ["OPENAI_BASE_URL"] = server.base_url
+        settings.openai_api_key = os.environ["OPENAI_API_KEY"]
+        settings.openai_base_url = server.base_url
+        settings.sqlite_db_path = db_dir  # LLM 응답 캐시가 기존 DB를 쓰지 않도록 분리
+
+        from main import app
+
+        print(f"스텁 서버: {server.base_url} (mode={args.mode}, latency={args.latency} "
+              f"{args.mean_ms:.0f}±{args.spread_ms:.0f}ms, {args.tokens_per_second:.0f} tok/s)")
+        # 스트리밍 첫 이벤트 시간을 재려면 응답 본문을 모아서 돌려주는 ASGITransport 대신 실제 HTTP로 호출
+        with StubServer(app) as backend:
+            results, wall, metrics = asyncio.run(run_load(
+                f"http://127.0.0.1:{backend.port}", args.endpoint, args.requests, args.concurrency, args.state_graph
+            ))
+        stub_stats = stub_app.state.stats
+
+    statuses = Counter(status for status, _, _, _ in results)
+    ok = [result for result in results if result[0] == 200]
+    totals = [elapsed for _, elapsed, _, _ in ok]
+    firsts = [first for _, _, first, _ in ok if first is not None]
+    agents = Counter(agent for _, _, _, agent in ok)
+
+    print(f"\n엔드포인트: {args.endpoint}, 요청 {args.requests}건, 동시 {args.concurrency}")
+    print(f"처리량: {len(ok) / wall:.1f} req/s (총 {wall:.2f}s)")
+    print(f"상태 코드: {dict(statuses)} (429 비율 {statuses.get(429, 0) / len(results):.1%})")
+    print(f"전체 지연 ms: p50 {_percentile(totals, 0.5):.0f}, p95 {_percentile(totals, 0.95):.0f}, "
+          f"p99 {_percentile(totals, 0.99):.0f}, 평균 {statistics.mean(totals) if totals else 0:.0f}")
+    if args.endpoint == "stream":
+        print(f"첫 응답 이벤트까지 ms: p50 {_percentile(firsts, 0.5):.0f}, p95 {_percentile(firsts, 0.95):.0f}")
+    print(f"Agent 분포: {dict(agents)}")
+    print(f"스텁 호출: {stub_stats}")
+    for name in ("prompt_cache", "circuit_breaker", "single_flight", "admission"):
+        if name in metrics:
+            print(f"{name}: {json.dumps(metrics[name], ensure_ascii=False)[:400]}")
+
+
+if __name__ == "__main__":
+    main()
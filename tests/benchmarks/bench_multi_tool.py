@@ -0,0 +1,84 @@
+"""
+복합 질문 멀티 Tool 실행 벤치마크
+
+Agent 처리 시간을 지정한 지연으로 흉내 낸 뒤, Router Graph의 병렬 멀티 Tool 실행과
+같은 Agent들을 하나씩 순서대로 실행하는 방식(기존 방식)의 응답 지연시간을 비교합니다.
+
+실행:
+    python tests/benchmarks/bench_multi_tool.py --latencies 0.8 1.2 0.5 --rounds 5
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "backend"))
+
+from app.core.config import settings
+from app.services.router_agent.router_agent import RouterAgent
+
+AGENTS = ["employee_agent", "client_agent", "db_agent", "docs_agent"]
+
+
+class SimulatedAgent:
+    def __init__(self, name: str, latency: float):
+        self.name = name
+        self.latency = latency
+
+    async def process(self, args, original_message, prefetched=None):
+        await asyncio.sleep(self.latency)
+        return {"response": f"{self.name} 결과", "sources": [], "metadata": {"agent": self.name}}
+
+
+class SimulatedToolCaller:
+    def __init__(self, agents):
+        self.tool_calls = [
+            {"function_name": agent, "function_args": {"query": "벤치마크"}, "confidence": 0.9} for agent in agents
+        ]
+
+    async def call_tool(self, message):
+        return {"tool_call": self.tool_calls[0], "tool_calls": self.tool_calls, "general_response": None}
+
+
+async def run_sequential(router: RouterAgent, tool_calls, message: str) -> float:
+    """기존 방식: Agent를 하나씩 순서대로 실행"""
+    started = time.perf_counter()
+    for call in tool_calls:
+        await router.graph.agent_nodes.execute_agent(call["function_name"], call["function_args"], message)
+    return (time.perf_counter() - started) * 1000
+
+
+async def run_parallel(router: RouterAgent, message: str) -> float:
+    started = time.perf_counter()
+    result = await router.route_request(message)
+    assert result["agent"] == "multi_agent"
+    return (time.perf_counter() - started) * 1000
+
+
+async def main(latencies, rounds: int):
+    settings.speculative_prefetch_enabled = False
+    agents = AGENTS[:len(latencies)]
+    router = RouterAgent()
+    router.graph.tool_caller = SimulatedToolCaller(agents)
+    for agent, latency in zip(agents, latencies):
+        router.graph.agent_nodes.agent_instances[agent] = SimulatedAgent(agent, latency)
+
+    message = "최수아 담당 거래처 매출 추이"
+    sequential = [await run_sequential(router, router.graph.tool_caller.tool_calls, message) for _ in range(rounds)]
+    parallel = [await run_parallel(router, message) for _ in range(rounds)]
+
+    print(f"Agent {len(agents)}개, 지연 {latencies}s, {rounds}회 평균")
+    print(f"  순차 실행: {sum(sequential) / rounds:8.1f} ms")
+    print(f"  병렬 실행: {sum(parallel) / rounds:8.1f} ms")
+    print(f"  단축 비율: {sum(sequential) / sum(parallel):8.2f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="멀티 Tool 병렬 실행 벤치마크")
+    parser.add_argument("--latencies", type=float, nargs="+", default=[0.8, 1.2, 0.5],
+                        help="Agent별 처리 시간(초), 최대 4개")
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(main(args.latencies[:len(AGENTS)], args.rounds))
@@ -0,0 +1,139 @@
+"""
+워커 수별 처리량 벤치마크
+
+운영 모드(uvicorn 다중 워커)로 서버를 띄우고 CPU 바운드 검색 요청(직원 정보 Excel 검색)의
+초당 처리량을 워커 수별로 측정합니다. OpenAI 키 없이 키워드 Fallback 라우팅을 사용합니다.
+
+실행:
+    python tests/benchmarks/bench_workers.py --workers 1 2 4 --duration 20
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+project_root = Path(__file__).parent.parent.parent
+backend_dir = project_root / "backend"
+
+CHAT_PATH = "/api/v1/tool-calling/chat"
+PAYLOAD = {"message": "영업부 직원 연락처 알려줘", "use_state_graph": False}
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(workers: int, port: int, state_dir: str) -> subprocess.Popen:
+    """uvicorn 다중 워커 서버 실행 (공유 SQLite 상태 디렉토리 사용)"""
+    env = {
+        **os.environ,
+        "OPENAI_API_KEY": "",
+        "SQLITE_DB_PATH": state_dir,
+    }
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app",
+         "--host", "127.0.0.1", "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning"],
+        cwd=str(backend_dir),
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+async def wait_ready(base_url: str, workers: int, timeout: float = 300.0):
+    """모든 워커가 워밍업을 마칠 때까지 /ready 폴링"""
+    deadline = time.monotonic() + timeout
+    consecutive = 0
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        while time.monotonic() < deadline:
+            try:
+                response = await client.get("/ready")
+                consecutive = consecutive + 1 if response.status_code == 200 else 0
+            except httpx.TransportError:
+                consecutive = 0
+            # 워커별로 요청이 분산되므로 연속 성공 횟수로 판단
+            if consecutive >= workers * 4:
+                return
+            await asyncio.sleep(0.2)
+    raise TimeoutError("서버 준비 시간 초과")
+
+
+async def measure(base_url: str, concurrency: int, duration: float) -> dict:
+    """고정 시간 동안 동시 요청을 보내 처리량과 지연시간 측정"""
+    latencies = []
+    errors = 0
+    deadline = time.monotonic() + duration
+
+    async def worker(client: httpx.AsyncClient):
+        nonlocal errors
+        while time.monotonic() < deadline:
+            started = time.perf_counter()
+            try:
+                response = await client.post(CHAT_PATH, json=PAYLOAD)
+                response.raise_for_status()
+                latencies.append(time.perf_counter() - started)
+            except httpx.HTTPError:
+                errors += 1
+
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, timeout=60, limits=limits) as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": len(latencies) / elapsed,
+        "p50_ms": latencies[len(latencies) // 2] * 1000 if latencies else 0.0,
+        "p95_ms": latencies[int(len(latencies) * 0.95)] * 1000 if latencies else 0.0,
+    }
+
+
+async def run(worker_counts, duration: float, concurrency_per_worker: int):
+    results = []
+    for workers in worker_counts:
+        port = _free_port()
+        base_url = f"http://127.0.0.1:{port}"
+        with tempfile.TemporaryDirectory() as state_dir:
+            server = start_server(workers, port, state_dir)
+            try:
+                await wait_ready(base_url, workers)
+                result = await measure(base_url, workers * concurrency_per_worker, duration)
+            finally:
+                server.terminate()
+                server.wait(timeout=30)
+        results.append((workers, result))
+        print(f"workers={workers:<3} rps={result['rps']:8.1f}  p50={result['p50_ms']:7.1f}ms  "
+              f"p95={result['p95_ms']:7.1f}ms  errors={result['errors']}")
+
+    base_rps = results[0][1]["rps"] / results[0][0] if results and results[0][1]["rps"] else 0
+    if base_rps:
+        print("\n워커당 처리량 대비 확장 효율")
+        for workers, result in results:
+            print(f"  workers={workers:<3} efficiency={result['rps'] / (base_rps * workers):.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="워커 수별 처리량 벤치마크")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--duration", type=float, default=20.0)
+    parser.add_argument("--concurrency-per-worker", type=int, default=4)
+    args = parser.parse_args()
+    asyncio.run(run(args.workers, args.duration, args.concurrency_per_worker))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,395 @@
+"""
+OpenAI 호환 스텁 서버 + 녹화/재생 하네스
+
+API 키와 네트워크 없이 Router, Agent, 스트리밍 엔드포인트를 결정적으로 부하 테스트하기 위한 로컬 서버입니다.
+설정의 openai_base_url을 이 서버 주소로 지정하면 백엔드의 모든 OpenAI 호출 지점이 스텁으로 향합니다.
+
+- POST /v1/chat/completions: 일반 응답, Tool Call(요청의 tools 중 질문 키워드와 맞는 함수 선택), SSE 스트리밍
+- 지연 시간 분포(fixed/uniform/lognormal, 시드 고정)와 초당 토큰 생성 속도 모사
+- usage.prompt_tokens_details.cached_tokens: 같은 접두부(시스템 프롬프트 + tools)가 반복되면 캐시 적중으로 보고
+- mode="record": 실제 API 응답을 카세트(JSON) 파일에 한 번 저장, mode="replay": 카세트에서만 응답
+
+사용:
+    app = create_stub_app(StubConfig(latency=LatencyModel("lognormal", mean_ms=800), tokens_per_second=50))
+    with StubServer(app) as server:
+        settings.openai_base_url = server.base_url
+"""
+
+import asyncio
+import hashlib
+import json
+import math
+import os
+import random
+import socket
+import sys
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "backend"))
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from app.core.context_compactor import count_tokens
+
+OPENAI_API_URL = "https://api.openai.com/v1"
+
+# 함수 이름 → 선택 키워드 (요청의 tools에 있는 함수만 후보)
+TOOL_KEYWORDS = {
+    "employee_agent": ["직원", "인사", "연락처", "조직", "부서", "상사", "인원", "담당자", "실적"],
+    "client_agent": ["거래처", "고객", "매출", "등급", "비즈니스"],
+    "db_agent": ["정책", "규정", "검색", "찾아", "공지", "매뉴얼"],
+    "docs_agent": ["보고서", "양식", "작성", "컴플라이언스", "위반", "문서"],
+}
+
+# OpenAI 프롬프트 캐시와 같은 최소 길이/단위
+CACHE_MIN_TOKENS = 1024
+CACHE_BLOCK_TOKENS = 128
+
+
+@dataclass
+class LatencyModel:
+    """응답 첫 토큰까지의 지연 시간 분포 (시드 고정으로 실행마다 같은 순서의 지연 생성)"""
+
+    distribution: str = "fixed"  # fixed | uniform | lognormal
+    mean_ms: float = 0.0
+    spread_ms: float = 0.0  # uniform: ±폭, lognormal: 표준편차
+    seed: int = 0
+
+    def __post_init__(self):
+        if self.distribution not in ("fixed", "uniform", "lognormal"):
+            raise ValueError(f"지원하지 않는 지연 분포: {self.distribution}")
+        self._random = random.Random(self.seed)
+        self._lock = threading.Lock()
+
+    def sample(self) -> float:
+        """지연 시간(초)"""
+        if self.mean_ms <= 0:
+            return 0.0
+        with self._lock:
+            if self.distribution == "uniform":
+                value = self._random.uniform(self.mean_ms - self.spread_ms, self.mean_ms + self.spread_ms)
+            elif self.distribution == "lognormal" and self.spread_ms > 0:
+                # 평균/표준편차가 mean_ms, spread_ms인 로그정규 분포 (긴 꼬리 지연 모사)
+                sigma2 = math.log(1 + (self.spread_ms / self.mean_ms) ** 2)
+                value = self._random.lognormvariate(math.log(self.mean_ms) - sigma2 / 2, math.sqrt(sigma2))
+            else:
+                value = self.mean_ms
+        return max(0.0, value) / 1000
+
+
+@dataclass
+class StubConfig:
+    mode: str = "stub"  # stub | record | replay
+    latency: LatencyModel = field(default_factory=LatencyModel)
+    tokens_per_second: float = 0.0  # 0이면 생성 시간 없이 즉시 응답
+    completion_tokens: int = 120  # 일반 응답 길이
+    cassette_path: Optional[str] = None
+    upstream_url: str = OPENAI_API_URL
+    upstream_api_key: Optional[str] = None
+    replay_fallback: bool = False  # 재생 모드에서 카세트에 없는 요청을 스텁 응답으로 대체할지
+
+
+def request_key(body: Dict[str, Any]) -> str:
+    """카세트 키 (stream 여부는 제외해 한 번 녹화한 응답을 일반/스트리밍 모두에 재생)"""
+    payload = {key: value for key, value in body.items() if key not in ("stream", "stream_options")}
+    encoded = json.dumps(payload, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class Cassette:
+    """요청 키 → 녹화된 chat.completion 응답 (JSON 파일)"""
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self.interactions: Dict[str, Dict[str, Any]] = {}
+        if self.path.exists():
+            self.interactions = json.loads(self.path.read_text(encoding="utf-8")).get("interactions", {})
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self.interactions.get(key)
+        return entry["response"] if entry else None
+
+    def put(self, key: str, request: Dict[str, Any], response: Dict[str, Any]):
+        with self._lock:
+            self.interactions[key] = {"request": request, "response": response}
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.path.write_text(
+                json.dumps({"interactions": self.interactions}, ensure_ascii=False, indent=2), encoding="utf-8"
+            )
+
+
+def _message_text(message: Dict[str, Any]) -> str:
+    content = message.get("content") or ""
+    if isinstance(content, list):
+        content = " ".join(part.get("text", "") for part in content if isinstance(part, dict))
+    return content
+
+
+def _tool_arguments(tool: Dict[str, Any], question: str) -> Dict[str, Any]:
+    """함수 스키마의 필수 인수를 채움 (enum은 첫 값, 나머지는 질문 원문)"""
+    parameters = tool.get("function", {}).get("parameters", {})
+    arguments = {}
+    for name in parameters.get("required", []):
+        spec = parameters.get("properties", {}).get(name, {})
+        if spec.get("enum"):
+            arguments[name] = spec["enum"][0]
+        elif spec.get("type") in ("integer", "number"):
+            arguments[name] = 1
+        else:
+            arguments[name] = question
+    return arguments
+
+
+class StubResponder:
+    """규칙 기반 모의 응답 생성 + 접두부 캐시 모사"""
+
+    def __init__(self, config: StubConfig):
+        self.config = config
+        self._prefixes = set()
+        self._lock = threading.Lock()
+
+    def _usage(self, body: Dict[str, Any], completion_tokens: int) -> Dict[str, Any]:
+        messages = body.get("messages", [])
+        prefix_text = json.dumps(body.get("tools", []), ensure_ascii=False)
+        if messages and messages[0].get("role") == "system":
+            prefix_text += _message_text(messages[0])
+        prefix_tokens = count_tokens(prefix_text)
+        prompt_tokens = prefix_tokens + sum(count_tokens(_message_text(m)) for m in messages[1:])
+
+        # 같은 접두부를 두 번째 본 요청부터 128토큰 단위로 캐시 적중
+        digest = hashlib.sha256(prefix_text.encode("utf-8")).hexdigest()
+        with self._lock:
+            seen = digest in self._prefixes
+            self._prefixes.add(digest)
+        cached = 0
+        if seen and prefix_tokens >= CACHE_MIN_TOKENS:
+            cached = prefix_tokens // CACHE_BLOCK_TOKENS * CACHE_BLOCK_TOKENS
+        return {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+            "prompt_tokens_details": {"cached_tokens": cached},
+        }
+
+    def _select_tools(self, body: Dict[str, Any], question: str) -> List[Dict[str, Any]]:
+        tools = {tool.get("function", {}).get("name"): tool for tool in body.get("tools") or []}
+        if not tools or body.get("tool_choice") == "none":
+            return []
+        selected = [
+            tools[name] for name, keywords in TOOL_KEYWORDS.items()
+            if name in tools and any(keyword in question for keyword in keywords)
+        ]
+        if not selected and body.get("tool_choice") == "required":
+            selected = [next(iter(tools.values()))]
+        return selected
+
+    def complete(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        messages = body.get("messages", [])
+        question = next((_message_text(m) for m in reversed(messages) if m.get("role") == "user"), "")
+        tools = self._select_tools(body, question)
+
+        if tools:
+            message = {
+                "role": "assistant",
+                "content": None,
+                "tool_calls": [
+                    {
+                        "id": f"call_{uuid.uuid4().hex[:24]}",
+                        "type": "function",
+                        "function": {
+                            "name": tool["function"]["name"],
+                            "arguments": json.dumps(_tool_arguments(tool, question), ensure_ascii=False),
+                        },
+                    }
+                    for tool in tools
+                ],
+            }
+            finish_reason = "tool_calls"
+            completion_tokens = sum(count_tokens(call["function"]["arguments"]) + 5 for call in message["tool_calls"])
+        else:
+            completion_tokens = max(1, min(self.config.completion_tokens, body.get("max_tokens") or 10 ** 6))
+            content = " ".join(f"응답{index}" for index in range(completion_tokens))
+            message = {"role": "assistant", "content": f"[모의 응답] {question[:40]} {content}"}
+            finish_reason = "stop"
+
+        return {
+            "id": f"chatcmpl-{uuid.uuid4().hex[:24]}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "gpt-4o"),
+            "choices": [{"index": 0, "message": message, "finish_reason": finish_reason, "logprobs": None}],
+            "usage": self._usage(body, completion_tokens),
+        }
+
+
+def _sse(payload: Dict[str, Any]) -> str:
+    return f"data: {json.dumps(payload, ensure_ascii=False)}\n\n"
+
+
+def _chunk(completion: Dict[str, Any], delta: Optional[Dict[str, Any]] = None,
+           finish_reason: Optional[str] = None) -> Dict[str, Any]:
+    return {
+        "id": completion["id"],
+        "object": "chat.completion.chunk",
+        "created": completion["created"],
+        "model": completion["model"],
+        "choices": [] if delta is None else [
+            {"index": 0, "delta": delta, "finish_reason": finish_reason, "logprobs": None}
+        ],
+    }
+
+
+def _content_pieces(content: str) -> List[str]:
+    """스트리밍 조각 (공백 단위 = 토큰 하나로 취급)"""
+    words = content.split(" ")
+    return [word if index == 0 else " " + word for index, word in enumerate(words)]
+
+
+async def _stream_completion(completion: Dict[str, Any], tokens_per_second: float,
+                             include_usage: bool) -> AsyncIterator[str]:
+    message = completion["choices"][0]["message"]
+    interval = 1 / tokens_per_second if tokens_per_second > 0 else 0.0
+
+    yield _sse(_chunk(completion, {"role": "assistant", "content": ""}))
+    if message.get("tool_calls"):
+        for index, call in enumerate(message["tool_calls"]):
+            if interval:
+                await asyncio.sleep(interval * max(1, count_tokens(call["function"]["arguments"])))
+            yield _sse(_chunk(completion, {"tool_calls": [{"index": index, **call}]}))
+    else:
+        for piece in _content_pieces(message.get("content") or ""):
+            if interval:
+                await asyncio.sleep(interval)
+            yield _sse(_chunk(completion, {"content": piece}))
+    yield _sse(_chunk(completion, {}, completion["choices"][0]["finish_reason"]))
+
+    if include_usage:
+        yield _sse({**_chunk(completion), "usage": completion.get("usage")})
+    yield "data: [DONE]\n\n"
+
+
+def create_stub_app(config: Optional[StubConfig] = None, upstream_transport: Any = None) -> FastAPI:
+    """
+    OpenAI 호환 스텁 앱
+
+    Args:
+        upstream_transport: 녹화 모드에서 상위 API 호출에 사용할 httpx 전송 계층 (테스트용)
+    """
+    config = config or StubConfig()
+    if config.mode not in ("stub", "record", "replay"):
+        raise ValueError(f"지원하지 않는 모드: {config.mode}")
+    if config.mode != "stub" and not config.cassette_path:
+        raise ValueError(f"{config.mode} 모드에는 cassette_path가 필요합니다")
+
+    app = FastAPI(title="OpenAI Stub")
+    responder = StubResponder(config)
+    cassette = Cassette(config.cassette_path) if config.cassette_path else None
+    app.state.stats = {"requests": 0, "streamed": 0, "recorded": 0, "replayed": 0, "replay_misses": 0}
+
+    async def record(body: Dict[str, Any], key: str) -> Dict[str, Any]:
+        import httpx
+
+        api_key = config.upstream_api_key or os.getenv("OPENAI_API_KEY")
+        request = {k: v for k, v in body.items() if k not in ("stream", "stream_options")}
+        async with httpx.AsyncClient(base_url=config.upstream_url, transport=upstream_transport, timeout=120) as client:
+            response = await client.post(
+                "/chat/completions", json=request, headers={"Authorization": f"Bearer {api_key}"}
+            )
+        response.raise_for_status()
+        completion = response.json()
+        cassette.put(key, request, completion)
+        app.state.stats["recorded"] += 1
+        return completion
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        app.state.stats["requests"] += 1
+        key = request_key(body)
+        simulate_latency = True
+
+        if config.mode == "record":
+            completion = cassette.get(key)
+            if completion is None:
+                completion = await record(body, key)
+                simulate_latency = False  # 실제 API 지연이 이미 반영됨
+        elif config.mode == "replay":
+            completion = cassette.get(key)
+            if completion is None:
+                app.state.stats["replay_misses"] += 1
+                if not config.replay_fallback:
+                    return JSONResponse(status_code=404, content={"error": {
+                        "message": f"카세트에 녹화되지 않은 요청입니다 (key={key[:12]})",
+                        "type": "cassette_miss", "code": "cassette_miss",
+                    }})
+                completion = responder.complete(body)
+            else:
+                app.state.stats["replayed"] += 1
+        else:
+            completion = responder.complete(body)
+
+        if simulate_latency:
+            await asyncio.sleep(config.latency.sample())
+        tokens_per_second = config.tokens_per_second if simulate_latency else 0.0
+
+        if body.get("stream"):
+            app.state.stats["streamed"] += 1
+            include_usage = bool((body.get("stream_options") or {}).get("include_usage"))
+            return StreamingResponse(
+                _stream_completion(completion, tokens_per_second, include_usage), media_type="text/event-stream"
+            )
+
+        if tokens_per_second > 0:
+            await asyncio.sleep(completion.get("usage", {}).get("completion_tokens", 0) / tokens_per_second)
+        return completion
+
+    @app.get("/v1/models")
+    async def models():
+        return {"object": "list", "data": [{"id": "gpt-4o", "object": "model", "owned_by": "stub"}]}
+
+    @app.get("/stats")
+    async def stats():
+        return app.state.stats
+
+    return app
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class StubServer:
+    """ASGI 앱(스텁 또는 백엔드)을 같은 프로세스의 백그라운드 스레드에서 uvicorn으로 실행 (동기 OpenAI 클라이언트용 실제 HTTP 주소)"""
+
+    def __init__(self, app: FastAPI, port: Optional[int] = None):
+        import uvicorn
+
+        self.port = port or _free_port()
+        self._server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=self.port, log_level="warning"))
+        self._thread = threading.Thread(target=self._server.run, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}/v1"
+
+    def __enter__(self) -> "StubServer":
+        self._thread.start()
+        deadline = time.monotonic() + 10
+        while not self._server.started:
+            if not self._thread.is_alive() or time.monotonic() > deadline:
+                raise RuntimeError("스텁 서버 시작 실패")
+            time.sleep(0.01)
+        return self
+
+    def __exit__(self, *exc_info):
+        self._server.should_exit = True
+        self._thread.join(timeout=10)
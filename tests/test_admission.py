@@ -0,0 +1,119 @@
+"""
+과부하 제어(admission) 테스트
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import httpx
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+from fastapi import FastAPI
+
+from app.core.admission import AdmissionMiddleware, AgentLimiter, Overloaded, admission_controller
+from app.core.config import settings
+from app.services.router_agent import api_router
+from app.services.router_agent.router_agent import RouterAgent
+from app.services.router_agent.schema_loader import AgentSchemaLoader
+
+
+def test_bounded_queue_rejects_when_full():
+    limiter = AgentLimiter("docs_agent", max_concurrent=1, max_queue=1, max_wait_seconds=5)
+
+    async def run():
+        await limiter.acquire()
+        queued = asyncio.ensure_future(limiter.acquire())
+        await asyncio.sleep(0)
+        with pytest.raises(Overloaded) as rejected:
+            await limiter.acquire()
+        assert limiter.queue_depth == 1 and not queued.done()
+        limiter.release(0.5)
+        await queued
+        return rejected.value
+
+    rejected = asyncio.run(run())
+    assert rejected.reason == "queue_full" and rejected.retry_after >= 1
+    assert limiter.running == 1 and limiter.stats()["rejected_queue_full"] == 1 and limiter.stats()["admitted"] == 2
+
+
+def test_deadline_aware_drop_is_immediate():
+    limiter = AgentLimiter("docs_agent", max_concurrent=1, max_queue=10, max_wait_seconds=1)
+    limiter.avg_service_seconds = 5.0  # 대기열에 들어가도 1초 안에 차례가 오지 않음
+
+    async def run():
+        await limiter.acquire()
+        started = time.perf_counter()
+        with pytest.raises(Overloaded) as rejected:
+            await limiter.acquire()
+        return rejected.value, time.perf_counter() - started
+
+    rejected, elapsed = asyncio.run(run())
+    assert rejected.reason == "deadline" and rejected.retry_after == 5 and elapsed < 0.05
+    assert limiter.queue_depth == 0
+
+
+class DocsToolCaller:
+    async def call_tool(self, message, context=None):
+        return {"tool_call": {"function_name": "docs_agent", "function_args": {"task_type": "generate_document"},
+                              "confidence": 0.9}, "general_response": None}
+
+
+class SlowDocsAgent:
+    async def process(self, args, original_message):
+        await asyncio.sleep(0.2)
+        return {"response": f"{original_message} 작성 완료", "sources": [], "metadata": {"agent": "docs_agent"}}
+
+
+def _app(monkeypatch):
+    monkeypatch.setattr(settings, "speculative_prefetch_enabled", False, raising=False)
+    monkeypatch.setattr(settings, "admission_enabled", True, raising=False)
+    router = RouterAgent()
+    router.graph.tool_caller = DocsToolCaller()
+    monkeypatch.setitem(router.graph.agent_nodes.agent_instances, "docs_agent", SlowDocsAgent())
+    monkeypatch.setitem(api_router._router_agents, False, router)
+    app = FastAPI()
+    app.include_router(api_router.router, prefix="/api/v1/tool-calling")
+    app.add_middleware(AdmissionMiddleware)
+    return app
+
+
+def test_agent_overload_returns_429_with_retry_after(monkeypatch):
+    app = _app(monkeypatch)
+    admission_controller.configure({"docs_agent": {"max_concurrent": 1, "max_queue": 0}})
+
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await asyncio.gather(*[
+                client.post("/api/v1/tool-calling/chat", json={"message": f"주간 보고서 {i}"}) for i in range(2)
+            ])
+
+    try:
+        responses = asyncio.run(run())
+    finally:
+        admission_controller.configure({"docs_agent": AgentSchemaLoader().get_agent_admission("docs_agent")})
+
+    assert sorted(response.status_code for response in responses) == [200, 429]
+    rejected = next(response for response in responses if response.status_code == 429)
+    assert int(rejected.headers["retry-after"]) >= 1
+
+
+def test_global_in_flight_cap(monkeypatch):
+    app = _app(monkeypatch)
+    monkeypatch.setattr(settings, "admission_max_in_flight", 0, raising=False)
+
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            chat = await client.post("/api/v1/tool-calling/chat", json={"message": "주간 보고서"})
+            health = await client.get("/api/v1/tool-calling/prompt-cache")
+            return chat, health
+
+    chat, other = asyncio.run(run())
+    assert chat.status_code == 429 and chat.headers["retry-after"] and chat.json()["reason"] == "max_in_flight"
+    assert other.status_code == 200
+    assert admission_controller.in_flight == 0
@@ -0,0 +1,98 @@
+"""
+실적 급증/급감 스캔(anomaly_scan) 테스트
+"""
+
+import asyncio
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+from app.core.config import settings
+from app.services.agents.client_agent.client_agent import ClientAgent
+from app.services.agents.employee_agent.employee_agent import EmployeeAgent
+from app.services.analytics.anomaly_scan import AnomalyStore, detect_anomalies, run_anomaly_scan, seconds_until
+
+MONTHS = [202401 + i for i in range(9)]
+
+KEYS = [("홍길동", "가나의원", "A정"), ("홍길동", "가나의원", "B정"), ("김영희", "다라약국", "C정")]
+
+
+def _values(months: int = 9) -> np.ndarray:
+    values = np.array([
+        [100, 110, 95, 105, 100, 98, 102, 101, 10],     # 마지막 달 급감
+        [50, 52, 48, 51, 49, 50, 300, 50, 51],          # 7번째 달 급증
+        [0, 0, 0, 0, 0, 0, 0, 0, 500],                  # 신규 진입은 제외
+    ], dtype=np.float64)
+    return values[:, :months]
+
+
+def test_detect_anomalies_flags_spikes_and_drops():
+    found = detect_anomalies(_values(), range(9), window=6)
+
+    flagged = {(int(row), int(column)): float(change) for row, column, change in
+               zip(found["row"], found["column"], found["change_rate"])}
+    assert set(flagged) == {(0, 8), (1, 6)}
+    assert flagged[(0, 8)] < -0.8 and flagged[(1, 6)] > 4
+
+    # 1차원/빈 입력은 IndexError 없이 빈 결과
+    for values in ([], np.zeros(9), np.zeros((0, 9))):
+        assert len(detect_anomalies(values, range(9), window=6)["row"]) == 0
+
+
+def test_incremental_scan_and_query(tmp_path):
+    store = AnomalyStore(tmp_path / "anomalies.db", window=6)
+
+    assert store.refresh(KEYS, MONTHS[:8], _values(8)) == MONTHS[6:8]
+    assert store.query(direction="down") == []
+    # 새 월 도착: 새 월과 최신 월만 스캔
+    assert store.refresh(KEYS, MONTHS, _values()) == [MONTHS[8]]
+    assert store.scanned_months() == MONTHS[6:]
+
+    drops = store.query(direction="급감")
+    assert [(row["rep"], row["product"], row["month"]) for row in drops] == [("홍길동", "A정", 202409)]
+    assert store.query(month=202407, direction="up", rep="홍길동")[0]["product"] == "B정"
+    assert store.summary() == {"month": 202409, "급증": 0, "급감": 1}
+
+
+def test_scan_lease_lets_one_worker_run(tmp_path):
+    store = AnomalyStore(tmp_path / "anomalies.db")
+    other_worker = AnomalyStore(tmp_path / "anomalies.db")
+
+    assert store.try_lease("anomaly_scan", "host:1", ttl_seconds=60)
+    assert not other_worker.try_lease("anomaly_scan", "host:2", ttl_seconds=60)
+    assert store.try_lease("anomaly_scan", "host:1", ttl_seconds=60)  # 보유 워커는 갱신 가능
+
+    store.release_lease("anomaly_scan", "host:1")
+    assert other_worker.try_lease("anomaly_scan", "host:2", ttl_seconds=0)
+    # 만료된 임대는 다른 워커가 가져감
+    time.sleep(0.01)
+    assert store.try_lease("anomaly_scan", "host:1", ttl_seconds=60)
+
+
+def test_seconds_until_next_run():
+    assert seconds_until(2, datetime(2024, 1, 1, 1, 30)) == 1800
+    assert seconds_until(2, datetime(2024, 1, 1, 2, 0)) == 24 * 3600
+
+
+def test_agents_serve_precomputed_anomalies(monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "sqlite_db_path", str(tmp_path), raising=False)
+    agent = ClientAgent()
+
+    # 요청 처리 경로는 스캔하지 않음 (예약 스캔 전에는 빈 테이블)
+    assert agent.database_service.get_anomaly_store().scanned_months() == []
+    scan = run_anomaly_scan(service=agent.database_service)
+    assert scan["scanned_months"] and scan["series"] > 0
+
+    result = asyncio.run(agent.process({"analysis_type": "anomaly"}, "이번 달 급감 품목 알려줘"))
+    assert "급감" in result["response"]
+    assert result["metadata"]["data_points"] > 0
+
+    # 예약 스캔이 채운 공유 이상치 테이블을 담당자 기준으로 조회
+    result = asyncio.run(EmployeeAgent().process({"search_type": "anomaly", "search_value": "최수아"}, "최수아 급감 품목"))
+    assert result["metadata"]["rep"] == "최수아"
+    assert "최수아" in result["response"]
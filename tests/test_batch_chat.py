@@ -0,0 +1,96 @@
+"""
+배치 채팅(/chat/batch, route_batch_requests) 테스트
+"""
+
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.services.router_agent import api_router
+from app.services.router_agent.router_agent import RouterAgent
+
+# 메시지별 (라우팅 Agent, 실행 시간)
+PLAN = {
+    "느린 문서 검색": ("db_agent", 0.15),
+    "빠른 문서 검색": ("db_agent", 0.01),
+    "직원 연락처": ("employee_agent", 0.05),
+    "안녕": (None, 0.0),
+}
+
+
+class FakeToolCaller:
+    async def call_tool(self, message):
+        await asyncio.sleep(0.01)
+        agent, _ = PLAN[message]
+        if agent is None:
+            return {"tool_call": None, "general_response": "무엇을 도와드릴까요?", "confidence": 0.5}
+        return {"tool_call": {"function_name": agent, "function_args": {"query": message}, "confidence": 0.9},
+                "general_response": None}
+
+
+class FakeAgentNodes:
+    def __init__(self):
+        self.prepared = {}
+        self.running = 0
+        self.max_running = 0
+
+    async def prepare_batch(self, agent_name, items):
+        self.prepared[agent_name] = [message for _, message in items]
+
+    async def execute_agent(self, agent_name, function_args, message):
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        await asyncio.sleep(PLAN[message][1])
+        self.running -= 1
+        return {"response": f"{message} 결과", "sources": [], "metadata": {"agent": agent_name}}
+
+
+def _router():
+    router = RouterAgent()
+    router.graph.tool_caller = FakeToolCaller()
+    router.graph.agent_nodes = FakeAgentNodes()
+    return router
+
+
+def test_batch_runs_concurrently_and_groups_by_agent():
+    router = _router()
+    messages = list(PLAN)
+
+    async def run():
+        order = [index async for index, _ in router.iter_batch_requests(messages, concurrency=2)]
+        max_running = router.graph.agent_nodes.max_running
+        return order, max_running, await router.route_batch_requests(messages)
+
+    order, max_running, results = asyncio.run(run())
+    nodes = router.graph.agent_nodes
+
+    assert nodes.prepared == {"db_agent": ["느린 문서 검색", "빠른 문서 검색"], "employee_agent": ["직원 연락처"]}
+    assert max_running == 2
+    assert order[-1] == 0  # 가장 느린 요청이 마지막에 완료
+    assert [result["response"] for result in results] == [
+        "느린 문서 검색 결과", "빠른 문서 검색 결과", "직원 연락처 결과", "무엇을 도와드릴까요?"
+    ]
+    assert [result["agent"] for result in results] == ["db_agent", "db_agent", "employee_agent", "general_chat"]
+
+
+def test_batch_endpoint_streams_ndjson(monkeypatch):
+    monkeypatch.setitem(api_router._router_agents, False, _router())
+    app = FastAPI()
+    app.include_router(api_router.router)
+    client = TestClient(app)
+
+    response = client.post("/chat/batch", json={"messages": list(PLAN)})
+    lines = [json.loads(line) for line in response.text.strip().splitlines()]
+
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert sorted(line["index"] for line in lines[:-1]) == [0, 1, 2, 3]
+    assert lines[-1]["done"] is True and lines[-1]["total"] == 4 and lines[-1]["errors"] == 0
+    assert next(line for line in lines if line["index"] == 2)["agent"] == "employee_agent"
+
+    assert client.post("/chat/batch", json={"messages": []}).status_code == 400
@@ -0,0 +1,139 @@
+"""
+OpenAI 회로 차단기(circuit_breaker) 테스트
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+from app.core.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpen, llm_breaker
+from app.core.config import settings
+from app.services.agents.docs_agent.docs_agent import DocsAgent
+from app.services.router_agent.router_agent_tool import RouterAgentTool
+
+
+@pytest.fixture
+def breaker_settings(monkeypatch):
+    values = {"llm_breaker_enabled": True, "llm_breaker_window": 10, "llm_breaker_window_seconds": 60.0,
+              "llm_breaker_min_calls": 3, "llm_breaker_failure_rate": 0.5, "llm_breaker_slow_call_ms": 50.0,
+              "llm_breaker_slow_rate": 0.8, "llm_breaker_open_seconds": 0.2, "llm_breaker_half_open_probes": 1}
+    for name, value in values.items():
+        monkeypatch.setattr(settings, name, value, raising=False)
+    llm_breaker.reset()
+    yield
+    llm_breaker.reset()
+
+
+def _fail():
+    raise TimeoutError("OpenAI timeout")
+
+
+def test_opens_on_errors_and_recovers_through_probe(breaker_settings):
+    breaker = CircuitBreaker("test")
+    for _ in range(3):
+        with pytest.raises(TimeoutError):
+            breaker.call(_fail)
+    assert breaker.state == OPEN and not breaker.available()
+
+    calls = []
+    with pytest.raises(CircuitOpen):
+        breaker.call(calls.append, "skipped")
+    assert calls == [] and breaker.stats()["short_circuited"] == 1
+
+    # 반개방 탐색 호출 실패 → 다시 차단
+    time.sleep(0.21)
+    assert breaker.available()
+    with pytest.raises(TimeoutError):
+        breaker.call(_fail)
+    assert breaker.state == OPEN
+
+    # 탐색 호출 성공 → 복구
+    time.sleep(0.21)
+    assert breaker.call(lambda: "ok") == "ok"
+    assert breaker.state == CLOSED and breaker.stats()["opened"] == 2
+
+
+def test_opens_on_slow_calls(breaker_settings):
+    breaker = CircuitBreaker("test")
+    for _ in range(3):
+        breaker.call(time.sleep, 0.06)
+    assert breaker.state == OPEN and breaker.stats()["slow_calls"] == 3
+
+
+class FlakyCompletions:
+    def __init__(self):
+        self.calls = 0
+
+    def create(self, **request):
+        self.calls += 1
+        time.sleep(0.05)
+        raise TimeoutError("OpenAI timeout")
+
+
+def test_router_degrades_to_keyword_routing_instantly(breaker_settings):
+    tool = RouterAgentTool()
+    completions = FlakyCompletions()
+    tool.openai_client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+
+    async def run():
+        for _ in range(3):
+            await tool.call_tool("최수아 직원 연락처")
+        started = time.perf_counter()
+        result = await tool.call_tool("최수아 직원 연락처")
+        return result, time.perf_counter() - started
+
+    result, elapsed = asyncio.run(run())
+
+    assert completions.calls == 3 and llm_breaker.state == OPEN
+    assert elapsed < 0.02
+    assert result["tool_call"]["function_name"] == "employee_agent" and result["fallback_reason"]
+
+
+def test_docs_agent_uses_local_fallback_while_open(breaker_settings, monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "sqlite_db_path", str(tmp_path), raising=False)
+    for _ in range(3):
+        with pytest.raises(TimeoutError):
+            llm_breaker.call(_fail)
+    agent = DocsAgent()
+    completions = FlakyCompletions()
+    agent.openai_client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+
+    args = {"task_type": "regulation_violation", "regulation_category": "ethics"}
+    result = asyncio.run(agent.process(args, "거래처 접대비 한도 초과 검토"))
+
+    assert completions.calls == 0
+    assert "기본 위반 검토" in result["response"]
+    assert llm_breaker.stats()["short_circuited"] >= 1
+    assert llm_breaker.state in (OPEN, HALF_OPEN)
+
+
+def test_only_provider_failures_count(breaker_settings):
+    openai = pytest.importorskip("openai")
+    import httpx
+
+    def status_error(cls, status):
+        request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+        return cls("error", response=httpx.Response(status, request=request), body=None)
+
+    def raise_error(error):
+        raise error
+
+    breaker = CircuitBreaker("test")
+    # 잘못된 요청(4xx)이 반복돼도 차단하지 않음
+    for error in [status_error(openai.BadRequestError, 400), ValueError("bad prompt")] * 3:
+        with pytest.raises(type(error)):
+            breaker.call(raise_error, error)
+    assert breaker.state == CLOSED and breaker.stats()["failures"] == 0 and breaker.stats()["window_calls"] == 0
+
+    # 429/5xx는 제공자 장애로 집계
+    for error in [status_error(openai.RateLimitError, 429), status_error(openai.InternalServerError, 503),
+                  openai.APITimeoutError(httpx.Request("POST", "https://api.openai.com/v1/chat/completions"))]:
+        with pytest.raises(type(error)):
+            breaker.call(raise_error, error)
+    assert breaker.state == OPEN and breaker.stats()["failures"] == 3
@@ -0,0 +1,126 @@
+"""
+ClientAgent 종합 분석 동시 실행 테스트
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+from app.core.config import settings
+from app.services.agents.client_agent.client_agent import ClientAgent
+
+
+def test_comprehensive_analysis_runs_branches_concurrently():
+    agent = ClientAgent()
+    # 분석 엔진 구축(Excel 적재)은 측정 구간에서 제외
+    agent.database_service.get_analytics_engine()
+    delay = 0.2
+
+    def slow(method):
+        async def wrapper(*args, **kwargs):
+            await asyncio.sleep(delay)
+            return await method(*args, **kwargs)
+        return wrapper
+
+    for name in ("_analyze_client_profile", "_analyze_sales", "_analyze_risks", "_analyze_opportunities"):
+        setattr(agent, name, slow(getattr(agent, name)))
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        result = await agent.process({"analysis_type": "comprehensive"}, "종합 분석")
+        return result, loop.time() - started
+
+    result, elapsed = asyncio.run(run())
+
+    timings = result["metadata"]["branch_timings"]
+    assert set(timings) == {"profile", "sales", "risks", "opportunities"}
+    assert all(t["status"] == "ok" for t in timings.values())
+    # 순차 실행이면 4 * delay 이상 소요
+    assert elapsed < delay * 3
+
+
+def test_comprehensive_analysis_returns_partial_results_on_timeout(monkeypatch):
+    monkeypatch.setattr(settings, "client_analysis_branch_timeout", 0.1, raising=False)
+    agent = ClientAgent()
+
+    async def hang(*args, **kwargs):
+        await asyncio.sleep(10)
+
+    agent._analyze_risks = hang
+
+    result = asyncio.run(agent.process({"analysis_type": "comprehensive"}, "종합 분석"))
+
+    metadata = result["metadata"]
+    assert metadata["failed_branches"] == ["risks"]
+    assert metadata["partial"] is True
+    assert metadata["branch_timings"]["risks"]["status"] == "timeout"
+    assert "risks" in result["response"]
+
+
+def test_comprehensive_analysis_loads_engine_once(monkeypatch):
+    agent = ClientAgent()
+    calls = []
+    original = agent.database_service.get_analytics_engine
+
+    def counting_load():
+        calls.append(1)
+        return original()
+
+    monkeypatch.setattr(agent.database_service, "get_analytics_engine", counting_load)
+
+    result = asyncio.run(agent.process({"analysis_type": "comprehensive"}, "종합 분석"))
+
+    assert len(calls) == 1
+    assert result["metadata"]["failed_branches"] == []
+
+
+def test_empty_branch_is_completed_not_failed():
+    agent = ClientAgent()
+
+    async def no_data(*args, **kwargs):
+        return {"data": [], "sources": []}
+
+    agent._analyze_opportunities = no_data
+
+    result = asyncio.run(agent.process({"analysis_type": "comprehensive"}, "종합 분석"))
+
+    metadata = result["metadata"]
+    assert metadata["branch_timings"]["opportunities"]["status"] == "empty"
+    assert metadata["failed_branches"] == [] and metadata["partial"] is False
+    assert "완료되지 않아" not in result["response"]
+
+
+def test_branch_that_raises_is_reported_as_failed(monkeypatch):
+    agent = ClientAgent()
+
+    def broken_profile(*args, **kwargs):
+        raise RuntimeError("프로필 집계 오류")
+
+    # 분석 함수 내부에서 발생한 예외는 데이터 없음(empty)이 아닌 실패로 보고
+    engine = agent.database_service.get_analytics_engine()
+    monkeypatch.setattr(engine, "profile", broken_profile)
+
+    result = asyncio.run(agent.process({"analysis_type": "comprehensive"}, "종합 분석"))
+
+    metadata = result["metadata"]
+    assert metadata["branch_timings"]["profile"]["status"] == "error"
+    assert metadata["failed_branches"] == ["profile"] and metadata["partial"] is True
+    assert "profile" in result["response"]
+
+
+def test_engine_load_failure_fails_engine_branches(monkeypatch):
+    agent = ClientAgent()
+
+    def broken_load():
+        raise OSError("실적자료 읽기 실패")
+
+    monkeypatch.setattr(agent.database_service, "get_analytics_engine", broken_load)
+
+    result = asyncio.run(agent.process({"analysis_type": "comprehensive"}, "종합 분석"))
+
+    metadata = result["metadata"]
+    assert metadata["failed_branches"] == ["profile", "sales", "risks"]
+    assert metadata["partial"] is True
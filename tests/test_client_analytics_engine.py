@@ -0,0 +1,76 @@
+"""
+거래처 분석 엔진(ClientAnalyticsEngine) 테스트
+"""
+
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+from app.services.agents.client_agent.analytics_engine import ClientAnalyticsEngine
+
+
+def _engine():
+    monthly = pd.DataFrame({
+        "거래처ID": ["가나의원(강서구)"] * 3 + ["다라약국(동작구)"] * 2,
+        "월": [202401, 202402, 202403, 202402, 202403],
+        "월누적금액": [100, 200, 300, 50, 0],
+        "월방문횟수": [1, 2, 3, 1, 1],
+        "월사용금액": [10, 20, 30, 5, 0],
+        "총환자수": [500, 500, 500, 80, 80],
+    })
+    transactions = pd.DataFrame({
+        "담당자": ["홍길동"] * 4 + ["김영희"] * 2,
+        "거래처ID": ["가나의원(강서구)"] * 4 + ["마바내과(금천구)"] * 2,
+        "품목": ["A정", "B정", "A정", "A정", "C정", "C정"],
+        "월": [202401, 202401, 202402, 202402, 202401, 202402],
+        "금액": [60.0, 40.0, 150.0, 50.0, 7.0, 9.0],
+    })
+    return ClientAnalyticsEngine(monthly, transactions)
+
+
+def test_cube_aggregates_duplicate_cells_and_merges_sources():
+    engine = _engine()
+
+    # 거래처정보에 없는 거래처는 품목 실적 합계를 매출로 사용
+    assert engine.clients == ["가나의원(강서구)", "다라약국(동작구)", "마바내과(금천구)"]
+    assert engine.sales("마바내과")["monthly_sales"] == {"2024-01": 7.0, "2024-02": 16.0 - 7.0}
+
+    rows = engine.transactions("가나의원", (202402, 202402))
+    assert rows == [{"date": "2024-02-01", "amount": 200.0, "product": "A정", "client": "가나의원(강서구)"}]
+
+
+def test_period_filter_and_all_clients_totals():
+    engine = _engine()
+
+    sales = engine.sales("가나의원", (202402, 202403))
+    assert sales["monthly_sales"] == {"2024-02": 200.0, "2024-03": 300.0}
+    assert sales["total_sales"] == 500.0
+
+    trend = engine.trend(None)
+    assert trend["월별"] == ["2024-01", "2024-02", "2024-03"]
+    assert trend["매출액"] == [107.0, 259.0, 300.0]
+
+
+def test_profile_and_risk():
+    engine = _engine()
+
+    profile = engine.profile("가나의원")
+    assert profile["manager"] == "홍길동"
+    assert profile["top_products"][0] == {"product": "A정", "amount": 260.0}
+    assert profile["status"] == "활성"
+    # 최신 월 행은 있지만 매출이 0이면 요약과 같은 기준으로 비활성
+    assert engine.profile("다라약국")["status"] == "비활성"
+    assert engine.profile("없는거래처") == {}
+
+    summary = engine.profile(None)
+    assert summary["total_clients"] == 3
+    # 최신 월(202403) 매출이 있는 거래처만 활성
+    assert summary["active_clients"] == 1
+    assert summary["active_clients"] == sum(engine.profile(c)["status"] == "활성" for c in engine.clients)
+
+    risk = engine.risk("가나의원")
+    assert risk["transaction_volume"] == {"current_month": 300.0, "previous_month": 200.0}
+    assert risk["product_concentration"] == 260.0 / 300.0
@@ -0,0 +1,94 @@
+"""
+거래처 등급 분류(ClientGradingEngine) 테스트
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+from app.core.config import settings
+from app.services.agents.client_agent.analytics_engine import ClientAnalyticsEngine
+from app.services.agents.client_agent.client_agent import ClientAgent
+from app.services.agents.client_agent.grading_engine import (
+    ClientGradingEngine, assign_grades, compute_grade_table
+)
+
+CUTOFFS = {"S": 90.0, "A": 70.0, "B": 40.0, "C": 15.0, "D": 0.0}
+
+
+def _monthly(months):
+    rows = []
+    for client, amounts in {
+        "가나의원": [100, 110, 120, 130, 140, 150],
+        "다라약국": [100, 100, 100, 100, 100, 100],
+        "마바내과": [300, 300, 300, 50, 40, 0],
+        "사아의원": [0, 0, 0, 0, 0, 0],
+    }.items():
+        for month, amount in zip(months, amounts):
+            rows.append({"거래처ID": client, "월": month, "월누적금액": amount,
+                         "월방문횟수": 1, "월사용금액": 0, "총환자수": 10})
+    return pd.DataFrame(rows)
+
+
+MONTHS = [202401, 202402, 202403, 202404, 202405, 202406]
+
+
+def test_assign_grades_uses_cutoffs():
+    grades = assign_grades(np.array([95.0, 70.0, 69.9, 10.0]), CUTOFFS)
+    assert list(grades) == ["S", "A", "B", "D"]
+
+
+def test_grade_table_scores_all_clients_at_once():
+    engine = ClientAnalyticsEngine(_monthly(MONTHS))
+    table = compute_grade_table(engine.monthly_matrix(), engine.clients, len(MONTHS) - 1, CUTOFFS).set_index("client_id")
+
+    assert table.loc["마바내과", "recency"] == 1
+    assert table.loc["가나의원", "frequency"] == 6
+    assert table.loc["마바내과", "growth_rate"] < 0 < table.loc["가나의원", "growth_rate"]
+    # 거래가 없는 거래처는 최하 등급
+    assert table.loc["사아의원", "grade"] == "D"
+    assert table.loc["가나의원", "score"] > table.loc["마바내과", "score"]
+
+
+def test_incremental_refresh_and_grade_changes(tmp_path):
+    grading = ClientGradingEngine(tmp_path / "grades.db", CUTOFFS)
+    engine = ClientAnalyticsEngine(_monthly(MONTHS[:5]))
+
+    assert grading.refresh(engine) == MONTHS[:5]
+    # 변경 없음: 최신 기준월만 다시 계산
+    assert grading.refresh(engine) == [MONTHS[4]]
+
+    # 새 월 데이터 도착: 새 기준월과 최신 기준월만 계산
+    engine = ClientAnalyticsEngine(_monthly(MONTHS))
+    assert grading.refresh(engine) == [MONTHS[5]]
+    assert grading.stored_months() == MONTHS
+
+    # 마바내과: 202405 A → 202406 B
+    assert [row["client_id"] for row in grading.grade_changes("down")] == ["마바내과"]
+    assert grading.client_grade("마바내과")["grade"] == "B"
+
+    # 엔진 최신 월(202407)의 등급표가 아직 저장되지 않았으면 이전 월끼리 비교하지 않음
+    grading.latest_month, grading.months = 202407, MONTHS + [202407]
+    assert grading.grade_changes("down") == []
+    grading.latest_month, grading.months = engine.latest_month, list(engine.months)
+
+    # 다른 인스턴스(다른 워커)도 저장된 등급표를 그대로 조회
+    reopened = ClientGradingEngine(tmp_path / "grades.db", CUTOFFS)
+    assert reopened.distribution() == grading.distribution()
+
+
+def test_agent_answers_grade_questions(monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "sqlite_db_path", str(tmp_path), raising=False)
+    agent = ClientAgent()
+
+    result = asyncio.run(agent.process({"analysis_type": "grade"}, "A등급 거래처 목록"))
+    assert "A등급 거래처" in result["response"]
+    assert result["metadata"]["data_points"] > 0
+
+    result = asyncio.run(agent.process({"analysis_type": "grade"}, "등급 하락 거래처 알려줘"))
+    assert "등급 하락" in result["response"]
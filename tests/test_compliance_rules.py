@@ -0,0 +1,65 @@
+"""
+컴플라이언스 규칙 엔진(compliance_rules) 테스트
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+from app.services.agents.docs_agent.compliance_rules import get_rule_engine, parse_amounts
+from app.services.agents.docs_agent.docs_agent import DocsAgent
+
+DOCS_DIR = Path(__file__).parent.parent / "database" / "relationdb" / "외부자료"
+
+
+def _statuses(result):
+    return {finding["rule_id"]: finding["status"] for finding in result["findings"]}
+
+
+def test_limits_are_compiled_from_documents():
+    engine = get_rule_engine(DOCS_DIR)
+
+    assert engine.rules["entertainment"]["limit_values"] == {"per_person": 100_000}
+    assert engine.rules["lecture_fee"]["limit_values"] == {"per_case": 500_000, "per_day": 1_000_000, "annual": 3_000_000}
+    assert engine.rules["visit"]["monthly_limit"] == 4
+    assert "1인당 10만원" in engine.rules["entertainment"]["clause"]
+    assert [amount for amount, _, _ in parse_amounts("식대 150,000원, 기념품 1.5만 원")] == [150_000, 15_000]
+
+
+def test_scan_decisions():
+    engine = get_rule_engine(DOCS_DIR)
+
+    result = engine.scan("거래처 원장님 접대비 45만원 (3명)")
+    assert result["status"] == "violation" and result["risk_level"] == "높음"
+    assert result["findings"][0]["amount"] == 150_000 and result["findings"][0]["limit"] == 100_000
+
+    assert _statuses(engine.scan("제품설명회 식음료 1인당 8만원, 기념품 3만원")) == {"briefing": "clear"}
+    assert _statuses(engine.scan("제품설명회 식음료 1인당 8만원, 기념품 7만원")) == {"briefing": "violation"}
+    assert _statuses(engine.scan("접대비 50만원")) == {"entertainment": "ambiguous"}
+    assert _statuses(engine.scan("학회 참가 원장님 배우자 항공권 지원"))["companion_travel"] == "violation"
+    assert _statuses(engine.scan("이 약은 부작용이 없습니다")) == {"exaggerated_ad": "violation"}
+    # 카테고리 필터: 재무 규정만 검토하면 광고 규칙은 제외
+    assert engine.scan("이 약은 부작용이 없습니다", category="finance")["findings"] == []
+    assert engine.scan("신규 채용 절차 검토")["status"] == "clear"
+
+
+def test_compliance_check_skips_llm_for_clear_cut_cases():
+    class RecordingClient:
+        calls = 0
+
+        @property
+        def chat(self):
+            RecordingClient.calls += 1
+            raise AssertionError("LLM should not be called")
+
+    agent = DocsAgent()
+    agent.openai_client = RecordingClient()
+    content = "거래처 원장님 접대비 45만원 (3명)"
+
+    result = asyncio.run(agent.process({"task_type": "compliance_check", "content": content}, content))
+    assert RecordingClient.calls == 0
+    assert result["metadata"]["mode"] == "rule_engine" and result["metadata"]["risk_level"] == "높음"
+    assert result["sources"][0]["source"] == "컴플라이언스 규정 총정리.docx"
+    assert "향응 (접대)" in result["response"]
@@ -0,0 +1,104 @@
+"""
+대화 맥락 압축(context_compactor) 테스트
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+from app.core.config import settings
+from app.core.context_compactor import ContextCompactor, context_compactor, count_tokens, truncate_tokens
+from app.services.router_agent.router_agent import RouterAgent
+
+
+def _settings(monkeypatch, **overrides):
+    values = {"context_compaction_enabled": True, "context_budget_tokens": 200, "context_recent_turns": 2,
+              "context_summary_every": 3, "context_summary_max_tokens": 60}
+    values.update(overrides)
+    for name, value in values.items():
+        monkeypatch.setattr(settings, name, value, raising=False)
+
+
+def test_truncate_tokens_respects_budget():
+    text = "최수아 담당 거래처 매출 추이를 분기별로 알려주세요. " * 20
+    assert count_tokens(truncate_tokens(text, 30)) <= 30
+    assert truncate_tokens(text, 30, keep="start").startswith("최수아")
+    assert truncate_tokens("짧은 문장", 30) == "짧은 문장"
+
+
+def test_running_summary_keeps_prompt_size_constant(monkeypatch):
+    _settings(monkeypatch)
+    calls = []
+
+    def summarizer(previous, turns):
+        calls.append((previous, [user_message for user_message, _ in turns]))
+        return (previous + " " if previous else "") + ", ".join(user_message for user_message, _ in turns)
+
+    compactor = ContextCompactor(summarizer=summarizer)
+
+    async def converse():
+        sizes = []
+        for turn in range(30):
+            compactor.add_turn("s1", f"질문 {turn}", f"답변 {turn} " + "상세 설명 " * 40)
+            await asyncio.gather(*list(compactor._tasks))
+            sizes.append(compactor.build_context("s1")[1])
+        return sizes
+
+    sizes = asyncio.run(converse())
+
+    assert max(sizes) <= 200 and max(sizes[10:]) - min(sizes[10:]) < 40
+    # 요약은 매번 새로 요약할 턴만 받아 이전 요약에 덧붙임 (증분 갱신)
+    assert calls[0] == ("", ["질문 0", "질문 1", "질문 2"])
+    assert calls[1][0] and calls[1][1] == ["질문 3", "질문 4", "질문 5"]
+    snapshot = compactor.snapshot("s1")
+    assert snapshot["pending_turns"] < 2 + 3 and snapshot["summarized_turns"] + snapshot["pending_turns"] == 30
+
+    messages, _ = compactor.build_context("s1")
+    assert messages[0]["role"] == "system" and messages[0]["content"].startswith("이전 대화 요약")
+    assert messages[-2:] == [
+        {"role": "user", "content": "질문 29"},
+        {"role": "assistant", "content": messages[-1]["content"]},
+    ] and messages[-1]["content"].startswith("답변 29")
+
+
+class RecordingToolCaller:
+    def __init__(self):
+        self.contexts = []
+
+    async def call_tool(self, message, context=None):
+        self.contexts.append(context)
+        return {"tool_call": None, "general_response": f"{message}에 대한 답변", "confidence": 0.5}
+
+
+def test_router_passes_previous_turns_to_routing(monkeypatch):
+    _settings(monkeypatch, speculative_prefetch_enabled=False)
+    context_compactor.reset()
+    router = RouterAgent()
+    router.graph.tool_caller = RecordingToolCaller()
+
+    async def run():
+        await router.route_request("최수아 직원 정보 알려줘", session_id="s-ctx")
+        return await router.route_request("그 사람 담당 거래처는?", session_id="s-ctx")
+
+    result = asyncio.run(run())
+    first, second = router.graph.tool_caller.contexts
+
+    assert first is None
+    assert second[0] == {"role": "user", "content": "최수아 직원 정보 알려줘"}
+    assert result["metadata"]["context_tokens"] == count_tokens(second[0]["content"]) + count_tokens(
+        second[1]["content"])
+    context_compactor.reset()
+
+
+def test_summary_client_uses_request_timeout(monkeypatch):
+    pytest.importorskip("openai")
+    monkeypatch.setattr(settings, "openai_api_key", "test-key", raising=False)
+    monkeypatch.setattr(settings, "openai_timeout", 7.5, raising=False)
+
+    client = ContextCompactor()._get_openai_client()
+
+    assert client.timeout == 7.5
@@ -0,0 +1,104 @@
+"""
+문서양식 라이브러리(template_library) 테스트
+"""
+
+import asyncio
+import json
+import sys
+from datetime import date
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+from app.core.config import settings
+from app.services.agents.docs_agent.docs_agent import DocsAgent
+from app.services.agents.docs_agent.template_library import (
+    TemplateLibrary, fill_template, free_text_blocks, get_template_library, parse_template
+)
+
+FORM_DIR = Path(__file__).parent.parent / "database" / "raw_data" / "문서양식"
+
+# .doc 양식과 같은 표기: "\r" 단락 끝, "\x07" 셀 끝, 하이퍼링크 필드 안의 제목
+WEEKLY_FORM = (
+    '\x13HYPERLINK "http://example.com"\x01\x14주간영업보고서\x15\x07담  당\x07\x07\x07y\r'
+    "기    간\x0720  년  월  일 ~ 20  년  월  일\x07\x07목    표\x07\x07소    속\x07\x07보 고 자\x07\x07\x07"
+    "실    적\x07\x07\x07요일\x07방 문 처\x07주요 활동내용 및 결과\x07\x07월\x07\x07\x07\x07화\x07\x07\x07\x07"
+    "■ 특별사항\x07\x07\x07\x07위와 같이 주간 영업결과를 보고합니다.\r\r20  년  월  일\r\r보 고 자 :          (인)\x07\x07\r"
+)
+
+
+def test_parse_template_structure():
+    template = parse_template(WEEKLY_FORM, "주간영업 보고서")
+    kinds = {block.get("key", block["kind"]): block for block in template["blocks"]}
+
+    assert template["title"] == "주간영업보고서"
+    assert template["fields"] == ["기간", "목표", "소속", "보고자", "실적"]
+    assert kinds["기간"]["value_type"] == "period"
+    assert [block["key"] for block in free_text_blocks(template)] == ["특별사항"]
+    table = next(block for block in template["blocks"] if block["kind"] == "table")
+    assert table["columns"] == ["요일", "방 문 처", "주요 활동내용 및 결과"] and table["rows"] == ["월", "화"]
+    assert "작성일" in kinds and "보고자" in {b["key"] for b in template["blocks"] if b["kind"] == "signature"}
+
+
+def test_fill_template_is_deterministic():
+    template = parse_template(WEEKLY_FORM, "주간영업 보고서")
+    values = {"name": "홍길동", "department": "서부팀", "target": "1,000", "actual": "900"}
+
+    result = fill_template(template, values, {"특별사항": "신규 거래처 2곳 방문"}, today=date(2024, 11, 6))
+    assert result == fill_template(template, values, {"특별사항": "신규 거래처 2곳 방문"}, today=date(2024, 11, 6))
+    assert "• 기 간: 2024-11-04 ~ 2024-11-10" in result["document"]
+    assert "• 보 고 자: 홍길동" in result["document"]
+    assert "보 고 자: 홍길동 (인)" in result["document"]
+    assert "2024년 11월 6일" in result["document"]
+    assert result["missing"] == []
+
+
+def test_library_parses_forms_once(tmp_path):
+    library = TemplateLibrary(FORM_DIR, tmp_path / "document_templates.json")
+    templates = library.templates()
+
+    assert len(templates) == 15
+    assert library.match("최수아 주간영업 보고서 작성")["name"] == "주간영업 보고서"
+    assert library.get("판매실적보고서")["title"] == "판매실적보고서(취급의약품)"
+    # 다른 인스턴스는 JSON 캐시에서 복원
+    assert TemplateLibrary(FORM_DIR, tmp_path / "document_templates.json")._read_cache(library._source_key()) == templates
+
+
+def test_docs_agent_fills_form_from_employee_data(monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "sqlite_db_path", str(tmp_path), raising=False)
+    agent = DocsAgent()
+    agent.openai_client = None
+
+    result = asyncio.run(agent.process({"task_type": "generate_document"}, "최수아 주간영업 보고서 작성해줘"))
+    metadata = result["metadata"]
+    assert metadata["mode"] == "template" and metadata["template_name"] == "주간영업 보고서"
+    assert metadata["employee"] == "최수아"
+    assert {"소속", "보고자", "목표", "실적", "누적실적"} <= set(metadata["filled_fields"])
+    assert "• 소 속: 서부팀" in result["response"]
+
+
+def test_llm_sections_counts_only_llm_filled_blocks(monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "sqlite_db_path", str(tmp_path), raising=False)
+    agent = DocsAgent()
+    answers = []
+
+    class Completions:
+        def create(self, **request):
+            if not answers:
+                raise RuntimeError("LLM 호출 실패")
+            message = SimpleNamespace(content=answers[0])
+            return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=None)
+
+    agent.openai_client = SimpleNamespace(chat=SimpleNamespace(completions=Completions()))
+    message = "최수아 주간영업 보고서 작성해줘"
+
+    # LLM 실패 시 템플릿 문구만 사용 → LLM 작성 섹션 없음
+    failed = asyncio.run(agent.process({"task_type": "generate_document"}, message))
+    assert failed["metadata"]["llm_sections"] == 0
+
+    # 서술형 항목 중 하나만 채운 응답
+    blocks = free_text_blocks(get_template_library().match(message))
+    answers.append(json.dumps({blocks[-1]["key"]: "거래처 방문 결과 요약"}, ensure_ascii=False))
+    filled = asyncio.run(agent.process({"task_type": "generate_document"}, message))
+    assert filled["metadata"]["llm_sections"] == 1
@@ -0,0 +1,47 @@
+"""
+직원 이름 인덱스(NameIndex) 테스트
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+from app.services.agents.employee_agent import EmployeeAgent
+from app.services.agents.employee_agent.name_index import NameIndex, decompose, edit_distance, initials
+
+NAMES = ["최수아", "최서연", "조수아", "정은우", "김지우", "최수아"]
+
+
+def _index():
+    return NameIndex(enumerate(NAMES))
+
+
+def test_jamo_helpers():
+    assert decompose("최수아") == "ㅊㅚㅅㅜㅇㅏ"
+    assert initials("최수아") == "ㅊㅅㅇ"
+    assert edit_distance(decompose("최수아"), decompose("최수사")) == 1
+    assert edit_distance("abcdef", "uvwxyz", limit=2) == 3
+
+
+def test_search_variants():
+    index = _index()
+
+    # 동명이인은 같은 이름에 모든 레코드 키
+    assert index.search("최수아") == [{"name": "최수아", "keys": [0, 5], "score": 1.0, "match_type": "exact"}]
+    # 문장 속 이름은 정확 일치만 사용
+    assert [m["name"] for m in index.search("최수아 연락처 알려줘")] == ["최수아"]
+
+    assert [m["name"] for m in index.search("ㅊㅅㅇ")] == ["최서연", "최수아"]
+    assert [m["name"] for m in index.search("ㅊㅅ")] == ["최서연", "최수아"]
+    assert index.search("최수사")[0]["name"] == "최수아"
+    assert index.search("Choi Sua")[0]["name"] == "최수아"
+    assert index.search("sua choi")[0]["name"] == "최수아"
+    assert index.search("연락처 알려줘") == []
+
+
+def test_agent_uses_name_index():
+    result = asyncio.run(EmployeeAgent().process({"search_type": "name", "search_value": "ㅊㅅㅇ"}, "ㅊㅅㅇ 연락처"))
+    assert "최수아" in result["response"]
+    assert all(source["match_type"] == "name_initials" for source in result["sources"])
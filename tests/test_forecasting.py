@@ -0,0 +1,65 @@
+"""
+시계열 일괄 예측(app.services.analytics.forecasting) 테스트
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+from app.services.analytics.forecasting import _linear, fit_forecasts, summarize_models
+
+
+def test_selects_best_model_per_series():
+    t = np.arange(24, dtype=float)
+    values = np.stack([
+        100 + 10 * t,                                   # 선형 추세
+        np.tile([10.0, 50, 90, 50], 6),                 # 주기 4 계절성
+        np.full(24, 70.0),                              # 일정
+    ])
+    result = fit_forecasts(values, keys=["linear", "seasonal", "flat"], season_length=4)
+
+    linear = result.get("linear")
+    assert linear["model"] == "linear"
+    assert linear["forecast"] == 340.0
+    assert linear["trend"] == "increasing"
+
+    seasonal = result.get("seasonal")
+    assert seasonal["model"] == "seasonal_naive"
+    assert seasonal["forecast"] == 10.0
+    assert seasonal["lower"] == seasonal["upper"] == 10.0
+
+    assert result.get("flat")["forecast"] == 70.0
+    assert result.get("flat")["trend"] == "stable"
+    assert result.get("missing") is None
+
+
+def test_intervals_contain_forecast_and_are_non_negative():
+    rng = np.random.default_rng(0)
+    values = rng.gamma(2.0, 100.0, size=(500, 12))
+    values[::7] = 0.0
+    result = fit_forecasts(values)
+
+    assert len(result) == 500
+    assert (result.lower <= result.forecast).all()
+    assert (result.forecast <= result.upper).all()
+    assert (result.lower >= 0).all()
+    assert sum(summarize_models(result).values()) == 500
+
+
+def test_models_are_scored_on_one_step_errors():
+    rng = np.random.default_rng(1)
+    values = rng.normal(100, 10, size=(3, 10))
+    _, _, residuals = _linear(values)
+    # 선형 모형 잔차도 직전 값만으로 적합한 추세의 예측 오차
+    for k in range(2, 10):
+        for row in range(3):
+            coefficients = np.polyfit(np.arange(k), values[row, :k], 1)
+            assert abs(values[row, k] - np.polyval(coefficients, k) - residuals[row, k]) < 1e-8
+
+    # 무작위 행보는 적합 잔차로 비교하면 선형이 과다 선택되지만, 1-step 오차로는 지수 평활이 우세
+    walks = 100 + np.cumsum(rng.normal(0, 10, size=(2000, 24)), axis=1)
+    counts = summarize_models(fit_forecasts(walks))
+    assert counts["exponential"] > counts["linear"]
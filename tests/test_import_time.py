@@ -0,0 +1,89 @@
+"""
+백엔드 import 시간 회귀 테스트
+
+`python -X importtime`으로 backend/main.py import 비용을 측정하고,
+무거운 의존성(chromadb, pandas, torch 등)이 import 시점에 로드되지 않는지 확인합니다.
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+backend_dir = Path(__file__).parent.parent / "backend"
+
+# main import 허용 시간 (마이크로초) - 환경변수로 조정 가능
+IMPORT_TIME_BUDGET_US = int(os.getenv("NARUTALK_IMPORT_BUDGET_US", "1500000"))
+
+# main import 시점에 로드되면 안 되는 모듈
+HEAVY_MODULES = [
+    "chromadb",
+    "pandas",
+    "torch",
+    "sentence_transformers",
+    "docx",
+    "langgraph",
+    "openai",
+]
+
+
+def _run_importtime():
+    """별도 프로세스에서 main을 import하고 importtime 결과와 로드된 모듈 목록 반환"""
+    code = (
+        "import sys, main\n"
+        f"heavy = {HEAVY_MODULES!r}\n"
+        "print(','.join(m for m in heavy if m in sys.modules))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=str(backend_dir),
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+    return result.stdout.strip(), result.stderr
+
+
+def _cumulative_us(importtime_output: str, module: str) -> int:
+    """importtime 출력에서 특정 모듈의 누적 import 시간 조회"""
+    for line in importtime_output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) == 3 and parts[2].strip() == module:
+            return int(parts[1])
+    raise AssertionError(f"importtime 결과에서 {module} 모듈을 찾을 수 없습니다.")
+
+
+def test_main_import_has_no_heavy_modules():
+    loaded, _ = _run_importtime()
+    assert loaded == "", f"main import 시 무거운 모듈이 로드됨: {loaded}"
+
+
+def test_main_import_time_within_budget():
+    _, importtime_output = _run_importtime()
+    cumulative = _cumulative_us(importtime_output, "main")
+    assert cumulative <= IMPORT_TIME_BUDGET_US, (
+        f"main import 시간 {cumulative / 1000:.0f}ms가 "
+        f"예산 {IMPORT_TIME_BUDGET_US / 1000:.0f}ms를 초과했습니다."
+    )
+
+
+def test_config_import_has_no_side_effects():
+    code = (
+        "import os\n"
+        "os.environ.pop('OPENAI_API_KEY', None)\n"
+        "import app.core.config as config\n"
+        "assert 'OPENAI_API_KEY' not in os.environ\n"
+        "assert config.get_settings.cache_info().currsize == 0\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=str(backend_dir),
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+    assert result.stdout == ""
@@ -0,0 +1,100 @@
+"""
+LLM 응답 캐시(llm_cache) 테스트
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+from app.core.config import settings
+from app.core.llm_cache import LLMCache, cached_completion, get_llm_cache
+from app.services.agents.docs_agent.docs_agent import DocsAgent
+
+
+class FakeCompletions:
+    def __init__(self):
+        self.calls = []
+
+    def create(self, **request):
+        self.calls.append(request)
+        message = SimpleNamespace(content=f"답변 {len(self.calls)}", tool_calls=None)
+        usage = SimpleNamespace(prompt_tokens=120, completion_tokens=30)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=usage)
+
+
+def _client():
+    completions = FakeCompletions()
+    return SimpleNamespace(chat=SimpleNamespace(completions=completions)), completions
+
+
+def _request(text, temperature=0.3):
+    return {"model": "gpt-4o", "messages": [{"role": "user", "content": text}], "temperature": temperature}
+
+
+def test_cached_completion_replays_and_counts_saved_tokens(monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "sqlite_db_path", str(tmp_path), raising=False)
+    client, completions = _client()
+
+    assert cached_completion(client, "compliance_check", "ethics", **_request("접대비 검토")) == ("답변 1", False)
+    assert cached_completion(client, "compliance_check", "ethics", **_request("접대비 검토")) == ("답변 1", True)
+    # 카테고리나 temperature가 다르면 다른 키
+    assert cached_completion(client, "compliance_check", "finance", **_request("접대비 검토"))[1] is False
+    assert cached_completion(client, "compliance_check", "ethics", **_request("접대비 검토", 0.5))[1] is False
+    assert len(completions.calls) == 3
+
+    stats = get_llm_cache().stats()["tasks"]["compliance_check"]
+    assert stats["hits"] == 1 and stats["misses"] == 3 and stats["hit_rate"] == 0.25
+    assert stats["saved_prompt_tokens"] == 120 and stats["saved_completion_tokens"] == 30
+
+    monkeypatch.setattr(settings, "llm_cache_skip_sampled", True, raising=False)
+    assert cached_completion(client, "compliance_check", "ethics", **_request("접대비 검토"))[1] is False
+    assert get_llm_cache().stats()["tasks"]["compliance_check"]["bypassed"] == 1
+
+
+def test_sampled_requests_bypass_cache_when_skipped(monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "sqlite_db_path", str(tmp_path), raising=False)
+    monkeypatch.setattr(settings, "llm_cache_skip_sampled", True, raising=False)
+    client, completions = _client()
+
+    # temperature > 0 요청은 조회/저장 없이 매번 LLM 호출
+    assert cached_completion(client, "generate_document", "report", **_request("주간 보고서", 0.7)) == ("답변 1", False)
+    assert cached_completion(client, "generate_document", "report", **_request("주간 보고서", 0.7)) == ("답변 2", False)
+    # temperature 0 요청은 계속 캐시 사용
+    assert cached_completion(client, "generate_document", "report", **_request("주간 보고서", 0))[1] is False
+    assert cached_completion(client, "generate_document", "report", **_request("주간 보고서", 0))[1] is True
+    assert len(completions.calls) == 3
+
+    cache = get_llm_cache()
+    stats = cache.stats()
+    assert stats["entries"] == 1
+    assert stats["tasks"]["generate_document"]["bypassed"] == 2
+    assert stats["tasks"]["generate_document"]["misses"] == 1 and stats["tasks"]["generate_document"]["hits"] == 1
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    cache = LLMCache(tmp_path / "llm_cache.db", max_entries=2)
+    cache.put("a", "t", "gpt-4o", "A")
+    cache.put("b", "t", "gpt-4o", "B")
+    assert cache.get("a", "t")["content"] == "A"
+    cache.put("c", "t", "gpt-4o", "C")
+
+    assert cache.get("b", "t") is None
+    assert cache.get("a", "t") is not None and cache.get("c", "t") is not None
+    assert cache.stats()["entries"] == 2
+
+
+def test_docs_agent_marks_cached_answers(monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "sqlite_db_path", str(tmp_path), raising=False)
+    agent = DocsAgent()
+    agent.openai_client, completions = _client()
+    args = {"task_type": "regulation_violation", "regulation_category": "ethics"}
+
+    first = asyncio.run(agent.process(args, "신규 채용 절차 검토 요청"))
+    second = asyncio.run(agent.process(args, "신규 채용 절차 검토 요청"))
+
+    assert len(completions.calls) == 1
+    assert first["metadata"]["llm_cache"] == "miss" and second["metadata"]["llm_cache"] == "hit"
+    assert first["response"] == second["response"]
@@ -0,0 +1,99 @@
+"""
+복합 질문 병렬 멀티 Tool 실행 테스트
+"""
+
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.services.router_agent import api_router
+from app.services.router_agent.router_agent import RouterAgent
+
+TOOL_CALLS = [
+    {"function_name": "employee_agent", "function_args": {"search_type": "name", "search_value": "최수아"},
+     "confidence": 0.9},
+    {"function_name": "client_agent", "function_args": {"query": "최수아 담당 거래처 매출 추이"}, "confidence": 0.8},
+]
+
+
+class FakeToolCaller:
+    async def call_tool(self, message):
+        return {"tool_call": TOOL_CALLS[0], "tool_calls": TOOL_CALLS, "general_response": None}
+
+
+class FakeAgent:
+    def __init__(self, name, delay):
+        self.name = name
+        self.delay = delay
+        self.spans = []
+
+    async def process(self, args, original_message):
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        await asyncio.sleep(self.delay)
+        self.spans.append((started, loop.time()))
+        return {"response": f"{self.name} 결과", "sources": [{"title": f"{self.name} 자료"}],
+                "metadata": {"agent": self.name}}
+
+
+def _router(monkeypatch):
+    monkeypatch.setattr(settings, "speculative_prefetch_enabled", False, raising=False)
+    router = RouterAgent()
+    router.graph.tool_caller = FakeToolCaller()
+    agents = router.graph.agent_nodes.agent_instances
+    monkeypatch.setitem(agents, "employee_agent", FakeAgent("employee_agent", 0.2))
+    monkeypatch.setitem(agents, "client_agent", FakeAgent("client_agent", 0.1))
+    return router
+
+
+def test_agents_run_concurrently_and_compose_in_routing_order(monkeypatch):
+    router = _router(monkeypatch)
+
+    async def run():
+        return [event async for event in router.stream_request("최수아 담당 거래처 매출 추이")]
+
+    events = asyncio.run(run())
+
+    # 먼저 끝난 client_agent의 부분 결과가 먼저 도착하고 최종 결과는 마지막
+    assert [(event["type"], event.get("agent")) for event in events] == [
+        ("agent_result", "client_agent"), ("agent_result", "employee_agent"), ("final", None)
+    ]
+    result = events[-1]["result"]
+    assert result["agent"] == "multi_agent" and result["routing_confidence"] == 0.8
+    assert result["response"] == "[직원 정보]\nemployee_agent 결과\n\n[거래처 분석]\nclient_agent 결과"
+    assert [source["agent"] for source in result["sources"]] == ["employee_agent", "client_agent"]
+
+    metadata = result["metadata"]
+    assert metadata["agents"] == ["employee_agent", "client_agent"]
+    assert metadata["latency"]["parallel_ms"] > 0 and metadata["latency"]["sequential_estimate_ms"] > 0
+
+    # 두 Agent 실행 구간이 겹침 (각각 상대가 끝나기 전에 시작) - 벽시계 시간에 의존하지 않는 병렬 실행 확인
+    agents = router.graph.agent_nodes.agent_instances
+    (employee_start, employee_end), = agents["employee_agent"].spans
+    (client_start, client_end), = agents["client_agent"].spans
+    assert employee_start < client_end and client_start < employee_end
+
+
+def test_stream_endpoint_emits_partials_before_answer(monkeypatch):
+    monkeypatch.setitem(api_router._router_agents, False, _router(monkeypatch))
+    app = FastAPI()
+    app.include_router(api_router.router)
+
+    response = TestClient(app).post("/chat/stream", json={"message": "최수아 담당 거래처 매출 추이"})
+    events = [
+        json.loads(line[len("data: "):]) for line in response.text.splitlines()
+        if line.startswith("data: {")
+    ]
+    types = [event["type"] for event in events]
+
+    assert events[0]["agent"] == "multi_agent"
+    assert [event["agent"] for event in events if event["type"] == "agent_partial"] == ["client_agent", "employee_agent"]
+    assert types.index("agent_partial") < types.index("token") and types[-1] == "complete"
+    assert events[-1]["metadata"]["type"] == "multi_tool"
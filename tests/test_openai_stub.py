@@ -0,0 +1,120 @@
+"""
+OpenAI 호환 스텁 서버 / 녹화-재생 하네스 테스트
+"""
+
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+import httpx
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+sys.path.insert(0, str(Path(__file__).parent / "benchmarks"))
+
+from openai_stub import LatencyModel, StubConfig, StubServer, create_stub_app
+
+from app.core.circuit_breaker import llm_breaker
+from app.core.config import settings
+
+TOOLS = [
+    {
+        "type": "function",
+        "function": {
+            "name": "employee_agent",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "search_type": {"type": "string", "enum": ["name", "department"]},
+                    "search_value": {"type": "string"},
+                },
+                "required": ["search_type", "search_value"],
+            },
+        },
+    },
+    {"type": "function", "function": {"name": "client_agent", "parameters": {"type": "object", "properties": {}}}},
+]
+
+
+def _post(app, body, **kwargs):
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://stub") as client:
+            return await client.post("/v1/chat/completions", json=body, **kwargs)
+
+    return asyncio.run(run())
+
+
+def test_latency_model_is_seeded_and_shaped():
+    model = LatencyModel("lognormal", mean_ms=200, spread_ms=100, seed=7)
+    samples = [model.sample() for _ in range(2000)]
+    replay = LatencyModel("lognormal", mean_ms=200, spread_ms=100, seed=7)
+    assert [replay.sample() for _ in range(5)] == samples[:5]
+    assert 0.18 < sum(samples) / len(samples) < 0.22 and max(samples) > 0.4  # 평균 200ms, 긴 꼬리
+
+    uniform = LatencyModel("uniform", mean_ms=100, spread_ms=20)
+    assert all(0.08 <= uniform.sample() <= 0.12 for _ in range(100))
+    with pytest.raises(ValueError):
+        LatencyModel("pareto")
+
+
+def test_streaming_follows_token_rate():
+    app = create_stub_app(StubConfig(tokens_per_second=200, completion_tokens=20))
+    body = {"model": "gpt-4o", "stream": True, "stream_options": {"include_usage": True},
+            "messages": [{"role": "user", "content": "안녕하세요"}]}
+
+    started = time.perf_counter()
+    response = _post(app, body)
+    elapsed = time.perf_counter() - started
+
+    events = [line[6:] for line in response.text.splitlines() if line.startswith("data: ")]
+    assert events[-1] == "[DONE]"
+    chunks = [json.loads(event) for event in events[:-1]]
+    content = "".join(chunk["choices"][0]["delta"].get("content") or "" for chunk in chunks if chunk["choices"])
+    assert content.startswith("[모의 응답] 안녕하세요")
+    assert chunks[-2]["choices"][0]["finish_reason"] == "stop"
+    assert chunks[-1]["usage"]["completion_tokens"] == 20
+    assert elapsed >= 20 / 200  # 초당 200토큰으로 조각을 내보냄
+
+
+def test_router_tool_calls_through_stub_server(monkeypatch):
+    pytest.importorskip("openai")
+    pytest.importorskip("uvicorn")
+    from app.services.router_agent.router_agent_tool import RouterAgentTool
+
+    llm_breaker.reset()
+    with StubServer(create_stub_app()) as server:
+        monkeypatch.setattr(settings, "openai_api_key", "stub-key", raising=False)
+        monkeypatch.setattr(settings, "openai_base_url", server.base_url, raising=False)
+        tool = RouterAgentTool()
+        result = asyncio.run(tool.call_tool("영업부 직원 연락처와 거래처 매출 알려줘"))
+
+    assert "fallback_reason" not in result
+    names = [call["function_name"] for call in result["tool_calls"]]
+    assert names == ["employee_agent", "client_agent"]
+    assert result["tool_call"]["function_args"]["search_value"] == "영업부 직원 연락처와 거래처 매출 알려줘"
+
+
+def test_record_once_then_replay_offline(tmp_path):
+    cassette = tmp_path / "cassette.json"
+    upstream = create_stub_app(StubConfig(completion_tokens=5))
+    recorder = create_stub_app(
+        StubConfig(mode="record", cassette_path=str(cassette), upstream_url="http://upstream/v1"),
+        upstream_transport=httpx.ASGITransport(app=upstream),
+    )
+    body = {"model": "gpt-4o", "tools": TOOLS, "messages": [{"role": "user", "content": "인사팀 직원 알려줘"}]}
+
+    recorded = _post(recorder, body).json()
+    assert recorded["choices"][0]["message"]["tool_calls"][0]["function"]["name"] == "employee_agent"
+    _post(recorder, body)
+    assert upstream.state.stats["requests"] == 1  # 두 번째 요청은 카세트에서 응답
+
+    replayer = create_stub_app(StubConfig(mode="replay", cassette_path=str(cassette)))
+    assert _post(replayer, body).json() == recorded
+    streamed = _post(replayer, {**body, "stream": True}).text
+    assert '"name": "employee_agent"' in streamed and streamed.rstrip().endswith("data: [DONE]")
+
+    missing = _post(replayer, {**body, "messages": [{"role": "user", "content": "다른 질문"}]})
+    assert missing.status_code == 404 and missing.json()["error"]["code"] == "cassette_miss"
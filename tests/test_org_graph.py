@@ -0,0 +1,83 @@
+"""
+조직 그래프(OrgGraph) 테스트
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+from app.core.config import settings
+from app.services.agents.employee_agent import EmployeeAgent
+from app.services.agents.employee_agent.org_graph import OrgGraph, parse_org_chart
+
+DEPARTMENTS = [("대표이사", None), ("영업본부", "대표이사"), ("강남팀", "영업본부"), ("강북팀", "영업본부"), ("연구소", "대표이사")]
+
+
+def _graph():
+    employees = pd.DataFrame({
+        "사번": [1, 2, 3, 4, 5, 6],
+        "성명": ["홍길동", "김영희", "이철수", "박민수", "최본부", "정연구"],
+        "부서": ["강남팀", "강남팀", "강북팀", "강북팀", "영업본부", "연구소"],
+        "직급": ["사원", "부장", "과장", "대리", "팀장", "부장"],
+    })
+    performance = pd.DataFrame({
+        "지점": ["강남팀", "강남팀", "강북팀", "강북팀"],
+        "담당자": ["홍길동", "김영희", "이철수", "홍길동"],
+        "월": [202401, 202401, 202402, 202401],
+        "목표": [100.0, 200.0, 50.0, 999.0],
+        "실적": [90.0, 260.0, 40.0, 999.0],
+    })
+    return OrgGraph(DEPARTMENTS, employees, performance)
+
+
+def test_hierarchy_queries():
+    graph = _graph()
+
+    assert [m["성명"] for m in graph.members("영업본부")] == ["최본부", "김영희", "홍길동", "이철수", "박민수"]
+    assert graph.headcount("영업본부", recursive=False) == 1
+    assert graph.is_ancestor("영업본부", "강북팀") and not graph.is_ancestor("연구소", "강북팀")
+    assert graph.department_path("강남팀") == ["대표이사", "영업본부", "강남팀"]
+
+    # 부서원 → 부서장 → 상위 부서장
+    assert graph.manager(1)["성명"] == "김영희"
+    assert [p["성명"] for p in graph.reporting_chain(1)] == ["김영희", "최본부"]
+    assert graph.manager(5) is None
+    assert len(graph.subordinates(5)) == 4 and graph.subordinates(1) == []
+
+
+def test_rollup_and_cache_round_trip(tmp_path):
+    graph = _graph()
+
+    rollup = graph.rollup("영업본부")
+    # 인사 자료와 (부서, 이름)이 맞지 않는 실적 행은 제외
+    assert (rollup["target"], rollup["actual"]) == (350.0, 390.0)
+    assert graph.rollup("강남팀", [202401])["achievement_rate"] == round(350 / 300, 4)
+
+    source = [["좋은제약_인사자료.xlsx", 1.0]]
+    graph.save(tmp_path / "org_graph.json", source)
+    restored = OrgGraph.load(tmp_path / "org_graph.json", source)
+    assert restored.tree() == graph.tree()
+    assert restored.rollup("영업본부") == rollup
+    assert OrgGraph.load(tmp_path / "org_graph.json", [["좋은제약_인사자료.xlsx", 2.0]]) is None
+
+
+def test_agent_answers_org_questions(monkeypatch, tmp_path):
+    chart = Path(settings.project_root) / "database" / "raw_data" / "내부자료" / "좋은제약_인사도.docx"
+    parsed = {name: (parent, members) for name, parent, members in parse_org_chart(chart)}
+    assert parsed["서부팀"][0] == "영업부서" and parsed["영업부서"][0] == "총괄영업본부"
+    assert "최수아" in parsed["서부팀"][1]
+
+    monkeypatch.setattr(settings, "sqlite_db_path", str(tmp_path), raising=False)
+    agent = EmployeeAgent()
+
+    result = asyncio.run(agent.process({"search_type": "department", "search_value": "서부팀 전체 인원"}, ""))
+    assert "서부팀 전체 인원 6명" in result["response"]
+    assert "실적 롤업" in result["response"]
+    assert (tmp_path / "org_graph.json").exists()
+
+    result = asyncio.run(agent.process({"search_type": "manager", "search_value": "조시현"}, "조시현의 상사"))
+    assert "직속 상사: 정예준" in result["response"]
@@ -0,0 +1,78 @@
+"""
+프롬프트 접두부 배치 및 캐시 토큰 집계(prompt_cache) 테스트
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.core.prompt_cache import layout_messages, prompt_cache_stats, record_usage
+from app.services.agents.docs_agent.docs_agent import DocsAgent
+from app.services.router_agent import api_router
+
+
+class FakeCompletions:
+    def __init__(self):
+        self.calls = []
+
+    def create(self, **request):
+        self.calls.append(request)
+        # 두 번째 호출부터 고정 접두부가 캐시되었다고 가정
+        cached = 1024 if len(self.calls) > 1 else 0
+        usage = SimpleNamespace(prompt_tokens=1500, completion_tokens=200,
+                                prompt_tokens_details=SimpleNamespace(cached_tokens=cached))
+        message = SimpleNamespace(content=f"검토 결과 {len(self.calls)}", tool_calls=None)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=usage)
+
+
+def test_layout_puts_static_prefix_first():
+    history = [{"role": "user", "content": "이전 질문"}, {"role": "assistant", "content": "이전 답변"}]
+    messages = layout_messages("site", "고정 지시", "요청 본문", context="카테고리: 윤리", history=history)
+
+    assert messages[0] == {"role": "system", "content": "고정 지시"}
+    assert messages[1:3] == history
+    assert messages[-1] == {"role": "user", "content": "카테고리: 윤리\n\n요청 본문"}
+
+
+def test_docs_agent_system_prompt_is_static_across_categories(monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "sqlite_db_path", str(tmp_path), raising=False)
+    monkeypatch.setattr(settings, "llm_input_price_per_million", 2.0, raising=False)
+    monkeypatch.setattr(settings, "llm_cached_input_discount", 0.5, raising=False)
+    prompt_cache_stats.reset()
+    agent = DocsAgent()
+    completions = FakeCompletions()
+    agent.openai_client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+
+    for category in ("ethics", "hr", "finance"):
+        args = {"task_type": "regulation_violation", "regulation_category": category}
+        asyncio.run(agent.process(args, f"{category} 관련 검토 요청"))
+
+    systems = {call["messages"][0]["content"] for call in completions.calls}
+    assert len(completions.calls) == 3 and len(systems) == 1
+
+    site = prompt_cache_stats.report()["call_sites"]["regulation_violation"]
+    assert site["prefix_variants"] == 1 and site["calls"] == 3
+    assert site["cached_tokens"] == 2048 and site["uncached_tokens"] == 4500 - 2048
+    assert site["estimated_saved_usd"] == round(2048 * 0.5 * 2.0 / 1_000_000, 6)
+
+
+def test_prompt_cache_report_endpoint():
+    prompt_cache_stats.reset()
+    usage = SimpleNamespace(prompt_tokens=2000, completion_tokens=50,
+                            prompt_tokens_details=SimpleNamespace(cached_tokens=1536))
+    record_usage("router", SimpleNamespace(usage=usage))
+    record_usage("router", SimpleNamespace(usage=SimpleNamespace(prompt_tokens=2000, completion_tokens=50)))
+
+    app = FastAPI()
+    app.include_router(api_router.router)
+    report = TestClient(app).get("/prompt-cache").json()
+
+    assert report["call_sites"]["router"]["cache_ratio"] == round(1536 / 4000, 4)
+    assert report["total"]["calls"] == 2 and report["total"]["uncached_tokens"] == 4000 - 1536
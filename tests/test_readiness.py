@@ -0,0 +1,101 @@
+"""
+시작 워밍업 / 레디니스 체크 테스트
+"""
+
+import asyncio
+import sys
+import threading
+import time
+from pathlib import Path
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+import main
+from app.core.config import settings
+from app.services.agents.client_agent import client_agent
+from app.services.router_agent import router_agent_nodes
+from app.services.router_agent.router_agent_nodes import RouterAgentNodes
+
+
+def test_ready_returns_503_until_warm_up_finishes(monkeypatch):
+    monkeypatch.setattr(settings, "warmup_enabled", True, raising=False)
+    monkeypatch.setattr(settings, "anomaly_scan_enabled", False, raising=False)
+
+    async def run():
+        release = asyncio.Event()
+
+        async def slow_warm_up(self, max_workers=6):
+            await release.wait()
+            return {"agents": {}}
+
+        monkeypatch.setattr(RouterAgentNodes, "warm_up", slow_warm_up)
+        transport = httpx.ASGITransport(app=main.app)
+        async with main.lifespan(main.app), httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            warming = await client.get("/ready")
+            release.set()
+            for _ in range(100):
+                if main.app.state.ready:
+                    break
+                await asyncio.sleep(0.01)
+            ready = await client.get("/ready")
+        return warming, ready
+
+    warming, ready = asyncio.run(run())
+    assert warming.status_code == 503 and warming.json()["status"] == "warming_up"
+    assert ready.status_code == 200 and ready.json()["warm_up"] == {"agents": {}}
+
+
+def test_concurrent_first_get_agent_builds_one_instance(monkeypatch):
+    constructed = []
+    lock = threading.Lock()
+
+    class SlowClientAgent:
+        def __init__(self):
+            time.sleep(0.05)  # 생성 중 다른 요청이 들어오도록 지연
+            with lock:
+                constructed.append(self)
+
+    monkeypatch.setattr(client_agent, "ClientAgent", SlowClientAgent)
+    previous = router_agent_nodes._shared_agent_instances.pop("client_agent", None)
+    try:
+        async def run():
+            nodes = [RouterAgentNodes() for _ in range(2)]
+            return await asyncio.gather(*(nodes[i % 2].get_agent("client_agent") for i in range(8)))
+
+        instances = asyncio.run(run())
+    finally:
+        router_agent_nodes._shared_agent_instances.pop("client_agent", None)
+        if previous is not None:
+            router_agent_nodes._shared_agent_instances["client_agent"] = previous
+
+    assert len(constructed) == 1
+    assert all(instance is constructed[0] for instance in instances)
+
+
+def test_cancelled_warm_up_does_not_wait_for_agent_builds(monkeypatch):
+    release = threading.Event()
+
+    def blocked_build(self, agent_name):
+        release.wait(5)
+        return None
+
+    monkeypatch.setattr(RouterAgentNodes, "_create_agent_instance", blocked_build)
+
+    async def run():
+        task = asyncio.create_task(RouterAgentNodes().warm_up())
+        await asyncio.sleep(0.05)
+        task.cancel()
+        started = time.perf_counter()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        return time.perf_counter() - started
+
+    try:
+        # 종료 시 취소된 워밍업이 진행 중인 Agent 생성을 기다리며 이벤트 루프를 막지 않음
+        assert asyncio.run(run()) < 1
+    finally:
+        release.set()
@@ -0,0 +1,127 @@
+"""
+동일 질문 합류(single_flight) 테스트
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+from app.core.config import settings
+from app.core.context_compactor import context_compactor
+from app.core.single_flight import SingleFlight
+from app.services.router_agent.router_agent import RouterAgent
+
+
+class CountingToolCaller:
+    def __init__(self):
+        self.calls = 0
+
+    async def call_tool(self, message, context=None):
+        self.calls += 1
+        await asyncio.sleep(0.05)
+        return {"tool_call": {"function_name": "employee_agent", "function_args": {"search_value": "공지"},
+                              "confidence": 0.9}, "general_response": None}
+
+
+class SlowAgent:
+    def __init__(self):
+        self.calls = 0
+
+    async def process(self, args, original_message):
+        self.calls += 1
+        await asyncio.sleep(0.1)
+        return {"response": "오늘 공지사항입니다.", "sources": [], "metadata": {"agent": "employee_agent"}}
+
+
+def _router(monkeypatch):
+    monkeypatch.setattr(settings, "speculative_prefetch_enabled", False, raising=False)
+    monkeypatch.setattr(settings, "single_flight_enabled", True, raising=False)
+    context_compactor.reset()
+    router = RouterAgent()
+    router.graph.tool_caller = CountingToolCaller()
+    agent = SlowAgent()
+    monkeypatch.setitem(router.graph.agent_nodes.agent_instances, "employee_agent", agent)
+    return router, agent
+
+
+def test_identical_questions_share_one_computation(monkeypatch):
+    router, agent = _router(monkeypatch)
+    messages = ["오늘 공지 알려줘", "오늘  공지 알려줘 ", "오늘 공지 알려줘", "오늘 공지 알려줘"]
+
+    async def run():
+        return await asyncio.gather(*[
+            router.route_request(message, session_id=f"s{i}") for i, message in enumerate(messages)
+        ])
+
+    results = asyncio.run(run())
+
+    assert router.graph.tool_caller.calls == 1 and agent.calls == 1
+    assert [result["session_id"] for result in results] == ["s0", "s1", "s2", "s3"]
+    assert sum(bool(result["metadata"].get("coalesced")) for result in results) == 3
+    assert {result["response"] for result in results} == {"오늘 공지사항입니다."}
+    # 합류한 요청도 각자 세션의 대화 맥락에 기록됨
+    assert all(context_compactor.snapshot(f"s{i}")["total_turns"] == 1 for i in range(4))
+    context_compactor.reset()
+
+
+def test_session_context_routes_separately(monkeypatch):
+    router, agent = _router(monkeypatch)
+    context_compactor.add_turn("s-ctx", "최수아 직원 정보", "최수아 - 영업1팀")
+
+    async def run():
+        return await asyncio.gather(
+            router.route_request("오늘 공지 알려줘", session_id="s-ctx"),
+            router.route_request("오늘 공지 알려줘", session_id="s-ctx")
+        )
+
+    asyncio.run(run())
+
+    # 맥락이 있는 요청은 라우팅을 공유하지 않지만, 같은 (Agent, 인수, 메시지) 실행은 합류
+    assert router.graph.tool_caller.calls == 2 and agent.calls == 1
+    context_compactor.reset()
+
+
+def test_stream_fans_out_to_late_subscribers():
+    flight = SingleFlight("test")
+    produced = []
+
+    async def source():
+        for index in range(3):
+            await asyncio.sleep(0.02)
+            produced.append(index)
+            yield index
+
+    async def consume(delay):
+        await asyncio.sleep(delay)
+        events, shared = flight.stream("key", source)
+        return [event async for event in events], shared
+
+    async def run():
+        return await asyncio.gather(consume(0), consume(0.03))
+
+    (first, first_shared), (second, second_shared) = asyncio.run(run())
+
+    assert produced == [0, 1, 2]
+    assert first == second == [0, 1, 2] and not first_shared and second_shared
+    assert flight.stats()["stream_followers"] == 1 and flight.stats()["in_flight"] == 0
+
+
+def test_errors_propagate_to_every_waiter():
+    flight = SingleFlight("test")
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise ValueError("검색 실패")
+
+    async def run():
+        return await asyncio.gather(flight.do("key", fail), flight.do("key", fail), return_exceptions=True)
+
+    errors = asyncio.run(run())
+    assert all(isinstance(error, ValueError) for error in errors)
+    assert flight.stats()["leaders"] == 1 and flight.stats()["followers"] == 1
+    with pytest.raises(ValueError):
+        asyncio.run(flight.do("key", fail))
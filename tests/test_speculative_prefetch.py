@@ -0,0 +1,88 @@
+"""
+라우팅-검색 병렬 선조회(speculative prefetch) 테스트
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+from app.services.router_agent.router_agent import RouterAgent
+from app.services.router_agent.router_agent_graph import prefetch_stats
+
+CANDIDATES = [{"content": "출장비 정산 규정", "metadata": {}, "score": 0.9, "rank": 1, "source": "chromadb_semantic_search"}]
+
+
+class FakeToolCaller:
+    def __init__(self, function_name, function_args):
+        self.tool_call = {"function_name": function_name, "function_args": function_args, "confidence": 0.9}
+
+    async def call_tool(self, message):
+        await asyncio.sleep(0.1)  # 라우팅 LLM 호출
+        return {"tool_call": self.tool_call, "general_response": None}
+
+
+class FakeDbAgent:
+    def __init__(self, delay):
+        self.delay = delay
+        self.prefetch_cancelled = False
+        self.received = "not called"
+
+    async def prefetch_candidates(self, query, document_type="general"):
+        try:
+            await asyncio.sleep(self.delay)  # 임베딩 + 벡터 검색
+        except asyncio.CancelledError:
+            self.prefetch_cancelled = True
+            raise
+        return CANDIDATES
+
+    async def process(self, args, original_message, prefetched=None):
+        self.received = prefetched
+        return {"response": "검색 결과", "sources": prefetched or [], "metadata": {"agent": "db_agent"}}
+
+
+class FakeEmployeeAgent:
+    async def process(self, args, original_message):
+        return {"response": "직원 정보", "sources": [], "metadata": {"agent": "employee_agent"}}
+
+
+def _router(monkeypatch, function_name, function_args, prefetch_delay=0.08):
+    router = RouterAgent()
+    router.graph.tool_caller = FakeToolCaller(function_name, function_args)
+    db_agent = FakeDbAgent(prefetch_delay)
+    monkeypatch.setitem(router.graph.agent_nodes.agent_instances, "db_agent", db_agent)
+    monkeypatch.setitem(router.graph.agent_nodes.agent_instances, "employee_agent", FakeEmployeeAgent())
+    prefetch_stats.reset()
+    return router, db_agent
+
+
+def test_prefetch_reused_when_routed_to_db_agent(monkeypatch):
+    router, db_agent = _router(monkeypatch, "db_agent", {"query": "출장비 규정", "search_type": "semantic"})
+
+    result = asyncio.run(router.route_request("출장비 규정 알려줘"))
+
+    assert result["agent"] == "db_agent" and db_agent.received == CANDIDATES
+    stats = prefetch_stats.snapshot()
+    assert stats["started"] == 1 and stats["reused"] == 1 and stats["hit_rate"] == 1.0
+    assert stats["saved_ms_total"] > 50  # 검색이 라우팅 호출과 겹쳐 실행됨
+
+
+def test_prefetch_cancelled_for_other_agents(monkeypatch):
+    router, db_agent = _router(monkeypatch, "db_agent", {"query": "출장비", "search_type": "keyword"})
+    asyncio.run(router.route_request("출장비 키워드 검색"))
+    assert db_agent.received is None  # 키워드 검색은 선조회 후보를 쓰지 않음
+
+    router, db_agent = _router(
+        monkeypatch, "employee_agent", {"search_type": "name", "search_value": "최수아"}, prefetch_delay=0.5
+    )
+
+    async def run():
+        result = await router.route_request("최수아 연락처")
+        await asyncio.sleep(0)
+        return result
+
+    result = asyncio.run(run())
+    assert result["agent"] == "employee_agent"
+    assert db_agent.prefetch_cancelled and db_agent.received == "not called"
+    assert prefetch_stats.snapshot()["cancelled"] == 1 and prefetch_stats.snapshot()["reused"] == 0
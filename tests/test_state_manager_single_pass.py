@@ -0,0 +1,86 @@
+"""
+StateManager 단일 라우팅 패스 테스트
+"""
+
+import asyncio
+import json
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+from app.core.checkpointer import close_checkpointers
+from app.core.config import settings
+
+
+class CountingCompletions:
+    """chat.completions.create 호출 횟수를 세는 가짜 OpenAI 클라이언트"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def create(self, **kwargs):
+        self.calls += 1
+        tool_call = SimpleNamespace(
+            function=SimpleNamespace(name="client_agent", arguments=json.dumps({"analysis_type": "profile"}))
+        )
+        message = SimpleNamespace(tool_calls=[tool_call], content=None)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+def _make_state_manager(monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "sqlite_db_path", str(tmp_path), raising=False)
+    monkeypatch.setattr(settings, "checkpoint_backend", "memory", raising=False)
+    from app.services.state_management.state_manager import StateManager
+
+    manager = StateManager()
+    completions = CountingCompletions()
+    manager.agent_router.graph.tool_caller.openai_client = SimpleNamespace(
+        chat=SimpleNamespace(completions=completions)
+    )
+    return manager, completions
+
+
+def test_one_llm_call_per_turn(monkeypatch, tmp_path):
+    manager, completions = _make_state_manager(monkeypatch, tmp_path)
+
+    async def run():
+        try:
+            first = await manager.process_message("거래처 프로필 알려줘", user_id="tester")
+            calls_after_first = completions.calls
+            second = await manager.process_message("다시 알려줘", session_id=first["session_id"])
+            return first, calls_after_first, second
+        finally:
+            await close_checkpointers()
+
+    first, calls_after_first, second = asyncio.run(run())
+
+    assert calls_after_first == 1
+    assert completions.calls == 2
+    assert first["agent"] == "client_analysis_agent"
+    assert first["response"]
+    assert second["error"] is None
+
+
+def test_routing_error_short_circuits_to_fallback_response(monkeypatch, tmp_path):
+    manager, _ = _make_state_manager(monkeypatch, tmp_path)
+
+    async def failing_route(**kwargs):
+        raise RuntimeError("router down")
+
+    manager.agent_router.route_request = failing_route
+
+    async def run():
+        try:
+            return await manager.process_message("거래처 프로필 알려줘", user_id="tester")
+        finally:
+            await close_checkpointers()
+
+    result = asyncio.run(run())
+
+    assert "router down" in result["error"]
+    assert result["response"].startswith("죄송합니다")
+    # 오류가 나도 사용자/어시스턴트 메시지는 저장됨
+    history = manager.session_manager.get_conversation_context(result["session_id"], 10)
+    assert len(history) == 2
@@ -0,0 +1,70 @@
+"""
+요청 타이밍 수집(app.core.tracing) 테스트
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+from app.core import tracing
+
+
+def test_span_records_into_current_trace_and_metrics():
+    tracing.metrics.reset()
+    token = tracing.start_trace("/test", debug=True)
+    try:
+        with tracing.span("routing.llm"):
+            pass
+        with tracing.span("routing.llm"):
+            pass
+        breakdown = tracing.timing_metadata()
+    finally:
+        tracing.end_trace(token)
+
+    assert set(breakdown["stages"]) == {"routing.llm"}
+    assert tracing.metrics.snapshot()["routing.llm"]["count"] == 2
+    assert tracing.timing_metadata() is None
+
+
+def test_timing_metadata_requires_debug_flag():
+    token = tracing.start_trace("/test", debug=False)
+    try:
+        with tracing.span("db.persist"):
+            pass
+        assert tracing.timing_metadata() is None
+    finally:
+        tracing.end_trace(token)
+
+
+def test_span_propagates_into_threads():
+    async def run():
+        token = tracing.start_trace("/test", debug=True)
+        try:
+            def work():
+                with tracing.span("agent.db_agent.construct"):
+                    pass
+            await asyncio.to_thread(work)
+            return tracing.timing_metadata()
+        finally:
+            tracing.end_trace(token)
+
+    assert "agent.db_agent.construct" in asyncio.run(run())["stages"]
+
+
+def test_percentiles():
+    metrics = tracing.StageMetrics()
+    for value in range(1, 101):
+        metrics.observe("stage", float(value))
+    snapshot = metrics.snapshot()["stage"]
+    assert snapshot["count"] == 100
+    assert snapshot["p50_ms"] == 51.0
+    assert snapshot["p95_ms"] == 95.0
+    assert snapshot["p99_ms"] == 99.0
+    assert snapshot["max_ms"] == 100.0
+
+
+def test_metrics_providers_included():
+    tracing.register_metrics_provider("test_provider", lambda: {"hits": 1})
+    assert tracing.collect_metrics()["test_provider"] == {"hits": 1}
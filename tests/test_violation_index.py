@@ -0,0 +1,86 @@
+"""
+위반 사례 색인(violation_index) 테스트
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+import numpy as np
+
+from app.core.config import settings
+from app.core.embeddings import EmbeddingCache
+from app.services.agents.docs_agent.docs_agent import DocsAgent
+from app.services.agents.docs_agent.violation_index import ViolationIndex, chunk_paragraphs
+
+REGULATION_DIR = Path(__file__).parent.parent / "database" / "relationdb" / "외부자료"
+
+
+def test_embedding_cache_evicts_least_recent():
+    cache = EmbeddingCache(max_size=2)
+    cache.put_many(["a", "b"], np.eye(2, dtype=np.float32))
+    cache.get_many(["a"])
+    cache.put_many(["c"], np.ones((1, 2), dtype=np.float32))
+
+    assert [vector is not None for vector in cache.get_many(["a", "b", "c"])] == [True, False, True]
+    assert cache.stats()["hits"] == 3 and cache.stats()["misses"] == 1
+
+
+def test_chunks_carry_headings_and_categories():
+    paragraphs = [
+        "제3장: 임직원의 기본 책무 및 행동 기준",
+        "2. 부당 이득 수수 금지 (금품, 향응, 편의)",
+        "골프 접대: 직무관련자와 사행성 오락(골프 포함)을 금지합니다.",
+        "4. 건전한 조직문화",
+        "상호 존중: 임직원 간 폭언, 폭행, 괴롭힘 등 일체의 행위를 금지합니다.",
+        "청탁금지법 8조",
+        "1. 공공기관이 소속 공직자등에게 지급하는 금품등은 수수 금지 대상에서 제외된다",
+    ]
+    chunks = chunk_paragraphs(paragraphs, "총정리.docx", "ethics")
+
+    assert [chunk["title"] for chunk in chunks] == [
+        "제3장: 임직원의 기본 책무 및 행동 기준 > 2. 부당 이득 수수 금지 (금품, 향응, 편의)",
+        "제3장: 임직원의 기본 책무 및 행동 기준 > 4. 건전한 조직문화",
+        "청탁금지법 8조",
+    ]
+    assert [chunk["category"] for chunk in chunks] == ["ethics", "hr", "ethics"]
+
+
+def test_search_ranks_matching_clause_and_filters_category(tmp_path):
+    case_dir = tmp_path / "위반사례"
+    case_dir.mkdir()
+    (case_dir / "2024.txt").write_text(
+        "영업사원이 거래처 원장에게 골프 라운딩 비용 80만원을 대납하여 징계 처분\n\n"
+        "제품설명회 후 참석 의사에게 상품권 30만원 지급, 리베이트로 적발",
+        encoding="utf-8",
+    )
+    index = ViolationIndex(REGULATION_DIR, case_dir, tmp_path / "violation_index.npz")
+
+    results = index.search("거래처 의사에게 골프 접대를 하고 상품권 20만원을 제공했습니다.", k=3, category="ethics")
+    assert len(results) == 3
+    assert all(result["metadata"]["category"] == "ethics" for result in results)
+    assert results == sorted(results, key=lambda result: result["score"], reverse=True)
+    assert any("골프" in result["content"] for result in results[:2])
+
+    cases = index.search("원장 골프 비용 대납", k=1)
+    assert cases[0]["source"] == "2024.txt" and cases[0]["metadata"]["type"] == "violation_case"
+
+    # 다른 인스턴스는 npz 캐시에서 같은 색인을 복원
+    restored = ViolationIndex(REGULATION_DIR, case_dir, tmp_path / "violation_index.npz")
+    assert restored.search("원장 골프 비용 대납", k=1) == cases
+
+
+def test_docs_agent_returns_similar_clauses(monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "sqlite_db_path", str(tmp_path), raising=False)
+    agent = DocsAgent()
+    agent.openai_client = None
+
+    result = asyncio.run(agent.process(
+        {"task_type": "regulation_violation", "regulation_category": "general"},
+        "전문의약품을 TV에 광고했습니다",
+    ))
+    clauses = [source for source in result["sources"] if "metadata" in source]
+    assert clauses and clauses[0]["source"] == "의약품 광고심의 관련 법률.docx"
+    assert "관련 조항/사례" in result["response"]